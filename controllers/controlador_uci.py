@@ -0,0 +1,323 @@
+"""
+Define el controlador UCI: habla el protocolo UCI por entrada/salida de texto para manejar
+el motor sin interfaz gráfica (interfaces de ajedrez, torneos y pruebas automáticas).
+"""
+
+import logging
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, TextIO
+
+from models.motor.buscador import MATE, MATE_UMBRAL
+from models.motor.posicion import BLANCO, FEN_INICIAL, Posicion, movimiento_a_uci
+from models.motor.trabajador_motor import TrabajadorMotor
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_MOTOR = "Ajedrez"
+AUTOR_MOTOR = "Equipo Ajedrez"
+
+# Opción Hash (MB) de la tabla de transposición
+HASH_POR_DEFECTO = 16
+HASH_MINIMO = 1
+HASH_MAXIMO = 1024
+# Opción MultiPV: número de variantes principales informadas
+MULTI_PV_MAXIMO = 64
+
+# Parámetros numéricos de 'go'
+_PARAMETROS_GO = ('depth', 'nodes', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo')
+
+
+def puntuacion_uci(puntuacion: int) -> str:
+    """
+    Formatea una puntuación del motor como 'cp N' o 'mate N' (N en jugadas; negativo si recibe el mate).
+    """
+    if puntuacion >= MATE_UMBRAL:
+        return f"mate {(MATE - puntuacion + 1) // 2}"
+    if puntuacion <= -MATE_UMBRAL:
+        return f"mate {-((MATE + puntuacion) // 2)}"
+    return f"cp {puntuacion}"
+
+
+class ControladorUCI:
+    """
+    Traduce los comandos UCI a encargos del `TrabajadorMotor`, de modo que 'stop' y 'isready'
+    se atienden mientras el motor piensa. Admite 'uci', 'isready', 'ucinewgame',
+    'setoption name Hash|MultiPV value N', 'position [startpos | fen ...] [moves ...]',
+    'go' (depth, nodes, movetime, wtime/btime/winc/binc/movestogo, infinite), 'stop' y 'quit'.
+    Las líneas de 'info' y 'bestmove' se escriben desde el hilo de escucha del trabajador.
+    """
+
+    def __init__(self, salida: TextIO = sys.stdout, tamano_tabla_mb: int = HASH_POR_DEFECTO,
+                 telemetria: Optional[Callable[[Dict], None]] = None):
+        """
+        Args:
+            salida: Flujo donde se escriben las respuestas.
+            tamano_tabla_mb: Tamaño inicial de la tabla de transposición (opción Hash).
+            telemetria: Función opcional que recibe el registro de telemetría de cada búsqueda
+                (ver `telemetria.registro_busqueda`), p. ej. un `RegistroTelemetria`.
+        """
+        self.salida = salida
+        self.telemetria = telemetria
+        self.tamano_tabla_mb = tamano_tabla_mb
+        self.multi_pv = 1
+        self.posicion = Posicion.desde_fen(FEN_INICIAL)
+        self._trabajador: Optional[TrabajadorMotor] = None
+        self._cerrojo_salida = threading.Lock()
+        self._cerrojo = threading.Lock()
+        self._futuro: Optional[Future] = None
+        self._infinito = False # 'go infinite': el bestmove espera a 'stop'
+        self._detenido = False
+        self._resultado_retenido: Optional[Dict] = None
+
+    @property
+    def trabajador(self) -> TrabajadorMotor:
+        """
+        Trabajador del motor, creado al primer uso (así 'setoption Hash' no lo arranca dos veces).
+        """
+        if self._trabajador is None:
+            self._trabajador = TrabajadorMotor(self.tamano_tabla_mb)
+        return self._trabajador
+
+    def _escribir(self, linea: str):
+        """
+        Escribe una línea de respuesta y vacía el flujo.
+        """
+        with self._cerrojo_salida:
+            self.salida.write(linea + "\n")
+            self.salida.flush()
+
+    # ============================================================
+    # 1. Bucle de Comandos
+    # ============================================================
+
+    def ejecutar(self, entrada: TextIO = sys.stdin):
+        """
+        Atiende comandos hasta 'quit' o el fin de la entrada, y libera el motor.
+        """
+        try:
+            for linea in entrada:
+                if not self.procesar(linea):
+                    break
+        finally:
+            self.cerrar()
+
+    def procesar(self, linea: str) -> bool:
+        """
+        Atiende un comando UCI. Los comandos desconocidos o mal formados se registran y se ignoran.
+
+        Returns:
+            False si el comando es 'quit'.
+        """
+        partes = linea.split()
+        if not partes:
+            return True
+        comando, argumentos = partes[0], partes[1:]
+        if comando == 'quit':
+            return False
+        manejador = {
+            'uci': self._uci, 'isready': self._isready, 'ucinewgame': self._ucinewgame,
+            'setoption': self._setoption, 'position': self._position, 'go': self._go, 'stop': self._stop,
+        }.get(comando)
+        if manejador is None:
+            logger.warning(f"Comando UCI desconocido: {linea.strip()}")
+            return True
+        try:
+            manejador(argumentos)
+        except ValueError as error:
+            logger.error(f"Comando UCI no válido '{linea.strip()}': {error}")
+        return True
+
+    def esperar_busqueda(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Espera a que termine la búsqueda en curso (útil en pruebas y scripts).
+
+        Returns:
+            Resultado de la búsqueda, o None si no había ninguna.
+        """
+        with self._cerrojo:
+            futuro = self._futuro
+        return futuro.result(timeout) if futuro is not None else None
+
+    def cerrar(self):
+        """
+        Detiene la búsqueda en curso y termina el proceso del motor.
+        """
+        if self._trabajador is not None:
+            self._trabajador.cerrar()
+            self._trabajador = None
+
+    # ============================================================
+    # 2. Comandos
+    # ============================================================
+
+    def _uci(self, _argumentos: List[str]):
+        """
+        Se identifica, anuncia las opciones y confirma con 'uciok'.
+        """
+        self._escribir(f"id name {NOMBRE_MOTOR}")
+        self._escribir(f"id author {AUTOR_MOTOR}")
+        self._escribir(f"option name Hash type spin default {HASH_POR_DEFECTO} min {HASH_MINIMO} max {HASH_MAXIMO}")
+        self._escribir(f"option name MultiPV type spin default 1 min 1 max {MULTI_PV_MAXIMO}")
+        self._escribir("uciok")
+
+    def _isready(self, _argumentos: List[str]):
+        """
+        Arranca el motor si hace falta y responde 'readyok'.
+        """
+        self.trabajador
+        self._escribir("readyok")
+
+    def _ucinewgame(self, _argumentos: List[str]):
+        """
+        Olvida la tabla de transposición de la partida anterior.
+        """
+        if self._trabajador is not None:
+            self._trabajador.nueva_partida()
+
+    def _setoption(self, argumentos: List[str]):
+        """
+        'setoption name <nombre> [value <valor>]'; se admiten Hash (recrea el motor) y MultiPV.
+        """
+        if 'name' not in argumentos:
+            raise ValueError("falta 'name'")
+        indice_valor = argumentos.index('value') if 'value' in argumentos else len(argumentos)
+        nombre = ' '.join(argumentos[argumentos.index('name') + 1:indice_valor])
+        valor = ' '.join(argumentos[indice_valor + 1:])
+        if nombre.lower() == 'multipv':
+            self.multi_pv = max(1, min(MULTI_PV_MAXIMO, int(valor)))
+            return
+        if nombre.lower() != 'hash':
+            logger.warning(f"Opción UCI desconocida: {nombre}")
+            return
+        tamano = max(HASH_MINIMO, min(HASH_MAXIMO, int(valor)))
+        if tamano != self.tamano_tabla_mb:
+            self.tamano_tabla_mb = tamano
+            self.cerrar()
+
+    def _position(self, argumentos: List[str]):
+        """
+        'position startpos|fen <fen> [moves m1 m2 ...]'. Si un movimiento es ilegal se
+        descarta la orden completa y se conserva la posición anterior.
+        """
+        indice_moves = argumentos.index('moves') if 'moves' in argumentos else len(argumentos)
+        if argumentos[:1] == ['startpos']:
+            posicion = Posicion.desde_fen(FEN_INICIAL)
+        elif argumentos[:1] == ['fen']:
+            posicion = Posicion.desde_fen(' '.join(argumentos[1:indice_moves]))
+        else:
+            raise ValueError("se esperaba 'startpos' o 'fen'")
+        for texto in argumentos[indice_moves + 1:]:
+            movimiento = posicion.movimiento_desde_uci(texto)
+            if movimiento is None or not posicion.hacer_movimiento(movimiento):
+                raise ValueError(f"movimiento ilegal {texto}")
+        self.posicion = posicion
+
+    def _go(self, argumentos: List[str]):
+        """
+        'go [depth N] [nodes N] [movetime N] [wtime N btime N winc N binc N movestogo N] [infinite]'.
+        Con reloj, el tiempo de la jugada lo reparte un `GestorTiempo` en el trabajador.
+        """
+        parametros = {}
+        indice = 0
+        while indice < len(argumentos):
+            palabra = argumentos[indice]
+            if palabra in _PARAMETROS_GO and indice + 1 < len(argumentos):
+                parametros[palabra] = int(argumentos[indice + 1])
+                indice += 2
+            else:
+                parametros[palabra] = True # 'infinite', 'ponder' y palabras sin valor
+                indice += 1
+        limites = {}
+        if 'depth' in parametros:
+            limites['profundidad_max'] = max(1, parametros['depth'])
+        if 'nodes' in parametros:
+            limites['nodos_max'] = max(1, parametros['nodes'])
+        if 'movetime' in parametros:
+            limites['tiempo_ms'] = max(1, parametros['movetime'])
+        else:
+            restante, incremento = ('wtime', 'winc') if self.posicion.turno == BLANCO else ('btime', 'binc')
+            if restante in parametros:
+                limites['reloj'] = {'restante_ms': parametros[restante], 'incremento_ms': parametros.get(incremento, 0),
+                                    'jugadas_restantes': parametros.get('movestogo')}
+        if 'infinite' in parametros:
+            limites = {}
+        if self.multi_pv > 1:
+            limites['multi_pv'] = self.multi_pv
+        with self._cerrojo:
+            self._infinito = 'infinite' in parametros
+            self._detenido = False
+            self._resultado_retenido = None
+            futuro = self.trabajador.pensar(self.posicion, limites, self._informar)
+            self._futuro = futuro
+        futuro.add_done_callback(self._alTerminar)
+
+    def _stop(self, _argumentos: List[str]):
+        """
+        Detiene la búsqueda; su 'bestmove' sale con la última iteración completa.
+        """
+        with self._cerrojo:
+            self._detenido = True
+            retenido, self._resultado_retenido = self._resultado_retenido, None
+            trabajador, futuro = self._trabajador, self._futuro
+        # Fuera del cerrojo: cancelar un encargo en cola ejecuta '_alTerminar' en este hilo
+        if trabajador is not None and futuro is not None:
+            trabajador.cancelar(futuro)
+        if retenido is not None:
+            self._escribirMejor(retenido)
+
+    # ============================================================
+    # 3. Salida de la Búsqueda
+    # ============================================================
+
+    def _informar(self, informe: Dict):
+        """
+        Escribe las líneas 'info' de una iteración completa (una por variante con MultiPV).
+        """
+        tiempo_ms = max(1, int(informe['tiempo_ms']))
+        lineas = informe['lineas']
+        for numero, linea in enumerate(lineas, 1):
+            multi_pv = f"multipv {numero} " if len(lineas) > 1 else ""
+            self._escribir(f"info depth {informe['profundidad']} seldepth {informe['profundidad_selectiva']} "
+                           f"{multi_pv}score {puntuacion_uci(linea['puntuacion'])} "
+                           f"nodes {informe['nodos']} nps {informe['nps']} time {tiempo_ms} "
+                           f"pv {' '.join(movimiento_a_uci(m) for m in linea['pv'])}")
+
+    def _alTerminar(self, futuro: Future):
+        """
+        Escribe 'bestmove' al terminar la búsqueda; con 'go infinite' lo retiene hasta 'stop'.
+        """
+        if futuro.cancelled(): # 'stop' antes de empezar: no hay jugada que proponer
+            resultado = {'movimiento': None, 'pv': []}
+        else:
+            try:
+                resultado = futuro.result()
+            except RuntimeError as error:
+                logger.error(f"La búsqueda falló: {error}")
+                resultado = {'movimiento': None, 'pv': []}
+        if self.telemetria is not None and resultado.get('telemetria'):
+            try:
+                self.telemetria(resultado['telemetria'])
+            except Exception:
+                logger.exception("Error al registrar la telemetría")
+        with self._cerrojo:
+            if futuro is not self._futuro:
+                return
+            if self._infinito and not self._detenido:
+                self._resultado_retenido = resultado
+                return
+        self._escribirMejor(resultado)
+
+    def _escribirMejor(self, resultado: Dict):
+        """
+        Escribe 'bestmove' (con 'ponder' si la variante principal lo permite).
+        """
+        if resultado['movimiento'] is None:
+            self._escribir("bestmove 0000")
+            return
+        linea = f"bestmove {movimiento_a_uci(resultado['movimiento'])}"
+        pv = resultado.get('pv') or []
+        if len(pv) >= 2 and pv[0] == resultado['movimiento']:
+            linea += f" ponder {movimiento_a_uci(pv[1])}"
+        self._escribir(linea)
@@ -0,0 +1,4 @@
+"""
+Inicializador del paquete de herramientas de línea de comandos del motor
+(mediciones, generación de datos y utilidades sin interfaz gráfica).
+"""
@@ -0,0 +1,68 @@
+"""
+Ajusta los pesos de la evaluación (método de Texel) sobre posiciones etiquetadas con el
+resultado de su partida y escribe un archivo de pesos.
+
+Uso:
+    python -m herramientas.ajustar_pesos posiciones.epd [mas.epd ...] [--pgn partidas.pgn ...]
+        [-o pesos.json] [--iteraciones 500] [--tasa 1.0] [--procesos 8]
+
+Cada línea de los archivos de posiciones es una FEN seguida del resultado (`1-0`, `0-1`,
+`1/2-1/2`, `[1.0]`, `[0.5]`, `[0.0]` o EPD con `c9 "..."`). Con --pgn se usan además las
+posiciones de las partidas (tras la apertura) etiquetadas con su resultado.
+
+Por defecto los pesos se escriben en `pesos.json` del directorio de trabajo, no en el del
+motor: `tablas_pst` carga `models/motor/pesos.json` (o el archivo de la variable de entorno
+AJEDREZ_PESOS) al importarse, así que escribir ahí cambiaría la evaluación de todo lo que
+use el motor (pruebas y la referencia de los enfrentamientos incluidas). Para adoptar unos
+pesos ajustados, primero se prueban con `AJEDREZ_PESOS=pesos.json` (p. ej. en un
+enfrentamiento) y después se copian a propósito a `models/motor/pesos.json`.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from models.motor.ajuste_texel import AjusteTexel, posiciones_desde_pgn
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: carga las posiciones, ajusta los pesos, los escribe e imprime un resumen JSON.
+    """
+    parser = argparse.ArgumentParser(description="Ajuste Texel de los pesos de la evaluación.")
+    parser.add_argument('posiciones', nargs='*', help="Archivos con una FEN y su resultado por línea.")
+    parser.add_argument('--pgn', nargs='*', default=[], help="Archivos PGN de los que extraer posiciones.")
+    parser.add_argument('--saltar-plies', type=int, default=8, help="Plies iniciales de cada partida PGN que se descartan.")
+    parser.add_argument('-o', '--salida', default='pesos.json',
+                        help="Archivo de pesos de salida (por defecto, pesos.json en el directorio actual).")
+    parser.add_argument('--iteraciones', type=int, default=500, help="Iteraciones de descenso de gradiente.")
+    parser.add_argument('--tasa', type=float, default=1.0, help="Tamaño de paso (centipeones por iteración).")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos de extracción (por defecto, núcleos).")
+    args = parser.parse_args(argumentos)
+    if not args.posiciones and not args.pgn:
+        parser.error("indica al menos un archivo de posiciones o --pgn")
+
+    logging.basicConfig(level=logging.INFO)
+    lineas = []
+    for ruta in args.posiciones:
+        with open(ruta, encoding='utf-8') as archivo:
+            lineas.extend(archivo)
+    for ruta in args.pgn:
+        with open(ruta, encoding='utf-8', errors='replace') as archivo:
+            lineas.extend(posiciones_desde_pgn(archivo.read(), args.saltar_plies))
+
+    inicio = time.perf_counter()
+    ajuste = AjusteTexel()
+    ajuste.cargar(lineas, args.procesos)
+    carga_s = time.perf_counter() - inicio
+    historial = ajuste.ajustar(args.iteraciones, args.tasa)
+    ajuste.guardar(args.salida)
+    print(json.dumps({'posiciones': ajuste.num_posiciones, 'escala': ajuste.escala,
+                      'perdida_inicial': historial[0], 'perdida_final': historial[-1],
+                      'carga_s': round(carga_s, 1), 'total_s': round(time.perf_counter() - inicio, 1),
+                      'salida': args.salida}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Compila un libro de aperturas Polyglot (.bin) a partir de archivos PGN.
+
+Uso:
+    python -m herramientas.construir_libro partidas.pgn [mas.pgn ...] -o libro.bin [--max-plies 24] [--min-partidas 2]
+"""
+
+import argparse
+import logging
+
+from models.motor.constructor_libro import ConstructorLibro
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: lee los PGN indicados y escribe el libro.
+    """
+    parser = argparse.ArgumentParser(description="Construye un libro de aperturas Polyglot desde PGN.")
+    parser.add_argument('pgn', nargs='+', help="Archivos PGN de entrada.")
+    parser.add_argument('-o', '--salida', required=True, help="Archivo .bin de salida.")
+    parser.add_argument('--max-plies', type=int, default=24, help="Plies de cada partida que entran en el libro.")
+    parser.add_argument('--min-partidas', type=int, default=1, help="Partidas mínimas para incluir un movimiento.")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO)
+    constructor = ConstructorLibro(args.max_plies, args.min_partidas)
+    for ruta in args.pgn:
+        constructor.agregar_archivo(ruta)
+    constructor.guardar(args.salida)
+
+
+if __name__ == '__main__':
+    main()
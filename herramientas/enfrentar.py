@@ -0,0 +1,56 @@
+"""
+Enfrenta dos configuraciones del jugador ordenador en paralelo hasta que el SPRT decide.
+
+Uso:
+    python -m herramientas.enfrentar --a '{"nodos_max": 4000}' --b '{"nodos_max": 2000}' \
+        [--aperturas aperturas.txt] [--partidas 2000] [--procesos 8] [--elo0 0 --elo1 10]
+
+Cada configuración es un objeto JSON con argumentos de `JugadorOrdenador` (o "nivel" y
+opciones). Por defecto se juega sin plazo de tiempo, con el presupuesto de nodos indicado,
+para que los resultados no dependan de la carga de la máquina. El informe incluye las
+partidas por segundo, útil para dimensionar ejecuciones de integración continua.
+"""
+
+import argparse
+import json
+import logging
+
+from models.motor.enfrentamiento import Enfrentamiento, MAX_PLIES_POR_DEFECTO, leer_aperturas
+from models.motor.sprt import SPRT
+
+# Configuración base de cada jugador; la de la línea de órdenes la completa o la sustituye
+CONFIG_BASE = {'tiempo_max_ms': None, 'nodos_max': 2000, 'tamano_tabla_mb': 2}
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: juega el enfrentamiento e imprime el informe como JSON en la salida estándar.
+    """
+    parser = argparse.ArgumentParser(description="Enfrentamiento entre dos configuraciones con parada por SPRT.")
+    parser.add_argument('--a', default='{}', help="Configuración JSON del jugador probado.")
+    parser.add_argument('--b', default='{}', help="Configuración JSON del jugador de referencia.")
+    parser.add_argument('--aperturas', default=None, help="Archivo con una apertura (UCI o SAN) por línea.")
+    parser.add_argument('--partidas', type=int, default=1000, help="Máximo de partidas.")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del pool (por defecto, núcleos).")
+    parser.add_argument('--elo0', type=float, default=0.0, help="Elo de la hipótesis nula.")
+    parser.add_argument('--elo1', type=float, default=10.0, help="Elo de la hipótesis alternativa.")
+    parser.add_argument('--alfa', type=float, default=0.05, help="Tasa de falsos positivos.")
+    parser.add_argument('--beta', type=float, default=0.05, help="Tasa de falsos negativos.")
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES_POR_DEFECTO, help="Plies tras los que se dan tablas.")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    # Cada Tablero nuevo avisa de las imágenes de las piezas, que aquí no hacen falta
+    logging.getLogger('models.piezas').setLevel(logging.ERROR)
+    aperturas = None
+    if args.aperturas:
+        with open(args.aperturas, encoding='utf-8') as archivo:
+            aperturas = leer_aperturas(archivo)
+    enfrentamiento = Enfrentamiento({**CONFIG_BASE, **json.loads(args.a)}, {**CONFIG_BASE, **json.loads(args.b)},
+                                    aperturas, SPRT(args.elo0, args.elo1, args.alfa, args.beta), args.procesos,
+                                    max_plies=args.max_plies)
+    print(json.dumps(enfrentamiento.jugar(args.partidas), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Genera las tablas de finales (KQK, KRK, KPK) por análisis retrógrado.
+
+Uso:
+    python -m herramientas.generar_tablas_finales -d tablas [--firmas KQK KRK KPK] [--procesos 8]
+"""
+
+import argparse
+import logging
+
+from models.motor.generador_tablas_finales import generar_tablas
+from models.motor.tablas_finales import FIRMAS
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: genera las tablas pedidas en el directorio indicado.
+    """
+    parser = argparse.ArgumentParser(description="Genera tablas de finales por análisis retrógrado.")
+    parser.add_argument('-d', '--directorio', required=True, help="Directorio de salida.")
+    parser.add_argument('--firmas', nargs='+', default=list(FIRMAS), choices=list(FIRMAS),
+                        help="Finales a generar.")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos (por defecto, uno por núcleo).")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO)
+    generar_tablas(args.directorio, args.firmas, args.procesos)
+
+
+if __name__ == '__main__':
+    main()
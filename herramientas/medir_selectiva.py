@@ -0,0 +1,70 @@
+"""
+Compara la búsqueda con y sin búsqueda selectiva (movimiento nulo y LMR): nodos a
+profundidad fija y profundidad alcanzada con el mismo plazo.
+
+Uso:
+    python -m herramientas.medir_selectiva --profundidad 5 --tiempo-ms 2000 [--fen-archivo posiciones.fen]
+"""
+
+import argparse
+import json
+import logging
+
+from herramientas.medir_smp import POSICIONES_POR_DEFECTO
+from models.motor.buscador import Buscador
+from models.motor.posicion import Posicion, movimiento_a_uci
+
+# Configuraciones comparadas: nombre -> (movimiento nulo, reducciones)
+CONFIGURACIONES = {
+    'completa': (False, False),
+    'nulo': (True, False),
+    'lmr': (False, True),
+    'nulo+lmr': (True, True),
+}
+
+
+def medir(fens, profundidad: int, tiempo_ms: int):
+    """
+    Busca cada posición con cada configuración, primero a profundidad fija y después con
+    plazo de tiempo, y devuelve por configuración los nodos totales, la profundidad media
+    alcanzada y las jugadas elegidas.
+    """
+    resultado = {}
+    for nombre, (nulo, reducciones) in CONFIGURACIONES.items():
+        nodos, tiempo, profundidades, jugadas = 0, 0.0, [], []
+        for fen in fens:
+            buscador = Buscador(movimiento_nulo=nulo, reducciones=reducciones)
+            fija = buscador.buscar(Posicion.desde_fen(fen), profundidad_max=profundidad)
+            nodos += fija['nodos']
+            tiempo += fija['tiempo_ms']
+            jugadas.append(movimiento_a_uci(fija['movimiento']) if fija['movimiento'] else None)
+            buscador = Buscador(movimiento_nulo=nulo, reducciones=reducciones)
+            profundidades.append(buscador.buscar(Posicion.desde_fen(fen), tiempo_ms=tiempo_ms)['profundidad'])
+        resultado[nombre] = {'nodos': nodos, 'tiempo_ms': round(tiempo), 'jugadas': jugadas,
+                             'profundidad_media_con_plazo': sum(profundidades) / len(profundidades)}
+    base = resultado['completa']['nodos']
+    for datos in resultado.values():
+        datos['nodos_relativos'] = round(datos['nodos'] / base, 3) if base else 0.0
+    return resultado
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: ejecuta la comparación e imprime el resultado como JSON en la salida estándar.
+    """
+    parser = argparse.ArgumentParser(description="Nodos y profundidad con y sin búsqueda selectiva.")
+    parser.add_argument('--profundidad', type=int, default=5, help="Profundidad fija por posición.")
+    parser.add_argument('--tiempo-ms', type=int, default=2000, help="Plazo por posición para medir la profundidad.")
+    parser.add_argument('--fen-archivo', default=None, help="Archivo con una FEN por línea.")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.WARNING)
+    fens = POSICIONES_POR_DEFECTO
+    if args.fen_archivo:
+        with open(args.fen_archivo, encoding='utf-8') as archivo:
+            fens = [linea.strip() for linea in archivo if linea.strip()]
+    print(json.dumps(medir(fens, args.profundidad, args.tiempo_ms), indent=2))
+
+
+if __name__ == '__main__':
+    main()
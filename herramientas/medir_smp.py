@@ -0,0 +1,46 @@
+"""
+Mide la aceleración de la búsqueda paralela (Lazy SMP) frente a un solo proceso.
+
+Uso:
+    python -m herramientas.medir_smp --procesos 8 --profundidad 5 [--fen-archivo posiciones.fen]
+"""
+
+import argparse
+import json
+import logging
+
+from models.motor.buscador_paralelo import medir_aceleracion
+from models.motor.posicion import Posicion
+
+# Posiciones de medio juego por defecto (una FEN por línea en --fen-archivo)
+POSICIONES_POR_DEFECTO = [
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "2rq1rk1/pp1bppbp/2np1np1/8/3NP3/1BN1BP2/PPPQ2PP/2KR3R b - - 0 11",
+]
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: ejecuta la medición e imprime el resultado como JSON en la salida estándar.
+    """
+    parser = argparse.ArgumentParser(description="Aceleración de la búsqueda paralela frente a un proceso.")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos de la búsqueda paralela (por defecto, núcleos).")
+    parser.add_argument('--profundidad', type=int, default=5, help="Profundidad fija por posición.")
+    parser.add_argument('--tabla-mb', type=float, default=64, help="Tamaño de la tabla de transposición compartida.")
+    parser.add_argument('--fen-archivo', default=None, help="Archivo con una FEN por línea.")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.WARNING)
+    fens = POSICIONES_POR_DEFECTO
+    if args.fen_archivo:
+        with open(args.fen_archivo, encoding='utf-8') as archivo:
+            fens = [linea.strip() for linea in archivo if linea.strip()]
+    posiciones = [Posicion.desde_fen(fen) for fen in fens]
+    resultado = medir_aceleracion(posiciones, args.profundidad, args.procesos, args.tabla_mb)
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Resuelve en paralelo un archivo EPD de problemas de mate y muestra la tasa de acierto y el tiempo.
+
+Uso:
+    python -m herramientas.resolver_mates problemas.epd [--max-jugadas 5] [--tiempo-ms 10000] [--procesos 8] [--detalle]
+
+Cada línea es una posición EPD con operaciones opcionales `dm N;` (mate en N esperado),
+`bm <SAN>;` (primera jugada esperada) e `id "...";`. Se marcan también los problemas con
+más de una primera jugada ganadora (soluciones alternativas).
+"""
+
+import argparse
+import json
+import logging
+
+from models.motor.solucionador_mate import resolver_lote
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: resuelve el lote e imprime el informe como JSON en la salida estándar.
+    """
+    parser = argparse.ArgumentParser(description="Solucionador de mates por lotes (EPD).")
+    parser.add_argument('epd', help="Archivo EPD con los problemas.")
+    parser.add_argument('--max-jugadas', type=int, default=5, help="Máximo de jugadas buscadas por problema.")
+    parser.add_argument('--tiempo-ms', type=int, default=None, help="Plazo por problema.")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del pool (por defecto, núcleos).")
+    parser.add_argument('--detalle', action='store_true', help="Incluir el resultado de cada problema.")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.epd, encoding='utf-8') as archivo:
+        informe = resolver_lote(archivo, args.max_jugadas, args.tiempo_ms, args.procesos)
+    if not args.detalle:
+        informe['fallidos'] = [r['id'] for r in informe['resultados'] if not r['correcto']]
+        informe['alternativas'] = {r['id']: r['alternativas'] for r in informe['resultados'] if r['alternativas']}
+        del informe['resultados']
+    print(json.dumps(informe, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Ejecuta el motor como motor UCI por la entrada y salida estándar, sin interfaz gráfica.
+
+Uso:
+    python -m herramientas.uci [--hash 16] [--log motor.log] [--telemetria busquedas.jsonl]
+
+Sirve para conectarlo a interfaces de ajedrez o a herramientas de torneos y pruebas. Los registros
+nunca se escriben en la salida estándar, que es del protocolo (se fuerza la configuración,
+porque algunos módulos la fijan al importarse). Con --telemetria se añade una línea JSON por
+búsqueda (nodos, nodos/s, profundidades, tabla de transposición, cortes, factor de ramificación).
+"""
+
+import argparse
+import logging
+
+from controllers.controlador_uci import ControladorUCI, HASH_POR_DEFECTO
+from models.motor.telemetria import RegistroTelemetria
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada: atiende comandos UCI hasta 'quit' o el fin de la entrada.
+    """
+    parser = argparse.ArgumentParser(description="Motor de ajedrez por protocolo UCI.")
+    parser.add_argument('--hash', type=int, default=HASH_POR_DEFECTO, help="Tabla de transposición inicial (MB).")
+    parser.add_argument('--log', default=None, help="Archivo de registro (por defecto, avisos por la salida de error).")
+    parser.add_argument('--telemetria', default=None, help="Archivo JSONL donde añadir la telemetría de cada búsqueda.")
+    args = parser.parse_args(argumentos)
+
+    if args.log:
+        logging.basicConfig(filename=args.log, level=logging.INFO, force=True)
+    else:
+        logging.basicConfig(level=logging.WARNING, force=True)
+    registro = RegistroTelemetria(args.telemetria) if args.telemetria else None
+    try:
+        ControladorUCI(tamano_tabla_mb=args.hash, telemetria=registro).ejecutar()
+    finally:
+        if registro is not None:
+            registro.cerrar()
+
+
+if __name__ == '__main__':
+    main()
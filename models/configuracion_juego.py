@@ -1,3 +1,85 @@
 """
 Define la clase para gestionar la configuración específica de una partida de ajedrez.
 """
+
+import logging
+from typing import Literal, Optional
+
+from models.jugadores.jugador_ordenador import JugadorOrdenador
+from models.motor.nivel_dificultad import NivelDificultad, NIVEL_POR_DEFECTO, obtener_nivel
+from models.temporizador import Temporizador
+
+logger = logging.getLogger(__name__)
+
+
+class ConfiguracionJuego:
+    """
+    Configuración de una partida: tipo de juego, nivel de dificultad del ordenador y temporizador.
+    El nivel de dificultad se traduce en un presupuesto de búsqueda explícito (`NivelDificultad`).
+    """
+
+    def __init__(self, tipoJuego: Literal['humano_vs_humano', 'humano_vs_ordenador'] = 'humano_vs_ordenador',
+                 nivelDificultad: int = NIVEL_POR_DEFECTO, usarTemporizador: bool = False,
+                 limiteTiempo: Optional[int] = None, semilla: Optional[int] = None, incrementoTiempo: int = 0):
+        """
+        Args:
+            tipoJuego: Modalidad de la partida.
+            nivelDificultad: Nivel del jugador ordenador (ver `NIVELES_DIFICULTAD`).
+            usarTemporizador: Si la partida se juega con reloj.
+            limiteTiempo: Tiempo por jugador en segundos (si se usa temporizador).
+            semilla: Semilla del ruido y del libro del ordenador (partidas reproducibles en los niveles por nodos).
+            incrementoTiempo: Incremento por jugada en segundos (si se usa temporizador).
+
+        Raises:
+            ValueError: Si el tipo de juego o el nivel no son válidos.
+        """
+        if tipoJuego not in ('humano_vs_humano', 'humano_vs_ordenador'):
+            raise ValueError(f"Tipo de juego no válido: {tipoJuego!r}")
+        self.tipoJuego = tipoJuego
+        self.nivelDificultad = nivelDificultad
+        self.presupuesto: NivelDificultad = obtener_nivel(nivelDificultad)
+        self.usarTemporizador = usarTemporizador
+        self.limiteTiempo = limiteTiempo
+        self.semilla = semilla
+        self.incrementoTiempo = incrementoTiempo
+
+    def getNivelDificultad(self) -> int:
+        """
+        Devuelve el nivel de dificultad configurado.
+        """
+        return self.nivelDificultad
+
+    def setNivelDificultad(self, nivel: int):
+        """
+        Cambia el nivel de dificultad (y su presupuesto de búsqueda).
+
+        Raises:
+            ValueError: Si el nivel no existe.
+        """
+        self.presupuesto = obtener_nivel(nivel)
+        self.nivelDificultad = nivel
+        logger.info(f"Nivel de dificultad {nivel}: {self.presupuesto}")
+
+    def getPresupuesto(self) -> NivelDificultad:
+        """
+        Devuelve el presupuesto de búsqueda del nivel configurado.
+        """
+        return self.presupuesto
+
+    def crearTemporizador(self) -> Optional[Temporizador]:
+        """
+        Crea el reloj de la partida, o None si se juega sin temporizador.
+        """
+        if not self.usarTemporizador or not self.limiteTiempo:
+            return None
+        return Temporizador(self.limiteTiempo * 1000, self.incrementoTiempo * 1000)
+
+    def crearJugadorOrdenador(self, nombre: str, color: Literal['blanco', 'negro'], **opciones) -> JugadorOrdenador:
+        """
+        Crea el jugador ordenador con el presupuesto del nivel configurado.
+
+        Args:
+            opciones: Resto de argumentos de `JugadorOrdenador` (libro, tablas de finales, el
+                `temporizador` de la partida...).
+        """
+        return JugadorOrdenador.desde_nivel(nombre, color, self.presupuesto, semilla=self.semilla, **opciones)
@@ -1,3 +1,45 @@
 """
 Define la clase base abstracta para todos los tipos de jugadores.
 """
+
+from abc import ABC, abstractmethod
+from typing import Literal, Optional, Tuple
+
+
+class Jugador(ABC):
+    """
+    Clase base para los jugadores de una partida (humano u ordenador).
+    """
+
+    def __init__(self, nombre: str, color: Literal['blanco', 'negro']):
+        """
+        Args:
+            nombre: Nombre visible del jugador.
+            color: Color con el que juega ('blanco' o 'negro').
+        """
+        if color not in ('blanco', 'negro'):
+            raise ValueError(f"Color de jugador no válido: {color!r}")
+        self.nombre = nombre
+        self.color = color
+
+    def getNombre(self) -> str:
+        """
+        Devuelve el nombre del jugador.
+        """
+        return self.nombre
+
+    def getColor(self) -> Literal['blanco', 'negro']:
+        """
+        Devuelve el color con el que juega el jugador.
+        """
+        return self.color
+
+    @abstractmethod
+    def elegir_movimiento(self, tablero) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]]:
+        """
+        Decide el movimiento a jugar en el tablero dado.
+
+        Returns:
+            Tupla (origen, destino, promocion) en coordenadas (fila, columna) de `Tablero`,
+            con `promocion` como letra ('Q', 'R', 'B', 'N') o None; None si no hay movimiento.
+        """
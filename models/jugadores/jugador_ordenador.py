@@ -1,3 +1,172 @@
 """
 Define la clase para representar a un jugador controlado por la computadora (IA).
 """
+
+import logging
+import random
+from typing import Callable, Dict, Literal, Optional, Tuple, Union
+
+from models.jugadores.jugador import Jugador
+from models.motor.buscador import Buscador
+from models.motor.buscador_paralelo import BuscadorParalelo
+from models.motor.gestor_tiempo import GestorTiempo
+from models.motor.libro_aperturas import LibroAperturas
+from models.motor.nivel_dificultad import NivelDificultad, obtener_nivel
+from models.motor.ponderador import Ponderador
+from models.motor.posicion import Posicion, movimiento_a_tupla
+from models.motor.tabla_transposicion import TablaTransposicion
+from models.motor.tablas_finales import TablasFinales
+from models.piezas.tipo_pieza import TipoPieza
+
+logger = logging.getLogger(__name__)
+
+# Presupuesto de tiempo por defecto: el requisito es decidir en menos de un segundo
+TIEMPO_MAXIMO_MS_POR_DEFECTO = 900
+
+
+class JugadorOrdenador(Jugador):
+    """
+    Jugador que decide sus movimientos con el motor de búsqueda (`Buscador`)
+    dentro de un presupuesto de tiempo por jugada: fijo o, con temporizador, repartido del reloj.
+    """
+
+    def __init__(self, nombre: str, color: Literal['blanco', 'negro'],
+                 tiempo_max_ms: Optional[int] = TIEMPO_MAXIMO_MS_POR_DEFECTO, profundidad_max: int = 64,
+                 tamano_tabla_mb: float = 16, num_procesos: int = 1, ruta_libro: Optional[str] = None,
+                 directorio_tablas: Optional[str] = None, ponder: bool = False,
+                 nodos_max: Optional[int] = None, ruido_cp: int = 0, semilla: Optional[int] = None,
+                 telemetria: Optional[Callable[[Dict], None]] = None, temporizador=None):
+        """
+        Args:
+            nombre: Nombre visible del jugador.
+            color: Color con el que juega.
+            tiempo_max_ms: Plazo de reloj por jugada en milisegundos (None = sin plazo).
+            profundidad_max: Profundidad máxima de la búsqueda en plies.
+            tamano_tabla_mb: Memoria de la tabla de transposición (se conserva entre jugadas).
+            num_procesos: Procesos de búsqueda; con más de uno se usa la búsqueda paralela
+                (Lazy SMP) y hay que llamar a `cerrar` al terminar la partida.
+            ruta_libro: Libro de aperturas Polyglot opcional; mientras la posición esté en
+                el libro se juega una de sus jugadas sin buscar.
+            directorio_tablas: Directorio opcional de tablas de finales (KQK, KRK, KPK)
+                que la búsqueda consulta para jugar esos finales con precisión.
+            ponder: Si es True, tras cada jugada sigue buscando en segundo plano la respuesta
+                prevista del rival (ver `Ponderador`); hay que llamar a `cerrar` al terminar.
+            nodos_max: Presupuesto de nodos por jugada (None = sin límite).
+            ruido_cp: Ruido deliberado en la elección de la jugada (ver `Buscador.buscar`).
+            semilla: Semilla del ruido y del libro; sin plazo de tiempo, búsqueda en un solo
+                proceso y sin ponder, la misma partida produce siempre las mismas jugadas.
+            telemetria: Función opcional que recibe el registro de telemetría de cada búsqueda
+                (ver `telemetria.registro_busqueda`), p. ej. un `RegistroTelemetria`.
+            temporizador: `Temporizador` opcional de la partida; con él, el tiempo de cada jugada
+                lo reparte un `GestorTiempo` según el reloj del jugador (en lugar de `tiempo_max_ms`).
+        """
+        super().__init__(nombre, color)
+        self.tiempo_max_ms = tiempo_max_ms
+        self.profundidad_max = profundidad_max
+        self.nodos_max = nodos_max
+        self.ruido_cp = ruido_cp
+        self.aleatorio = random.Random(semilla)
+        self.telemetria = telemetria
+        self.temporizador = temporizador
+        self.tablas_finales = None
+        if num_procesos > 1:
+            self.buscador = BuscadorParalelo(num_procesos, tamano_tabla_mb, directorio_tablas)
+        else:
+            self.tablas_finales = TablasFinales(directorio_tablas) if directorio_tablas else None
+            self.buscador = Buscador(tabla=TablaTransposicion(tamano_tabla_mb), tablas_finales=self.tablas_finales)
+        self.libro = LibroAperturas(ruta_libro, semilla) if ruta_libro else None
+        self.ponderador = Ponderador(self.buscador) if ponder else None
+        # Resultado de la última búsqueda (ver `Buscador.buscar`), útil para estadísticas
+        self.ultimo_resultado: Optional[Dict] = None
+        # Posición de la partida con su historial, para rehacer solo las jugadas nuevas en cada turno
+        self._partida: Optional[Posicion] = None
+
+    @classmethod
+    def desde_nivel(cls, nombre: str, color: Literal['blanco', 'negro'], nivel: Union[int, NivelDificultad],
+                    semilla: Optional[int] = None, **opciones) -> 'JugadorOrdenador':
+        """
+        Crea un jugador con el presupuesto de búsqueda de un nivel de dificultad.
+
+        Args:
+            nivel: Número de nivel (ver `NIVELES_DIFICULTAD`) o un `NivelDificultad` propio.
+            semilla: Semilla del ruido y del libro.
+            opciones: Resto de argumentos del constructor (libro, tablas, tamaño de tabla...).
+        """
+        presupuesto = nivel if isinstance(nivel, NivelDificultad) else obtener_nivel(nivel)
+        return cls(nombre, color, tiempo_max_ms=presupuesto.tiempo_max_ms, profundidad_max=presupuesto.profundidad_max,
+                   nodos_max=presupuesto.nodos_max, ruido_cp=presupuesto.ruido_cp, semilla=semilla, **opciones)
+
+    def elegir_movimiento(self, tablero) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]]:
+        """
+        Busca el mejor movimiento para la posición actual del tablero, con el historial de la
+        partida (ver `Posicion.desde_partida`) para que la búsqueda vea las repeticiones.
+        El movimiento devuelto se valida con `Tablero.esMovimientoLegal`; si el motor no
+        devolviera uno legal, se juega el primer movimiento legal que genera el tablero.
+
+        Returns:
+            Tupla (origen, destino, promocion) o None si no hay movimientos legales.
+        """
+        if tablero.getTurnoColor() != self.color:
+            logger.warning(f"{self.nombre} ({self.color}) consultado fuera de su turno.")
+        posicion = self._partida = Posicion.desde_partida(tablero, self._partida) # Con historial: ve las repeticiones
+        tiempo_ms, gestor_tiempo = self.tiempo_max_ms, None
+        if self.temporizador is not None:
+            gestor_tiempo = GestorTiempo.desde_temporizador(self.temporizador, self.color, posicion)
+            tiempo_ms = gestor_tiempo.limite_blando_ms
+        resultado = self.ponderador.resolver(posicion, tiempo_ms) if self.ponderador else None
+        if resultado is None and self.libro is not None:
+            movimiento_libro = self.libro.elegir_movimiento(posicion)
+            if movimiento_libro is not None:
+                origen, destino, promocion = movimiento_a_tupla(movimiento_libro)
+                if tablero.esMovimientoLegal(origen, destino, promocion):
+                    self.ultimo_resultado = {'movimiento': movimiento_libro, 'libro': True}
+                    return (origen, destino, promocion)
+        if resultado is None:
+            opciones = {}
+            if gestor_tiempo is not None and not isinstance(self.buscador, BuscadorParalelo):
+                tiempo_ms, opciones['gestor_tiempo'] = None, gestor_tiempo # La búsqueda paralela usa el límite blando
+            resultado = self.buscador.buscar(posicion, tiempo_ms=tiempo_ms, profundidad_max=self.profundidad_max,
+                                             nodos_max=self.nodos_max, ruido_cp=self.ruido_cp, aleatorio=self.aleatorio,
+                                             **opciones)
+        self.ultimo_resultado = resultado
+        if self.telemetria is not None and resultado.get('telemetria'):
+            self.telemetria(resultado['telemetria'])
+        if resultado['movimiento'] is not None:
+            origen, destino, promocion = movimiento_a_tupla(resultado['movimiento'])
+            if tablero.esMovimientoLegal(origen, destino, promocion):
+                self._iniciarPonder(posicion, resultado)
+                return (origen, destino, promocion)
+            logger.error(f"El motor propuso un movimiento ilegal {origen}->{destino}; se usa el primer legal.")
+        for origen, destino in tablero.iterar_movimientos_legales(tablero.getTurnoColor()):
+            pieza = tablero.getPieza(origen)
+            promocion = 'Q' if pieza.tipo == TipoPieza.PEON and destino[0] in (0, 7) else None
+            return (origen, destino, promocion)
+        return None
+
+    def _iniciarPonder(self, posicion: Posicion, resultado: Dict):
+        """
+        Empieza a pensar en el tiempo del rival sobre la respuesta prevista por la variante principal.
+        """
+        pv = resultado['pv']
+        if self.ponderador is None or len(pv) < 2 or pv[0] != resultado['movimiento']:
+            return
+        posicion = posicion.copia()
+        posicion.hacer_movimiento(pv[0])
+        self.ponderador.iniciar(posicion, pv[1], self.profundidad_max, nodos_max=self.nodos_max,
+                                ruido_cp=self.ruido_cp, aleatorio=self.aleatorio)
+
+    def cerrar(self):
+        """
+        Libera los recursos del motor (búsqueda en segundo plano, procesos y memoria compartida
+        de la búsqueda paralela, libro de aperturas y tablas de finales).
+        """
+        if self.ponderador is not None:
+            self.ponderador.detener()
+        if self.libro is not None:
+            self.libro.cerrar()
+            self.libro = None
+        if self.tablas_finales is not None:
+            self.tablas_finales.cerrar()
+            self.tablas_finales = None
+        if isinstance(self.buscador, BuscadorParalelo):
+            self.buscador.cerrar()
@@ -0,0 +1,23 @@
+"""
+Inicializador del paquete del motor de búsqueda del jugador ordenador.
+"""
+
+from .posicion import Posicion
+from .evaluador import Evaluador
+from .tabla_transposicion import TablaTransposicion
+from .tabla_peones import TablaPeones
+from .buscador import Buscador
+from .buscador_paralelo import BuscadorParalelo
+from .libro_aperturas import LibroAperturas
+from .constructor_libro import ConstructorLibro
+from .tablas_finales import TablasFinales
+from .ponderador import Ponderador
+from .solucionador_mate import SolucionadorMate
+from .trabajador_motor import TrabajadorMotor
+from .sprt import SPRT
+from .enfrentamiento import Enfrentamiento
+from .telemetria import RegistroTelemetria
+from .gestor_tiempo import GestorTiempo
+from .nivel_dificultad import NivelDificultad, NIVELES_DIFICULTAD
+
+__all__ = ['Posicion', 'Evaluador', 'TablaTransposicion', 'TablaPeones', 'Buscador', 'BuscadorParalelo', 'LibroAperturas', 'ConstructorLibro', 'TablasFinales', 'Ponderador', 'SolucionadorMate', 'TrabajadorMotor', 'SPRT', 'Enfrentamiento', 'RegistroTelemetria', 'GestorTiempo', 'NivelDificultad', 'NIVELES_DIFICULTAD']
@@ -0,0 +1,414 @@
+"""
+Define el ajuste de los pesos de la evaluación por el método de Texel.
+
+La evaluación es lineal en sus pesos (material, PST y estructura de peones, interpolados por
+la fase), así que cada posición se reduce una sola vez a sus características: las piezas como
+índices dispersos de la tabla pieza-casilla y los recuentos de peones como una matriz densa.
+Después cada iteración evalúa y deriva todo el conjunto con unas pocas operaciones de NumPy
+(`bincount` y productos de matrices), sin volver a tocar `Posicion` ni `Tablero`.
+
+La pérdida es la entropía cruzada entre el resultado de la partida (1, 0.5, 0 para las blancas)
+y `sigmoide(K * evaluación)`, con K ajustada antes a los pesos de partida.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models.motor.constructor_libro import leer_partidas_pgn
+from models.motor.evaluador import MASCARA_PASADO
+from models.motor.posicion import Posicion, FEN_INICIAL, BLANCO, NEGRO, PEON
+from models.motor.tablas_pst import FASE_MAXIMA, FASE_TIPO, FORMA_PESOS, pesos_actuales, guardar_pesos
+
+logger = logging.getLogger(__name__)
+
+# Resultados reconocidos en los archivos de posiciones, desde el punto de vista de las blancas
+RESULTADOS = {'1-0': 1.0, '0-1': 0.0, '1/2-1/2': 0.5, '1.0': 1.0, '0.5': 0.5, '0.0': 0.0}
+# Columnas de la matriz de peones: doblados, aislados, pasados por fila relativa y pasados bloqueados por fila
+_PEONES_DOBLADOS = 0
+_PEONES_AISLADOS = 1
+_PEONES_PASADOS = 2
+_PEONES_BLOQUEADOS = 10
+_COLUMNAS_PEONES = 18
+# Posiciones por trabajo al extraer características en paralelo
+_BLOQUE_EXTRACCION = 20000
+
+
+def leer_posicion_etiquetada(linea: str) -> Optional[Tuple[str, float]]:
+    """
+    Interpreta una línea de un conjunto de posiciones etiquetadas: una FEN (con o sin contadores)
+    seguida del resultado de la partida, en cualquiera de los formatos habituales:
+    `<fen> 1-0`, `<fen> [0.5]`, `<fen> | 0-1` o EPD `<fen> c9 "1/2-1/2";`.
+
+    Returns:
+        (fen, resultado) o None si la línea no tiene FEN y resultado reconocibles.
+    """
+    for separador in ';"[]|,':
+        linea = linea.replace(separador, ' ')
+    campos = linea.split()
+    if len(campos) < 5:
+        return None
+    fen, resto = campos[:4], campos[4:]
+    if len(resto) >= 2 and resto[0].isdigit() and resto[1].isdigit():
+        fen, resto = fen + resto[:2], resto[2:]
+    for campo in reversed(resto):
+        if campo in RESULTADOS:
+            return ' '.join(fen), RESULTADOS[campo]
+    return None
+
+
+def posiciones_desde_pgn(texto: str, saltar_plies: int = 8) -> Iterator[str]:
+    """
+    Genera líneas etiquetadas (`<fen> <resultado>`) con las posiciones de las partidas de un PGN
+    con resultado conocido, saltando las primeras `saltar_plies` (teoría de aperturas).
+    """
+    for etiquetas, jugadas in leer_partidas_pgn(texto):
+        resultado = etiquetas.get('Result', '*')
+        if resultado not in RESULTADOS:
+            continue
+        posicion = Posicion.desde_fen(etiquetas.get('FEN', FEN_INICIAL))
+        for ply, san in enumerate(jugadas):
+            movimiento = posicion.movimiento_desde_san(san)
+            if movimiento is None:
+                break
+            posicion.hacer_movimiento(movimiento)
+            if ply + 1 >= saltar_plies:
+                yield f"{posicion.a_fen()} {resultado}"
+
+
+def _caracteristicas(posicion: Posicion) -> Tuple[List[int], List[int], int, List[int]]:
+    """
+    Reduce una posición a sus características (desde el punto de vista de las blancas):
+    índices `tipo * 64 + casilla de la PST` con su signo, fase y recuentos de peones.
+    """
+    casillas = posicion.casillas
+    indices, signos = [], []
+    peones = [0, 0]
+    columnas = [[0] * 8, [0] * 8]
+    fase = 0
+    for casilla, codigo in enumerate(casillas):
+        if not codigo:
+            continue
+        tipo, color = codigo & 7, codigo >> 3
+        fase += FASE_TIPO[tipo]
+        # Las PST están escritas con a8 = 0: las blancas se reflejan, las negras no
+        indices.append(tipo * 64 + (casilla ^ 56 if color == BLANCO else casilla))
+        signos.append(1 if color == BLANCO else -1)
+        if tipo == PEON:
+            peones[color] |= 1 << casilla
+            columnas[color][casilla & 7] += 1
+    recuentos = [0] * _COLUMNAS_PEONES
+    for color in (BLANCO, NEGRO):
+        signo = 1 if color == BLANCO else -1
+        propias = columnas[color]
+        rivales = peones[color ^ 1]
+        for columna in range(8):
+            if propias[columna] > 1:
+                recuentos[_PEONES_DOBLADOS] += signo * (propias[columna] - 1)
+        bits = peones[color]
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            casilla = bit.bit_length() - 1
+            columna = casilla & 7
+            if not (columna > 0 and propias[columna - 1]) and not (columna < 7 and propias[columna + 1]):
+                recuentos[_PEONES_AISLADOS] += signo
+            if not rivales & MASCARA_PASADO[color][casilla]:
+                fila = casilla >> 3 if color == BLANCO else 7 - (casilla >> 3)
+                recuentos[_PEONES_PASADOS + fila] += signo
+                if casillas[casilla + 8 if color == BLANCO else casilla - 8]:
+                    recuentos[_PEONES_BLOQUEADOS + fila] += signo
+    return indices, signos, fase, recuentos
+
+
+def _extraer_bloque(lineas: List[str]) -> Tuple[np.ndarray, ...]:
+    """
+    Extrae las características de un bloque de líneas etiquetadas, descartando las que no se
+    entienden y las posiciones en jaque (no tranquilas: su evaluación estática no es fiable).
+
+    Returns:
+        (indices, signos, piezas por posición, fases, recuentos de peones, resultados).
+    """
+    indices, signos, longitudes, fases, recuentos, resultados = [], [], [], [], [], []
+    for linea in lineas:
+        etiquetada = leer_posicion_etiquetada(linea)
+        if etiquetada is None:
+            continue
+        try:
+            posicion = Posicion.desde_fen(etiquetada[0])
+        except ValueError:
+            continue
+        if posicion.en_jaque():
+            continue
+        indices_posicion, signos_posicion, fase, recuentos_posicion = _caracteristicas(posicion)
+        indices.extend(indices_posicion)
+        signos.extend(signos_posicion)
+        longitudes.append(len(indices_posicion))
+        fases.append(min(fase, FASE_MAXIMA))
+        recuentos.append(recuentos_posicion)
+        resultados.append(etiquetada[1])
+    return (np.array(indices, dtype=np.int16), np.array(signos, dtype=np.int8),
+            np.array(longitudes, dtype=np.int32), np.array(fases, dtype=np.float64),
+            np.array(recuentos, dtype=np.float64).reshape(-1, _COLUMNAS_PEONES),
+            np.array(resultados, dtype=np.float64))
+
+
+def _desplazamientos() -> Dict[str, Tuple[int, int]]:
+    """
+    Posición (inicio, fin) de cada peso dentro del vector de parámetros.
+    """
+    desplazamientos = {}
+    inicio = 0
+    for nombre, forma in FORMA_PESOS.items():
+        tamano = math.prod(forma)
+        desplazamientos[nombre] = (inicio, inicio + tamano)
+        inicio += tamano
+    return desplazamientos
+
+
+_DESPLAZAMIENTOS = _desplazamientos()
+NUM_PARAMETROS = max(fin for _, fin in _DESPLAZAMIENTOS.values())
+
+
+class AjusteTexel:
+    """
+    Ajusta los pesos de la evaluación sobre un conjunto de posiciones etiquetadas con el
+    resultado de su partida, por descenso de gradiente (Adam) vectorizado sobre todo el conjunto.
+
+    Los pesos que no influyen en la evaluación (tipo 0, material del rey, peones en la primera
+    y última fila, pasados en filas imposibles) quedan fijos.
+    """
+
+    def __init__(self, pesos: Optional[Dict[str, list]] = None):
+        """
+        Args:
+            pesos: Pesos de partida (formato de `tablas_pst.pesos_actuales`); por defecto, los del motor.
+        """
+        pesos = pesos if pesos is not None else pesos_actuales()
+        self.parametros = np.zeros(NUM_PARAMETROS)
+        for nombre, (inicio, fin) in _DESPLAZAMIENTOS.items():
+            self.parametros[inicio:fin] = np.array(pesos[nombre], dtype=np.float64).ravel()
+        self.libres = np.ones(NUM_PARAMETROS, dtype=bool)
+        for nombre in ('MATERIAL_MG', 'MATERIAL_EG'):
+            inicio = _DESPLAZAMIENTOS[nombre][0]
+            self.libres[[inicio, inicio + 6]] = False
+        for nombre in ('PST_MG', 'PST_EG'):
+            inicio = _DESPLAZAMIENTOS[nombre][0]
+            self.libres[inicio:inicio + 64] = False
+            self.libres[inicio + 64:inicio + 72] = False # Peones en la octava fila
+            self.libres[inicio + 120:inicio + 128] = False # Peones en la primera fila
+        for nombre in ('PEON_PASADO_MG', 'PEON_PASADO_EG'):
+            inicio = _DESPLAZAMIENTOS[nombre][0]
+            self.libres[[inicio, inicio + 7]] = False
+        self.escala: Optional[float] = None
+        self.num_posiciones = 0
+        self._filas = self._indices = self._signos = None
+        self._fases = self._recuentos = self._resultados = None
+
+    # ============================================================
+    # 1. Carga del Conjunto de Posiciones
+    # ============================================================
+
+    def cargar(self, lineas: Iterable[str], procesos: Optional[int] = None) -> int:
+        """
+        Extrae (en paralelo) las características de las posiciones etiquetadas y las guarda
+        como matrices de NumPy. Sustituye cualquier conjunto cargado antes.
+
+        Args:
+            lineas: Líneas con FEN y resultado (ver `leer_posicion_etiquetada`).
+            procesos: Procesos de extracción (por defecto, uno por núcleo).
+
+        Returns:
+            Número de posiciones cargadas.
+        """
+        lineas = list(lineas)
+        bloques = [lineas[i:i + _BLOQUE_EXTRACCION] for i in range(0, len(lineas), _BLOQUE_EXTRACCION)]
+        procesos = max(1, procesos or os.cpu_count() or 1)
+        if procesos > 1 and len(bloques) > 1:
+            with multiprocessing.get_context().Pool(procesos) as pool:
+                partes = pool.map(_extraer_bloque, bloques)
+        else:
+            partes = [_extraer_bloque(bloque) for bloque in bloques]
+        if not partes:
+            partes = [_extraer_bloque([])]
+        indices, signos, longitudes, fases, recuentos, resultados = (np.concatenate(columna) for columna in zip(*partes))
+        self.num_posiciones = len(resultados)
+        self._indices = indices.astype(np.intp)
+        self._signos = signos.astype(np.float64)
+        self._filas = np.repeat(np.arange(self.num_posiciones), longitudes)
+        self._fases = fases
+        self._recuentos = recuentos
+        self._resultados = resultados
+        self.escala = None
+        logger.info(f"Ajuste Texel: {self.num_posiciones} posiciones cargadas de {len(lineas)} líneas")
+        return self.num_posiciones
+
+    # ============================================================
+    # 2. Evaluación, Pérdida y Gradiente
+    # ============================================================
+
+    def _vistas(self, parametros: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vistas de cada peso dentro del vector de parámetros (con su forma).
+        """
+        return {nombre: parametros[inicio:fin].reshape(FORMA_PESOS[nombre])
+                for nombre, (inicio, fin) in _DESPLAZAMIENTOS.items()}
+
+    def evaluaciones(self, parametros: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluación de todas las posiciones cargadas (centipeones, punto de vista de las blancas),
+        igual a la de `Evaluador` salvo redondeos enteros.
+        """
+        pesos = self._vistas(self.parametros if parametros is None else parametros)
+        n = self.num_posiciones
+        tabla_mg = (pesos['PST_MG'] + pesos['MATERIAL_MG'][:, None]).ravel()
+        tabla_eg = (pesos['PST_EG'] + pesos['MATERIAL_EG'][:, None]).ravel()
+        mg = np.bincount(self._filas, weights=self._signos * tabla_mg[self._indices], minlength=n)
+        eg = np.bincount(self._filas, weights=self._signos * tabla_eg[self._indices], minlength=n)
+        peones_mg, peones_eg = self._pesosPeones(pesos)
+        mg += self._recuentos @ peones_mg
+        eg += self._recuentos @ peones_eg
+        return (mg * self._fases + eg * (FASE_MAXIMA - self._fases)) / FASE_MAXIMA
+
+    @staticmethod
+    def _pesosPeones(pesos: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Coeficientes de medio juego y final de cada columna de la matriz de recuentos de peones
+        (un pasado bloqueado pierde la mitad de su bonificación de final).
+        """
+        mg = np.concatenate(([pesos['PEON_DOBLADO'][0], pesos['PEON_AISLADO'][0]],
+                             pesos['PEON_PASADO_MG'], np.zeros(8)))
+        eg = np.concatenate(([pesos['PEON_DOBLADO'][1], pesos['PEON_AISLADO'][1]],
+                             pesos['PEON_PASADO_EG'], -0.5 * pesos['PEON_PASADO_EG']))
+        return mg, eg
+
+    def perdida(self, parametros: Optional[np.ndarray] = None, escala: Optional[float] = None) -> float:
+        """
+        Entropía cruzada media entre los resultados y `sigmoide(escala * evaluación)`.
+        """
+        escala = escala if escala is not None else self._escala()
+        return self._perdidaDe(self.evaluaciones(parametros), escala)
+
+    def _perdidaDe(self, evaluaciones: np.ndarray, escala: float) -> float:
+        """
+        Entropía cruzada media de unas evaluaciones ya calculadas.
+        """
+        z = escala * evaluaciones
+        # log(1 + e^z) - y * z, estable para |z| grandes
+        return float(np.mean(np.logaddexp(0.0, z) - self._resultados * z))
+
+    def gradiente(self, parametros: Optional[np.ndarray] = None) -> Tuple[float, np.ndarray]:
+        """
+        Devuelve (pérdida, gradiente respecto al vector de parámetros).
+        """
+        parametros = self.parametros if parametros is None else parametros
+        escala = self._escala()
+        evaluaciones = self.evaluaciones(parametros)
+        perdida = self._perdidaDe(evaluaciones, escala)
+        # d(pérdida)/d(evaluación) de cada posición, repartida entre medio juego y final por la fase
+        delta = escala * (1.0 / (1.0 + np.exp(-escala * evaluaciones)) - self._resultados) / self.num_posiciones
+        delta_mg = delta * self._fases / FASE_MAXIMA
+        delta_eg = delta * (FASE_MAXIMA - self._fases) / FASE_MAXIMA
+        gradiente = np.zeros(NUM_PARAMETROS)
+        vistas = self._vistas(gradiente)
+        tamano_tabla = 7 * 64
+        tabla_mg = np.bincount(self._indices, weights=self._signos * delta_mg[self._filas], minlength=tamano_tabla)
+        tabla_eg = np.bincount(self._indices, weights=self._signos * delta_eg[self._filas], minlength=tamano_tabla)
+        vistas['PST_MG'][:] = tabla_mg.reshape(7, 64)
+        vistas['PST_EG'][:] = tabla_eg.reshape(7, 64)
+        vistas['MATERIAL_MG'][:] = vistas['PST_MG'].sum(axis=1)
+        vistas['MATERIAL_EG'][:] = vistas['PST_EG'].sum(axis=1)
+        columnas_mg = self._recuentos.T @ delta_mg
+        columnas_eg = self._recuentos.T @ delta_eg
+        vistas['PEON_DOBLADO'][:] = (columnas_mg[_PEONES_DOBLADOS], columnas_eg[_PEONES_DOBLADOS])
+        vistas['PEON_AISLADO'][:] = (columnas_mg[_PEONES_AISLADOS], columnas_eg[_PEONES_AISLADOS])
+        vistas['PEON_PASADO_MG'][:] = columnas_mg[_PEONES_PASADOS:_PEONES_BLOQUEADOS]
+        vistas['PEON_PASADO_EG'][:] = columnas_eg[_PEONES_PASADOS:_PEONES_BLOQUEADOS] \
+            - 0.5 * columnas_eg[_PEONES_BLOQUEADOS:]
+        gradiente[~self.libres] = 0.0
+        return perdida, gradiente
+
+    # ============================================================
+    # 3. Optimización
+    # ============================================================
+
+    def _escala(self) -> float:
+        """
+        Escala K de la sigmoide (se ajusta la primera vez que se necesita).
+        """
+        if self.escala is None:
+            self.ajustar_escala()
+        return self.escala
+
+    def ajustar_escala(self) -> float:
+        """
+        Busca (sección áurea sobre log K) la escala que minimiza la pérdida con los pesos actuales.
+        """
+        if not self.num_posiciones:
+            raise ValueError("No hay posiciones cargadas para el ajuste")
+        evaluaciones = self.evaluaciones()
+        bajo, alto = math.log(1e-4), math.log(0.1)
+        razon = (math.sqrt(5) - 1) / 2
+        for _ in range(60):
+            a = alto - razon * (alto - bajo)
+            b = bajo + razon * (alto - bajo)
+            if self._perdidaDe(evaluaciones, math.exp(a)) < self._perdidaDe(evaluaciones, math.exp(b)):
+                alto = b
+            else:
+                bajo = a
+        self.escala = math.exp((bajo + alto) / 2)
+        logger.info(f"Ajuste Texel: escala K = {self.escala:.6f}")
+        return self.escala
+
+    def ajustar(self, iteraciones: int = 500, tasa: float = 1.0, informe_cada: int = 50) -> List[float]:
+        """
+        Optimiza los pesos libres con Adam sobre el conjunto completo.
+
+        Args:
+            iteraciones: Pasos de descenso de gradiente.
+            tasa: Tamaño de paso de Adam (aproximadamente centipeones por paso).
+            informe_cada: Cada cuántas iteraciones se registra la pérdida.
+
+        Returns:
+            La pérdida antes de cada iteración y la final.
+        """
+        if not self.num_posiciones:
+            raise ValueError("No hay posiciones cargadas para el ajuste")
+        self._escala()
+        momento = np.zeros(NUM_PARAMETROS)
+        varianza = np.zeros(NUM_PARAMETROS)
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        historial = []
+        for iteracion in range(1, iteraciones + 1):
+            perdida, gradiente = self.gradiente()
+            historial.append(perdida)
+            momento = beta1 * momento + (1 - beta1) * gradiente
+            varianza = beta2 * varianza + (1 - beta2) * gradiente * gradiente
+            paso = tasa * (momento / (1 - beta1 ** iteracion)) / (np.sqrt(varianza / (1 - beta2 ** iteracion)) + epsilon)
+            self.parametros -= np.where(self.libres, paso, 0.0)
+            if informe_cada and iteracion % informe_cada == 0:
+                logger.info(f"Ajuste Texel: iteración {iteracion}/{iteraciones}, pérdida {perdida:.6f}")
+        historial.append(self.perdida())
+        return historial
+
+    # ============================================================
+    # 4. Resultado
+    # ============================================================
+
+    def pesos(self) -> Dict[str, list]:
+        """
+        Devuelve los pesos ajustados redondeados a enteros (formato del archivo de pesos).
+        """
+        redondeados = np.rint(self.parametros).astype(int)
+        return {nombre: valores.tolist() for nombre, valores in self._vistas(redondeados).items()}
+
+    def guardar(self, ruta: str):
+        """
+        Escribe los pesos ajustados en un archivo que el motor carga al arrancar (ver `tablas_pst`).
+        """
+        guardar_pesos(ruta, self.pesos())
+        logger.info(f"Pesos ajustados escritos en {ruta}")
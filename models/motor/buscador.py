@@ -0,0 +1,484 @@
+"""
+Define el buscador del motor: negamax con poda alfa-beta y profundización iterativa
+limitada por un plazo de tiempo de reloj.
+"""
+
+import logging
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+from models.motor.busqueda_interrumpida import BusquedaInterrumpida
+from models.motor.evaluador import Evaluador, VALORES_PIEZA
+from models.motor.gestor_tiempo import GestorTiempo
+from models.motor.ordenacion_movimientos import OrdenacionMovimientos
+from models.motor.posicion import Posicion, movimiento_a_uci
+from models.motor.tabla_transposicion import TablaTransposicion, COTA_EXACTA, COTA_INFERIOR, COTA_SUPERIOR
+from models.motor.tablas_finales import TablasFinales
+from models.motor.telemetria import registro_busqueda
+
+logger = logging.getLogger(__name__)
+
+# Puntuación de mate (se resta la distancia en plies para preferir el mate más corto)
+MATE = 100000
+# Umbral a partir del cual una puntuación se considera de mate
+MATE_UMBRAL = MATE - 1000
+INFINITO = 1000000
+# Profundidad máxima de búsqueda en plies
+PROFUNDIDAD_MAXIMA = 64
+# Límite de plies desde la raíz para la búsqueda de quiescencia
+PLY_MAXIMO_QUIESCENCIA = 120
+# Margen de la poda delta: una captura que ni sumando este margen alcanza alfa no se busca
+MARGEN_DELTA = 200
+# Cada cuántos nodos se consulta el reloj (potencia de 2 menos 1, usada como máscara)
+_MASCARA_COMPROBACION = 1023
+# Límite de nodos cuando la búsqueda no tiene presupuesto de nodos
+_SIN_LIMITE_NODOS = 1 << 62
+# Movimiento nulo: profundidad mínima y reducción (mayor en nodos profundos)
+PROFUNDIDAD_MINIMA_NULO = 3
+REDUCCION_NULO = 2
+REDUCCION_NULO_PROFUNDA = 3
+# Reducciones de movimientos tardíos (LMR): profundidad mínima y movimientos buscados completos antes de reducir
+PROFUNDIDAD_MINIMA_LMR = 3
+MOVIMIENTOS_SIN_REDUCIR = 3
+# _REDUCCIONES_LMR[profundidad][numero de movimiento]: reducción logarítmica en ambos
+_REDUCCIONES_LMR = [[0 if p < PROFUNDIDAD_MINIMA_LMR or n <= MOVIMIENTOS_SIN_REDUCIR
+                     else min(p - 2, int(0.75 + math.log(p) * math.log(n) / 2.25))
+                     for n in range(64)] for p in range(PROFUNDIDAD_MAXIMA + 1)]
+
+
+class Buscador:
+    """
+    Busca el mejor movimiento de una `Posicion` con profundización iterativa:
+    completa la búsqueda a profundidad 1, 2, 3... hasta agotar el tiempo o la profundidad
+    máxima, y devuelve siempre el resultado de la última iteración completada.
+    """
+
+    def __init__(self, evaluador: Optional[Evaluador] = None, tabla: Optional[TablaTransposicion] = None,
+                 evento_detener=None, tablas_finales: Optional[TablasFinales] = None,
+                 movimiento_nulo: bool = True, reducciones: bool = True):
+        """
+        Args:
+            evaluador: Evaluador estático a usar en las hojas (por defecto, `Evaluador()`).
+            tabla: Tabla de transposición (por defecto, una nueva de 16 MB). Se conserva entre
+                búsquedas; su edad avanza al empezar cada una.
+            evento_detener: Evento opcional (con `is_set()`, p. ej. `threading.Event` o
+                `multiprocessing.Event`) que, al activarse, interrumpe la búsqueda como si
+                se hubiera agotado el plazo.
+            tablas_finales: Tablas de finales opcionales; las posiciones con tres piezas que
+                cubren se puntúan directamente (resultado y distancia al mate exactos).
+            movimiento_nulo: Activa la poda de movimiento nulo.
+            reducciones: Activa las reducciones de movimientos tardíos (LMR).
+        """
+        self.evaluador = evaluador if evaluador is not None else Evaluador()
+        self.tabla = tabla if tabla is not None else TablaTransposicion()
+        self.ordenacion = OrdenacionMovimientos()
+        self.nodos: int = 0
+        self.nodos_quiescencia: int = 0
+        # Ply más lejano alcanzado en la iteración en curso (incluida la quiescencia)
+        self.profundidad_selectiva: int = 0
+        self._plazo: Optional[float] = None
+        self._limite_nodos: int = _SIN_LIMITE_NODOS
+        self._ruido: Dict[int, int] = {}
+        self.evento_detener = evento_detener
+        self._evento_busqueda = evento_detener
+        self.tablas_finales = tablas_finales
+        self.movimiento_nulo = movimiento_nulo
+        self.reducciones = reducciones
+        self.aciertos_tablas_finales: int = 0
+        self.cortes_nulos: int = 0
+        self.reducciones_lmr: int = 0
+        self.reintentos_lmr: int = 0
+        self._pv: List[List[int]] = [[] for _ in range(PROFUNDIDAD_MAXIMA + 2)]
+
+    # ============================================================
+    # 1. Profundización Iterativa
+    # ============================================================
+
+    def buscar(self, posicion: Posicion, tiempo_ms: Optional[int] = None,
+               profundidad_max: int = PROFUNDIDAD_MAXIMA, profundidad_inicial: int = 1,
+               evento_detener=None, nodos_max: Optional[int] = None, ruido_cp: int = 0,
+               aleatorio: Optional[random.Random] = None,
+               al_completar_iteracion: Optional[Callable[[Dict], None]] = None, multi_pv: int = 1,
+               gestor_tiempo: Optional[GestorTiempo] = None) -> Dict:
+        """
+        Busca el mejor movimiento para el bando al que le toca mover.
+
+        Args:
+            posicion: Posición a analizar (no se modifica: se busca sobre una copia).
+            tiempo_ms: Plazo de reloj en milisegundos, o None para no limitar por tiempo.
+            profundidad_max: Profundidad máxima (en plies) de la profundización iterativa.
+            profundidad_inicial: Primera iteración a buscar (los ayudantes de la búsqueda
+                paralela empiezan más profundo para no repetir el trabajo del principal).
+            evento_detener: Evento de detención solo para esta búsqueda (sustituye al del
+                constructor), p. ej. para cancelar una búsqueda en segundo plano.
+            nodos_max: Presupuesto de nodos; al agotarlo se devuelve la última iteración
+                completa. Sin plazo de tiempo, el resultado es reproducible.
+            ruido_cp: Ruido deliberado para niveles de dificultad bajos: cada movimiento de la
+                raíz recibe una bonificación aleatoria fija en [0, ruido_cp] centipeones al
+                compararlo (la puntuación devuelta es la real del movimiento elegido).
+            aleatorio: Generador del ruido (con semilla, la elección es reproducible).
+            al_completar_iteracion: Función opcional que recibe, tras cada iteración completa,
+                {'profundidad', 'profundidad_selectiva', 'puntuacion', 'movimiento', 'pv', 'nodos',
+                'nps', 'tiempo_ms', 'lineas'} (p. ej. para mostrar el progreso de una búsqueda larga).
+            multi_pv: Número de variantes principales (análisis): cada iteración puntúa con
+                exactitud los `multi_pv` mejores movimientos de la raíz en una sola pasada,
+                compartiendo tabla y ordenación. Con más de una no se aplica el ruido.
+            gestor_tiempo: Gestor del reloj de la partida (ver `GestorTiempo`): su límite duro
+                acota el plazo y, tras cada iteración, decide si se empieza la siguiente.
+                Con un único movimiento legal se juega tras la primera iteración.
+
+        Returns:
+            Diccionario con:
+            - 'movimiento': mejor movimiento (entero) de la última iteración completa, o None si no hay legales.
+            - 'puntuacion': puntuación en centipeones desde el punto de vista del bando que mueve.
+            - 'profundidad': profundidad de la última iteración completa.
+            - 'pv': variante principal (lista de movimientos).
+            - 'lineas': las `multi_pv` mejores líneas de la última iteración completa, de mejor a
+              peor, cada una con 'movimiento', 'puntuacion' y 'pv' (con multi_pv=1, solo la principal).
+            - 'nodos', 'tiempo_ms': nodos visitados (incluidos los de quiescencia) y tiempo total empleado.
+            - 'nodos_quiescencia': nodos visitados por la búsqueda de quiescencia.
+            - 'aciertos_tablas_finales': nodos resueltos por las tablas de finales.
+            - 'selectiva': {'cortes_nulos', 'reducciones_lmr', 'reintentos_lmr'} de la búsqueda selectiva.
+            - 'profundidad_selectiva': ply más lejano alcanzado en la última iteración completa.
+            - 'iteraciones': una entrada por iteración completa con 'profundidad', 'puntuacion',
+              'nodos' y 'tiempo_ms' (acumulados), y 'profundidad_selectiva', 'nodos_iteracion',
+              'tiempo_iteracion_ms', 'nps', 'factor_ramificacion' (nodos de la iteración entre
+              los de la anterior), 'sondeos_tt', 'aciertos_tt', 'cortes' y 'lineas' de esa iteración.
+            - 'tabla': estadísticas de la tabla de transposición (ver `TablaTransposicion.estadisticas`).
+            - 'peones': estadísticas de la tabla de peones del evaluador (ver `TablaPeones.estadisticas`).
+            - 'ordenacion': estadísticas de cortes (ver `OrdenacionMovimientos.estadisticas`).
+            - 'telemetria': registro plano de la jugada (ver `telemetria.registro_busqueda`).
+        """
+        inicio = time.perf_counter()
+        if gestor_tiempo is not None:
+            tiempo_ms = min(tiempo_ms, gestor_tiempo.limite_duro_ms) if tiempo_ms is not None else gestor_tiempo.limite_duro_ms
+        self._plazo = inicio + tiempo_ms / 1000.0 if tiempo_ms is not None else None
+        self._evento_busqueda = evento_detener if evento_detener is not None else self.evento_detener
+        self._limite_nodos = nodos_max if nodos_max is not None else _SIN_LIMITE_NODOS
+        self.nodos = 0
+        self.nodos_quiescencia = 0
+        self.aciertos_tablas_finales = 0
+        self.cortes_nulos = self.reducciones_lmr = self.reintentos_lmr = 0
+        self.tabla.nueva_busqueda()
+        self.tabla.reiniciar_estadisticas()
+        self.evaluador.tabla_peones.reiniciar_estadisticas()
+        self.ordenacion.nueva_busqueda()
+        posicion = posicion.copia()
+        profundidad_max = max(1, min(profundidad_max, PROFUNDIDAD_MAXIMA))
+
+        resultado = {'movimiento': None, 'puntuacion': 0, 'profundidad': 0, 'pv': [], 'lineas': [],
+                     'nodos': 0, 'nodos_quiescencia': 0, 'aciertos_tablas_finales': 0, 'tiempo_ms': 0.0,
+                     'profundidad_selectiva': 0, 'iteraciones': [], 'tabla': {}, 'peones': {}, 'ordenacion': {},
+                     'selectiva': {}, 'telemetria': {}}
+        movimientos = posicion.generar_movimientos_legales()
+        if not movimientos:
+            return resultado
+        entrada = self.tabla.sondear(posicion.clave)
+        movimientos = self.ordenacion.ordenar(posicion, movimientos, entrada[0] if entrada else 0, 0)
+        multi_pv = max(1, min(multi_pv, len(movimientos)))
+        if ruido_cp > 0 and multi_pv == 1:
+            aleatorio = aleatorio if aleatorio is not None else random.Random()
+            self._ruido = {movimiento: aleatorio.randint(0, ruido_cp) for movimiento in movimientos}
+        else:
+            self._ruido = {}
+        # Si el tiempo se agota antes de completar la profundidad 1, se juega cualquier legal
+        resultado['movimiento'] = movimientos[0]
+
+        # Contadores al terminar la iteración anterior, para la telemetría de cada iteración
+        nodos_previos, tiempo_previo, sondeos_previos, aciertos_previos, cortes_previos = 0, 0.0, 0, 0, 0
+        nodos_iteracion_previa = 0
+        for profundidad in range(max(1, min(profundidad_inicial, profundidad_max)), profundidad_max + 1):
+            self.profundidad_selectiva = 0
+            try:
+                if multi_pv > 1:
+                    lineas = self._buscarRaizMultiPV(posicion, movimientos, profundidad, multi_pv)
+                    puntuacion = lineas[0]['puntuacion']
+                else:
+                    puntuacion = self._buscarRaiz(posicion, movimientos, profundidad)
+                    lineas = [{'movimiento': self._pv[0][0], 'puntuacion': puntuacion, 'pv': list(self._pv[0])}]
+            except BusquedaInterrumpida:
+                logger.debug(f"Iteración {profundidad} interrumpida; se usa la última completa ({resultado['profundidad']})")
+                break
+            pv = list(lineas[0]['pv'])
+            transcurrido = (time.perf_counter() - inicio) * 1000.0
+            nodos_iteracion = self.nodos - nodos_previos
+            tiempo_iteracion = transcurrido - tiempo_previo
+            nps = int(self.nodos * 1000 / transcurrido) if transcurrido > 0 else 0
+            resultado.update({'movimiento': pv[0], 'puntuacion': puntuacion, 'profundidad': profundidad, 'pv': pv,
+                              'lineas': lineas, 'profundidad_selectiva': self.profundidad_selectiva})
+            resultado['iteraciones'].append({
+                'profundidad': profundidad, 'puntuacion': puntuacion, 'nodos': self.nodos, 'tiempo_ms': transcurrido,
+                'profundidad_selectiva': self.profundidad_selectiva, 'nodos_iteracion': nodos_iteracion,
+                'tiempo_iteracion_ms': tiempo_iteracion,
+                'nps': int(nodos_iteracion * 1000 / tiempo_iteracion) if tiempo_iteracion > 0 else 0,
+                'factor_ramificacion': nodos_iteracion / nodos_iteracion_previa if nodos_iteracion_previa else None,
+                'sondeos_tt': self.tabla.sondeos - sondeos_previos, 'aciertos_tt': self.tabla.aciertos - aciertos_previos,
+                'cortes': self.ordenacion.cortes - cortes_previos, 'lineas': lineas})
+            nodos_previos, tiempo_previo = self.nodos, transcurrido
+            sondeos_previos, aciertos_previos, cortes_previos = self.tabla.sondeos, self.tabla.aciertos, self.ordenacion.cortes
+            nodos_iteracion_previa = nodos_iteracion
+            if al_completar_iteracion is not None:
+                al_completar_iteracion({'profundidad': profundidad, 'profundidad_selectiva': self.profundidad_selectiva,
+                                        'puntuacion': puntuacion, 'movimiento': pv[0], 'pv': pv, 'nodos': self.nodos,
+                                        'nps': nps, 'tiempo_ms': transcurrido, 'lineas': lineas})
+            logger.debug(f"Profundidad {profundidad}: {puntuacion} cp, {self.nodos} nodos, {transcurrido:.0f} ms, "
+                         f"pv {' '.join(movimiento_a_uci(m) for m in pv)}")
+            # Ordenar la raíz: las mejores líneas de esta iteración se buscan primero en la siguiente
+            for linea in reversed(lineas):
+                movimientos.remove(linea['movimiento'])
+                movimientos.insert(0, linea['movimiento'])
+            if all(abs(linea['puntuacion']) >= MATE_UMBRAL for linea in lineas):
+                break # Mate encontrado: profundizar no lo mejora
+            if gestor_tiempo is not None and (len(movimientos) == 1 or not gestor_tiempo.continuar(resultado['iteraciones'][-1])):
+                break
+
+        resultado['nodos'] = self.nodos
+        resultado['nodos_quiescencia'] = self.nodos_quiescencia
+        resultado['aciertos_tablas_finales'] = self.aciertos_tablas_finales
+        resultado['selectiva'] = {'cortes_nulos': self.cortes_nulos, 'reducciones_lmr': self.reducciones_lmr,
+                                  'reintentos_lmr': self.reintentos_lmr}
+        resultado['tiempo_ms'] = (time.perf_counter() - inicio) * 1000.0
+        resultado['tabla'] = self.tabla.estadisticas()
+        resultado['peones'] = self.evaluador.tabla_peones.estadisticas()
+        resultado['ordenacion'] = self.ordenacion.estadisticas()
+        resultado['telemetria'] = registro_busqueda(resultado, posicion.a_fen())
+        logger.info(f"Búsqueda: profundidad {resultado['profundidad']}, {resultado['puntuacion']} cp, "
+                    f"{resultado['nodos']} nodos en {resultado['tiempo_ms']:.0f} ms, "
+                    f"aciertos TT {resultado['tabla']['tasa_aciertos']:.0%}, "
+                    f"aciertos peones {resultado['peones']['tasa_aciertos']:.0%}")
+        return resultado
+
+    # ============================================================
+    # 2. Negamax Alfa-Beta
+    # ============================================================
+
+    def _buscarRaiz(self, posicion: Posicion, movimientos: List[int], profundidad: int) -> int:
+        """
+        Busca todos los movimientos legales de la raíz a la profundidad dada y deja
+        la variante principal en `self._pv[0]`. Si hay ruido, los movimientos se comparan
+        con su bonificación sumada y se devuelve la puntuación real del elegido.
+        """
+        ruido = self._ruido
+        alfa = -INFINITO
+        mejor = -INFINITO
+        self._pv[0] = []
+        for movimiento in movimientos:
+            bonificacion = ruido.get(movimiento, 0)
+            posicion.hacer_movimiento(movimiento)
+            puntuacion = -self._negamax(posicion, profundidad - 1, -INFINITO, -(alfa - bonificacion), 1)
+            posicion.deshacer_movimiento()
+            if puntuacion + bonificacion > alfa:
+                alfa = puntuacion + bonificacion
+                mejor = puntuacion
+                self._pv[0] = [movimiento] + self._pv[1]
+        if not ruido: # Con ruido la puntuación de la raíz no es exacta
+            self.tabla.guardar(posicion.clave, profundidad, COTA_EXACTA, _puntuacionATabla(mejor, 0), self._pv[0][0])
+        return mejor
+
+    def _buscarRaizMultiPV(self, posicion: Posicion, movimientos: List[int], profundidad: int, multi_pv: int) -> List[Dict]:
+        """
+        Busca la raíz manteniendo las `multi_pv` mejores líneas: cada movimiento se busca con alfa
+        igual a la peor de las líneas ya guardadas, así que solo los que entran en el grupo reciben
+        una puntuación exacta y el resto se descarta con una cota, como en la búsqueda normal.
+
+        Returns:
+            Lista de {'movimiento', 'puntuacion', 'pv'} de mejor a peor.
+        """
+        lineas: List[Dict] = []
+        for movimiento in movimientos:
+            alfa = lineas[-1]['puntuacion'] if len(lineas) == multi_pv else -INFINITO
+            posicion.hacer_movimiento(movimiento)
+            puntuacion = -self._negamax(posicion, profundidad - 1, -INFINITO, -alfa, 1)
+            posicion.deshacer_movimiento()
+            if puntuacion > alfa:
+                indice = next((i for i, linea in enumerate(lineas) if puntuacion > linea['puntuacion']), len(lineas))
+                lineas.insert(indice, {'movimiento': movimiento, 'puntuacion': puntuacion, 'pv': [movimiento] + self._pv[1]})
+                del lineas[multi_pv:]
+        self._pv[0] = list(lineas[0]['pv'])
+        self.tabla.guardar(posicion.clave, profundidad, COTA_EXACTA, _puntuacionATabla(lineas[0]['puntuacion'], 0),
+                           lineas[0]['movimiento'])
+        return lineas
+
+    def _negamax(self, posicion: Posicion, profundidad: int, alfa: int, beta: int, ply: int,
+                 nulo_permitido: bool = True) -> int:
+        """
+        Negamax con poda alfa-beta (fail-soft). Devuelve la puntuación desde el punto de vista
+        del bando al que le toca mover en `posicion`.
+
+        Búsqueda selectiva:
+        - Movimiento nulo: si pasando el turno una búsqueda reducida sigue superando beta, se
+          corta. No se usa en jaque, tras otro nulo ni si el bando solo tiene rey y peones (zugzwang).
+        - LMR: los movimientos tranquilos tardíos se buscan reducidos (según profundidad y número
+          de movimiento) con ventana nula; si superan alfa, se repiten a profundidad completa.
+        """
+        self.nodos += 1
+        if not self.nodos & _MASCARA_COMPROBACION or self.nodos >= self._limite_nodos:
+            self._comprobarPlazo()
+        if ply > self.profundidad_selectiva:
+            self.profundidad_selectiva = ply
+        self._pv[ply] = []
+        if posicion.regla50 >= 100 or posicion.es_repeticion():
+            return 0
+        # Finales de tres piezas (la fase filtra antes de contar casillas): la tabla da el valor exacto
+        if self.tablas_finales is not None and posicion.fase <= 4 and posicion.casillas.count(0) >= 61:
+            puntuacion = self.tablas_finales.puntuacion(posicion, ply, MATE)
+            if puntuacion is not None:
+                self.aciertos_tablas_finales += 1
+                return puntuacion
+        if profundidad <= 0 or ply >= PROFUNDIDAD_MAXIMA:
+            self.nodos -= 1 # El nodo hoja se cuenta en la quiescencia
+            return self._quiescencia(posicion, alfa, beta, ply)
+
+        movimiento_tabla = 0
+        entrada = self.tabla.sondear(posicion.clave)
+        if entrada is not None:
+            movimiento_tabla = entrada[0]
+        if entrada is not None and entrada[2] >= profundidad:
+            _, puntuacion, _, tipo_cota = entrada
+            puntuacion = _puntuacionDesdeTabla(puntuacion, ply)
+            if tipo_cota == COTA_EXACTA or \
+                    (tipo_cota == COTA_INFERIOR and puntuacion >= beta) or \
+                    (tipo_cota == COTA_SUPERIOR and puntuacion <= alfa):
+                if movimiento_tabla:
+                    self._pv[ply] = [movimiento_tabla]
+                return puntuacion
+
+        en_jaque = posicion.en_jaque()
+        if self.movimiento_nulo and nulo_permitido and not en_jaque and profundidad >= PROFUNDIDAD_MINIMA_NULO \
+                and beta < MATE_UMBRAL and posicion.tiene_piezas(posicion.turno) \
+                and self.evaluador.evaluar(posicion) >= beta:
+            reduccion = REDUCCION_NULO_PROFUNDA if profundidad >= 6 else REDUCCION_NULO
+            posicion.hacer_movimiento_nulo()
+            puntuacion = -self._negamax(posicion, profundidad - 1 - reduccion, -beta, -beta + 1, ply + 1, False)
+            posicion.deshacer_movimiento_nulo()
+            if puntuacion >= beta:
+                self.cortes_nulos += 1
+                return beta if puntuacion >= MATE_UMBRAL else puntuacion # Un mate tras pasar no es fiable
+
+        alfa_original = alfa
+        mejor = -INFINITO
+        mejor_movimiento = 0
+        legales = 0
+        casillas = posicion.casillas
+        reducir = self.reducciones and not en_jaque and profundidad >= PROFUNDIDAD_MINIMA_LMR
+        killers = self.ordenacion.killers[ply] if ply < len(self.ordenacion.killers) else ()
+        reducciones_fila = _REDUCCIONES_LMR[profundidad] if profundidad <= PROFUNDIDAD_MAXIMA else _REDUCCIONES_LMR[-1]
+        for movimiento in self.ordenacion.ordenar(posicion, posicion.generar_movimientos(), movimiento_tabla, ply):
+            tranquilo = not casillas[(movimiento >> 6) & 63] and movimiento >> 12 == 0 # Ni captura, ni promoción, ni especial
+            if not posicion.hacer_movimiento(movimiento):
+                posicion.deshacer_movimiento()
+                continue
+            legales += 1
+            reduccion = 0
+            if reducir and tranquilo and legales < 64 and movimiento not in killers:
+                reduccion = reducciones_fila[legales]
+                if reduccion and posicion.en_jaque():
+                    reduccion = 0 # Los jaques no se reducen
+            if reduccion:
+                self.reducciones_lmr += 1
+                puntuacion = -self._negamax(posicion, profundidad - 1 - reduccion, -alfa - 1, -alfa, ply + 1)
+                if puntuacion > alfa:
+                    self.reintentos_lmr += 1
+                    puntuacion = -self._negamax(posicion, profundidad - 1, -beta, -alfa, ply + 1)
+            else:
+                puntuacion = -self._negamax(posicion, profundidad - 1, -beta, -alfa, ply + 1)
+            posicion.deshacer_movimiento()
+            if puntuacion > mejor:
+                mejor = puntuacion
+                mejor_movimiento = movimiento
+                if puntuacion > alfa:
+                    alfa = puntuacion
+                    self._pv[ply] = [movimiento] + self._pv[ply + 1]
+                    if alfa >= beta:
+                        self.ordenacion.registrar_corte(posicion, movimiento, profundidad, ply, legales - 1)
+                        break
+
+        if not legales:
+            # Jaque mate (cuanto más cercano, peor para el que lo recibe) o ahogado
+            return -MATE + ply if en_jaque else 0
+
+        if mejor <= alfa_original:
+            tipo_cota = COTA_SUPERIOR
+        elif mejor >= beta:
+            tipo_cota = COTA_INFERIOR
+        else:
+            tipo_cota = COTA_EXACTA
+        self.tabla.guardar(posicion.clave, profundidad, tipo_cota, _puntuacionATabla(mejor, ply), mejor_movimiento)
+        return mejor
+
+    def _quiescencia(self, posicion: Posicion, alfa: int, beta: int, ply: int) -> int:
+        """
+        Búsqueda de quiescencia: extiende las hojas solo con capturas y promociones hasta
+        llegar a una posición tranquila, para no evaluar a mitad de un intercambio.
+        Usa la evaluación estática como cota (stand pat) y descarta las capturas que
+        no pueden subir alfa ni con el margen delta.
+        """
+        self.nodos += 1
+        self.nodos_quiescencia += 1
+        if not self.nodos & _MASCARA_COMPROBACION or self.nodos >= self._limite_nodos:
+            self._comprobarPlazo()
+        if ply > self.profundidad_selectiva:
+            self.profundidad_selectiva = ply
+        estatica = self.evaluador.evaluar(posicion)
+        mejor = estatica # Stand pat: el bando que mueve puede no capturar
+        if mejor >= beta or ply >= PLY_MAXIMO_QUIESCENCIA:
+            return mejor
+        if mejor > alfa:
+            alfa = mejor
+
+        casillas = posicion.casillas
+        umbral_delta = alfa - estatica - MARGEN_DELTA
+        for movimiento in self.ordenacion.ordenar_capturas(posicion, posicion.generar_capturas()):
+            # Poda delta: ni ganando la pieza capturada (más la promoción) se alcanzaría alfa
+            ganancia = VALORES_PIEZA[casillas[(movimiento >> 6) & 63] & 7 or 1] + VALORES_PIEZA[(movimiento >> 12) & 7]
+            if ganancia < umbral_delta:
+                continue
+            if not posicion.hacer_movimiento(movimiento):
+                posicion.deshacer_movimiento()
+                continue
+            puntuacion = -self._quiescencia(posicion, -beta, -alfa, ply + 1)
+            posicion.deshacer_movimiento()
+            if puntuacion > mejor:
+                mejor = puntuacion
+                if puntuacion > alfa:
+                    alfa = puntuacion
+                    if alfa >= beta:
+                        break
+                    umbral_delta = alfa - estatica - MARGEN_DELTA
+        return mejor
+
+    def _comprobarPlazo(self):
+        """
+        Lanza `BusquedaInterrumpida` si se ha superado el plazo o el presupuesto de nodos
+        de la búsqueda o se ha activado el evento de detención.
+        """
+        if self.nodos >= self._limite_nodos:
+            raise BusquedaInterrumpida()
+        if self._plazo is not None and time.perf_counter() >= self._plazo:
+            raise BusquedaInterrumpida()
+        if self._evento_busqueda is not None and self._evento_busqueda.is_set():
+            raise BusquedaInterrumpida()
+
+
+def _puntuacionATabla(puntuacion: int, ply: int) -> int:
+    """
+    Convierte una puntuación de mate relativa a la raíz en relativa al nodo, para guardarla.
+    """
+    if puntuacion >= MATE_UMBRAL:
+        return puntuacion + ply
+    if puntuacion <= -MATE_UMBRAL:
+        return puntuacion - ply
+    return puntuacion
+
+
+def _puntuacionDesdeTabla(puntuacion: int, ply: int) -> int:
+    """
+    Convierte una puntuación de mate guardada (relativa al nodo) en relativa a la raíz.
+    """
+    if puntuacion >= MATE_UMBRAL:
+        return puntuacion - ply
+    if puntuacion <= -MATE_UMBRAL:
+        return puntuacion + ply
+    return puntuacion
@@ -0,0 +1,227 @@
+"""
+Define la búsqueda paralela del motor (Lazy SMP): varios procesos buscan la misma raíz
+compartiendo una tabla de transposición en memoria compartida.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+from models.motor.buscador import Buscador, PROFUNDIDAD_MAXIMA
+from models.motor.posicion import Posicion
+from models.motor.tabla_transposicion import TablaTransposicion
+from models.motor.tablas_finales import TablasFinales
+
+logger = logging.getLogger(__name__)
+
+# Margen de espera por encima del plazo antes de dar por perdido un proceso trabajador
+_MARGEN_ESPERA_S = 5.0
+# Cada cuánto se mira el evento de detención externo mientras se esperan resultados
+_INTERVALO_SONDEO_S = 0.02
+
+
+def _bucle_trabajador(indice: int, nombre_memoria: str, tamano_mb: float,
+                      tareas, resultados, evento_detener, directorio_tablas: Optional[str] = None):
+    """
+    Bucle de un proceso trabajador: espera tareas (posición y límites), busca con la tabla
+    compartida y devuelve el resultado. Termina al recibir None.
+    """
+    # Los procesos hijos comparten el gestor de recursos del padre, que es quien borra la memoria
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    # Las tablas de finales se proyectan en memoria: todos los procesos comparten sus páginas
+    tablas_finales = TablasFinales(directorio_tablas) if directorio_tablas else None
+    try:
+        tabla = TablaTransposicion(tamano_mb, buffer=memoria.buf)
+        buscador = Buscador(tabla=tabla, evento_detener=evento_detener, tablas_finales=tablas_finales)
+        while True:
+            tarea = tareas.get()
+            if tarea is None:
+                break
+            id_busqueda, posicion, tiempo_ms, profundidad_max, nodos_max, ruido_cp, semilla_ruido = tarea
+            # Los ayudantes impares empiezan una iteración más profundo (profundidades escalonadas)
+            resultado = buscador.buscar(posicion, tiempo_ms=tiempo_ms, profundidad_max=profundidad_max,
+                                        profundidad_inicial=1 + (indice & 1), nodos_max=nodos_max,
+                                        ruido_cp=ruido_cp, aleatorio=random.Random(semilla_ruido))
+            if resultado['profundidad'] >= profundidad_max:
+                evento_detener.set() # Profundidad objetivo alcanzada: los demás pueden parar
+            resultado['trabajador'] = indice
+            resultado['id_busqueda'] = id_busqueda
+            resultados.put(resultado)
+        # Soltar las vistas antes de cerrar la memoria compartida
+        del buscador, tabla
+    finally:
+        memoria.close()
+        if tablas_finales is not None:
+            tablas_finales.cerrar()
+
+
+class BuscadorParalelo:
+    """
+    Búsqueda Lazy SMP: N procesos trabajadores persistentes buscan la misma posición con
+    profundización iterativa (los impares empiezan una iteración más profundo) y comparten
+    una tabla de transposición en `multiprocessing.shared_memory`. Los resultados que cada
+    proceso escribe en la tabla aceleran a los demás. Se devuelve el resultado completo
+    más profundo.
+
+    Ofrece la misma interfaz `buscar` que `Buscador`. Hay que llamar a `cerrar` (o usarlo
+    como gestor de contexto) para terminar los procesos y liberar la memoria compartida.
+    """
+
+    def __init__(self, num_procesos: Optional[int] = None, tamano_tabla_mb: float = 64,
+                 directorio_tablas: Optional[str] = None):
+        """
+        Args:
+            num_procesos: Número de procesos trabajadores (por defecto, uno por núcleo).
+            tamano_tabla_mb: Tamaño de la tabla de transposición compartida.
+            directorio_tablas: Directorio opcional de tablas de finales (ver `TablasFinales`).
+        """
+        self.num_procesos = max(1, num_procesos or os.cpu_count() or 1)
+        self.tamano_tabla_mb = tamano_tabla_mb
+        self._memoria = shared_memory.SharedMemory(create=True, size=TablaTransposicion.bytes_necesarios(tamano_tabla_mb))
+        contexto = multiprocessing.get_context()
+        self._evento_detener = contexto.Event()
+        self._resultados = contexto.Queue()
+        self._tareas: List = []
+        self._procesos: List = []
+        self._id_busqueda = 0
+        try:
+            for indice in range(self.num_procesos):
+                tareas = contexto.Queue()
+                proceso = contexto.Process(target=_bucle_trabajador, name=f"motor-smp-{indice}", daemon=True,
+                                           args=(indice, self._memoria.name, tamano_tabla_mb, tareas,
+                                                 self._resultados, self._evento_detener, directorio_tablas))
+                proceso.start()
+                self._tareas.append(tareas)
+                self._procesos.append(proceso)
+        except BaseException:
+            # Sin procesos completos no hay búsqueda: se terminan los ya iniciados y se libera la memoria
+            for proceso in self._procesos:
+                proceso.terminate()
+                proceso.join()
+            self._procesos = []
+            self._tareas = []
+            self._memoria.close()
+            self._memoria.unlink()
+            raise
+        logger.info(f"Búsqueda paralela iniciada con {self.num_procesos} procesos y tabla compartida de {tamano_tabla_mb} MB")
+
+    def buscar(self, posicion: Posicion, tiempo_ms: Optional[int] = None,
+               profundidad_max: int = PROFUNDIDAD_MAXIMA, evento_detener=None, nodos_max: Optional[int] = None,
+               ruido_cp: int = 0, aleatorio: Optional[random.Random] = None) -> Dict:
+        """
+        Busca en paralelo y devuelve el resultado de la iteración completa más profunda
+        (en caso de empate, el del proceso de menor índice). Mismos argumentos y formato que
+        `Buscador.buscar`: `evento_detener` se reenvía a los procesos al activarse, `nodos_max`
+        se reparte entre ellos (el resultado ya no es reproducible) y todos usan el mismo ruido.
+        Los nodos se suman de todos los procesos y además se devuelve:
+        - 'trabajador': índice del proceso cuyo resultado se devuelve.
+        - 'procesos': número de procesos que participaron.
+
+        Raises:
+            RuntimeError: Si algún proceso trabajador no responde.
+        """
+        if not self._procesos:
+            raise RuntimeError("La búsqueda paralela ya está cerrada")
+        inicio = time.perf_counter()
+        self._evento_detener.clear()
+        self._id_busqueda += 1
+        nodos_proceso = None if nodos_max is None else max(1, nodos_max // self.num_procesos)
+        semilla_ruido = (aleatorio if aleatorio is not None else random).getrandbits(64)
+        tarea = (self._id_busqueda, posicion.copia(), tiempo_ms, profundidad_max, nodos_proceso, ruido_cp, semilla_ruido)
+        for tareas in self._tareas:
+            tareas.put(tarea)
+
+        limite = None if tiempo_ms is None else inicio + tiempo_ms / 1000.0 + _MARGEN_ESPERA_S
+        resultados = []
+        try:
+            while len(resultados) < self.num_procesos:
+                if evento_detener is not None and evento_detener.is_set():
+                    self._evento_detener.set()
+                try:
+                    resultado = self._resultados.get(timeout=_INTERVALO_SONDEO_S)
+                except queue.Empty:
+                    if limite is not None and time.perf_counter() > limite:
+                        raise RuntimeError(f"Solo respondieron {len(resultados)} de {self.num_procesos} "
+                                           f"procesos de búsqueda") from None
+                    if not all(proceso.is_alive() for proceso in self._procesos):
+                        raise RuntimeError("Un proceso de búsqueda terminó inesperadamente") from None
+                    continue
+                if resultado['id_busqueda'] == self._id_busqueda: # Descartar respuestas tardías de búsquedas anteriores
+                    resultados.append(resultado)
+        finally:
+            self._evento_detener.set()
+
+        mejor = max(resultados, key=lambda r: (r['profundidad'], -r['trabajador']))
+        mejor = dict(mejor)
+        mejor['nodos'] = sum(r['nodos'] for r in resultados)
+        mejor['nodos_quiescencia'] = sum(r['nodos_quiescencia'] for r in resultados)
+        mejor['tiempo_ms'] = (time.perf_counter() - inicio) * 1000.0
+        mejor['procesos'] = self.num_procesos
+        logger.info(f"Búsqueda paralela: profundidad {mejor['profundidad']} (proceso {mejor['trabajador']}), "
+                    f"{mejor['nodos']} nodos en {mejor['tiempo_ms']:.0f} ms")
+        return mejor
+
+    def cerrar(self):
+        """
+        Termina los procesos trabajadores y libera la memoria compartida.
+        """
+        for tareas in self._tareas:
+            tareas.put(None)
+        for proceso in self._procesos:
+            proceso.join(timeout=_MARGEN_ESPERA_S)
+            if proceso.is_alive():
+                proceso.terminate()
+        self._procesos = []
+        self._tareas = []
+        self._memoria.close()
+        self._memoria.unlink()
+
+    def __enter__(self) -> 'BuscadorParalelo':
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+def medir_aceleracion(posiciones: List[Posicion], profundidad: int, num_procesos: Optional[int] = None,
+                      tamano_tabla_mb: float = 64) -> Dict:
+    """
+    Mide la aceleración de la búsqueda paralela frente a un solo proceso, como el cociente
+    de tiempos para alcanzar la misma profundidad en un conjunto de posiciones.
+
+    Args:
+        posiciones: Posiciones de prueba.
+        profundidad: Profundidad fija a alcanzar en cada posición.
+        num_procesos: Procesos de la configuración paralela (por defecto, uno por núcleo).
+        tamano_tabla_mb: Tamaño de la tabla compartida en ambas configuraciones.
+
+    Returns:
+        Diccionario con 'procesos', 'tiempo_un_proceso_ms', 'tiempo_paralelo_ms',
+        'aceleracion', 'nps_un_proceso' y 'nps_paralelo'.
+    """
+    medidas = {}
+    for clave, procesos in (('un_proceso', 1), ('paralelo', num_procesos)):
+        with BuscadorParalelo(procesos, tamano_tabla_mb) as buscador:
+            procesos = buscador.num_procesos
+            tiempo_ms = 0.0
+            nodos = 0
+            for posicion in posiciones:
+                resultado = buscador.buscar(posicion, profundidad_max=profundidad)
+                tiempo_ms += resultado['tiempo_ms']
+                nodos += resultado['nodos']
+        medidas[clave] = (procesos, tiempo_ms, nodos)
+    _, tiempo_uno, nodos_uno = medidas['un_proceso']
+    procesos, tiempo_paralelo, nodos_paralelo = medidas['paralelo']
+    return {
+        'procesos': procesos,
+        'tiempo_un_proceso_ms': tiempo_uno,
+        'tiempo_paralelo_ms': tiempo_paralelo,
+        'aceleracion': tiempo_uno / tiempo_paralelo if tiempo_paralelo else 0.0,
+        'nps_un_proceso': nodos_uno * 1000.0 / tiempo_uno if tiempo_uno else 0.0,
+        'nps_paralelo': nodos_paralelo * 1000.0 / tiempo_paralelo if tiempo_paralelo else 0.0,
+    }
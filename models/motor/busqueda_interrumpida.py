@@ -0,0 +1,10 @@
+"""
+Define la señal interna con la que se aborta una búsqueda del motor.
+"""
+
+
+class BusquedaInterrumpida(Exception):
+    """
+    Señal interna para abortar la búsqueda en curso al agotarse el plazo o el presupuesto
+    de nodos, o al activarse el evento de detención. No sale de la clase que la lanza.
+    """
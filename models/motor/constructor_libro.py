@@ -0,0 +1,162 @@
+"""
+Define la construcción de libros de aperturas Polyglot a partir de colecciones de partidas PGN.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+from models.motor.libro_aperturas import FORMATO_ENTRADA, movimiento_a_polyglot
+from models.motor.posicion import Posicion, FEN_INICIAL, BLANCO
+
+logger = logging.getLogger(__name__)
+
+PESO_MAXIMO = 0xFFFF
+# Puntos que suma un movimiento según el resultado para el bando que lo jugó (como `polyglot make-book`)
+_PUNTOS_VICTORIA = 2
+_PUNTOS_TABLAS = 1
+
+_RESULTADOS = ('1-0', '0-1', '1/2-1/2', '*')
+# Comentarios {...} y de fin de línea, variantes (...), NAGs ($n) y números de jugada (12. / 12...)
+_RE_COMENTARIO = re.compile(r'\{[^}]*\}|;[^\n]*')
+_RE_NAG = re.compile(r'\$\d+')
+_RE_NUMERO = re.compile(r'\d+\.(\.\.)?')
+_RE_ETIQUETA = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+
+
+def _eliminarVariantes(texto: str) -> str:
+    """
+    Elimina las variantes entre paréntesis (pueden estar anidadas).
+    """
+    resultado = []
+    nivel = 0
+    for caracter in texto:
+        if caracter == '(':
+            nivel += 1
+        elif caracter == ')':
+            nivel = max(0, nivel - 1)
+        elif nivel == 0:
+            resultado.append(caracter)
+    return ''.join(resultado)
+
+
+def leer_partidas_pgn(texto: str) -> Iterator[Tuple[Dict[str, str], List[str]]]:
+    """
+    Recorre las partidas de un texto PGN.
+
+    Yields:
+        Pares (etiquetas, jugadas SAN de la línea principal).
+    """
+    etiquetas: Dict[str, str] = {}
+    lineas_jugadas: List[str] = []
+
+    def terminar():
+        cuerpo = _eliminarVariantes(_RE_COMENTARIO.sub(' ', '\n'.join(lineas_jugadas)))
+        cuerpo = _RE_NUMERO.sub(' ', _RE_NAG.sub(' ', cuerpo))
+        jugadas = [token for token in cuerpo.split() if token not in _RESULTADOS]
+        return dict(etiquetas), jugadas
+
+    for linea in texto.splitlines():
+        coincidencia = _RE_ETIQUETA.match(linea.strip())
+        if coincidencia:
+            if lineas_jugadas: # Empieza una partida nueva
+                yield terminar()
+                etiquetas.clear()
+                lineas_jugadas.clear()
+            etiquetas[coincidencia.group(1)] = coincidencia.group(2)
+        elif linea.strip():
+            lineas_jugadas.append(linea)
+    if etiquetas or lineas_jugadas:
+        yield terminar()
+
+
+class ConstructorLibro:
+    """
+    Compila un libro de aperturas Polyglot a partir de partidas PGN.
+    Cada movimiento jugado en los primeros `max_plies` de una partida suma 2 puntos si el
+    bando que lo jugó ganó y 1 si hizo tablas (o si el resultado es desconocido); el peso
+    final de la entrada es esa puntuación, reescalada para caber en 16 bits.
+    """
+
+    def __init__(self, max_plies: int = 24, min_partidas: int = 1):
+        """
+        Args:
+            max_plies: Número de plies de cada partida que se incorporan al libro.
+            min_partidas: Mínimo de partidas en que debe aparecer un movimiento para incluirlo.
+        """
+        self.max_plies = max_plies
+        self.min_partidas = min_partidas
+        # (clave, movimiento Polyglot) -> [puntos, partidas]
+        self._estadisticas: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+        self.partidas = 0
+        self.partidas_descartadas = 0
+
+    def agregar_partida(self, jugadas: List[str], resultado: str = '*', fen: str = FEN_INICIAL) -> bool:
+        """
+        Incorpora una partida dada como lista de jugadas SAN.
+
+        Returns:
+            False si alguna jugada no es legal (se conservan las anteriores a ella).
+        """
+        posicion = Posicion.desde_fen(fen)
+        for indice, san in enumerate(jugadas[:self.max_plies]):
+            movimiento = posicion.movimiento_desde_san(san)
+            if movimiento is None:
+                logger.warning(f"Jugada {san!r} no válida en la partida {self.partidas + 1}; se ignora el resto.")
+                self.partidas_descartadas += 1
+                return False
+            if resultado == '1/2-1/2' or resultado not in ('1-0', '0-1'):
+                puntos = _PUNTOS_TABLAS
+            else:
+                gano_blanco = resultado == '1-0'
+                puntos = _PUNTOS_VICTORIA if gano_blanco == (posicion.turno == BLANCO) else 0
+            estadistica = self._estadisticas[(posicion.clave, movimiento_a_polyglot(movimiento))]
+            estadistica[0] += puntos
+            estadistica[1] += 1
+            posicion.hacer_movimiento(movimiento)
+        self.partidas += 1
+        return True
+
+    def agregar_pgn(self, texto: str) -> int:
+        """
+        Incorpora todas las partidas de un texto PGN. Devuelve el número de partidas leídas.
+        """
+        leidas = 0
+        for etiquetas, jugadas in leer_partidas_pgn(texto):
+            fen = etiquetas.get('FEN', FEN_INICIAL)
+            self.agregar_partida(jugadas, etiquetas.get('Result', '*'), fen)
+            leidas += 1
+        return leidas
+
+    def agregar_archivo(self, ruta: str) -> int:
+        """
+        Incorpora las partidas de un archivo PGN. Devuelve el número de partidas leídas.
+        """
+        with open(ruta, encoding='utf-8', errors='replace') as archivo:
+            return self.agregar_pgn(archivo.read())
+
+    def entradas(self) -> List[Tuple[int, int, int]]:
+        """
+        Devuelve las entradas (clave, movimiento Polyglot, peso) ordenadas como exige el
+        formato: por clave y, dentro de cada clave, de mayor a menor peso.
+        """
+        seleccionadas = [(clave, codigo, puntos) for (clave, codigo), (puntos, partidas) in self._estadisticas.items()
+                         if partidas >= self.min_partidas and puntos > 0]
+        maximo = max((puntos for _, _, puntos in seleccionadas), default=0)
+        escala = PESO_MAXIMO / maximo if maximo > PESO_MAXIMO else 1.0
+        entradas = [(clave, codigo, max(1, int(puntos * escala))) for clave, codigo, puntos in seleccionadas]
+        entradas.sort(key=lambda entrada: (entrada[0], -entrada[2], entrada[1]))
+        return entradas
+
+    def guardar(self, ruta: str) -> int:
+        """
+        Escribe el libro en formato Polyglot. Devuelve el número de entradas escritas.
+        """
+        entradas = self.entradas()
+        with open(ruta, 'wb') as archivo:
+            for clave, codigo, peso in entradas:
+                archivo.write(FORMATO_ENTRADA.pack(clave, codigo, peso, 0))
+        logger.info(f"Libro {ruta} escrito: {len(entradas)} entradas de {self.partidas} partidas "
+                    f"({self.partidas_descartadas} con jugadas no válidas)")
+        return len(entradas)
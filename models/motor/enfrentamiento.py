@@ -0,0 +1,255 @@
+"""
+Define el enfrentamiento entre dos configuraciones del jugador ordenador: partidas en paralelo
+sobre `Tablero` (que arbitra mates y tablas), con colores alternos, aperturas de un archivo y
+parada anticipada por SPRT.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.jugadores.jugador_ordenador import JugadorOrdenador
+from models.motor.posicion import FEN_INICIAL, Posicion, casilla_a_algebraica, movimiento_a_tupla, movimiento_a_uci
+from models.motor.sprt import SPRT
+from models.tablero import Tablero
+
+logger = logging.getLogger(__name__)
+
+# Partidas más largas se dan por tablas (plies)
+MAX_PLIES_POR_DEFECTO = 400
+# Adjudicación: si ambos motores ven al menos esta ventaja para el mismo bando durante
+# `JUGADAS_ADJUDICACION` jugadas seguidas de cada uno, la partida se da por ganada
+UMBRAL_ADJUDICACION_CP = 1000
+JUGADAS_ADJUDICACION = 4
+
+
+def leer_aperturas(lineas: Iterable[str]) -> List[List[str]]:
+    """
+    Lee un archivo de aperturas: una por línea, como jugadas UCI o SAN desde la posición
+    inicial ('e2e4 e7e5' o '1. e4 e5 2. Nf3'). Se ignoran las líneas vacías y las que empiezan por '#'.
+
+    Returns:
+        Lista de aperturas, cada una como lista de jugadas UCI.
+
+    Raises:
+        ValueError: Si una apertura contiene una jugada ilegal.
+    """
+    aperturas = []
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            continue
+        posicion = Posicion.desde_fen(FEN_INICIAL)
+        jugadas = []
+        for texto in linea.split():
+            if texto.rstrip('.').isdigit() or texto in ('1-0', '0-1', '1/2-1/2', '*'):
+                continue
+            try:
+                movimiento = posicion.movimiento_desde_uci(texto)
+            except ValueError:
+                movimiento = None
+            if movimiento is None:
+                movimiento = posicion.movimiento_desde_san(texto)
+            if movimiento is None or not posicion.hacer_movimiento(movimiento):
+                raise ValueError(f"Jugada ilegal '{texto}' en la apertura de la línea {numero}")
+            jugadas.append(movimiento_a_uci(movimiento))
+        aperturas.append(jugadas)
+    return aperturas
+
+
+def _crear_jugador(config: Dict, color: str) -> JugadorOrdenador:
+    """
+    Crea el jugador de una configuración: argumentos de `JugadorOrdenador`, o 'nivel' y opciones.
+    """
+    config = dict(config)
+    nombre = config.pop('nombre', f"Motor {color}")
+    if 'nivel' in config:
+        return JugadorOrdenador.desde_nivel(nombre, color, config.pop('nivel'), **config)
+    return JugadorOrdenador(nombre, color, **config)
+
+
+def jugar_partida(config_blancas: Dict, config_negras: Dict, apertura: Optional[List[str]] = None,
+                  max_plies: int = MAX_PLIES_POR_DEFECTO, umbral_adjudicacion_cp: Optional[int] = UMBRAL_ADJUDICACION_CP,
+                  jugadas_adjudicacion: int = JUGADAS_ADJUDICACION) -> Dict:
+    """
+    Juega una partida entre dos configuraciones del jugador ordenador sobre un `Tablero`.
+
+    Args:
+        config_blancas, config_negras: Argumentos de `JugadorOrdenador` de cada bando
+            (o 'nivel' más opciones, ver `JugadorOrdenador.desde_nivel`).
+        apertura: Jugadas UCI forzadas desde la posición inicial.
+        max_plies: Plies tras los que la partida se da por tablas.
+        umbral_adjudicacion_cp: Ventaja para adjudicar la victoria (None = sin adjudicación).
+        jugadas_adjudicacion: Jugadas seguidas de cada motor con esa ventaja para adjudicar.
+
+    Returns:
+        Diccionario con 'resultado' ('1-0', '0-1' o '1/2-1/2'), 'motivo' ('jaque_mate', 'tablas',
+        'adjudicacion', 'limite' o 'sin_movimiento'), 'plies' y 'jugadas' (UCI).
+    """
+    tablero = Tablero()
+    jugadas = []
+    for texto in apertura or []:
+        movimiento = Posicion.desde_tablero(tablero).movimiento_desde_uci(texto)
+        if movimiento is None or not tablero.realizarMovimiento(*movimiento_a_tupla(movimiento)):
+            raise ValueError(f"Jugada ilegal en la apertura: {texto}")
+        jugadas.append(texto)
+    jugadores = {'blanco': _crear_jugador(config_blancas, 'blanco'), 'negro': _crear_jugador(config_negras, 'negro')}
+    racha = 0 # Plies seguidos con ventaja decisiva para el mismo bando (+ blancas, - negras)
+    try:
+        while tablero.estado_juego not in ('jaque_mate', 'tablas'):
+            if tablero.contadorPly >= max_plies:
+                return _resultado_partida('1/2-1/2', 'limite', tablero, jugadas)
+            turno = tablero.getTurnoColor()
+            jugada = jugadores[turno].elegir_movimiento(tablero)
+            if jugada is None or not tablero.realizarMovimiento(*jugada):
+                # No debería ocurrir: el tablero no ve el final de la partida pero el jugador no mueve
+                logger.error(f"El jugador {turno} no pudo mover en {tablero.obtenerPosicionActual()}")
+                return _resultado_partida('0-1' if turno == 'blanco' else '1-0', 'sin_movimiento', tablero, jugadas)
+            jugadas.append(_tupla_a_uci(*jugada))
+            if umbral_adjudicacion_cp is not None:
+                puntuacion = (jugadores[turno].ultimo_resultado or {}).get('puntuacion')
+                ventaja = 0
+                if puntuacion is not None and abs(puntuacion) >= umbral_adjudicacion_cp:
+                    ventaja = 1 if (puntuacion > 0) == (turno == 'blanco') else -1
+                racha = racha + ventaja if ventaja and racha * ventaja >= 0 else ventaja
+                if abs(racha) >= 2 * jugadas_adjudicacion:
+                    return _resultado_partida('1-0' if racha > 0 else '0-1', 'adjudicacion', tablero, jugadas)
+        if tablero.estado_juego == 'tablas':
+            return _resultado_partida('1/2-1/2', 'tablas', tablero, jugadas)
+        return _resultado_partida('0-1' if tablero.turno_blanco else '1-0', 'jaque_mate', tablero, jugadas)
+    finally:
+        for jugador in jugadores.values():
+            jugador.cerrar()
+
+
+def _tupla_a_uci(origen: Tuple[int, int], destino: Tuple[int, int], promocion: Optional[str]) -> str:
+    """
+    Notación UCI de un movimiento en coordenadas de `Tablero`.
+    """
+    texto = casilla_a_algebraica(origen[0] * 8 + origen[1]) + casilla_a_algebraica(destino[0] * 8 + destino[1])
+    return texto + promocion.lower() if promocion else texto
+
+
+def _resultado_partida(resultado: str, motivo: str, tablero: Tablero, jugadas: List[str]) -> Dict:
+    """
+    Diccionario de resultado de `jugar_partida`.
+    """
+    return {'resultado': resultado, 'motivo': motivo, 'plies': tablero.contadorPly, 'jugadas': jugadas}
+
+
+def _jugar_trabajo(trabajo: Tuple) -> Tuple[int, float, Dict]:
+    """
+    Juega la partida `indice` del enfrentamiento en un proceso del pool.
+
+    Returns:
+        (indice, puntos de la configuración A, partida).
+    """
+    indice, config_a, config_b, apertura, a_con_blancas, opciones = trabajo
+    blancas, negras = (config_a, config_b) if a_con_blancas else (config_b, config_a)
+    partida = jugar_partida(blancas, negras, apertura, **opciones)
+    puntos_blancas = {'1-0': 1.0, '0-1': 0.0, '1/2-1/2': 0.5}[partida['resultado']]
+    partida['a_con_blancas'] = a_con_blancas
+    return indice, puntos_blancas if a_con_blancas else 1.0 - puntos_blancas, partida
+
+
+class Enfrentamiento:
+    """
+    Enfrenta dos configuraciones del jugador ordenador (A, la que se prueba, y B, la de
+    referencia) en un pool de procesos. Cada apertura se juega dos veces, una con cada color,
+    y el enfrentamiento se detiene en cuanto el SPRT acepta una hipótesis (o al llegar al
+    máximo de partidas). Sin aperturas ni ruido, las partidas de una misma pareja de colores
+    se repiten jugada a jugada: conviene un archivo de aperturas variado.
+
+    Los procesos del pool no pueden crear procesos hijos, así que una configuración con
+    búsqueda paralela ('num_procesos' > 1) solo se enfrenta en serie (procesos=1).
+    """
+
+    def __init__(self, config_a: Dict, config_b: Dict, aperturas: Optional[List[List[str]]] = None,
+                 sprt: Optional[SPRT] = None, procesos: Optional[int] = None, **opciones_partida):
+        """
+        Args:
+            config_a, config_b: Configuraciones de cada jugador (ver `jugar_partida`).
+            aperturas: Aperturas en UCI (ver `leer_aperturas`); por defecto, la posición inicial.
+            sprt: Test de parada; por defecto `SPRT()` (H0: 0 Elo, H1: +10 Elo, α = β = 0.05).
+            procesos: Procesos del pool (por defecto, uno por núcleo; uno solo si alguna
+                configuración usa búsqueda paralela).
+            opciones_partida: 'max_plies', 'umbral_adjudicacion_cp' y 'jugadas_adjudicacion'.
+
+        Raises:
+            ValueError: Si se piden varios procesos y alguna configuración usa búsqueda paralela.
+        """
+        paralela = any(config.get('num_procesos', 1) > 1 for config in (config_a, config_b))
+        if paralela and procesos is not None and procesos > 1:
+            raise ValueError("Una configuración con 'num_procesos' > 1 no puede jugar en un pool de procesos: "
+                             "use procesos=1")
+        self.config_a = config_a
+        self.config_b = config_b
+        self.aperturas = aperturas or [[]]
+        self.sprt = sprt if sprt is not None else SPRT()
+        self.procesos = 1 if paralela else max(1, procesos or os.cpu_count() or 1)
+        self.opciones_partida = opciones_partida
+
+    def _trabajos(self, max_partidas: int):
+        """
+        Genera las partidas: la apertura cambia cada dos partidas y A alterna el color.
+        """
+        for indice in range(max_partidas):
+            apertura = self.aperturas[(indice // 2) % len(self.aperturas)]
+            yield (indice, self.config_a, self.config_b, apertura, indice % 2 == 0, self.opciones_partida)
+
+    def jugar(self, max_partidas: int = 1000, al_terminar_partida=None) -> Dict:
+        """
+        Juega hasta que el SPRT decide o se alcanzan `max_partidas`.
+
+        Args:
+            max_partidas: Máximo de partidas.
+            al_terminar_partida: Función opcional que recibe (indice, puntos de A, partida)
+                al terminar cada partida.
+
+        Returns:
+            Diccionario con 'partidas', 'victorias', 'tablas' y 'derrotas' (de A), 'puntuacion',
+            'elo' (estimación con su intervalo del 95 %), 'llr', 'limites', 'decision' ('H1',
+            'H0' o None), 'motivos' (conteo de finales), 'tiempo_s' y 'partidas_por_segundo'.
+        """
+        inicio = time.perf_counter()
+        motivos = Counter()
+        trabajos = self._trabajos(max_partidas)
+        if self.procesos > 1 and max_partidas > 1:
+            with multiprocessing.get_context().Pool(min(self.procesos, max_partidas)) as pool:
+                # Al salir del bloque se terminan las partidas aún en curso si el SPRT ya decidió
+                for resultado in pool.imap_unordered(_jugar_trabajo, trabajos):
+                    if self._registrar(resultado, motivos, al_terminar_partida):
+                        break
+        else:
+            for trabajo in trabajos:
+                if self._registrar(_jugar_trabajo(trabajo), motivos, al_terminar_partida):
+                    break
+        tiempo_s = time.perf_counter() - inicio
+        sprt = self.sprt
+        informe = {'partidas': sprt.partidas, 'victorias': sprt.victorias, 'tablas': sprt.tablas,
+                   'derrotas': sprt.derrotas,
+                   'puntuacion': (sprt.victorias + 0.5 * sprt.tablas) / sprt.partidas if sprt.partidas else 0.0,
+                   'elo': sprt.estimacion_elo(), 'llr': sprt.llr(),
+                   'limites': (sprt.limite_inferior, sprt.limite_superior), 'decision': sprt.decision(),
+                   'motivos': dict(motivos), 'tiempo_s': tiempo_s,
+                   'partidas_por_segundo': sprt.partidas / tiempo_s if tiempo_s > 0 else 0.0}
+        logger.info(f"Enfrentamiento: +{sprt.victorias} ={sprt.tablas} -{sprt.derrotas}, LLR {informe['llr']:.2f}, "
+                    f"decisión {informe['decision']}, {informe['partidas_por_segundo']:.2f} partidas/s")
+        return informe
+
+    def _registrar(self, resultado: Tuple[int, float, Dict], motivos: Counter, al_terminar_partida) -> bool:
+        """
+        Anota una partida terminada.
+
+        Returns:
+            True si el SPRT ya ha decidido.
+        """
+        indice, puntos, partida = resultado
+        self.sprt.registrar(puntos)
+        motivos[partida['motivo']] += 1
+        if al_terminar_partida is not None:
+            al_terminar_partida(indice, puntos, partida)
+        return self.sprt.decision() is not None
@@ -0,0 +1,127 @@
+"""
+Define la evaluación estática de posiciones usada por el motor de búsqueda.
+"""
+
+from typing import List, Optional, Tuple
+
+from models.motor.posicion import Posicion, BLANCO, NEGRO, PEON
+from models.motor.tabla_peones import TablaPeones
+from models.motor.tablas_pst import FASE_MAXIMA, PEON_DOBLADO, PEON_AISLADO, PEON_PASADO_MG, PEON_PASADO_EG
+
+# Valor material aproximado por código de tipo (NINGUNO, PEON, CABALLO, ALFIL, TORRE, REINA, REY),
+# en centipeones; lo usan la ordenación de movimientos y la poda delta
+VALORES_PIEZA = (0, 100, 320, 330, 500, 900, 0)
+
+
+def _calcular_mascaras_pasado() -> List[List[int]]:
+    """
+    Precalcula, por color y casilla, las casillas por delante del peón en su columna y en las
+    vecinas: si no hay peones rivales en ellas, el peón es pasado.
+    """
+    mascaras = [[0] * 64 for _ in range(2)]
+    for casilla in range(64):
+        fila, columna = casilla >> 3, casilla & 7
+        for c in range(max(0, columna - 1), min(7, columna + 1) + 1):
+            for f in range(fila + 1, 8):
+                mascaras[BLANCO][casilla] |= 1 << (f * 8 + c)
+            for f in range(0, fila):
+                mascaras[NEGRO][casilla] |= 1 << (f * 8 + c)
+    return mascaras
+
+
+# MASCARA_PASADO[color][casilla]: casillas que deben estar libres de peones rivales
+MASCARA_PASADO = _calcular_mascaras_pasado()
+
+
+def evaluar_estructura_peones(casillas: List[int]) -> Tuple[int, int, int, int]:
+    """
+    Evalúa la estructura de peones recorriendo el tablero (peones doblados, aislados y pasados).
+
+    Returns:
+        (mg, eg, pasados_blancos, pasados_negros): puntuaciones blancas - negras de medio juego
+        y final, y máscaras de bits de las casillas con peones pasados de cada bando.
+    """
+    peones = [0, 0]
+    columnas = [[0] * 8, [0] * 8]
+    for casilla, codigo in enumerate(casillas):
+        if codigo & 7 == PEON:
+            color = codigo >> 3
+            peones[color] |= 1 << casilla
+            columnas[color][casilla & 7] += 1
+    mg = eg = 0
+    pasados = [0, 0]
+    for color in (BLANCO, NEGRO):
+        signo = 1 if color == BLANCO else -1
+        propias = columnas[color]
+        rivales = peones[color ^ 1]
+        mascaras = MASCARA_PASADO[color]
+        for columna in range(8):
+            if propias[columna] > 1:
+                mg += signo * PEON_DOBLADO[0] * (propias[columna] - 1)
+                eg += signo * PEON_DOBLADO[1] * (propias[columna] - 1)
+        bits = peones[color]
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            casilla = bit.bit_length() - 1
+            columna = casilla & 7
+            if not (columna > 0 and propias[columna - 1]) and not (columna < 7 and propias[columna + 1]):
+                mg += signo * PEON_AISLADO[0]
+                eg += signo * PEON_AISLADO[1]
+            if not rivales & mascaras[casilla]:
+                pasados[color] |= bit
+                fila = casilla >> 3 if color == BLANCO else 7 - (casilla >> 3)
+                mg += signo * PEON_PASADO_MG[fila]
+                eg += signo * PEON_PASADO_EG[fila]
+    return mg, eg, pasados[BLANCO], pasados[NEGRO]
+
+
+class Evaluador:
+    """
+    Evalúa una `Posicion` en centipeones desde el punto de vista del bando al que le toca mover.
+    La evaluación es material más tablas pieza-casilla y estructura de peones, interpolada entre
+    medio juego y final según la fase. Las sumas de material y PST las mantiene `Posicion` al
+    hacer/deshacer movimientos; la estructura de peones se guarda en una `TablaPeones` por la
+    clave de peones, de modo que evaluar una hoja casi nunca recorre el tablero.
+    """
+
+    def __init__(self, tabla_peones: Optional[TablaPeones] = None):
+        """
+        Args:
+            tabla_peones: Caché de estructura de peones (por defecto, `TablaPeones()`).
+        """
+        self.tabla_peones = tabla_peones if tabla_peones is not None else TablaPeones()
+
+    def estructura_peones(self, posicion: Posicion) -> Tuple[int, int, int, int, int]:
+        """
+        Devuelve la entrada de la tabla de peones de la posición, calculándola si no está.
+        """
+        entrada = self.tabla_peones.sondear(posicion.clave_peones)
+        if entrada is None:
+            entrada = self.tabla_peones.guardar(posicion.clave_peones, *evaluar_estructura_peones(posicion.casillas))
+        return entrada
+
+    def evaluar(self, posicion: Posicion) -> int:
+        """
+        Devuelve la evaluación cónica (tapered) del bando al que le toca mover.
+        """
+        _, mg_peones, eg_peones, pasados_blancos, pasados_negros = self.estructura_peones(posicion)
+        mg = posicion.mg + mg_peones
+        eg = posicion.eg + eg_peones
+        # Pasados bloqueados: pierden la mitad de su bonificación de final (depende de las piezas, no se cachea)
+        casillas = posicion.casillas
+        while pasados_blancos:
+            bit = pasados_blancos & -pasados_blancos
+            pasados_blancos ^= bit
+            casilla = bit.bit_length() - 1
+            if casillas[casilla + 8]:
+                eg -= PEON_PASADO_EG[casilla >> 3] >> 1
+        while pasados_negros:
+            bit = pasados_negros & -pasados_negros
+            pasados_negros ^= bit
+            casilla = bit.bit_length() - 1
+            if casillas[casilla - 8]:
+                eg += PEON_PASADO_EG[7 - (casilla >> 3)] >> 1
+        fase = posicion.fase if posicion.fase < FASE_MAXIMA else FASE_MAXIMA # Con promociones puede superar el máximo
+        puntuacion = (mg * fase + eg * (FASE_MAXIMA - fase)) // FASE_MAXIMA
+        return -puntuacion if posicion.turno else puntuacion
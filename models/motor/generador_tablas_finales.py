@@ -0,0 +1,249 @@
+"""
+Genera las tablas de finales KQK, KRK y KPK por análisis retrógrado.
+
+1. Clasificación inicial (en paralelo, un trabajo por casilla del rey fuerte): se marcan
+   las posiciones imposibles, los mates, los ahogados y las posiciones en las que el rey
+   débil puede capturar la pieza (tablas), y se cuentan las jugadas del bando débil.
+2. Retroceso por niveles: desde las posiciones perdidas en n plies se deshacen jugadas
+   del bando fuerte (ganadas en n + 1); desde éstas se deshacen jugadas del débil y se
+   descuenta su contador: al llegar a cero, la posición está perdida en n + 2.
+Las posiciones sin resolver al terminar son tablas. En KPK las promociones se resuelven
+consultando las tablas KQK y KRK, que por eso se generan antes.
+"""
+
+import logging
+import multiprocessing
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.motor.posicion import BLANCO, PEON, TORRE, REINA, SALTOS_REY, RAYOS_ORTOGONALES, \
+    RAYOS_DIAGONALES, ATAQUES_PEON
+from models.motor.tablas_finales import MAGICO, VERSION, BYTES_CABECERA, ENTRADAS_POR_TABLA, TABLAS, \
+    PERDIDA, INVALIDA, FIRMAS, indice_tabla, ruta_tabla
+
+logger = logging.getLogger(__name__)
+
+# Marca temporal de las posiciones aún sin resolver durante la generación
+_PENDIENTE = 254
+
+# _ADYACENTES[a * 64 + b]: las casillas a y b son distintas y se tocan (reyes enfrentados)
+_ADYACENTES = bytes(1 if b in SALTOS_REY[a] else 0 for a in range(64) for b in range(64))
+
+
+def _calcularEntre(rayos) -> List[int]:
+    """
+    Precalcula, para cada par (origen, destino) alineado en alguno de los rayos, la máscara de
+    bits de las casillas intermedias; -1 si no están alineadas.
+    """
+    entre = [-1] * 4096
+    for origen in range(64):
+        for rayo in rayos[origen]:
+            mascara = 0
+            for destino in rayo:
+                entre[origen * 64 + destino] = mascara
+                mascara |= 1 << destino
+    return entre
+
+
+_ENTRE_ORTOGONAL = _calcularEntre(RAYOS_ORTOGONALES)
+_ENTRE_DIAGONAL = _calcularEntre(RAYOS_DIAGONALES)
+_ENTRE_REINA = [max(o, d) for o, d in zip(_ENTRE_ORTOGONAL, _ENTRE_DIAGONAL)]
+
+
+def _ataca(tipo: int, pieza: int, objetivo: int, bloqueo: int) -> bool:
+    """
+    Indica si la pieza blanca `tipo` en `pieza` ataca `objetivo`, con una única casilla
+    ocupada (`bloqueo`, el rey blanco) que puede interponerse.
+    """
+    if tipo == PEON:
+        return objetivo in ATAQUES_PEON[BLANCO][pieza]
+    entre = (_ENTRE_REINA if tipo == REINA else _ENTRE_ORTOGONAL)[pieza * 64 + objetivo]
+    return entre >= 0 and not (entre >> bloqueo) & 1
+
+
+def _clasificar_rey_fuerte(argumentos: Tuple[int, int]) -> Tuple[bytes, bytes]:
+    """
+    Clasificación inicial de todas las posiciones con el rey fuerte en una casilla dada.
+
+    Returns:
+        (valores, contadores) de las 2 * 64 * 64 posiciones de ese rey, en el orden
+        (turno, rey débil, pieza). Los contadores son las jugadas legales del rey débil
+        en las posiciones pendientes con turno de las negras.
+    """
+    tipo, rey_blanco = argumentos
+    valores = bytearray([INVALIDA]) * (2 * 4096)
+    contadores = bytearray(2 * 4096)
+    for rey_negro in range(64):
+        if rey_negro == rey_blanco or _ADYACENTES[rey_blanco * 64 + rey_negro]:
+            continue
+        for pieza in range(64):
+            if pieza == rey_blanco or pieza == rey_negro or (tipo == PEON and not 8 <= pieza < 56):
+                continue
+            local = rey_negro * 64 + pieza
+            # Turno de las blancas: válida si el rey negro (que no mueve) no está en jaque
+            if not _ataca(tipo, pieza, rey_negro, rey_blanco):
+                valores[local] = _PENDIENTE
+            # Turno de las negras: contar las jugadas del rey
+            jugadas = 0
+            captura = False
+            for destino in SALTOS_REY[rey_negro]:
+                if _ADYACENTES[rey_blanco * 64 + destino]:
+                    continue
+                if destino == pieza:
+                    captura = True # La pieza no está defendida: el rey la captura y son tablas
+                elif not _ataca(tipo, pieza, destino, rey_blanco):
+                    jugadas += 1
+            if captura:
+                valores[4096 + local] = TABLAS
+            elif jugadas:
+                valores[4096 + local] = _PENDIENTE
+                contadores[4096 + local] = jugadas
+            else:
+                valores[4096 + local] = PERDIDA if _ataca(tipo, pieza, rey_negro, rey_blanco) else TABLAS
+    return bytes(valores), bytes(contadores)
+
+
+def _predecesoresBlancas(tipo: int, rey_blanco: int, rey_negro: int, pieza: int) -> List[int]:
+    """
+    Índices (turno de las blancas) desde los que una jugada blanca lleva a la posición dada.
+    """
+    predecesores = []
+    for origen in SALTOS_REY[rey_blanco]:
+        if origen != rey_negro and origen != pieza:
+            predecesores.append(indice_tabla(0, origen, rey_negro, pieza))
+    if tipo == PEON:
+        origen = pieza - 8
+        if origen >= 8 and origen != rey_blanco and origen != rey_negro:
+            predecesores.append(indice_tabla(0, rey_blanco, rey_negro, origen))
+            # Doble avance desde la segunda fila
+            if pieza >> 3 == 3 and pieza - 16 != rey_blanco and pieza - 16 != rey_negro:
+                predecesores.append(indice_tabla(0, rey_blanco, rey_negro, pieza - 16))
+        return predecesores
+    rayos = RAYOS_ORTOGONALES[pieza] + RAYOS_DIAGONALES[pieza] if tipo == REINA else RAYOS_ORTOGONALES[pieza]
+    for rayo in rayos:
+        for origen in rayo:
+            if origen == rey_blanco or origen == rey_negro:
+                break
+            predecesores.append(indice_tabla(0, rey_blanco, rey_negro, origen))
+    return predecesores
+
+
+def generar_tabla(tipo: int, procesos: Optional[int] = None,
+                  tablas_promocion: Optional[Dict[int, bytes]] = None) -> bytearray:
+    """
+    Genera la tabla (bando fuerte = blancas) del final rey y pieza `tipo` contra rey.
+
+    Args:
+        tipo: REINA, TORRE o PEON.
+        procesos: Procesos para la clasificación inicial (por defecto, uno por núcleo).
+        tablas_promocion: Para KPK, tablas ya generadas por tipo ({REINA: ..., TORRE: ...}).
+
+    Returns:
+        Los `ENTRADAS_POR_TABLA` valores de la tabla (ver `tablas_finales`).
+    """
+    procesos = max(1, procesos or os.cpu_count() or 1)
+    trabajos = [(tipo, rey_blanco) for rey_blanco in range(64)]
+    if procesos > 1:
+        with multiprocessing.get_context().Pool(procesos) as pool:
+            bloques = pool.map(_clasificar_rey_fuerte, trabajos)
+    else:
+        bloques = [_clasificar_rey_fuerte(trabajo) for trabajo in trabajos]
+    valores = bytearray(ENTRADAS_POR_TABLA)
+    contadores = bytearray(ENTRADAS_POR_TABLA)
+    for rey_blanco, (bloque_valores, bloque_contadores) in enumerate(bloques):
+        for turno in (0, 1):
+            destino = indice_tabla(turno, rey_blanco, 0, 0)
+            valores[destino:destino + 4096] = bloque_valores[turno * 4096:(turno + 1) * 4096]
+            contadores[destino:destino + 4096] = bloque_contadores[turno * 4096:(turno + 1) * 4096]
+
+    # Victorias por promoción (KPK), agrupadas por distancia al mate
+    promociones: Dict[int, List[int]] = {}
+    if tipo == PEON:
+        for rey_blanco in range(64):
+            for rey_negro in range(64):
+                for pieza in range(48, 56):
+                    indice = indice_tabla(0, rey_blanco, rey_negro, pieza)
+                    destino = pieza + 8
+                    if valores[indice] != _PENDIENTE or destino == rey_blanco or destino == rey_negro:
+                        continue
+                    mejor = None
+                    for tabla in tablas_promocion.values():
+                        valor = tabla[indice_tabla(1, rey_blanco, rey_negro, destino)]
+                        if PERDIDA <= valor < INVALIDA and (mejor is None or valor - PERDIDA + 1 < mejor):
+                            mejor = valor - PERDIDA + 1
+                    if mejor is not None:
+                        promociones.setdefault(mejor, []).append(indice)
+
+    perdidas = [indice for indice in range(1 << 18, ENTRADAS_POR_TABLA) if valores[indice] == PERDIDA]
+    distancia = 0
+    while perdidas or any(d > distancia for d in promociones):
+        ganadas = []
+        for indice in perdidas:
+            for predecesor in _predecesoresBlancas(tipo, (indice >> 12) & 63, (indice >> 6) & 63, indice & 63):
+                if valores[predecesor] == _PENDIENTE:
+                    valores[predecesor] = distancia + 1
+                    ganadas.append(predecesor)
+        for indice in promociones.pop(distancia + 1, ()):
+            if valores[indice] == _PENDIENTE:
+                valores[indice] = distancia + 1
+                ganadas.append(indice)
+        perdidas = []
+        for indice in ganadas:
+            rey_blanco, rey_negro, pieza = (indice >> 12) & 63, (indice >> 6) & 63, indice & 63
+            for origen in SALTOS_REY[rey_negro]:
+                if origen == rey_blanco or origen == pieza:
+                    continue
+                predecesor = indice_tabla(1, rey_blanco, origen, pieza)
+                if valores[predecesor] == _PENDIENTE:
+                    contadores[predecesor] -= 1
+                    if not contadores[predecesor]:
+                        valores[predecesor] = PERDIDA + distancia + 2
+                        perdidas.append(predecesor)
+        logger.debug(f"Nivel {distancia + 1}: {len(ganadas)} ganadas, {len(perdidas)} perdidas")
+        distancia += 2
+        if distancia + 2 >= PERDIDA:
+            raise RuntimeError(f"La distancia al mate supera el máximo representable ({PERDIDA - 1} plies)")
+
+    return bytearray(TABLAS if valor == _PENDIENTE else valor for valor in valores)
+
+
+def guardar_tabla(ruta: str, tipo: int, valores: bytes):
+    """
+    Escribe una tabla con su cabecera.
+    """
+    cabecera = MAGICO + bytes([VERSION, tipo]) + bytes(BYTES_CABECERA - len(MAGICO) - 2)
+    with open(ruta, 'wb') as archivo:
+        archivo.write(cabecera)
+        archivo.write(valores)
+
+
+def generar_tablas(directorio: str, firmas: Sequence[str] = ('KQK', 'KRK', 'KPK'),
+                   procesos: Optional[int] = None) -> List[str]:
+    """
+    Genera y guarda en `directorio` las tablas pedidas. KPK necesita KQK y KRK: si no se
+    piden, se generan igualmente (o se leen si ya existen en el directorio).
+
+    Returns:
+        Rutas de los archivos escritos.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    desconocidas = [firma for firma in firmas if firma not in FIRMAS]
+    if desconocidas:
+        raise ValueError(f"Firmas de material no soportadas: {desconocidas}")
+    generadas: Dict[int, bytes] = {}
+    escritas = []
+    orden = [firma for firma in ('KQK', 'KRK', 'KPK') if firma in firmas or ('KPK' in firmas and firma != 'KPK')]
+    for firma in orden:
+        tipo = FIRMAS[firma]
+        ruta = ruta_tabla(directorio, firma)
+        if firma not in firmas and os.path.exists(ruta):
+            with open(ruta, 'rb') as archivo:
+                generadas[tipo] = archivo.read()[BYTES_CABECERA:]
+            continue
+        logger.info(f"Generando la tabla {firma}...")
+        promocion = {t: generadas[t] for t in (REINA, TORRE)} if tipo == PEON else None
+        generadas[tipo] = generar_tabla(tipo, procesos, promocion)
+        guardar_tabla(ruta, tipo, generadas[tipo])
+        escritas.append(ruta)
+        logger.info(f"Tabla {firma} escrita en {ruta}")
+    return escritas
@@ -0,0 +1,133 @@
+"""
+Define el gestor de tiempo de una jugada con reloj: reparte el tiempo restante en un límite
+blando (lo que se espera gastar) y uno duro (lo que nunca se supera), y decide tras cada
+iteración de la búsqueda si merece la pena empezar la siguiente.
+"""
+
+import logging
+from typing import Dict, Optional
+
+from models.motor.tablas_pst import FASE_MAXIMA
+
+logger = logging.getLogger(__name__)
+
+# Margen de seguridad que nunca se gasta (latencia de la interfaz y del sistema)
+MARGEN_RELOJ_MS = 50
+# Jugadas que se suponen por delante sin 'movestogo': más en la apertura que en el final
+JUGADAS_RESTANTES_APERTURA = 35
+JUGADAS_RESTANTES_FINAL = 15
+# Fracción del incremento que se gasta en cada jugada
+FRACCION_INCREMENTO = 0.75
+# Límite duro: varias veces el blando, sin pasar de esta fracción del tiempo disponible
+MULTIPLICADOR_DURO = 4.0
+FRACCION_MAXIMA_DURO = 0.4
+# Extensiones del límite blando: por cada cambio reciente de mejor jugada y por caída de
+# la puntuación (fallo bajo), sin pasar nunca de EXTENSION_MAXIMA veces el límite blando
+EXTENSION_POR_CAMBIO = 0.5
+CAIDA_FALLO_BAJO_CP = 30
+CAIDA_EXTENSION_MAXIMA_CP = 150
+EXTENSION_MAXIMA = 2.5
+# Factor de ramificación supuesto para prever la siguiente iteración, y sus límites (se usa el
+# mayor de las dos últimas iteraciones: alterna entre profundidades pares e impares)
+FACTOR_RAMIFICACION_SUPUESTO = 2.0
+FACTOR_RAMIFICACION_MINIMO = 1.5
+FACTOR_RAMIFICACION_MAXIMO = 8.0
+
+
+class GestorTiempo:
+    """
+    Gestor de tiempo de una sola búsqueda (se crea uno por jugada):
+
+    - Límite blando: tiempo restante entre las jugadas que quedan (según 'movestogo' o, sin él,
+      según la fase de la partida) más casi todo el incremento.
+    - Límite duro: plazo que la búsqueda no supera nunca (se aborta la iteración en curso).
+    - Tras cada iteración, el límite blando se extiende si la mejor jugada ha cambiado
+      recientemente o la puntuación ha caído (fallo bajo), y la siguiente iteración solo se
+      empieza si se prevé terminarla dentro de ese límite (nunca por encima del duro).
+
+    Se pasa a `Buscador.buscar(gestor_tiempo=...)`.
+    """
+
+    def __init__(self, restante_ms: int, incremento_ms: int = 0, jugadas_restantes: Optional[int] = None,
+                 fase: int = FASE_MAXIMA):
+        """
+        Args:
+            restante_ms: Tiempo que le queda en el reloj al bando que mueve.
+            incremento_ms: Incremento por jugada.
+            jugadas_restantes: Jugadas hasta el siguiente control ('movestogo'), o None si el
+                tiempo restante es para el resto de la partida.
+            fase: Fase de la partida (`Posicion.fase`: FASE_MAXIMA en la apertura, 0 sin piezas).
+        """
+        disponible = max(1, restante_ms - MARGEN_RELOJ_MS)
+        fase = min(max(fase, 0), FASE_MAXIMA)
+        estimadas = JUGADAS_RESTANTES_FINAL + (JUGADAS_RESTANTES_APERTURA - JUGADAS_RESTANTES_FINAL) * fase / FASE_MAXIMA
+        jugadas = min(jugadas_restantes, estimadas) if jugadas_restantes else estimadas
+        blando = restante_ms / max(1.0, jugadas) + incremento_ms * FRACCION_INCREMENTO
+        self.limite_blando_ms = max(1, int(min(blando, disponible)))
+        self.limite_duro_ms = max(self.limite_blando_ms,
+                                  int(min(self.limite_blando_ms * MULTIPLICADOR_DURO, disponible * FRACCION_MAXIMA_DURO)))
+        self.factor_extension = 1.0
+        self._cambios = 0.0 # Cambios recientes de mejor jugada (decae a la mitad en cada iteración estable)
+        self._mejor_previo: Optional[int] = None
+        self._puntuacion_previa: Optional[int] = None
+        self._factor_previo: Optional[float] = None
+        logger.debug(f"Reloj {restante_ms}+{incremento_ms} ms ({jugadas:.0f} jugadas): "
+                     f"límite blando {self.limite_blando_ms} ms, duro {self.limite_duro_ms} ms")
+
+    @classmethod
+    def para_posicion(cls, posicion, restante_ms: int, incremento_ms: int = 0,
+                      jugadas_restantes: Optional[int] = None) -> 'GestorTiempo':
+        """
+        Crea el gestor con la fase de la `Posicion` a buscar.
+        """
+        return cls(restante_ms, incremento_ms, jugadas_restantes, posicion.fase)
+
+    @classmethod
+    def desde_temporizador(cls, temporizador, color: str, posicion,
+                           jugadas_restantes: Optional[int] = None) -> 'GestorTiempo':
+        """
+        Crea el gestor leyendo el tiempo restante y el incremento del jugador en un `Temporizador`.
+        """
+        return cls.para_posicion(posicion, temporizador.getTiempoRestante(color), temporizador.getIncremento(),
+                                 jugadas_restantes)
+
+    @property
+    def limite_actual_ms(self) -> int:
+        """
+        Límite blando con las extensiones aplicadas (nunca por encima del duro).
+        """
+        return min(self.limite_duro_ms, int(self.limite_blando_ms * self.factor_extension))
+
+    def continuar(self, iteracion: Dict) -> bool:
+        """
+        Actualiza las extensiones con una iteración completa de la búsqueda (entrada de
+        'iteraciones' de `Buscador.buscar`) y decide si se empieza la siguiente.
+
+        Returns:
+            False si el tiempo (extendido) está agotado o la siguiente iteración no terminaría a tiempo.
+        """
+        mejor = iteracion['lineas'][0]['movimiento']
+        puntuacion = iteracion['puntuacion']
+        if self._mejor_previo is not None and mejor != self._mejor_previo:
+            self._cambios += 1.0
+        else:
+            self._cambios /= 2.0
+        extension = 1.0 + EXTENSION_POR_CAMBIO * self._cambios
+        if self._puntuacion_previa is not None and self._puntuacion_previa - puntuacion >= CAIDA_FALLO_BAJO_CP:
+            caida = min(self._puntuacion_previa - puntuacion, CAIDA_EXTENSION_MAXIMA_CP)
+            extension *= 1.0 + caida / CAIDA_EXTENSION_MAXIMA_CP
+        self.factor_extension = min(EXTENSION_MAXIMA, extension)
+        self._mejor_previo, self._puntuacion_previa = mejor, puntuacion
+
+        transcurrido = iteracion['tiempo_ms']
+        limite = self.limite_actual_ms
+        factores = [f for f in (iteracion.get('factor_ramificacion'), self._factor_previo) if f]
+        self._factor_previo = iteracion.get('factor_ramificacion')
+        factor = max(factores) if factores else FACTOR_RAMIFICACION_SUPUESTO
+        factor = min(max(factor, FACTOR_RAMIFICACION_MINIMO), FACTOR_RAMIFICACION_MAXIMO)
+        prevista = transcurrido + iteracion['tiempo_iteracion_ms'] * factor
+        seguir = prevista <= limite
+        if not seguir:
+            logger.debug(f"Se detiene tras la profundidad {iteracion['profundidad']}: {transcurrido:.0f} ms gastados, "
+                         f"siguiente iteración prevista hasta {prevista:.0f} ms, límite {limite} ms")
+        return seguir
@@ -0,0 +1,166 @@
+"""
+Define la lectura de libros de aperturas en formato binario Polyglot.
+
+Un libro Polyglot es una secuencia de entradas de 16 bytes en big-endian
+(clave u64, movimiento u16, peso u16, aprendizaje u32) ordenadas por clave.
+Como la clave Zobrist de `Posicion` ya es la clave Polyglot, basta una búsqueda
+binaria sobre el archivo proyectado en memoria para encontrar los movimientos.
+"""
+
+import logging
+import mmap
+import random
+import struct
+from typing import List, Optional, Tuple
+
+from models.motor.posicion import Posicion, REY, TORRE, ESPECIAL_ENROQUE
+
+logger = logging.getLogger(__name__)
+
+# Formato de una entrada: clave, movimiento, peso, aprendizaje
+FORMATO_ENTRADA = struct.Struct('>QHHI')
+BYTES_POR_ENTRADA = FORMATO_ENTRADA.size
+_FORMATO_CLAVE = struct.Struct('>Q')
+
+
+def movimiento_a_polyglot(movimiento: int) -> int:
+    """
+    Codifica un movimiento del motor en el formato Polyglot de 16 bits
+    (destino en bits 0-5, origen en 6-11, promoción en 12-14). Los enroques se
+    escriben como rey que captura su propia torre (e1h1, e1a1).
+    """
+    origen = movimiento & 63
+    destino = (movimiento >> 6) & 63
+    if movimiento >> 15 == ESPECIAL_ENROQUE:
+        destino = (destino & 56) | (7 if destino & 7 == 6 else 0)
+    promocion = (movimiento >> 12) & 7
+    # Polyglot: 1 = caballo, 2 = alfil, 3 = torre, 4 = dama (el tipo del motor menos uno)
+    return destino | (origen << 6) | ((promocion - 1 if promocion else 0) << 12)
+
+
+def movimiento_desde_polyglot(posicion: Posicion, codigo: int) -> Optional[int]:
+    """
+    Traduce un movimiento Polyglot al movimiento legal equivalente de `posicion`.
+
+    Returns:
+        El entero del movimiento, o None si no es legal en la posición (libro corrupto o colisión de clave).
+    """
+    destino = codigo & 63
+    origen = (codigo >> 6) & 63
+    promocion = (codigo >> 12) & 7
+    c = posicion.casillas
+    propio = posicion.turno << 3
+    if c[origen] == propio | REY and c[destino] == propio | TORRE:
+        destino = origen + 2 if destino > origen else origen - 2 # Enroque escrito como rey x torre
+    tipo_promocion = promocion + 1 if promocion else 0
+    for movimiento in posicion.generar_movimientos_legales():
+        if movimiento & 63 == origen and (movimiento >> 6) & 63 == destino \
+                and (movimiento >> 12) & 7 == tipo_promocion:
+            return movimiento
+    return None
+
+
+class LibroAperturas:
+    """
+    Libro de aperturas Polyglot de solo lectura proyectado en memoria (`mmap`).
+    Abrirlo no lee el archivo: cada consulta es una búsqueda binaria de unas pocas
+    páginas, y varios procesos que abren el mismo libro comparten la caché del sistema.
+    """
+
+    def __init__(self, ruta: str, semilla: Optional[int] = None):
+        """
+        Args:
+            ruta: Ruta del archivo .bin en formato Polyglot.
+            semilla: Semilla del generador aleatorio para la elección ponderada (reproducible).
+
+        Raises:
+            ValueError: Si el tamaño del archivo no es múltiplo de 16 bytes.
+        """
+        self.ruta = ruta
+        self._aleatorio = random.Random(semilla)
+        self._archivo = open(ruta, 'rb')
+        try:
+            tamano = self._archivo.seek(0, 2)
+            if tamano % BYTES_POR_ENTRADA:
+                raise ValueError(f"El libro {ruta} no es un archivo Polyglot válido ({tamano} bytes)")
+            # mmap no admite archivos vacíos: un libro vacío simplemente no tiene entradas
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ) if tamano else b''
+        except Exception:
+            self._archivo.close()
+            raise
+        self.num_entradas = tamano // BYTES_POR_ENTRADA
+        logger.info(f"Libro de aperturas {ruta} abierto con {self.num_entradas} entradas")
+
+    def _primeraEntrada(self, clave: int) -> int:
+        """
+        Devuelve el índice de la primera entrada con clave >= `clave` (búsqueda binaria).
+        """
+        mapa = self._mapa
+        bajo, alto = 0, self.num_entradas
+        while bajo < alto:
+            medio = (bajo + alto) >> 1
+            if _FORMATO_CLAVE.unpack_from(mapa, medio * BYTES_POR_ENTRADA)[0] < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def entradas(self, clave: int) -> List[Tuple[int, int]]:
+        """
+        Devuelve las entradas (movimiento Polyglot, peso) de una clave, en el orden del archivo.
+        """
+        resultado = []
+        indice = self._primeraEntrada(clave)
+        while indice < self.num_entradas:
+            clave_entrada, codigo, peso, _ = FORMATO_ENTRADA.unpack_from(self._mapa, indice * BYTES_POR_ENTRADA)
+            if clave_entrada != clave:
+                break
+            resultado.append((codigo, peso))
+            indice += 1
+        return resultado
+
+    def movimientos(self, posicion: Posicion) -> List[Tuple[int, int]]:
+        """
+        Devuelve los movimientos del libro para la posición como pares (movimiento, peso),
+        descartando los que no son legales en ella.
+        """
+        resultado = []
+        for codigo, peso in self.entradas(posicion.clave):
+            movimiento = movimiento_desde_polyglot(posicion, codigo)
+            if movimiento is None:
+                logger.warning(f"Entrada de libro ilegal {codigo:#06x} para la clave {posicion.clave:016x}")
+                continue
+            resultado.append((movimiento, peso))
+        return resultado
+
+    def elegir_movimiento(self, posicion: Posicion) -> Optional[int]:
+        """
+        Elige un movimiento del libro al azar con probabilidad proporcional a su peso.
+
+        Returns:
+            El movimiento elegido, o None si la posición no está en el libro.
+        """
+        candidatos = [(movimiento, peso) for movimiento, peso in self.movimientos(posicion) if peso > 0]
+        if not candidatos:
+            return None
+        total = sum(peso for _, peso in candidatos)
+        umbral = self._aleatorio.randrange(total)
+        for movimiento, peso in candidatos:
+            umbral -= peso
+            if umbral < 0:
+                return movimiento
+        return candidatos[-1][0]
+
+    def cerrar(self):
+        """
+        Libera la proyección en memoria y cierra el archivo.
+        """
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+        self._archivo.close()
+
+    def __enter__(self) -> 'LibroAperturas':
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
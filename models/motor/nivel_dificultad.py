@@ -0,0 +1,80 @@
+"""
+Define los niveles de dificultad del jugador ordenador como presupuestos explícitos de búsqueda.
+"""
+
+from typing import Dict, Optional
+
+
+class NivelDificultad:
+    """
+    Presupuesto de búsqueda de un nivel de dificultad:
+    - nodos_max: nodos por jugada (None = sin límite). Los niveles limitados solo por nodos
+      son reproducibles: la misma partida produce siempre las mismas jugadas.
+    - profundidad_max: profundidad máxima en plies.
+    - tiempo_max_ms: plazo de reloj por jugada (None = sin plazo).
+    - ruido_cp: ruido deliberado en centipeones en la elección de la raíz (0 = juega lo mejor que encuentra).
+    El coste de CPU de una jugada queda acotado por `nodos_max` o `tiempo_max_ms`.
+    """
+
+    def __init__(self, nombre: str, nodos_max: Optional[int] = None, profundidad_max: int = 64,
+                 tiempo_max_ms: Optional[int] = None, ruido_cp: int = 0):
+        """
+        Raises:
+            ValueError: Si el nivel no limita ni nodos ni tiempo ni profundidad, o algún valor es negativo.
+        """
+        if nodos_max is None and tiempo_max_ms is None and profundidad_max >= 64:
+            raise ValueError(f"El nivel {nombre!r} no tiene ningún presupuesto de búsqueda")
+        if (nodos_max is not None and nodos_max <= 0) or (tiempo_max_ms is not None and tiempo_max_ms <= 0) \
+                or profundidad_max <= 0 or ruido_cp < 0:
+            raise ValueError(f"Presupuesto no válido para el nivel {nombre!r}")
+        self.nombre = nombre
+        self.nodos_max = nodos_max
+        self.profundidad_max = profundidad_max
+        self.tiempo_max_ms = tiempo_max_ms
+        self.ruido_cp = ruido_cp
+
+    @property
+    def reproducible(self) -> bool:
+        """
+        Indica si el nivel no depende del reloj (sus jugadas son reproducibles con la misma semilla).
+        """
+        return self.tiempo_max_ms is None
+
+    def a_diccionario(self) -> Dict:
+        """
+        Devuelve el presupuesto como diccionario (útil para registrar o serializar la configuración).
+        """
+        return {'nombre': self.nombre, 'nodos_max': self.nodos_max, 'profundidad_max': self.profundidad_max,
+                'tiempo_max_ms': self.tiempo_max_ms, 'ruido_cp': self.ruido_cp}
+
+    def __repr__(self) -> str:
+        return (f"NivelDificultad({self.nombre!r}, nodos_max={self.nodos_max}, profundidad_max={self.profundidad_max}, "
+                f"tiempo_max_ms={self.tiempo_max_ms}, ruido_cp={self.ruido_cp})")
+
+
+# Niveles 1-8: los cinco primeros se limitan por nodos (reproducibles y baratos de servir);
+# los últimos por tiempo, para sacar todo el partido del hardware disponible
+NIVELES_DIFICULTAD: Dict[int, NivelDificultad] = {
+    1: NivelDificultad('principiante', nodos_max=300, profundidad_max=1, ruido_cp=200),
+    2: NivelDificultad('novato', nodos_max=1500, profundidad_max=2, ruido_cp=120),
+    3: NivelDificultad('aficionado', nodos_max=6000, profundidad_max=3, ruido_cp=60),
+    4: NivelDificultad('club', nodos_max=25000, profundidad_max=4, ruido_cp=25),
+    5: NivelDificultad('avanzado', nodos_max=80000, profundidad_max=6),
+    6: NivelDificultad('experto', tiempo_max_ms=400),
+    7: NivelDificultad('maestro', tiempo_max_ms=900),
+    8: NivelDificultad('analisis', tiempo_max_ms=3000),
+}
+NIVEL_POR_DEFECTO = 7
+
+
+def obtener_nivel(nivel: int) -> NivelDificultad:
+    """
+    Devuelve el presupuesto del nivel `nivel`.
+
+    Raises:
+        ValueError: Si el nivel no existe.
+    """
+    if nivel not in NIVELES_DIFICULTAD:
+        raise ValueError(f"Nivel de dificultad no válido: {nivel!r} (debe estar entre "
+                         f"{min(NIVELES_DIFICULTAD)} y {max(NIVELES_DIFICULTAD)})")
+    return NIVELES_DIFICULTAD[nivel]
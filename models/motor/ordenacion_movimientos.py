@@ -0,0 +1,134 @@
+"""
+Define la ordenación de movimientos del buscador: movimiento de la tabla de transposición,
+capturas MVV-LVA, movimientos asesinos (killers) y tabla de historia.
+"""
+
+from typing import Dict, List
+
+from models.motor.evaluador import VALORES_PIEZA
+from models.motor.posicion import Posicion, ESPECIAL_AL_PASO, PEON
+
+# Prioridades por categoría (de mayor a menor); la historia siempre queda por debajo de los killers
+PRIORIDAD_TABLA = 1 << 30
+PRIORIDAD_CAPTURA = 1 << 24
+PRIORIDAD_KILLER_1 = (1 << 23) + 1
+PRIORIDAD_KILLER_2 = 1 << 23
+PRIORIDAD_CAPTURA_MALA = 1 << 22
+# Al superar este valor, la tabla de historia se divide entre dos
+HISTORIA_MAXIMA = 1 << 20
+# Profundidad máxima de ply para la que se guardan killers
+_PLIES_KILLERS = 130
+
+
+class OrdenacionMovimientos:
+    """
+    Ordena los movimientos de un nodo para que el que probablemente produce el corte
+    beta se busque primero, y mantiene las heurísticas aprendidas durante la búsqueda:
+    - Movimiento de la tabla de transposición, siempre el primero.
+    - Capturas y promociones por MVV-LVA (víctima más valiosa, atacante menos valioso);
+      las capturas de una pieza menos valiosa que la atacante se dejan tras los killers.
+    - Dos movimientos asesinos por ply (movimientos tranquilos que produjeron cortes).
+    - Historia indexada por pieza (código) y casilla de destino para el resto de tranquilos.
+    También lleva las estadísticas de cortes para medir la calidad de la ordenación.
+    """
+
+    def __init__(self):
+        """
+        Crea las tablas vacías.
+        """
+        self.killers: List[List[int]] = [[0, 0] for _ in range(_PLIES_KILLERS)]
+        self.historia: List[int] = [0] * (16 * 64)
+        self.cortes = 0
+        self.cortes_primer_movimiento = 0
+
+    def nueva_busqueda(self):
+        """
+        Prepara una nueva búsqueda: olvida los killers, envejece la historia y reinicia las estadísticas.
+        """
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        self.historia = [valor >> 2 for valor in self.historia]
+        self.cortes = 0
+        self.cortes_primer_movimiento = 0
+
+    def ordenar(self, posicion: Posicion, movimientos: List[int], movimiento_tabla: int, ply: int) -> List[int]:
+        """
+        Devuelve los movimientos ordenados de más a menos prometedor.
+
+        Args:
+            posicion: Posición del nodo (antes de aplicar ningún movimiento).
+            movimientos: Movimientos pseudo-legales generados.
+            movimiento_tabla: Mejor movimiento guardado en la tabla de transposición (0 si no hay).
+            ply: Distancia a la raíz (para los killers).
+        """
+        c = posicion.casillas
+        historia = self.historia
+        killer_1, killer_2 = self.killers[ply] if ply < _PLIES_KILLERS else (0, 0)
+        puntuados = []
+        for movimiento in movimientos:
+            if movimiento == movimiento_tabla:
+                prioridad = PRIORIDAD_TABLA
+            else:
+                victima = c[(movimiento >> 6) & 63] & 7
+                promocion = (movimiento >> 12) & 7
+                if victima or promocion:
+                    atacante = c[movimiento & 63] & 7
+                    prioridad = ((victima + promocion) << 4) - atacante
+                    # Capturas de pieza menos valiosa que la atacante (posiblemente perdedoras): tras los killers
+                    prioridad += PRIORIDAD_CAPTURA if promocion or VALORES_PIEZA[victima] >= VALORES_PIEZA[atacante] \
+                        else PRIORIDAD_CAPTURA_MALA
+                elif movimiento >> 15 == ESPECIAL_AL_PASO:
+                    prioridad = PRIORIDAD_CAPTURA + (PEON << 4) - PEON
+                elif movimiento == killer_1:
+                    prioridad = PRIORIDAD_KILLER_1
+                elif movimiento == killer_2:
+                    prioridad = PRIORIDAD_KILLER_2
+                else:
+                    prioridad = historia[(c[movimiento & 63] << 6) | ((movimiento >> 6) & 63)]
+            puntuados.append((prioridad, movimiento))
+        puntuados.sort(reverse=True)
+        return [movimiento for _, movimiento in puntuados]
+
+    def ordenar_capturas(self, posicion: Posicion, capturas: List[int]) -> List[int]:
+        """
+        Ordena capturas y promociones solo por MVV-LVA (para la búsqueda de quiescencia).
+        """
+        c = posicion.casillas
+        puntuados = []
+        for movimiento in capturas:
+            victima = c[(movimiento >> 6) & 63] & 7 or PEON # Casilla vacía: captura al paso
+            puntuados.append(((((victima + ((movimiento >> 12) & 7)) << 4) - (c[movimiento & 63] & 7)), movimiento))
+        puntuados.sort(reverse=True)
+        return [movimiento for _, movimiento in puntuados]
+
+    def registrar_corte(self, posicion: Posicion, movimiento: int, profundidad: int, ply: int, indice: int):
+        """
+        Registra un corte beta producido por `movimiento`, el `indice`-ésimo (desde 0) buscado en el nodo.
+        Si es tranquilo, lo guarda como killer y refuerza su historia.
+        """
+        self.cortes += 1
+        if indice == 0:
+            self.cortes_primer_movimiento += 1
+        c = posicion.casillas
+        if c[(movimiento >> 6) & 63] or (movimiento >> 12) & 7 or movimiento >> 15 == ESPECIAL_AL_PASO:
+            return # Capturas y promociones ya se ordenan por MVV-LVA
+        if ply < _PLIES_KILLERS:
+            killers = self.killers[ply]
+            if killers[0] != movimiento:
+                killers[1] = killers[0]
+                killers[0] = movimiento
+        indice_historia = (c[movimiento & 63] << 6) | ((movimiento >> 6) & 63)
+        self.historia[indice_historia] += profundidad * profundidad
+        if self.historia[indice_historia] > HISTORIA_MAXIMA:
+            self.historia = [valor >> 1 for valor in self.historia]
+
+    def estadisticas(self) -> Dict:
+        """
+        Devuelve las estadísticas de cortes: 'cortes', 'cortes_primer_movimiento' y
+        'tasa_corte_primer_movimiento' (fracción de cortes producidos por el primer movimiento).
+        """
+        return {
+            'cortes': self.cortes,
+            'cortes_primer_movimiento': self.cortes_primer_movimiento,
+            'tasa_corte_primer_movimiento': self.cortes_primer_movimiento / self.cortes if self.cortes else 0.0,
+        }
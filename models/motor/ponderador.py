@@ -0,0 +1,139 @@
+"""
+Define la búsqueda en el tiempo del rival (pondering) del jugador ordenador.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from models.motor.buscador import PROFUNDIDAD_MAXIMA
+from models.motor.posicion import Posicion, movimiento_a_uci
+
+logger = logging.getLogger(__name__)
+
+
+class Ponderador:
+    """
+    Mientras el rival piensa, busca en un hilo en segundo plano la posición que resultaría
+    de su respuesta más probable (la segunda jugada de la variante principal).
+
+    - Acierto (el rival juega la jugada prevista): la búsqueda en curso se convierte en la
+      búsqueda de la jugada; solo se espera lo que falte del presupuesto contado desde que
+      empezó a pensar, y la tabla de transposición, killers e historia ya están calientes.
+    - Fallo: la búsqueda se cancela con el evento de detención y se busca normalmente
+      (la tabla de transposición conserva igualmente lo aprendido).
+
+    El buscador no debe usarse desde otro hilo mientras hay una búsqueda en segundo plano.
+    """
+
+    def __init__(self, buscador):
+        """
+        Args:
+            buscador: `Buscador` o `BuscadorParalelo` con el que buscar (el del jugador).
+        """
+        self.buscador = buscador
+        self._evento = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._clave_esperada: Optional[int] = None
+        self._inicio = 0.0
+        self._resultado: Optional[Dict] = None
+        self.aciertos = 0
+        self.fallos = 0
+
+    @property
+    def activo(self) -> bool:
+        """
+        Indica si hay una búsqueda en segundo plano pendiente de resolver.
+        """
+        return self._hilo is not None
+
+    def iniciar(self, posicion: Posicion, jugada_esperada: int, profundidad_max: int = PROFUNDIDAD_MAXIMA,
+                nodos_max: Optional[int] = None, ruido_cp: int = 0, aleatorio: Optional[random.Random] = None) -> bool:
+        """
+        Empieza a buscar en segundo plano la posición tras `jugada_esperada` del rival.
+
+        Args:
+            posicion: Posición con el turno del rival (no se modifica).
+            jugada_esperada: Respuesta prevista del rival.
+            profundidad_max: Profundidad máxima de la búsqueda.
+            nodos_max, ruido_cp, aleatorio: Presupuesto de nodos y ruido (ver `Buscador.buscar`).
+
+        Returns:
+            False si la jugada esperada no es legal (no se inicia nada).
+        """
+        self.detener()
+        posicion = posicion.copia()
+        if jugada_esperada not in posicion.generar_movimientos_legales():
+            return False
+        posicion.hacer_movimiento(jugada_esperada)
+        self._clave_esperada = posicion.clave
+        self._resultado = None
+        self._evento.clear()
+        self._inicio = time.perf_counter()
+        opciones = {'profundidad_max': profundidad_max, 'nodos_max': nodos_max,
+                    'ruido_cp': ruido_cp, 'aleatorio': aleatorio}
+        self._hilo = threading.Thread(target=self._buscar, args=(posicion, opciones),
+                                      name="motor-ponder", daemon=True)
+        self._hilo.start()
+        logger.debug(f"Pensando en el tiempo del rival tras {movimiento_a_uci(jugada_esperada)}")
+        return True
+
+    def _buscar(self, posicion: Posicion, opciones: Dict):
+        """
+        Cuerpo del hilo: búsqueda sin plazo hasta agotar el presupuesto o la detención.
+        """
+        self._resultado = self.buscador.buscar(posicion, tiempo_ms=None, evento_detener=self._evento, **opciones)
+
+    def resolver(self, posicion: Posicion, tiempo_ms: Optional[int]) -> Optional[Dict]:
+        """
+        Resuelve la búsqueda en segundo plano ahora que el rival ha movido.
+
+        Args:
+            posicion: Posición actual (con el turno del jugador ordenador).
+            tiempo_ms: Presupuesto de la jugada, contado desde que empezó la búsqueda en segundo
+                plano; con None se espera a que la búsqueda agote su presupuesto de nodos o profundidad.
+
+        Returns:
+            El resultado de la búsqueda (con 'ponder': True) si el rival jugó la jugada prevista;
+            None si no había búsqueda en segundo plano o se falló la predicción.
+        """
+        if self._hilo is None:
+            return None
+        if posicion.clave != self._clave_esperada:
+            self.fallos += 1
+            self.detener()
+            logger.debug("Predicción fallida: se cancela la búsqueda en segundo plano")
+            return None
+        self.aciertos += 1
+        if tiempo_ms is not None:
+            restante = tiempo_ms / 1000.0 - (time.perf_counter() - self._inicio)
+            self._hilo.join(max(0.0, restante))
+        else:
+            self._hilo.join()
+        self.detener()
+        resultado = self._resultado
+        if resultado is None or resultado['movimiento'] is None:
+            return None
+        resultado['ponder'] = True
+        logger.debug(f"Predicción acertada: profundidad {resultado['profundidad']} ya buscada")
+        return resultado
+
+    def detener(self):
+        """
+        Cancela la búsqueda en segundo plano (si la hay) y espera a que el hilo termine.
+        """
+        if self._hilo is None:
+            return
+        self._evento.set()
+        self._hilo.join()
+        self._hilo = None
+
+    def estadisticas(self) -> Dict:
+        """
+        Devuelve 'aciertos', 'fallos' y 'tasa_aciertos' de las predicciones resueltas.
+        """
+        total = self.aciertos + self.fallos
+        return {'aciertos': self.aciertos, 'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / total if total else 0.0}
@@ -0,0 +1,837 @@
+"""
+Define la posición compacta que usa el motor de búsqueda del jugador ordenador.
+
+La posición se guarda como una lista plana de 64 enteros (índice = fila * 8 + columna,
+fila 0 = primera fila de las blancas), con el mismo código `(color << 3) | tipo` que
+devuelve `Tablero.obtenerCodigos()`. Los movimientos se codifican en un único entero
+y se aplican/deshacen en el sitio (make/unmake) sin crear objetos por nodo.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+from models.piezas.color import Color
+from models.piezas.tipo_pieza import TipoPieza
+from models.motor.tablas_pst import TABLA_MG, TABLA_EG, FASE_PIEZA
+from models.motor.zobrist import ZOBRIST_PIEZA, ZOBRIST_ENROQUE, ZOBRIST_AL_PASO, ZOBRIST_TURNO
+
+logger = logging.getLogger(__name__)
+
+# Alias locales de los códigos (más rápidos que acceder al enum en los bucles calientes)
+BLANCO = int(Color.BLANCO)
+NEGRO = int(Color.NEGRO)
+PEON = int(TipoPieza.PEON)
+CABALLO = int(TipoPieza.CABALLO)
+ALFIL = int(TipoPieza.ALFIL)
+TORRE = int(TipoPieza.TORRE)
+REINA = int(TipoPieza.REINA)
+REY = int(TipoPieza.REY)
+
+# Codificación de un movimiento: origen | destino << 6 | promoción << 12 | especial << 15
+ESPECIAL_NORMAL = 0
+ESPECIAL_DOBLE_AVANCE = 1
+ESPECIAL_AL_PASO = 2
+ESPECIAL_ENROQUE = 3
+
+# Derechos de enroque como máscara de bits
+ENROQUE_BLANCO_CORTO = 1
+ENROQUE_BLANCO_LARGO = 2
+ENROQUE_NEGRO_CORTO = 4
+ENROQUE_NEGRO_LARGO = 8
+
+FEN_INICIAL = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def crear_movimiento(origen: int, destino: int, promocion: int = 0, especial: int = ESPECIAL_NORMAL) -> int:
+    """
+    Codifica un movimiento en un entero.
+
+    Args:
+        origen: Casilla de origen (0-63).
+        destino: Casilla de destino (0-63).
+        promocion: Código de `TipoPieza` de la promoción, o 0 si no promociona.
+        especial: Uno de los códigos ESPECIAL_*.
+    """
+    return origen | (destino << 6) | (promocion << 12) | (especial << 15)
+
+
+def _generar_saltos(desplazamientos: Tuple[Tuple[int, int], ...]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Precalcula, para cada casilla, los destinos de una pieza que salta (caballo o rey).
+    """
+    tabla = []
+    for casilla in range(64):
+        fila, col = divmod(casilla, 8)
+        tabla.append(tuple((fila + df) * 8 + col + dc for df, dc in desplazamientos
+                           if 0 <= fila + df <= 7 and 0 <= col + dc <= 7))
+    return tuple(tabla)
+
+
+def _generar_rayos(direcciones: Tuple[Tuple[int, int], ...]) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """
+    Precalcula, para cada casilla, los rayos no vacíos en las direcciones dadas
+    (cada rayo ordenado desde la casilla hacia el borde).
+    """
+    tabla = []
+    for casilla in range(64):
+        fila, col = divmod(casilla, 8)
+        rayos = []
+        for df, dc in direcciones:
+            rayo = []
+            f, c = fila + df, col + dc
+            while 0 <= f <= 7 and 0 <= c <= 7:
+                rayo.append(f * 8 + c)
+                f += df
+                c += dc
+            if rayo:
+                rayos.append(tuple(rayo))
+        tabla.append(tuple(rayos))
+    return tuple(tabla)
+
+
+SALTOS_CABALLO = _generar_saltos(((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)))
+SALTOS_REY = _generar_saltos(((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)))
+RAYOS_ORTOGONALES = _generar_rayos(((1, 0), (-1, 0), (0, 1), (0, -1)))
+RAYOS_DIAGONALES = _generar_rayos(((1, 1), (1, -1), (-1, 1), (-1, -1)))
+# Casillas que ataca un peón de cada color desde cada casilla: ATAQUES_PEON[color][casilla]
+ATAQUES_PEON = (_generar_saltos(((1, -1), (1, 1))), _generar_saltos(((-1, -1), (-1, 1))))
+
+# Derechos de enroque que se conservan al mover desde/hacia cada casilla (rey o torre inicial)
+MASCARA_ENROQUE = [15] * 64
+MASCARA_ENROQUE[4] = 15 & ~(ENROQUE_BLANCO_CORTO | ENROQUE_BLANCO_LARGO)
+MASCARA_ENROQUE[7] = 15 & ~ENROQUE_BLANCO_CORTO
+MASCARA_ENROQUE[0] = 15 & ~ENROQUE_BLANCO_LARGO
+MASCARA_ENROQUE[60] = 15 & ~(ENROQUE_NEGRO_CORTO | ENROQUE_NEGRO_LARGO)
+MASCARA_ENROQUE[63] = 15 & ~ENROQUE_NEGRO_CORTO
+MASCARA_ENROQUE[56] = 15 & ~ENROQUE_NEGRO_LARGO
+MASCARA_ENROQUE = tuple(MASCARA_ENROQUE)
+
+_PROMOCIONES = (REINA, CABALLO, TORRE, ALFIL)
+
+
+class Posicion:
+    """
+    Posición de ajedrez compacta con generación de movimientos y make/unmake en el sitio.
+    Es la representación interna del motor; se construye desde un `Tablero` (o FEN)
+    y nunca modifica el tablero del juego.
+    """
+    __slots__ = ('casillas', 'turno', 'enroques', 'al_paso', 'regla50', 'ply', 'reyes', 'clave', 'clave_peones', 'mg', 'eg', 'fase', '_pila')
+
+    def __init__(self):
+        """
+        Crea una posición vacía (sin piezas). Usar `desde_tablero` o `desde_fen` para cargar una.
+        """
+        self.casillas: List[int] = [0] * 64
+        self.turno: int = BLANCO
+        self.enroques: int = 0
+        self.al_paso: int = -1 # Casilla objetivo de captura al paso, o -1
+        self.regla50: int = 0
+        self.ply: int = 0 # Plies desde el inicio de la partida
+        self.reyes: List[int] = [-1, -1]
+        self.clave: int = 0 # Clave Zobrist (compatible con Polyglot), actualizada en make/unmake
+        self.clave_peones: int = 0 # Clave Zobrist solo de los peones (tabla de estructura de peones)
+        # Sumas de material + PST de medio juego y final (blancas - negras) y fase, actualizadas en make/unmake
+        self.mg: int = 0
+        self.eg: int = 0
+        self.fase: int = 0
+        self._pila: List[tuple] = []
+
+    # ============================================================
+    # 1. Construcción y Conversión
+    # ============================================================
+
+    @classmethod
+    def desde_tablero(cls, tablero) -> 'Posicion':
+        """
+        Construye la posición a partir del estado actual de un `Tablero`.
+
+        Args:
+            tablero: Instancia de `Tablero` (no se modifica).
+        """
+        posicion = cls()
+        posicion.casillas = tablero.obtenerCodigos()
+        posicion.turno = BLANCO if tablero.turno_blanco else NEGRO
+        derechos = tablero.derechosEnroque
+        posicion.enroques = ((ENROQUE_BLANCO_CORTO if derechos['blanco']['corto'] else 0) |
+                             (ENROQUE_BLANCO_LARGO if derechos['blanco']['largo'] else 0) |
+                             (ENROQUE_NEGRO_CORTO if derechos['negro']['corto'] else 0) |
+                             (ENROQUE_NEGRO_LARGO if derechos['negro']['largo'] else 0))
+        objetivo = tablero.objetivoPeonAlPaso
+        posicion.al_paso = -1 if objetivo is None else objetivo[0] * 8 + objetivo[1]
+        posicion.regla50 = tablero.contadorRegla50Movimientos
+        posicion.ply = tablero.contadorPly
+        posicion._inicializarDerivados()
+        return posicion
+
+    @classmethod
+    def desde_partida(cls, tablero, previa: Optional['Posicion'] = None) -> 'Posicion':
+        """
+        Construye la posición actual de un `Tablero` rehaciendo las jugadas de la partida
+        (`historial_movimientos`) desde la posición inicial, para que la búsqueda vea las
+        posiciones anteriores y no entre sin saberlo en una repetición.
+        Si el historial no reproduce el tablero (posición preparada a mano, o una promoción
+        a pieza distinta de la dama, que el historial no registra), devuelve la posición de
+        `desde_tablero`, sin historial.
+
+        Args:
+            tablero: Instancia de `Tablero` (no se modifica).
+            previa: Posición devuelta por una llamada anterior con la misma partida; solo se
+                rehacen las jugadas posteriores (si no cuadra, se rehace la partida entera).
+        """
+        actual = cls.desde_tablero(tablero)
+        jugadas = tablero.historial_movimientos
+        inicio = len(previa._pila) if previa is not None else 0
+        if 0 < inicio <= len(jugadas):
+            posicion = previa.copia()
+        else:
+            posicion, inicio = cls.desde_fen(FEN_INICIAL), 0
+        for _, origen, destino in jugadas[inicio:]:
+            movimiento = posicion.movimiento_desde_tupla(origen, destino)
+            if movimiento is None:
+                break
+            posicion.hacer_movimiento(movimiento)
+        else:
+            if posicion.clave == actual.clave and posicion.regla50 == actual.regla50:
+                return posicion
+        return cls.desde_partida(tablero) if inicio else actual
+
+    @classmethod
+    def desde_fen(cls, fen: str) -> 'Posicion':
+        """
+        Construye la posición a partir de una cadena FEN.
+
+        Raises:
+            ValueError: Si la FEN está mal formada.
+        """
+        campos = fen.split()
+        if len(campos) < 4:
+            raise ValueError(f"FEN incompleta: {fen!r}")
+        filas = campos[0].split('/')
+        if len(filas) != 8:
+            raise ValueError(f"FEN con número de filas incorrecto: {fen!r}")
+        posicion = cls()
+        for indice, texto_fila in enumerate(filas):
+            fila = 7 - indice
+            col = 0
+            for caracter in texto_fila:
+                if caracter.isdigit():
+                    col += int(caracter)
+                    continue
+                if col > 7:
+                    raise ValueError(f"FEN con fila demasiado larga: {fen!r}")
+                color = BLANCO if caracter.isupper() else NEGRO
+                posicion.casillas[fila * 8 + col] = (color << 3) | TipoPieza.desde_letra(caracter)
+                col += 1
+            if col != 8:
+                raise ValueError(f"FEN con fila de longitud incorrecta: {fen!r}")
+        if campos[1] not in ('w', 'b'):
+            raise ValueError(f"FEN con turno no válido: {fen!r}")
+        posicion.turno = BLANCO if campos[1] == 'w' else NEGRO
+        bits = {'K': ENROQUE_BLANCO_CORTO, 'Q': ENROQUE_BLANCO_LARGO, 'k': ENROQUE_NEGRO_CORTO, 'q': ENROQUE_NEGRO_LARGO}
+        for caracter in campos[2]:
+            posicion.enroques |= bits.get(caracter, 0)
+        posicion.al_paso = -1 if campos[3] == '-' else casilla_desde_algebraica(campos[3])
+        posicion.regla50 = int(campos[4]) if len(campos) > 4 else 0
+        numero_jugada = int(campos[5]) if len(campos) > 5 else 1
+        posicion.ply = 2 * (numero_jugada - 1) + posicion.turno
+        posicion._inicializarDerivados()
+        return posicion
+
+    def a_fen(self) -> str:
+        """
+        Devuelve la FEN de la posición (el número de jugada se deriva de `ply`).
+        """
+        filas = []
+        for fila in range(7, -1, -1):
+            texto, vacias = '', 0
+            for col in range(8):
+                codigo = self.casillas[fila * 8 + col]
+                if codigo == 0:
+                    vacias += 1
+                    continue
+                if vacias:
+                    texto += str(vacias)
+                    vacias = 0
+                letra = TipoPieza(codigo & 7).a_letra()
+                texto += letra if codigo >> 3 == BLANCO else letra.lower()
+            filas.append(texto + (str(vacias) if vacias else ''))
+        enroques = ''.join(letra for bit, letra in ((ENROQUE_BLANCO_CORTO, 'K'), (ENROQUE_BLANCO_LARGO, 'Q'),
+                                                    (ENROQUE_NEGRO_CORTO, 'k'), (ENROQUE_NEGRO_LARGO, 'q'))
+                           if self.enroques & bit) or '-'
+        al_paso = '-' if self.al_paso < 0 else casilla_a_algebraica(self.al_paso)
+        return f"{'/'.join(filas)} {'w' if self.turno == BLANCO else 'b'} {enroques} {al_paso} {self.regla50} {1 + self.ply // 2}"
+
+    def copia(self) -> 'Posicion':
+        """
+        Devuelve una copia independiente. Conserva la pila de movimientos (sus entradas son
+        inmutables): sin ella, la búsqueda sobre la copia no vería las repeticiones de la partida.
+        """
+        nueva = Posicion()
+        nueva.casillas = self.casillas[:]
+        nueva.turno = self.turno
+        nueva.enroques = self.enroques
+        nueva.al_paso = self.al_paso
+        nueva.regla50 = self.regla50
+        nueva.ply = self.ply
+        nueva.reyes = self.reyes[:]
+        nueva.clave = self.clave
+        nueva.clave_peones = self.clave_peones
+        nueva.mg, nueva.eg, nueva.fase = self.mg, self.eg, self.fase
+        nueva._pila = self._pila[:]
+        return nueva
+
+    def _inicializarDerivados(self):
+        """
+        Calcula desde cero el estado derivado de `casillas`: casilla de cada rey, claves Zobrist
+        y sumas incrementales de la evaluación.
+        """
+        self.reyes = [-1, -1]
+        for casilla, codigo in enumerate(self.casillas):
+            if codigo & 7 == REY:
+                self.reyes[codigo >> 3] = casilla
+        self.clave = self.calcular_clave()
+        self.clave_peones = self.calcular_clave_peones()
+        self.mg, self.eg, self.fase = self.calcular_sumas_evaluacion()
+
+    def calcular_sumas_evaluacion(self) -> Tuple[int, int, int]:
+        """
+        Calcula recorriendo el tablero las sumas (mg, eg, fase) que `hacer_movimiento`
+        mantiene de forma incremental.
+        """
+        mg = eg = fase = 0
+        for casilla, codigo in enumerate(self.casillas):
+            if codigo:
+                mg += TABLA_MG[codigo][casilla]
+                eg += TABLA_EG[codigo][casilla]
+                fase += FASE_PIEZA[codigo]
+        return mg, eg, fase
+
+    def calcular_clave(self) -> int:
+        """
+        Calcula la clave Zobrist recorriendo el tablero (la búsqueda usa la versión incremental, `clave`).
+        La columna al paso solo forma parte de la clave si un peón del bando que mueve puede capturar.
+        """
+        clave = 0
+        for casilla, codigo in enumerate(self.casillas):
+            if codigo:
+                clave ^= ZOBRIST_PIEZA[codigo][casilla]
+        clave ^= ZOBRIST_ENROQUE[self.enroques]
+        if self._alPasoCapturable():
+            clave ^= ZOBRIST_AL_PASO[self.al_paso & 7]
+        if self.turno == BLANCO:
+            clave ^= ZOBRIST_TURNO
+        return clave
+
+    def calcular_clave_peones(self) -> int:
+        """
+        Calcula la clave Zobrist de los peones recorriendo el tablero (la búsqueda usa `clave_peones`).
+        """
+        clave = 0
+        for casilla, codigo in enumerate(self.casillas):
+            if codigo & 7 == PEON:
+                clave ^= ZOBRIST_PIEZA[codigo][casilla]
+        return clave
+
+    def _alPasoCapturable(self) -> bool:
+        """
+        Indica si hay objetivo al paso y un peón del bando que mueve junto al peón que avanzó dos casillas
+        (criterio Polyglot: no comprueba clavadas).
+        """
+        if self.al_paso < 0:
+            return False
+        peon = (self.turno << 3) | PEON
+        for origen in ATAQUES_PEON[self.turno ^ 1][self.al_paso]:
+            if self.casillas[origen] == peon:
+                return True
+        return False
+
+    def es_repeticion(self) -> bool:
+        """
+        Indica si la posición actual ya apareció desde el último movimiento irreversible
+        (solo entre los movimientos aplicados sobre esta `Posicion`).
+        """
+        pila = self._pila
+        limite = max(0, len(pila) - self.regla50)
+        for indice in range(len(pila) - 2, limite - 1, -2):
+            if pila[indice][5] == self.clave:
+                return True
+        return False
+
+    # ============================================================
+    # 2. Conversión de Movimientos
+    # ============================================================
+
+    def movimiento_desde_tupla(self, origen: Tuple[int, int], destino: Tuple[int, int],
+                               promocion: Optional[str] = None) -> Optional[int]:
+        """
+        Busca el movimiento legal que corresponde a coordenadas (fila, columna) de `Tablero`.
+
+        Args:
+            origen: Casilla de origen (fila, columna).
+            destino: Casilla de destino (fila, columna).
+            promocion: Letra de la pieza de promoción ('Q', 'R', 'B', 'N'); por defecto dama.
+
+        Returns:
+            El entero del movimiento, o None si no es legal en esta posición.
+        """
+        o = origen[0] * 8 + origen[1]
+        d = destino[0] * 8 + destino[1]
+        tipo_promocion = TipoPieza.desde_letra(promocion) if promocion else REINA
+        for movimiento in self.generar_movimientos_legales():
+            if movimiento & 63 == o and (movimiento >> 6) & 63 == d:
+                promo = (movimiento >> 12) & 7
+                if promo == 0 or promo == tipo_promocion:
+                    return movimiento
+        return None
+
+    def movimiento_desde_uci(self, texto: str) -> Optional[int]:
+        """
+        Busca el movimiento legal que corresponde a una cadena UCI ('e2e4', 'e7e8q').
+        """
+        if len(texto) not in (4, 5):
+            return None
+        origen = casilla_desde_algebraica(texto[0:2])
+        destino = casilla_desde_algebraica(texto[2:4])
+        return self.movimiento_desde_tupla(divmod(origen, 8), divmod(destino, 8),
+                                           texto[4].upper() if len(texto) == 5 else None)
+
+    def movimiento_desde_san(self, texto: str) -> Optional[int]:
+        """
+        Busca el movimiento legal que corresponde a notación algebraica estándar (SAN),
+        por ejemplo 'e4', 'Nbd7', 'exd6', 'e8=Q+', 'O-O-O'. Ignora las marcas de jaque y anotación.
+
+        Returns:
+            El entero del movimiento, o None si no es legal o el texto es ambiguo o no válido.
+        """
+        texto = texto.rstrip('+#!?')
+        if texto in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+            rey = self.reyes[self.turno]
+            destino = rey + 2 if len(texto) == 3 else rey - 2
+            for movimiento in self.generar_movimientos_legales():
+                if movimiento >> 15 == ESPECIAL_ENROQUE and (movimiento >> 6) & 63 == destino:
+                    return movimiento
+            return None
+        promocion = 0
+        if '=' in texto:
+            texto, letra = texto.split('=', 1)
+            promocion = int(TipoPieza.desde_letra(letra[:1])) if letra[:1] in 'NBRQ' and letra else -1
+        elif len(texto) > 2 and texto[-1] in 'NBRQ' and texto[-2] in '18':
+            promocion = int(TipoPieza.desde_letra(texto[-1]))
+            texto = texto[:-1]
+        tipo = PEON
+        if texto[:1] in ('N', 'B', 'R', 'Q', 'K'):
+            tipo = int(TipoPieza.desde_letra(texto[0]))
+            texto = texto[1:]
+        texto = texto.replace('x', '').replace('-', '')
+        if promocion < 0 or len(texto) < 2:
+            return None
+        try:
+            destino = casilla_desde_algebraica(texto[-2:])
+        except ValueError:
+            return None
+        desambiguacion = texto[:-2]
+        if tipo == PEON and not desambiguacion:
+            desambiguacion = texto[-2] # Un avance de peón no cambia de columna
+        candidatos = []
+        for movimiento in self.generar_movimientos_legales():
+            origen = movimiento & 63
+            if (movimiento >> 6) & 63 != destino or self.casillas[origen] & 7 != tipo \
+                    or (movimiento >> 12) & 7 != promocion:
+                continue
+            nombre_origen = casilla_a_algebraica(origen)
+            if all(caracter in nombre_origen for caracter in desambiguacion):
+                candidatos.append(movimiento)
+        return candidatos[0] if len(candidatos) == 1 else None
+
+    # ============================================================
+    # 3. Ataques y Jaque
+    # ============================================================
+
+    def casilla_atacada(self, casilla: int, atacante: int) -> bool:
+        """
+        Indica si `casilla` está atacada por alguna pieza del color `atacante`.
+        """
+        c = self.casillas
+        base = atacante << 3
+        objetivo = base | CABALLO
+        for origen in SALTOS_CABALLO[casilla]:
+            if c[origen] == objetivo:
+                return True
+        # Un peón atacante ataca `casilla` desde las casillas que atacaría un peón rival situado en ella
+        objetivo = base | PEON
+        for origen in ATAQUES_PEON[atacante ^ 1][casilla]:
+            if c[origen] == objetivo:
+                return True
+        objetivo = base | REY
+        for origen in SALTOS_REY[casilla]:
+            if c[origen] == objetivo:
+                return True
+        reina = base | REINA
+        objetivo = base | TORRE
+        for rayo in RAYOS_ORTOGONALES[casilla]:
+            for origen in rayo:
+                codigo = c[origen]
+                if codigo:
+                    if codigo == objetivo or codigo == reina:
+                        return True
+                    break
+        objetivo = base | ALFIL
+        for rayo in RAYOS_DIAGONALES[casilla]:
+            for origen in rayo:
+                codigo = c[origen]
+                if codigo:
+                    if codigo == objetivo or codigo == reina:
+                        return True
+                    break
+        return False
+
+    def en_jaque(self) -> bool:
+        """
+        Indica si el bando al que le toca mover está en jaque.
+        """
+        return self.casilla_atacada(self.reyes[self.turno], self.turno ^ 1)
+
+    # ============================================================
+    # 4. Generación de Movimientos
+    # ============================================================
+
+    def generar_movimientos(self) -> List[int]:
+        """
+        Genera los movimientos pseudo-legales del bando al que le toca mover
+        (pueden dejar al propio rey en jaque; ver `es_legal_tras_hacer`).
+        """
+        movimientos: List[int] = []
+        agregar = movimientos.append
+        c = self.casillas
+        turno = self.turno
+        rival = turno ^ 1
+        for origen in range(64):
+            codigo = c[origen]
+            if not codigo or codigo >> 3 != turno:
+                continue
+            tipo = codigo & 7
+            if tipo == PEON:
+                self._generarPeon(origen, movimientos, solo_capturas=False)
+            elif tipo == CABALLO or tipo == REY:
+                for destino in (SALTOS_CABALLO if tipo == CABALLO else SALTOS_REY)[origen]:
+                    ocupante = c[destino]
+                    if not ocupante or ocupante >> 3 == rival:
+                        agregar(origen | (destino << 6))
+            else:
+                rayos = ()
+                if tipo != ALFIL:
+                    rayos = RAYOS_ORTOGONALES[origen]
+                if tipo != TORRE:
+                    rayos = rayos + RAYOS_DIAGONALES[origen]
+                for rayo in rayos:
+                    for destino in rayo:
+                        ocupante = c[destino]
+                        if ocupante:
+                            if ocupante >> 3 == rival:
+                                agregar(origen | (destino << 6))
+                            break
+                        agregar(origen | (destino << 6))
+        self._generarEnroques(movimientos)
+        return movimientos
+
+    def generar_capturas(self) -> List[int]:
+        """
+        Genera solo capturas (incluida al paso) y promociones pseudo-legales,
+        sin recorrer los movimientos tranquilos.
+        """
+        movimientos: List[int] = []
+        agregar = movimientos.append
+        c = self.casillas
+        turno = self.turno
+        rival = turno ^ 1
+        for origen in range(64):
+            codigo = c[origen]
+            if not codigo or codigo >> 3 != turno:
+                continue
+            tipo = codigo & 7
+            if tipo == PEON:
+                self._generarPeon(origen, movimientos, solo_capturas=True)
+            elif tipo == CABALLO or tipo == REY:
+                for destino in (SALTOS_CABALLO if tipo == CABALLO else SALTOS_REY)[origen]:
+                    ocupante = c[destino]
+                    if ocupante and ocupante >> 3 == rival:
+                        agregar(origen | (destino << 6))
+            else:
+                rayos = ()
+                if tipo != ALFIL:
+                    rayos = RAYOS_ORTOGONALES[origen]
+                if tipo != TORRE:
+                    rayos = rayos + RAYOS_DIAGONALES[origen]
+                for rayo in rayos:
+                    for destino in rayo:
+                        ocupante = c[destino]
+                        if ocupante:
+                            if ocupante >> 3 == rival:
+                                agregar(origen | (destino << 6))
+                            break
+        return movimientos
+
+    def _generarPeon(self, origen: int, movimientos: List[int], solo_capturas: bool):
+        """
+        Añade los movimientos de un peón: avances (salvo `solo_capturas`, aunque las promociones
+        por avance se generan siempre), capturas, al paso y promociones.
+        """
+        c = self.casillas
+        turno = self.turno
+        paso = 8 if turno == BLANCO else -8
+        fila = origen >> 3
+        fila_promocion = 6 if turno == BLANCO else 1 # Fila de origen desde la que se promociona
+        promociona = fila == fila_promocion
+        destino = origen + paso
+        if not c[destino]:
+            if promociona:
+                for tipo in _PROMOCIONES:
+                    movimientos.append(origen | (destino << 6) | (tipo << 12))
+            elif not solo_capturas:
+                movimientos.append(origen | (destino << 6))
+                if fila == (1 if turno == BLANCO else 6) and not c[destino + paso]:
+                    movimientos.append(origen | ((destino + paso) << 6) | (ESPECIAL_DOBLE_AVANCE << 15))
+        rival = turno ^ 1
+        for destino in ATAQUES_PEON[turno][origen]:
+            ocupante = c[destino]
+            if ocupante and ocupante >> 3 == rival:
+                if promociona:
+                    for tipo in _PROMOCIONES:
+                        movimientos.append(origen | (destino << 6) | (tipo << 12))
+                else:
+                    movimientos.append(origen | (destino << 6))
+            elif destino == self.al_paso:
+                movimientos.append(origen | (destino << 6) | (ESPECIAL_AL_PASO << 15))
+
+    def _generarEnroques(self, movimientos: List[int]):
+        """
+        Añade los enroques disponibles: derechos intactos, casillas intermedias libres
+        y rey que no está en jaque ni atraviesa casillas atacadas.
+        """
+        if self.turno == BLANCO:
+            derechos = self.enroques & (ENROQUE_BLANCO_CORTO | ENROQUE_BLANCO_LARGO)
+            rey, corto, largo = 4, ENROQUE_BLANCO_CORTO, ENROQUE_BLANCO_LARGO
+        else:
+            derechos = self.enroques & (ENROQUE_NEGRO_CORTO | ENROQUE_NEGRO_LARGO)
+            rey, corto, largo = 60, ENROQUE_NEGRO_CORTO, ENROQUE_NEGRO_LARGO
+        if not derechos or self.reyes[self.turno] != rey:
+            return
+        c = self.casillas
+        rival = self.turno ^ 1
+        torre = (self.turno << 3) | TORRE
+        if derechos & corto and not c[rey + 1] and not c[rey + 2] and c[rey + 3] == torre:
+            if not self.casilla_atacada(rey, rival) and not self.casilla_atacada(rey + 1, rival) \
+                    and not self.casilla_atacada(rey + 2, rival):
+                movimientos.append(rey | ((rey + 2) << 6) | (ESPECIAL_ENROQUE << 15))
+        if derechos & largo and not c[rey - 1] and not c[rey - 2] and not c[rey - 3] and c[rey - 4] == torre:
+            if not self.casilla_atacada(rey, rival) and not self.casilla_atacada(rey - 1, rival) \
+                    and not self.casilla_atacada(rey - 2, rival):
+                movimientos.append(rey | ((rey - 2) << 6) | (ESPECIAL_ENROQUE << 15))
+
+    def generar_movimientos_legales(self) -> List[int]:
+        """
+        Genera los movimientos legales (filtra los pseudo-legales con make/unmake).
+        """
+        legales = []
+        for movimiento in self.generar_movimientos():
+            if self.hacer_movimiento(movimiento):
+                legales.append(movimiento)
+            self.deshacer_movimiento()
+        return legales
+
+    # ============================================================
+    # 5. Make / Unmake
+    # ============================================================
+
+    def hacer_movimiento(self, movimiento: int) -> bool:
+        """
+        Aplica un movimiento pseudo-legal en el sitio. Siempre debe seguirse de
+        `deshacer_movimiento`, aunque el movimiento resulte ilegal.
+
+        Returns:
+            True si el movimiento es legal (no deja al propio rey atacado).
+        """
+        c = self.casillas
+        origen = movimiento & 63
+        destino = (movimiento >> 6) & 63
+        especial = movimiento >> 15
+        pieza = c[origen]
+        capturada = c[destino]
+        turno = self.turno
+        clave = self.clave
+        self._pila.append((movimiento, capturada, self.enroques, self.al_paso, self.regla50, clave,
+                           self.mg, self.eg, self.fase, self.clave_peones))
+
+        if self.al_paso >= 0 and self._alPasoCapturable():
+            clave ^= ZOBRIST_AL_PASO[self.al_paso & 7]
+        claves_pieza = ZOBRIST_PIEZA[pieza]
+        clave ^= claves_pieza[origen] ^ claves_pieza[destino]
+        tabla_mg = TABLA_MG[pieza]
+        tabla_eg = TABLA_EG[pieza]
+        mg = self.mg + tabla_mg[destino] - tabla_mg[origen]
+        eg = self.eg + tabla_eg[destino] - tabla_eg[origen]
+        if capturada:
+            clave ^= ZOBRIST_PIEZA[capturada][destino]
+            mg -= TABLA_MG[capturada][destino]
+            eg -= TABLA_EG[capturada][destino]
+            self.fase -= FASE_PIEZA[capturada]
+        c[destino] = pieza
+        c[origen] = 0
+        tipo = pieza & 7
+        if tipo == PEON:
+            self.clave_peones ^= claves_pieza[origen] ^ claves_pieza[destino]
+        if capturada & 7 == PEON:
+            self.clave_peones ^= ZOBRIST_PIEZA[capturada][destino]
+        if especial == ESPECIAL_AL_PASO:
+            casilla_capturada = destino - 8 if turno == BLANCO else destino + 8
+            peon = c[casilla_capturada]
+            clave ^= ZOBRIST_PIEZA[peon][casilla_capturada]
+            self.clave_peones ^= ZOBRIST_PIEZA[peon][casilla_capturada]
+            mg -= TABLA_MG[peon][casilla_capturada]
+            eg -= TABLA_EG[peon][casilla_capturada]
+            c[casilla_capturada] = 0
+        elif especial == ESPECIAL_ENROQUE:
+            torre_origen, torre_destino = (origen + 3, origen + 1) if destino > origen else (origen - 4, origen - 1)
+            torre = c[torre_origen]
+            clave ^= ZOBRIST_PIEZA[torre][torre_origen] ^ ZOBRIST_PIEZA[torre][torre_destino]
+            mg += TABLA_MG[torre][torre_destino] - TABLA_MG[torre][torre_origen]
+            eg += TABLA_EG[torre][torre_destino] - TABLA_EG[torre][torre_origen]
+            c[torre_destino] = torre
+            c[torre_origen] = 0
+        promocion = (movimiento >> 12) & 7
+        if promocion:
+            nueva = (turno << 3) | promocion
+            clave ^= claves_pieza[destino] ^ ZOBRIST_PIEZA[nueva][destino]
+            self.clave_peones ^= claves_pieza[destino] # El peón promocionado sale de la estructura
+            mg += TABLA_MG[nueva][destino] - tabla_mg[destino]
+            eg += TABLA_EG[nueva][destino] - tabla_eg[destino]
+            self.fase += FASE_PIEZA[nueva]
+            c[destino] = nueva
+        if tipo == REY:
+            self.reyes[turno] = destino
+        enroques = self.enroques & MASCARA_ENROQUE[origen] & MASCARA_ENROQUE[destino]
+        clave ^= ZOBRIST_ENROQUE[self.enroques] ^ ZOBRIST_ENROQUE[enroques]
+        self.enroques = enroques
+        self.regla50 = 0 if tipo == PEON or capturada else self.regla50 + 1
+        self.turno = turno ^ 1
+        clave ^= ZOBRIST_TURNO
+        if especial == ESPECIAL_DOBLE_AVANCE:
+            self.al_paso = (origen + destino) >> 1
+            if self._alPasoCapturable():
+                clave ^= ZOBRIST_AL_PASO[destino & 7]
+        else:
+            self.al_paso = -1
+        self.clave = clave
+        self.mg = mg
+        self.eg = eg
+        self.ply += 1
+        return not self.casilla_atacada(self.reyes[turno], turno ^ 1)
+
+    def deshacer_movimiento(self):
+        """
+        Deshace el último movimiento aplicado con `hacer_movimiento`.
+        """
+        (movimiento, capturada, self.enroques, self.al_paso, self.regla50, self.clave,
+         self.mg, self.eg, self.fase, self.clave_peones) = self._pila.pop()
+        self.ply -= 1
+        turno = self.turno ^ 1
+        self.turno = turno
+        c = self.casillas
+        origen = movimiento & 63
+        destino = (movimiento >> 6) & 63
+        especial = movimiento >> 15
+        pieza = c[destino]
+        if (movimiento >> 12) & 7:
+            pieza = (turno << 3) | PEON
+        c[origen] = pieza
+        c[destino] = capturada
+        if pieza & 7 == REY:
+            self.reyes[turno] = origen
+        if especial == ESPECIAL_AL_PASO:
+            c[destino - 8 if turno == BLANCO else destino + 8] = ((turno ^ 1) << 3) | PEON
+        elif especial == ESPECIAL_ENROQUE:
+            if destino > origen:
+                c[origen + 3] = c[origen + 1]
+                c[origen + 1] = 0
+            else:
+                c[origen - 4] = c[origen - 1]
+                c[origen - 1] = 0
+
+    def hacer_movimiento_nulo(self):
+        """
+        Pasa el turno sin mover (para la poda de movimiento nulo). Debe seguirse de
+        `deshacer_movimiento_nulo`. No se buscan repeticiones a través del movimiento nulo.
+        """
+        clave = self.clave
+        self._pila.append((0, 0, self.enroques, self.al_paso, self.regla50, clave, self.mg, self.eg, self.fase,
+                           self.clave_peones))
+        if self.al_paso >= 0 and self._alPasoCapturable():
+            clave ^= ZOBRIST_AL_PASO[self.al_paso & 7]
+        self.al_paso = -1
+        self.regla50 = 0
+        self.turno ^= 1
+        self.clave = clave ^ ZOBRIST_TURNO
+        self.ply += 1
+
+    def deshacer_movimiento_nulo(self):
+        """
+        Deshace el último `hacer_movimiento_nulo`.
+        """
+        _, _, self.enroques, self.al_paso, self.regla50, self.clave, _, _, _, _ = self._pila.pop()
+        self.turno ^= 1
+        self.ply -= 1
+
+    def tiene_piezas(self, color: int) -> bool:
+        """
+        Indica si `color` tiene alguna pieza además del rey y los peones (sin ellas el
+        zugzwang es frecuente y el movimiento nulo no es fiable).
+        """
+        for codigo in self.casillas:
+            if codigo and codigo >> 3 == color and CABALLO <= codigo & 7 <= REINA:
+                return True
+        return False
+
+    def pieza_capturada(self, movimiento: int) -> int:
+        """
+        Devuelve el código de la pieza que captura `movimiento` (0 si no captura).
+        """
+        if movimiento >> 15 == ESPECIAL_AL_PASO:
+            return ((self.turno ^ 1) << 3) | PEON
+        return self.casillas[(movimiento >> 6) & 63]
+
+
+def casilla_desde_algebraica(texto: str) -> int:
+    """
+    Convierte una casilla algebraica ('e4') a su índice 0-63.
+
+    Raises:
+        ValueError: Si el texto no es una casilla válida.
+    """
+    if len(texto) != 2 or texto[0] not in 'abcdefgh' or texto[1] not in '12345678':
+        raise ValueError(f"Casilla no válida: {texto!r}")
+    return (int(texto[1]) - 1) * 8 + 'abcdefgh'.index(texto[0])
+
+
+def casilla_a_algebraica(casilla: int) -> str:
+    """
+    Convierte un índice 0-63 a notación algebraica ('e4').
+    """
+    return 'abcdefgh'[casilla & 7] + str((casilla >> 3) + 1)
+
+
+def movimiento_a_uci(movimiento: int) -> str:
+    """
+    Devuelve la notación UCI de un movimiento ('e2e4', 'e7e8q').
+    """
+    texto = casilla_a_algebraica(movimiento & 63) + casilla_a_algebraica((movimiento >> 6) & 63)
+    promocion = (movimiento >> 12) & 7
+    return texto + TipoPieza(promocion).a_letra().lower() if promocion else texto
+
+
+def movimiento_a_tupla(movimiento: int) -> Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]:
+    """
+    Convierte un movimiento a coordenadas de `Tablero`: (origen, destino, letra de promoción o None).
+    """
+    promocion = (movimiento >> 12) & 7
+    return (divmod(movimiento & 63, 8), divmod((movimiento >> 6) & 63, 8),
+            TipoPieza(promocion).a_letra() if promocion else None)
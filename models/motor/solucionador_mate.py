@@ -0,0 +1,322 @@
+"""
+Define el solucionador de mates en N jugadas y su modo por lotes para problemas EPD.
+
+A diferencia del buscador general, el bando atacante solo prueba jugadas que dan jaque y
+el defensor prueba todas sus respuestas, así que el árbol es mucho más estrecho. La búsqueda
+es en profundidad con profundización iterativa (mate en 1, en 2, ...) y tabla de
+transposición propia con cotas probadas y refutadas por posición.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.motor.busqueda_interrumpida import BusquedaInterrumpida
+from models.motor.posicion import Posicion, movimiento_a_uci
+
+logger = logging.getLogger(__name__)
+
+# Cada cuántos nodos se comprueban el plazo y el presupuesto
+_MASCARA_COMPROBACION = 1023
+
+
+class SolucionadorMate:
+    """
+    Busca mates forzados en hasta N jugadas del bando que mueve (solo jaques del atacante).
+
+    La tabla de transposición guarda, por clave Zobrist:
+    - probadas: el menor N con el que se ha probado el mate (y la jugada del atacante);
+    - refutadas: el mayor N con el que se ha probado que no hay mate.
+    Como la clave incluye el turno, las posiciones del atacante y del defensor no se mezclan.
+    Las repeticiones y la regla de 50 movimientos se ignoran: con N acotado no hay ciclos.
+    """
+
+    def __init__(self):
+        self._probadas: Dict[int, Tuple[int, int]] = {}
+        self._refutadas: Dict[int, int] = {}
+        self.nodos = 0
+        self._limite_nodos: Optional[int] = None
+        self._plazo: Optional[float] = None
+
+    def resolver(self, posicion, max_jugadas: int = 5, tiempo_ms: Optional[int] = None,
+                 nodos_max: Optional[int] = None) -> Dict:
+        """
+        Busca el mate más corto en hasta `max_jugadas` jugadas del bando que mueve.
+
+        Args:
+            posicion: `Posicion` o `Tablero` (no se modifica).
+            max_jugadas: Máximo de jugadas del atacante (mate en N).
+            tiempo_ms: Plazo de reloj, o None sin plazo.
+            nodos_max: Presupuesto de nodos, o None sin límite.
+
+        Returns:
+            Diccionario con 'mate_en' (N o None), 'movimiento' y 'variante' (movimientos enteros,
+            con la defensa más larga), 'nodos', 'tiempo_ms' y 'completo' (False si se agotó el plazo
+            o el presupuesto antes de probar o refutar el mate en `max_jugadas`).
+        """
+        inicio = time.perf_counter()
+        posicion = posicion.copia() if isinstance(posicion, Posicion) else Posicion.desde_tablero(posicion)
+        self._probadas.clear()
+        self._refutadas.clear()
+        self.nodos = 0
+        self._limite_nodos = nodos_max
+        self._plazo = inicio + tiempo_ms / 1000.0 if tiempo_ms is not None else None
+        resultado = {'mate_en': None, 'movimiento': None, 'variante': [], 'nodos': 0, 'tiempo_ms': 0.0,
+                     'completo': True}
+        try:
+            for jugadas in range(1, max_jugadas + 1):
+                if self._atacante(posicion, jugadas):
+                    resultado['mate_en'] = jugadas
+                    break
+        except BusquedaInterrumpida:
+            resultado['completo'] = False
+        if resultado['mate_en'] is not None:
+            # El mate ya está probado: la variante se reconstruye sin límites (casi todo sale de
+            # la tabla) para no devolver un mate sin jugada si el límite se agota a medias
+            self._limite_nodos = self._plazo = None
+            resultado['variante'] = self._variante(posicion, resultado['mate_en'])
+            resultado['movimiento'] = resultado['variante'][0]
+        resultado['nodos'] = self.nodos
+        resultado['tiempo_ms'] = (time.perf_counter() - inicio) * 1000.0
+        logger.debug(f"Mate en {resultado['mate_en']}: {' '.join(movimiento_a_uci(m) for m in resultado['variante'])} "
+                     f"({self.nodos} nodos, {resultado['tiempo_ms']:.0f} ms)")
+        return resultado
+
+    def soluciones(self, posicion, jugadas: int, tiempo_ms: Optional[int] = None) -> List[int]:
+        """
+        Devuelve todas las primeras jugadas que dan mate en hasta `jugadas` jugadas (para
+        comprobar que un problema tiene solución única).
+
+        Raises:
+            TimeoutError: Si se agota el plazo antes de terminar.
+        """
+        posicion = posicion.copia() if isinstance(posicion, Posicion) else Posicion.desde_tablero(posicion)
+        self._limite_nodos = None
+        self._plazo = time.perf_counter() + tiempo_ms / 1000.0 if tiempo_ms is not None else None
+        encontradas = []
+        try:
+            for movimiento, _ in self._jaques(posicion):
+                posicion.hacer_movimiento(movimiento)
+                if self._defensor(posicion, jugadas - 1):
+                    encontradas.append(movimiento)
+                posicion.deshacer_movimiento()
+        except BusquedaInterrumpida:
+            raise TimeoutError("Plazo agotado al enumerar las soluciones") from None
+        return encontradas
+
+    # ============================================================
+    # 1. Búsqueda
+    # ============================================================
+
+    def _contarNodo(self):
+        """
+        Cuenta un nodo y comprueba periódicamente el plazo y el presupuesto.
+        """
+        self.nodos += 1
+        if self._limite_nodos is not None and self.nodos >= self._limite_nodos:
+            raise BusquedaInterrumpida()
+        if self._plazo is not None and not self.nodos & _MASCARA_COMPROBACION and time.perf_counter() >= self._plazo:
+            raise BusquedaInterrumpida()
+
+    def _jaques(self, posicion: Posicion) -> List[Tuple[int, int]]:
+        """
+        Jugadas legales del bando que mueve que dan jaque, con el número de respuestas legales
+        del rival, ordenadas de menos a más respuestas (las más forzantes primero).
+        """
+        jaques = []
+        for movimiento in posicion.generar_movimientos():
+            if posicion.hacer_movimiento(movimiento) and posicion.en_jaque():
+                jaques.append((len(posicion.generar_movimientos_legales()), movimiento))
+            posicion.deshacer_movimiento()
+        jaques.sort()
+        return [(movimiento, respuestas) for respuestas, movimiento in jaques]
+
+    def _atacante(self, posicion: Posicion, jugadas: int) -> bool:
+        """
+        Indica si el bando que mueve da mate en hasta `jugadas` jugadas.
+        """
+        clave = posicion.clave
+        probada = self._probadas.get(clave)
+        if probada is not None and probada[0] <= jugadas:
+            return True
+        if self._refutadas.get(clave, 0) >= jugadas:
+            return False
+        self._contarNodo()
+        for movimiento, _ in self._jaques(posicion):
+            posicion.hacer_movimiento(movimiento)
+            mate = self._defensor(posicion, jugadas - 1)
+            posicion.deshacer_movimiento()
+            if mate:
+                self._probadas[clave] = (jugadas, movimiento)
+                return True
+        self._refutadas[clave] = jugadas
+        return False
+
+    def _defensor(self, posicion: Posicion, jugadas: int) -> bool:
+        """
+        Indica si todas las respuestas del bando que mueve (en jaque) reciben mate en hasta
+        `jugadas` jugadas del atacante. Sin respuestas legales, es mate.
+        """
+        clave = posicion.clave
+        probada = self._probadas.get(clave)
+        if probada is not None and probada[0] <= jugadas:
+            return True
+        if self._refutadas.get(clave, -1) >= jugadas:
+            return False
+        self._contarNodo()
+        respuestas = posicion.generar_movimientos_legales()
+        if not respuestas:
+            self._probadas[clave] = (0, 0)
+            return True
+        if not jugadas:
+            self._refutadas[clave] = 0
+            return False
+        # Primero las respuestas que ya escaparon con este N (suelen volver a refutar)
+        refutadas = self._refutadas
+        respuestas.sort(key=lambda respuesta: -self._escapaTras(posicion, respuesta, refutadas, jugadas))
+        for respuesta in respuestas:
+            posicion.hacer_movimiento(respuesta)
+            mate = self._atacante(posicion, jugadas)
+            posicion.deshacer_movimiento()
+            if not mate:
+                self._refutadas[clave] = jugadas
+                return False
+        self._probadas[clave] = (jugadas, 0)
+        return True
+
+    @staticmethod
+    def _escapaTras(posicion: Posicion, respuesta: int, refutadas: Dict[int, int], jugadas: int) -> int:
+        """
+        1 si la posición tras `respuesta` ya está refutada con al menos `jugadas`, 0 si no.
+        """
+        posicion.hacer_movimiento(respuesta)
+        escapa = refutadas.get(posicion.clave, 0) >= jugadas
+        posicion.deshacer_movimiento()
+        return 1 if escapa else 0
+
+    def _variante(self, posicion: Posicion, jugadas: int) -> List[int]:
+        """
+        Reconstruye la variante del mate probado: la jugada del atacante guardada y, para el
+        defensor, la respuesta que más retrasa el mate.
+        """
+        variante = []
+        aplicados = 0
+        while jugadas > 0:
+            movimiento = self._probadas[posicion.clave][1]
+            variante.append(movimiento)
+            posicion.hacer_movimiento(movimiento)
+            aplicados += 1
+            mejor, mejor_jugadas = None, -1
+            for respuesta in posicion.generar_movimientos_legales():
+                posicion.hacer_movimiento(respuesta)
+                restantes = next(n for n in range(1, jugadas) if self._atacante(posicion, n))
+                posicion.deshacer_movimiento()
+                if restantes > mejor_jugadas:
+                    mejor, mejor_jugadas = respuesta, restantes
+            if mejor is None:
+                break # Mate dado
+            variante.append(mejor)
+            posicion.hacer_movimiento(mejor)
+            aplicados += 1
+            jugadas = mejor_jugadas
+        for _ in range(aplicados):
+            posicion.deshacer_movimiento()
+        return variante
+
+
+# ============================================================
+# Modo por Lotes (EPD)
+# ============================================================
+
+def leer_epd(linea: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    Interpreta una línea EPD: cuatro campos de FEN seguidos de operaciones `opcode operandos;`.
+
+    Returns:
+        (fen, operaciones) con los operandos sin comillas, o None si la línea está vacía o es un comentario.
+    """
+    linea = linea.strip()
+    if not linea or linea.startswith('#'):
+        return None
+    campos = linea.split(None, 4)
+    if len(campos) < 4:
+        raise ValueError(f"Línea EPD incompleta: {linea!r}")
+    fen = ' '.join(campos[:4]) + ' 0 1'
+    operaciones = {}
+    for operacion in (campos[4] if len(campos) > 4 else '').split(';'):
+        partes = operacion.strip().split(None, 1)
+        if partes:
+            operaciones[partes[0]] = partes[1].strip().strip('"') if len(partes) > 1 else ''
+    return fen, operaciones
+
+
+def _resolver_problema(argumentos: Tuple[int, str, int, Optional[int]]) -> Dict:
+    """
+    Resuelve un problema EPD (en un proceso del lote) y compara con 'dm' y 'bm' si los tiene.
+    """
+    numero, linea, max_jugadas, tiempo_ms = argumentos
+    fen, operaciones = leer_epd(linea)
+    posicion = Posicion.desde_fen(fen)
+    mate_en = int(operaciones['dm']) if operaciones.get('dm', '').isdigit() else None
+    solucionador = SolucionadorMate()
+    resultado = solucionador.resolver(posicion, max(max_jugadas, mate_en or 0), tiempo_ms)
+    esperadas = []
+    for san in operaciones.get('bm', '').split():
+        movimiento = posicion.movimiento_desde_san(san)
+        if movimiento is None:
+            logger.warning(f"Problema {numero}: se ignora la jugada 'bm' no válida {san!r}")
+        else:
+            esperadas.append(movimiento)
+    correcto = resultado['mate_en'] is not None and (mate_en is None or resultado['mate_en'] <= mate_en) \
+        and (not esperadas or resultado['movimiento'] in esperadas)
+    alternativas = []
+    if resultado['mate_en'] is not None:
+        try:
+            alternativas = [movimiento_a_uci(m) for m in solucionador.soluciones(posicion, resultado['mate_en'], tiempo_ms)
+                            if m != resultado['movimiento']]
+        except TimeoutError:
+            pass
+    return {'numero': numero, 'id': operaciones.get('id', str(numero)), 'fen': fen,
+            'mate_en': resultado['mate_en'], 'esperado': mate_en,
+            'variante': [movimiento_a_uci(m) for m in resultado['variante']],
+            'correcto': correcto, 'alternativas': alternativas, 'completo': resultado['completo'],
+            'nodos': resultado['nodos'], 'tiempo_ms': resultado['tiempo_ms']}
+
+
+def resolver_lote(lineas: Iterable[str], max_jugadas: int = 5, tiempo_ms: Optional[int] = None,
+                  procesos: Optional[int] = None) -> Dict:
+    """
+    Resuelve un archivo EPD de problemas de mate en un pool de procesos.
+
+    Args:
+        lineas: Líneas EPD (con 'dm' y/o 'bm' opcionales para validar la solución).
+        max_jugadas: Máximo de jugadas buscadas por problema (se amplía a 'dm' si es mayor).
+        tiempo_ms: Plazo por problema.
+        procesos: Procesos del pool (por defecto, uno por núcleo).
+
+    Returns:
+        Diccionario con 'problemas', 'resueltos', 'correctos', 'tasa_resueltos', 'tasa_correctos',
+        'con_alternativas' (problemas con más de una primera jugada ganadora), 'tiempo_s' y
+        'resultados' (uno por problema, en el orden del archivo).
+    """
+    inicio = time.perf_counter()
+    trabajos = [(numero, linea, max_jugadas, tiempo_ms) for numero, linea in enumerate(lineas, 1)
+                if leer_epd(linea) is not None]
+    procesos = max(1, procesos or os.cpu_count() or 1)
+    if procesos > 1 and len(trabajos) > 1:
+        with multiprocessing.get_context().Pool(min(procesos, len(trabajos))) as pool:
+            resultados = pool.map(_resolver_problema, trabajos, chunksize=1)
+    else:
+        resultados = [_resolver_problema(trabajo) for trabajo in trabajos]
+    total = len(resultados)
+    resueltos = sum(1 for r in resultados if r['mate_en'] is not None)
+    correctos = sum(1 for r in resultados if r['correcto'])
+    informe = {'problemas': total, 'resueltos': resueltos, 'correctos': correctos,
+               'tasa_resueltos': resueltos / total if total else 0.0,
+               'tasa_correctos': correctos / total if total else 0.0,
+               'con_alternativas': sum(1 for r in resultados if r['alternativas']),
+               'tiempo_s': time.perf_counter() - inicio, 'resultados': resultados}
+    logger.info(f"Lote de mates: {resueltos}/{total} resueltos, {correctos} correctos en {informe['tiempo_s']:.1f} s")
+    return informe
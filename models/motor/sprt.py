@@ -0,0 +1,122 @@
+"""
+Define el test secuencial de razón de verosimilitudes (SPRT) para decidir, partida a partida,
+si un cambio en el motor lo hace más fuerte.
+"""
+
+import math
+from typing import Dict, Optional
+
+# Pseudo-partidas previas de cada resultado (victoria, tablas, derrota) al estimar puntuación y varianza
+_CUENTA_PREVIA = 0.5
+
+
+def puntuacion_a_elo(puntuacion: float) -> float:
+    """
+    Convierte una puntuación esperada (0..1) en diferencia de Elo (modelo logístico).
+    """
+    puntuacion = min(max(puntuacion, 1e-6), 1 - 1e-6)
+    return -400.0 * math.log10(1.0 / puntuacion - 1.0)
+
+
+def elo_a_puntuacion(elo: float) -> float:
+    """
+    Convierte una diferencia de Elo en puntuación esperada (modelo logístico).
+    """
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+class SPRT:
+    """
+    SPRT entre H0 (la diferencia de Elo es `elo0`) y H1 (es `elo1`) sobre victorias, tablas y
+    derrotas, con la aproximación normal del cociente de verosimilitudes (GSPRT trinomial):
+
+        LLR = N·(s1 - s0)·(2·s - s0 - s1) / (2·varianza)
+
+    donde s es la puntuación media observada y s0, s1 las esperadas bajo cada hipótesis.
+    Se acepta H1 cuando LLR ≥ ln((1-β)/α) y H0 cuando LLR ≤ ln(β/(1-α)).
+    """
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 10.0, alfa: float = 0.05, beta: float = 0.05):
+        """
+        Args:
+            elo0: Diferencia de Elo de la hipótesis nula (el cambio no mejora).
+            elo1: Diferencia de Elo de la hipótesis alternativa (el cambio mejora).
+            alfa: Probabilidad de aceptar H1 siendo cierta H0 (falso positivo).
+            beta: Probabilidad de aceptar H0 siendo cierta H1 (falso negativo).
+        """
+        if elo1 <= elo0:
+            raise ValueError("elo1 debe ser mayor que elo0")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.limite_inferior = math.log(beta / (1.0 - alfa))
+        self.limite_superior = math.log((1.0 - beta) / alfa)
+        self.victorias = 0
+        self.tablas = 0
+        self.derrotas = 0
+
+    @property
+    def partidas(self) -> int:
+        """
+        Partidas registradas.
+        """
+        return self.victorias + self.tablas + self.derrotas
+
+    def registrar(self, puntos: float):
+        """
+        Registra el resultado de una partida desde el punto de vista del motor probado (1, 0.5 o 0).
+        """
+        if puntos == 1:
+            self.victorias += 1
+        elif puntos == 0:
+            self.derrotas += 1
+        elif puntos == 0.5:
+            self.tablas += 1
+        else:
+            raise ValueError(f"Resultado no válido: {puntos}")
+
+    def _puntuacionYVarianza(self):
+        """
+        Puntuación media por partida y su varianza (por partida), con media pseudo-partida previa
+        de cada resultado: sin ella, las primeras partidas (p. ej. dos victorias, varianza nula)
+        dan un LLR enorme y el test decide al azar; con ella, las tasas de error simuladas
+        quedan en α y β.
+        """
+        victorias, tablas, derrotas = (cuenta + _CUENTA_PREVIA for cuenta in (self.victorias, self.tablas, self.derrotas))
+        n = victorias + tablas + derrotas
+        puntuacion = (victorias + 0.5 * tablas) / n
+        varianza = (victorias * (1.0 - puntuacion) ** 2 + tablas * (0.5 - puntuacion) ** 2
+                    + derrotas * puntuacion ** 2) / n
+        return puntuacion, varianza
+
+    def llr(self) -> float:
+        """
+        Logaritmo del cociente de verosimilitudes con los resultados registrados (0 sin partidas).
+        """
+        if self.partidas == 0:
+            return 0.0
+        puntuacion, varianza = self._puntuacionYVarianza()
+        s0, s1 = elo_a_puntuacion(self.elo0), elo_a_puntuacion(self.elo1)
+        return self.partidas * (s1 - s0) * (2.0 * puntuacion - s0 - s1) / (2.0 * varianza)
+
+    def decision(self) -> Optional[str]:
+        """
+        Returns:
+            'H1' si el cambio es mejor, 'H0' si no lo es, o None si hacen falta más partidas.
+        """
+        llr = self.llr()
+        if llr >= self.limite_superior:
+            return 'H1'
+        if llr <= self.limite_inferior:
+            return 'H0'
+        return None
+
+    def estimacion_elo(self) -> Dict[str, float]:
+        """
+        Diferencia de Elo observada con su intervalo de confianza del 95 %.
+        """
+        if self.partidas == 0:
+            return {'elo': 0.0, 'minimo': -math.inf, 'maximo': math.inf}
+        puntuacion, varianza = self._puntuacionYVarianza()
+        margen = 1.96 * math.sqrt(varianza / self.partidas)
+        return {'elo': puntuacion_a_elo(puntuacion), 'minimo': puntuacion_a_elo(puntuacion - margen),
+                'maximo': puntuacion_a_elo(puntuacion + margen)}
@@ -0,0 +1,86 @@
+"""
+Define la tabla de estructura de peones del evaluador: caché acotada indexada por la
+clave Zobrist de los peones (`Posicion.clave_peones`).
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Entradas por defecto (potencia de dos): la estructura de peones cambia poco dentro de una búsqueda
+ENTRADAS_POR_DEFECTO = 1 << 14
+
+
+class TablaPeones:
+    """
+    Caché de la estructura de peones. Los términos de peones (doblados, aislados, pasados)
+    solo cambian al mover o capturar un peón, así que la misma estructura se repite en casi
+    todos los nodos de una búsqueda y la tabla evita recorrer el tablero para calcularlos.
+
+    Cada entrada guarda (clave, mg, eg, pasados_blancos, pasados_negros); los pasados son
+    máscaras de bits de casillas. Se indexa por los bits bajos de la clave y se reemplaza siempre.
+    """
+
+    def __init__(self, entradas: int = ENTRADAS_POR_DEFECTO):
+        """
+        Args:
+            entradas: Número de entradas (se redondea a la potencia de dos inferior).
+
+        Raises:
+            ValueError: Si el número de entradas no es positivo.
+        """
+        if entradas <= 0:
+            raise ValueError(f"Número de entradas de la tabla de peones no válido: {entradas}")
+        self.num_entradas = 1 << (entradas.bit_length() - 1)
+        self._mascara = self.num_entradas - 1
+        self._entradas: List[Optional[Tuple[int, int, int, int, int]]] = [None] * self.num_entradas
+        self.sondeos = 0
+        self.aciertos = 0
+
+    def sondear(self, clave: int) -> Optional[Tuple[int, int, int, int, int]]:
+        """
+        Busca la estructura de peones con clave `clave`.
+
+        Returns:
+            La entrada (clave, mg, eg, pasados_blancos, pasados_negros) o None si no está.
+        """
+        self.sondeos += 1
+        entrada = self._entradas[clave & self._mascara]
+        if entrada is not None and entrada[0] == clave:
+            self.aciertos += 1
+            return entrada
+        return None
+
+    def guardar(self, clave: int, mg: int, eg: int, pasados_blancos: int, pasados_negros: int) -> Tuple:
+        """
+        Guarda una estructura de peones (reemplazando la que ocupe su entrada) y devuelve la entrada.
+        """
+        entrada = (clave, mg, eg, pasados_blancos, pasados_negros)
+        self._entradas[clave & self._mascara] = entrada
+        return entrada
+
+    def limpiar(self):
+        """
+        Vacía la tabla y reinicia las estadísticas.
+        """
+        self._entradas = [None] * self.num_entradas
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        """
+        Pone a cero los contadores de sondeos y aciertos.
+        """
+        self.sondeos = 0
+        self.aciertos = 0
+
+    def estadisticas(self) -> Dict:
+        """
+        Devuelve 'entradas', 'sondeos', 'aciertos' y 'tasa_aciertos'.
+        """
+        return {
+            'entradas': self.num_entradas,
+            'sondeos': self.sondeos,
+            'aciertos': self.aciertos,
+            'tasa_aciertos': self.aciertos / self.sondeos if self.sondeos else 0.0,
+        }
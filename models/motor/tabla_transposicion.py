@@ -0,0 +1,203 @@
+"""
+Define la tabla de transposición del motor: memoria acotada y preasignada,
+indexada por la clave Zobrist de la posición.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tipos de cota de la puntuación guardada
+COTA_EXACTA = 1
+COTA_INFERIOR = 2 # La búsqueda falló alto (puntuación >= beta)
+COTA_SUPERIOR = 3 # La búsqueda falló bajo (puntuación <= alfa)
+
+# Bytes por entrada: clave combinada con los datos (8) + datos empaquetados (8)
+BYTES_POR_ENTRADA = 16
+# Entradas por cubeta: [0] se reemplaza por profundidad, [1] se reemplaza siempre
+ENTRADAS_POR_CUBETA = 2
+# Las banderas guardan el tipo de cota en los 2 bits bajos y la edad en los 6 altos
+_MASCARA_EDAD = 63
+# Entradas que se muestrean para estimar la ocupación
+_MUESTRA_OCUPACION = 2000
+# Datos empaquetados en 64 bits: movimiento (24), puntuación con signo (24), profundidad con
+# signo (8) y banderas (8)
+_MASCARA_24 = 0xFFFFFF
+_SIGNO_24 = 0x800000
+
+
+class TablaTransposicion:
+    """
+    Tabla de transposición con dos arrays paralelos preasignados sobre un único buffer de
+    tamaño fijo: los datos de cada entrada (movimiento, puntuación, profundidad y banderas)
+    empaquetados en una palabra de 64 bits, y la clave combinada con ellos por XOR.
+
+    Cada clave se asigna a una cubeta de dos entradas:
+    - la primera conserva la búsqueda más profunda (se reemplaza si la nueva es al menos
+      igual de profunda o si la guardada es de una búsqueda anterior);
+    - la segunda se reemplaza siempre.
+    La edad se incrementa entre jugadas (`nueva_busqueda`) para que las entradas antiguas
+    se desalojen aunque sean profundas.
+
+    La combinación por XOR hace la tabla segura sin cerrojos en la búsqueda paralela, donde
+    varios procesos escriben a la vez en la misma memoria compartida: si otro proceso
+    reescribe la entrada entre la lectura de la clave y la de los datos, `clave ^ datos` ya no
+    coincide con la clave buscada y el sondeo falla en vez de devolver la puntuación y la
+    cota de otra posición.
+    """
+
+    def __init__(self, tamano_mb: float = 16, buffer=None):
+        """
+        Args:
+            tamano_mb: Tamaño de la tabla en megabytes.
+            buffer: Buffer escribible opcional sobre el que construir los arrays
+                (por ejemplo, el de una memoria compartida). Debe medir al menos
+                `TablaTransposicion.bytes_necesarios(tamano_mb)`.
+
+        Raises:
+            ValueError: Si el tamaño no es positivo o el buffer es demasiado pequeño.
+        """
+        if tamano_mb <= 0:
+            raise ValueError(f"Tamaño de tabla de transposición no válido: {tamano_mb} MB")
+        self.num_cubetas = max(1, int(tamano_mb * 1024 * 1024) // (BYTES_POR_ENTRADA * ENTRADAS_POR_CUBETA))
+        self.num_entradas = self.num_cubetas * ENTRADAS_POR_CUBETA
+        necesarios = self.num_entradas * BYTES_POR_ENTRADA
+        if buffer is None:
+            buffer = bytearray(necesarios)
+        elif len(memoryview(buffer)) < necesarios:
+            raise ValueError(f"Buffer de {len(memoryview(buffer))} bytes insuficiente; se necesitan {necesarios}")
+        self.tamano_mb = tamano_mb
+        self._buffer = buffer
+
+        # Arrays paralelos como vistas tipadas de regiones contiguas del mismo buffer
+        vista = memoryview(buffer)
+        n = self.num_entradas
+        self._claves = vista[0:8 * n].cast('Q') # clave ^ datos
+        self._datos = vista[8 * n:16 * n].cast('Q')
+
+        self.edad = 0
+        self.sondeos = 0
+        self.aciertos = 0
+        self.escrituras = 0
+
+    @staticmethod
+    def bytes_necesarios(tamano_mb: float) -> int:
+        """
+        Devuelve el número de bytes que ocupa una tabla del tamaño indicado.
+        """
+        num_cubetas = max(1, int(tamano_mb * 1024 * 1024) // (BYTES_POR_ENTRADA * ENTRADAS_POR_CUBETA))
+        return num_cubetas * ENTRADAS_POR_CUBETA * BYTES_POR_ENTRADA
+
+    # ============================================================
+    # 1. Sondeo y Almacenamiento
+    # ============================================================
+
+    def sondear(self, clave: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Busca la entrada de una posición.
+
+        Returns:
+            Tupla (movimiento, puntuacion, profundidad, tipo_cota) o None si no está.
+        """
+        self.sondeos += 1
+        indice = (clave % self.num_cubetas) * ENTRADAS_POR_CUBETA
+        datos = self._datos[indice]
+        if self._claves[indice] ^ datos != clave:
+            indice += 1
+            datos = self._datos[indice]
+            if self._claves[indice] ^ datos != clave:
+                return None
+        banderas = datos >> 56
+        if not banderas & 3:
+            return None # Entrada vacía (clave 0 coincidente por casualidad)
+        self.aciertos += 1
+        return (datos & _MASCARA_24, ((datos >> 24 & _MASCARA_24) ^ _SIGNO_24) - _SIGNO_24,
+                ((datos >> 48 & 0xFF) ^ 0x80) - 0x80, banderas & 3)
+
+    def guardar(self, clave: int, profundidad: int, tipo_cota: int, puntuacion: int, movimiento: int):
+        """
+        Guarda el resultado de buscar una posición según el esquema de reemplazo de la cubeta.
+
+        Args:
+            clave: Clave Zobrist de la posición.
+            profundidad: Profundidad restante con la que se buscó.
+            tipo_cota: COTA_EXACTA, COTA_INFERIOR o COTA_SUPERIOR.
+            puntuacion: Puntuación (las de mate deben venir ya relativas al nodo).
+            movimiento: Mejor movimiento encontrado (0 si ninguno).
+        """
+        base = (clave % self.num_cubetas) * ENTRADAS_POR_CUBETA
+        claves = self._claves
+        datos = self._datos
+        guardados = datos[base]
+        banderas = guardados >> 56
+        profundidad_guardada = ((guardados >> 48 & 0xFF) ^ 0x80) - 0x80
+        if claves[base] ^ guardados == clave or not banderas & 3 or \
+                profundidad >= profundidad_guardada or (banderas >> 2) != self.edad:
+            indice = base
+        else:
+            indice = base + 1
+        # Conservar el movimiento conocido si la nueva búsqueda no encontró ninguno
+        if not movimiento and claves[indice] ^ datos[indice] == clave:
+            movimiento = datos[indice] & _MASCARA_24
+        nuevos = ((movimiento & _MASCARA_24) | (puntuacion & _MASCARA_24) << 24
+                  | (max(-128, min(127, profundidad)) & 0xFF) << 48 | (tipo_cota | (self.edad << 2)) << 56)
+        datos[indice] = nuevos
+        claves[indice] = clave ^ nuevos
+        self.escrituras += 1
+
+    # ============================================================
+    # 2. Gestión y Estadísticas
+    # ============================================================
+
+    def nueva_busqueda(self):
+        """
+        Avanza la edad de la tabla. Llamar al empezar cada jugada: las entradas de búsquedas
+        anteriores pasan a ser reemplazables aunque sean más profundas.
+        """
+        self.edad = (self.edad + 1) & _MASCARA_EDAD
+
+    def limpiar(self):
+        """
+        Vacía la tabla y reinicia edad y estadísticas.
+        """
+        vista = memoryview(self._buffer)
+        vista[:self.num_entradas * BYTES_POR_ENTRADA] = bytes(self.num_entradas * BYTES_POR_ENTRADA)
+        self.edad = 0
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        """
+        Pone a cero los contadores de sondeos, aciertos y escrituras.
+        """
+        self.sondeos = 0
+        self.aciertos = 0
+        self.escrituras = 0
+
+    def ocupacion(self) -> float:
+        """
+        Estima la fracción (0.0 a 1.0) de entradas ocupadas por la búsqueda actual,
+        muestreando las primeras entradas de la tabla.
+        """
+        muestra = min(self.num_entradas, _MUESTRA_OCUPACION)
+        datos = self._datos
+        usadas = sum(1 for i in range(muestra) if datos[i] >> 56 & 3 and datos[i] >> 58 == self.edad)
+        return usadas / muestra
+
+    def estadisticas(self) -> Dict:
+        """
+        Devuelve las estadísticas de uso de la tabla.
+
+        Returns:
+            Diccionario con 'tamano_mb', 'entradas', 'sondeos', 'aciertos', 'tasa_aciertos',
+            'escrituras' y 'ocupacion'.
+        """
+        return {
+            'tamano_mb': self.tamano_mb,
+            'entradas': self.num_entradas,
+            'sondeos': self.sondeos,
+            'aciertos': self.aciertos,
+            'tasa_aciertos': self.aciertos / self.sondeos if self.sondeos else 0.0,
+            'escrituras': self.escrituras,
+            'ocupacion': self.ocupacion(),
+        }
@@ -0,0 +1,171 @@
+"""
+Define el formato y la consulta de las tablas de finales (KQK, KRK, KPK) generadas
+por análisis retrógrado (ver `generador_tablas_finales`).
+
+Cada tabla guarda un byte por posición, con el bando fuerte normalizado a blancas:
+    índice = turno << 18 | rey_fuerte << 12 | rey_debil << 6 | pieza
+    0          -> tablas
+    1..127     -> gana el bando que mueve; mate en ese número de plies
+    128 + d    -> pierde el bando que mueve; recibe mate en d plies (128 = mate ya dado)
+    255        -> posición imposible
+"""
+
+import logging
+import mmap
+import os
+from typing import Dict, Optional, Tuple
+
+from models.motor.posicion import Posicion, BLANCO, PEON, TORRE, REINA, REY
+
+logger = logging.getLogger(__name__)
+
+# Cabecera de los archivos: firma mágica, versión, tipo de la pieza del bando fuerte y relleno
+MAGICO = b'TBAJ'
+VERSION = 1
+BYTES_CABECERA = 16
+ENTRADAS_POR_TABLA = 1 << 19
+EXTENSION = '.tbf'
+
+TABLAS = 0
+PERDIDA = 128
+INVALIDA = 255
+
+# Firma de material -> tipo de la única pieza además de los reyes
+FIRMAS: Dict[str, int] = {'KQK': REINA, 'KRK': TORRE, 'KPK': PEON}
+_FIRMA_POR_TIPO = {tipo: firma for firma, tipo in FIRMAS.items()}
+
+
+def indice_tabla(turno: int, rey_fuerte: int, rey_debil: int, pieza: int) -> int:
+    """
+    Índice de una posición normalizada (bando fuerte = blancas) dentro de su tabla.
+    """
+    return (turno << 18) | (rey_fuerte << 12) | (rey_debil << 6) | pieza
+
+
+def decodificar_valor(valor: int) -> Optional[Tuple[int, int]]:
+    """
+    Traduce un byte de la tabla a (resultado, plies hasta el mate), con resultado 1 si gana
+    el bando que mueve, 0 si son tablas y -1 si pierde. None para posiciones imposibles.
+    """
+    if valor == INVALIDA:
+        return None
+    if valor == TABLAS:
+        return (0, 0)
+    if valor < PERDIDA:
+        return (1, valor)
+    return (-1, valor - PERDIDA)
+
+
+def ruta_tabla(directorio: str, firma: str) -> str:
+    """
+    Ruta del archivo de la tabla `firma` ('KQK', ...) dentro de `directorio`.
+    """
+    return os.path.join(directorio, firma + EXTENSION)
+
+
+class TablasFinales:
+    """
+    Consulta las tablas de finales de un directorio. Los archivos se proyectan en memoria
+    de solo lectura (`mmap`), así que abrirlos es inmediato, varios procesos comparten las
+    mismas páginas y cada consulta es un único acceso indexado.
+    """
+
+    def __init__(self, directorio: str):
+        """
+        Args:
+            directorio: Directorio con los archivos `<firma>.tbf`. Las firmas que falten
+                simplemente no se consultan.
+
+        Raises:
+            ValueError: Si un archivo existe pero no tiene el formato esperado.
+        """
+        self.directorio = directorio
+        self._archivos = []
+        # Tabla proyectada por tipo de pieza del bando fuerte
+        self._mapas: Dict[int, mmap.mmap] = {}
+        for firma, tipo in FIRMAS.items():
+            ruta = ruta_tabla(directorio, firma)
+            if not os.path.exists(ruta):
+                continue
+            archivo = open(ruta, 'rb')
+            self._archivos.append(archivo)
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(mapa) != BYTES_CABECERA + ENTRADAS_POR_TABLA or mapa[:4] != MAGICO \
+                    or mapa[4] != VERSION or mapa[5] != tipo:
+                mapa.close()
+                self.cerrar()
+                raise ValueError(f"La tabla de finales {ruta} no tiene el formato esperado")
+            self._mapas[tipo] = mapa
+        logger.info(f"Tablas de finales disponibles en {directorio}: {', '.join(self.firmas()) or 'ninguna'}")
+
+    def firmas(self):
+        """
+        Devuelve las firmas de material disponibles ('KQK', 'KRK', 'KPK').
+        """
+        return [_FIRMA_POR_TIPO[tipo] for tipo in self._mapas]
+
+    def sondear(self, posicion: Posicion) -> Optional[Tuple[int, int]]:
+        """
+        Consulta la posición en las tablas.
+
+        Returns:
+            (resultado, plies hasta el mate) desde el punto de vista del bando que mueve
+            (resultado 1 gana, 0 tablas, -1 pierde), o None si la posición no está cubierta
+            (otro material, derechos de enroque o tabla no disponible).
+        """
+        if posicion.enroques:
+            return None
+        pieza = -1
+        for casilla, codigo in enumerate(posicion.casillas):
+            if codigo and codigo & 7 != REY:
+                if pieza >= 0:
+                    return None # Más de una pieza además de los reyes
+                pieza = casilla
+        if pieza < 0:
+            return None
+        codigo = posicion.casillas[pieza]
+        mapa = self._mapas.get(codigo & 7)
+        if mapa is None:
+            return None
+        fuerte = codigo >> 3
+        rey_fuerte, rey_debil = posicion.reyes[fuerte], posicion.reyes[fuerte ^ 1]
+        turno = posicion.turno
+        if fuerte != BLANCO:
+            # Normalizar: bando fuerte a blancas reflejando las filas
+            rey_fuerte, rey_debil, pieza, turno = rey_fuerte ^ 56, rey_debil ^ 56, pieza ^ 56, turno ^ 1
+        return decodificar_valor(mapa[BYTES_CABECERA + indice_tabla(turno, rey_fuerte, rey_debil, pieza)])
+
+    def puntuacion(self, posicion: Posicion, ply: int, mate: int) -> Optional[int]:
+        """
+        Puntuación de búsqueda de la posición según las tablas (None si no está cubierta):
+        `mate - (ply + plies hasta el mate)` si gana el bando que mueve, su opuesto si pierde, 0 si son tablas.
+        """
+        sondeo = self.sondear(posicion)
+        if sondeo is None:
+            return None
+        resultado, distancia = sondeo
+        return resultado * (mate - ply - distancia) if resultado else 0
+
+    def sondear_tablero(self, tablero) -> Optional[Tuple[int, int]]:
+        """
+        Consulta la posición de un `Tablero` (p. ej. tras `actualizarEstadoJuego`, para
+        mostrar el resultado teórico de un final). Mismo formato que `sondear`.
+        """
+        return self.sondear(Posicion.desde_tablero(tablero))
+
+    def cerrar(self):
+        """
+        Libera las proyecciones en memoria y cierra los archivos.
+        """
+        for mapa in self._mapas.values():
+            mapa.close()
+        self._mapas = {}
+        for archivo in self._archivos:
+            archivo.close()
+        self._archivos = []
+
+    def __enter__(self) -> 'TablasFinales':
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
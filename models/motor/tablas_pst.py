@@ -0,0 +1,248 @@
+"""
+Define los pesos de la evaluación del motor: material y tablas pieza-casilla (PST)
+de medio juego y final, el peso de cada pieza en la fase de la partida y los términos
+de estructura de peones.
+
+Los valores de partida son los de la función de evaluación PeSTO. Las tablas están
+escritas desde el punto de vista de las blancas con la octava fila arriba (índice 0 = a8).
+Si existe un archivo de pesos ajustados (ver `herramientas.ajustar_pesos`), sus valores
+sustituyen a los de partida al importar el módulo.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Archivo de pesos ajustados que se carga al arrancar; la variable de entorno AJEDREZ_PESOS lo sustituye
+RUTA_PESOS = os.environ.get('AJEDREZ_PESOS', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pesos.json'))
+
+# Material de medio juego y de final por tipo (NINGUNO, PEON, CABALLO, ALFIL, TORRE, REINA, REY)
+MATERIAL_MG = [0, 82, 337, 365, 477, 1025, 0]
+MATERIAL_EG = [0, 94, 281, 297, 512, 936, 0]
+# Contribución de cada tipo a la fase (24 = todas las piezas en el tablero, 0 = solo reyes y peones)
+FASE_TIPO = (0, 0, 1, 1, 2, 4, 0)
+FASE_MAXIMA = 24
+
+# Estructura de peones (medio juego, final) en centipeones
+PEON_DOBLADO = (-10, -20) # Por cada peón de más en la misma columna
+PEON_AISLADO = (-10, -15) # Sin peones propios en las columnas vecinas
+# Peón pasado por fila relativa (0 = primera fila del bando, 7 = promoción)
+PEON_PASADO_MG = (0, 5, 10, 15, 25, 40, 60, 0)
+PEON_PASADO_EG = (0, 10, 20, 35, 60, 95, 140, 0)
+
+PST_MG = [
+    [0] * 64,
+    [ # Peón
+          0,   0,   0,   0,   0,   0,  0,   0,
+         98, 134,  61,  95,  68, 126, 34, -11,
+         -6,   7,  26,  31,  65,  56, 25, -20,
+        -14,  13,   6,  21,  23,  12, 17, -23,
+        -27,  -2,  -5,  12,  17,   6, 10, -25,
+        -26,  -4,  -4, -10,   3,   3, 33, -12,
+        -35,  -1, -20, -23, -15,  24, 38, -22,
+          0,   0,   0,   0,   0,   0,  0,   0,
+    ],
+    [ # Caballo
+        -167, -89, -34, -49,  61, -97, -15, -107,
+         -73, -41,  72,  36,  23,  62,   7,  -17,
+         -47,  60,  37,  65,  84, 129,  73,   44,
+          -9,  17,  19,  53,  37,  69,  18,   22,
+         -13,   4,  16,  13,  28,  19,  21,   -8,
+         -23,  -9,  12,  10,  19,  17,  25,  -16,
+         -29, -53, -12,  -3,  -1,  18, -14,  -19,
+        -105, -21, -58, -33, -17, -28, -19,  -23,
+    ],
+    [ # Alfil
+        -29,   4, -82, -37, -25, -42,   7,  -8,
+        -26,  16, -18, -13,  30,  59,  18, -47,
+        -16,  37,  43,  40,  35,  50,  37,  -2,
+         -4,   5,  19,  50,  37,  37,   7,  -2,
+         -6,  13,  13,  26,  34,  12,  10,   4,
+          0,  15,  15,  15,  14,  27,  18,  10,
+          4,  15,  16,   0,   7,  21,  33,   1,
+        -33,  -3, -14, -21, -13, -12, -39, -21,
+    ],
+    [ # Torre
+         32,  42,  32,  51, 63,  9,  31,  43,
+         27,  32,  58,  62, 80, 67,  26,  44,
+         -5,  19,  26,  36, 17, 45,  61,  16,
+        -24, -11,   7,  26, 24, 35,  -8, -20,
+        -36, -26, -12,  -1,  9, -7,   6, -23,
+        -45, -25, -16, -17,  3,  0,  -5, -33,
+        -44, -16, -20,  -9, -1, 11,  -6, -71,
+        -19, -13,   1,  17, 16,  7, -37, -26,
+    ],
+    [ # Reina
+        -28,   0,  29,  12,  59,  44,  43,  45,
+        -24, -39,  -5,   1, -16,  57,  28,  54,
+        -13, -17,   7,   8,  29,  56,  47,  57,
+        -27, -27, -16, -16,  -1,  17,  -2,   1,
+         -9, -26,  -9, -10,  -2,  -4,   3,  -3,
+        -14,   2, -11,  -2,  -5,   2,  14,   5,
+        -35,  -8,  11,   2,   8,  15,  -3,   1,
+         -1, -18,  -9,  10, -15, -25, -31, -50,
+    ],
+    [ # Rey
+        -65,  23,  16, -15, -56, -34,   2,  13,
+         29,  -1, -20,  -7,  -8,  -4, -38, -29,
+         -9,  24,   2, -16, -20,   6,  22, -22,
+        -17, -20, -12, -27, -30, -25, -14, -36,
+        -49,  -1, -27, -39, -46, -44, -33, -51,
+        -14, -14, -22, -46, -44, -30, -15, -27,
+          1,   7,  -8, -64, -43, -16,   9,   8,
+        -15,  36,  12, -54,   8, -28,  24,  14,
+    ],
+]
+
+PST_EG = [
+    [0] * 64,
+    [ # Peón
+          0,   0,   0,   0,   0,   0,   0,   0,
+        178, 173, 158, 134, 147, 132, 165, 187,
+         94, 100,  85,  67,  56,  53,  82,  84,
+         32,  24,  13,   5,  -2,   4,  17,  17,
+         13,   9,  -3,  -7,  -7,  -8,   3,  -1,
+          4,   7,  -6,   1,   0,  -5,  -1,  -8,
+         13,   8,   8,  10,  13,   0,   2,  -7,
+          0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    [ # Caballo
+        -58, -38, -13, -28, -31, -27, -63, -99,
+        -25,  -8, -25,  -2,  -9, -25, -24, -52,
+        -24, -20,  10,   9,  -1,  -9, -19, -41,
+        -17,   3,  22,  22,  22,  11,   8, -18,
+        -18,  -6,  16,  25,  16,  17,   4, -18,
+        -23,  -3,  -1,  15,  10,  -3, -20, -22,
+        -42, -20, -10,  -5,  -2, -20, -23, -44,
+        -29, -51, -23, -15, -22, -18, -50, -64,
+    ],
+    [ # Alfil
+        -14, -21, -11,  -8, -7,  -9, -17, -24,
+         -8,  -4,   7, -12, -3, -13,  -4, -14,
+          2,  -8,   0,  -1, -2,   6,   0,   4,
+         -3,   9,  12,   9, 14,  10,   3,   2,
+         -6,   3,  13,  19,  7,  10,  -3,  -9,
+        -12,  -3,   8,  10, 13,   3,  -7, -15,
+        -14, -18,  -7,  -1,  4,  -9, -15, -27,
+        -23,  -9, -23,  -5, -9, -16,  -5, -17,
+    ],
+    [ # Torre
+        13, 10, 18, 15, 12,  12,   8,   5,
+        11, 13, 13, 11, -3,   3,   8,   3,
+         7,  7,  7,  5,  4,  -3,  -5,  -3,
+         4,  3, 13,  1,  2,   1,  -1,   2,
+         3,  5,  8,  4, -5,  -6,  -8, -11,
+        -4,  0, -5, -1, -7, -12,  -8, -16,
+        -6, -6,  0,  2, -9,  -9, -11,  -3,
+        -9,  2,  3, -1, -5, -13,   4, -20,
+    ],
+    [ # Reina
+         -9,  22,  22,  27,  27,  19,  10,  20,
+        -17,  20,  32,  41,  58,  25,  30,   0,
+        -20,   6,   9,  49,  47,  35,  19,   9,
+          3,  22,  24,  45,  57,  40,  57,  36,
+        -18,  28,  19,  47,  31,  34,  39,  23,
+        -16, -27,  15,   6,   9,  17,  10,   5,
+        -22, -23, -30, -16, -16, -23, -36, -32,
+        -33, -28, -22, -43,  -5, -32, -20, -41,
+    ],
+    [ # Rey
+        -74, -35, -18, -18, -11,  15,   4, -17,
+        -12,  17,  14,  17,  17,  38,  23,  11,
+         10,  17,  23,  15,  20,  45,  44,  13,
+         -8,  22,  24,  27,  26,  33,  26,   3,
+        -18,  -4,  21,  24,  27,  23,   9, -11,
+        -19,  -3,  11,  21,  23,  16,   7,  -9,
+        -27, -11,   4,  13,  14,   4,  -5, -17,
+        -53, -34, -21, -11, -28, -14, -24, -43,
+    ],
+]
+
+# Longitud de cada peso ajustable (listas de listas: PST_MG/PST_EG, 7 tipos x 64 casillas)
+FORMA_PESOS: Dict[str, tuple] = {
+    'MATERIAL_MG': (7,), 'MATERIAL_EG': (7,), 'PST_MG': (7, 64), 'PST_EG': (7, 64),
+    'PEON_DOBLADO': (2,), 'PEON_AISLADO': (2,), 'PEON_PASADO_MG': (8,), 'PEON_PASADO_EG': (8,),
+}
+
+
+def pesos_actuales() -> Dict[str, list]:
+    """
+    Devuelve los pesos en uso como diccionario serializable (mismo formato que el archivo de pesos).
+    """
+    actuales = globals()
+    return {nombre: [list(fila) for fila in actuales[nombre]] if len(forma) == 2 else list(actuales[nombre])
+            for nombre, forma in FORMA_PESOS.items()}
+
+
+def cargar_pesos(ruta: str) -> Dict[str, list]:
+    """
+    Lee un archivo de pesos JSON. Puede contener solo algunos pesos (el resto conserva su valor).
+
+    Raises:
+        OSError: Si no se puede leer el archivo.
+        ValueError: Si el contenido no es JSON válido o algún peso es desconocido o tiene otra forma.
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        pesos = json.load(archivo)
+    if not isinstance(pesos, dict):
+        raise ValueError(f"El archivo de pesos {ruta} no contiene un objeto JSON")
+    for nombre, valores in pesos.items():
+        forma = FORMA_PESOS.get(nombre)
+        if forma is None:
+            raise ValueError(f"Peso desconocido en {ruta}: {nombre!r}")
+        filas = valores if len(forma) == 2 else [valores]
+        if len(valores) != forma[0] or any(len(fila) != forma[-1] or not all(isinstance(v, int) for v in fila)
+                                           for fila in filas):
+            raise ValueError(f"El peso {nombre!r} de {ruta} no tiene la forma {forma} de enteros")
+    return pesos
+
+
+def guardar_pesos(ruta: str, pesos: Dict[str, list]):
+    """
+    Escribe un archivo de pesos JSON (una fila de la PST por línea para que sea legible).
+    """
+    lineas = []
+    for nombre, valores in pesos.items():
+        if len(FORMA_PESOS[nombre]) == 2:
+            filas = ',\n'.join('    ' + json.dumps(list(fila)) for fila in valores)
+            lineas.append(f'  "{nombre}": [\n{filas}\n  ]')
+        else:
+            lineas.append(f'  "{nombre}": {json.dumps(list(valores))}')
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write('{\n' + ',\n'.join(lineas) + '\n}\n')
+
+
+if os.path.exists(RUTA_PESOS):
+    try:
+        _pesos_archivo = cargar_pesos(RUTA_PESOS)
+    except (OSError, ValueError) as error:
+        logger.warning(f"No se pudieron cargar los pesos de {RUTA_PESOS}; se usan los de partida: {error}")
+    else:
+        for _nombre, _valores in _pesos_archivo.items():
+            globals()[_nombre] = _valores if len(FORMA_PESOS[_nombre]) == 2 else tuple(_valores)
+        logger.info(f"Pesos de evaluación cargados de {RUTA_PESOS}: {', '.join(_pesos_archivo)}")
+
+
+def _construir_tabla(material: List[int], pst: List[List[int]]) -> List[List[int]]:
+    """
+    Combina material y PST en una tabla indexada por código de pieza `(color << 3) | tipo`
+    y casilla del motor (índice 0 = a1), con signo positivo para las blancas y negativo
+    para las negras. Así la suma sobre todas las piezas es directamente blancas - negras.
+    """
+    tabla = [[0] * 64 for _ in range(16)]
+    for tipo in range(1, 7):
+        for casilla in range(64):
+            # Blancas: la fila 0 del motor es la última fila de la tabla; negras: la tabla reflejada
+            tabla[tipo][casilla] = material[tipo] + pst[tipo][casilla ^ 56]
+            tabla[8 | tipo][casilla] = -(material[tipo] + pst[tipo][casilla])
+    return tabla
+
+
+# TABLA_MG[codigo][casilla] y TABLA_EG[codigo][casilla]: valor con signo (blancas +, negras -)
+TABLA_MG = _construir_tabla(MATERIAL_MG, PST_MG)
+TABLA_EG = _construir_tabla(MATERIAL_EG, PST_EG)
+# FASE_PIEZA[codigo]: contribución a la fase de cada código de pieza
+FASE_PIEZA = tuple(FASE_TIPO[codigo & 7] if codigo & 7 < 7 else 0 for codigo in range(16))
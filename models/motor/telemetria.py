@@ -0,0 +1,112 @@
+"""
+Define la telemetría de la búsqueda: un registro plano por jugada (nodos, nodos/s, profundidad
+y profundidad selectiva, tabla de transposición, cortes, factor de ramificación efectivo y
+tiempo por iteración) y su escritura como líneas JSON para seguir el rendimiento del motor.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, TextIO
+
+from models.motor.posicion import movimiento_a_uci
+
+logger = logging.getLogger(__name__)
+
+
+def factor_ramificacion_efectivo(iteraciones: List[Dict]) -> Optional[float]:
+    """
+    Media geométrica de los cocientes de nodos entre iteraciones consecutivas:
+    (nodos de la última / nodos de la primera) ^ (1 / (iteraciones - 1)).
+
+    Returns:
+        El factor, o None con menos de dos iteraciones.
+    """
+    if len(iteraciones) < 2 or iteraciones[0]['nodos_iteracion'] <= 0:
+        return None
+    cociente = iteraciones[-1]['nodos_iteracion'] / iteraciones[0]['nodos_iteracion']
+    return cociente ** (1.0 / (len(iteraciones) - 1))
+
+
+def registro_busqueda(resultado: Dict, fen: Optional[str] = None) -> Dict:
+    """
+    Construye el registro de telemetría de una búsqueda a partir del resultado de `Buscador.buscar`.
+
+    Returns:
+        Diccionario plano serializable en JSON con 'fen', 'movimiento' (UCI), 'puntuacion',
+        'profundidad', 'profundidad_selectiva', 'nodos', 'nodos_quiescencia', 'nps', 'tiempo_ms',
+        'sondeos_tt', 'aciertos_tt', 'tasa_aciertos_tt', 'cortes', 'tasa_corte_primer_movimiento',
+        'cortes_nulos', 'reducciones_lmr', 'reintentos_lmr', 'factor_ramificacion' e
+        'iteraciones' (con nodos, tiempo, nodos/s y factor de ramificación de cada una).
+    """
+    tabla = resultado.get('tabla') or {}
+    ordenacion = resultado.get('ordenacion') or {}
+    selectiva = resultado.get('selectiva') or {}
+    tiempo_ms = resultado.get('tiempo_ms', 0.0)
+    iteraciones = resultado.get('iteraciones', [])
+    return {
+        'fen': fen,
+        'movimiento': movimiento_a_uci(resultado['movimiento']) if resultado.get('movimiento') else None,
+        'puntuacion': resultado.get('puntuacion'),
+        'profundidad': resultado.get('profundidad', 0),
+        'profundidad_selectiva': resultado.get('profundidad_selectiva', 0),
+        'nodos': resultado.get('nodos', 0),
+        'nodos_quiescencia': resultado.get('nodos_quiescencia', 0),
+        'nps': int(resultado.get('nodos', 0) * 1000 / tiempo_ms) if tiempo_ms > 0 else 0,
+        'tiempo_ms': tiempo_ms,
+        'sondeos_tt': tabla.get('sondeos', 0),
+        'aciertos_tt': tabla.get('aciertos', 0),
+        'tasa_aciertos_tt': tabla.get('tasa_aciertos', 0.0),
+        'cortes': ordenacion.get('cortes', 0),
+        'tasa_corte_primer_movimiento': ordenacion.get('tasa_corte_primer_movimiento', 0.0),
+        'cortes_nulos': selectiva.get('cortes_nulos', 0),
+        'reducciones_lmr': selectiva.get('reducciones_lmr', 0),
+        'reintentos_lmr': selectiva.get('reintentos_lmr', 0),
+        'factor_ramificacion': factor_ramificacion_efectivo(iteraciones),
+        'iteraciones': [{clave: iteracion[clave] for clave in
+                         ('profundidad', 'profundidad_selectiva', 'puntuacion', 'nodos_iteracion',
+                          'tiempo_iteracion_ms', 'nps', 'factor_ramificacion', 'sondeos_tt', 'aciertos_tt', 'cortes')}
+                        for iteracion in iteraciones],
+    }
+
+
+class RegistroTelemetria:
+    """
+    Escribe registros de telemetría como líneas JSON (una por jugada), añadiendo al archivo.
+    Se usa directamente como función de telemetría (p. ej. en `JugadorOrdenador` o en el
+    controlador UCI): `registro(telemetria)`.
+    """
+
+    def __init__(self, destino, etiquetas: Optional[Dict] = None):
+        """
+        Args:
+            destino: Ruta del archivo JSONL o flujo de texto abierto.
+            etiquetas: Campos fijos añadidos a cada línea (p. ej. versión o configuración del motor).
+        """
+        self._propio = isinstance(destino, str)
+        self._archivo: TextIO = open(destino, 'a', encoding='utf-8') if self._propio else destino
+        self.etiquetas = dict(etiquetas or {})
+        self.lineas = 0
+
+    def __call__(self, telemetria: Dict):
+        """
+        Escribe un registro como una línea JSON (con marca de tiempo y etiquetas).
+        """
+        linea = {'marca_tiempo': time.time(), **self.etiquetas, **telemetria}
+        self._archivo.write(json.dumps(linea, ensure_ascii=False) + "\n")
+        self._archivo.flush()
+        self.lineas += 1
+
+    def cerrar(self):
+        """
+        Cierra el archivo si lo abrió el registro.
+        """
+        if self._propio and not self._archivo.closed:
+            self._archivo.close()
+        logger.debug(f"Registro de telemetría cerrado tras {self.lineas} líneas")
+
+    def __enter__(self) -> 'RegistroTelemetria':
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
@@ -0,0 +1,310 @@
+"""
+Define el trabajador asíncrono del motor: un proceso persistente que busca fuera del hilo
+de la interfaz y del controlador, con futuros, informes de progreso, cancelación y plazos.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, Optional, Union
+
+from models.motor.buscador import Buscador, PROFUNDIDAD_MAXIMA
+from models.motor.gestor_tiempo import GestorTiempo
+from models.motor.nivel_dificultad import NivelDificultad
+from models.motor.posicion import Posicion
+from models.motor.tabla_transposicion import TablaTransposicion
+from models.motor.tablas_finales import TablasFinales
+
+logger = logging.getLogger(__name__)
+
+# Margen sobre el plazo de una búsqueda antes de ordenar su detención desde fuera
+_MARGEN_PLAZO_S = 0.25
+# Cada cuánto comprueba el hilo de escucha los plazos cuando no llegan mensajes
+_INTERVALO_SONDEO_S = 0.02
+# Espera máxima al cerrar el proceso trabajador
+_ESPERA_CIERRE_S = 5.0
+
+
+def _bucle_motor(tareas, mensajes, evento_detener, tamano_tabla_mb: float, directorio_tablas: Optional[str]):
+    """
+    Bucle del proceso trabajador: un único `Buscador` (con su tabla de transposición, tabla de
+    peones e historia) atiende todas las búsquedas, así que sigue caliente entre jugadas.
+    Termina al recibir None.
+    """
+    tablas_finales = TablasFinales(directorio_tablas) if directorio_tablas else None
+    buscador = Buscador(tabla=TablaTransposicion(tamano_tabla_mb), tablas_finales=tablas_finales)
+    try:
+        while True:
+            tarea = tareas.get()
+            if tarea is None:
+                break
+            if tarea[0] == 'nueva_partida':
+                buscador.tabla.limpiar()
+                continue
+            _, id_tarea, posicion, limites = tarea
+            try:
+                semilla = limites.get('semilla')
+                reloj = limites.get('reloj')
+                resultado = buscador.buscar(
+                    posicion, tiempo_ms=limites.get('tiempo_ms'),
+                    profundidad_max=limites.get('profundidad_max', PROFUNDIDAD_MAXIMA),
+                    evento_detener=evento_detener, nodos_max=limites.get('nodos_max'),
+                    ruido_cp=limites.get('ruido_cp', 0),
+                    aleatorio=random.Random(semilla) if semilla is not None else None,
+                    multi_pv=limites.get('multi_pv', 1),
+                    gestor_tiempo=GestorTiempo.para_posicion(posicion, **reloj) if reloj else None,
+                    al_completar_iteracion=lambda informe: mensajes.put(('informe', id_tarea, informe)))
+                resultado['detenido'] = evento_detener.is_set()
+                mensajes.put(('resultado', id_tarea, resultado))
+            except Exception as error: # El proceso sigue vivo para las siguientes búsquedas
+                logger.exception("Error en la búsqueda del trabajador del motor")
+                mensajes.put(('error', id_tarea, f"{type(error).__name__}: {error}"))
+    finally:
+        if tablas_finales is not None:
+            tablas_finales.cerrar()
+
+
+class TrabajadorMotor:
+    """
+    Ejecuta el motor en un proceso trabajador persistente para que pensar no congele el
+    hilo de la interfaz ni el del controlador.
+
+    - `pensar` devuelve un `concurrent.futures.Future` con el resultado (formato de
+      `Buscador.buscar`, más 'detenido'); `pensar_async` devuelve un futuro de asyncio.
+    - Cada iteración completa se informa a la función `al_informar` (mejor jugada,
+      puntuación, profundidad, nodos) desde el hilo de escucha.
+    - `detener` (o cancelar el futuro) corta la búsqueda en curso, que se resuelve con la
+      última iteración completa; los encargos aún en cola se descartan al cancelarlos.
+    - Si la búsqueda supera su plazo, el hilo de escucha ordena su detención.
+    Las búsquedas se atienden de una en una, en orden de llegada, con el mismo buscador.
+    Hay que llamar a `cerrar` (o usarlo como gestor de contexto) al terminar.
+    """
+
+    def __init__(self, tamano_tabla_mb: float = 16, directorio_tablas: Optional[str] = None):
+        """
+        Args:
+            tamano_tabla_mb: Memoria de la tabla de transposición del trabajador.
+            directorio_tablas: Directorio opcional de tablas de finales (ver `TablasFinales`).
+        """
+        contexto = multiprocessing.get_context()
+        self._tareas = contexto.Queue()
+        self._mensajes = contexto.Queue()
+        self._evento_detener = contexto.Event()
+        self._proceso = contexto.Process(target=_bucle_motor, name="motor-trabajador", daemon=True,
+                                         args=(self._tareas, self._mensajes, self._evento_detener,
+                                               tamano_tabla_mb, directorio_tablas))
+        self._proceso.start()
+        self._cerrojo = threading.Lock()
+        self._pendientes: Deque[Dict] = deque()
+        self._activo: Optional[Dict] = None
+        self._id_tarea = 0
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._escuchar, name="motor-escucha", daemon=True)
+        self._hilo.start()
+        logger.info(f"Trabajador del motor iniciado (pid {self._proceso.pid}, tabla de {tamano_tabla_mb} MB)")
+
+    # ============================================================
+    # 1. Encargos
+    # ============================================================
+
+    @staticmethod
+    def _normalizarLimites(limites: Union[None, Dict, NivelDificultad]) -> Dict:
+        """
+        Convierte los límites a diccionario ('tiempo_ms', 'profundidad_max', 'nodos_max',
+        'ruido_cp', 'semilla', 'multi_pv', 'reloj'); acepta también un `NivelDificultad`.
+        """
+        if limites is None:
+            return {}
+        if isinstance(limites, NivelDificultad):
+            return {'tiempo_ms': limites.tiempo_max_ms, 'profundidad_max': limites.profundidad_max,
+                    'nodos_max': limites.nodos_max, 'ruido_cp': limites.ruido_cp}
+        desconocidos = set(limites) - {'tiempo_ms', 'profundidad_max', 'nodos_max', 'ruido_cp', 'semilla', 'multi_pv', 'reloj'}
+        if desconocidos:
+            raise ValueError(f"Límites de búsqueda desconocidos: {sorted(desconocidos)}")
+        return dict(limites)
+
+    def pensar(self, posicion, limites: Union[None, Dict, NivelDificultad] = None,
+               al_informar: Optional[Callable[[Dict], None]] = None) -> Future:
+        """
+        Encarga una búsqueda al trabajador sin bloquear.
+
+        Args:
+            posicion: `Posicion` o `Tablero` (se copia; no se modifica). De un `Tablero` se toma
+                también el historial de la partida (ver `Posicion.desde_partida`).
+            limites: Diccionario con 'tiempo_ms', 'profundidad_max', 'nodos_max', 'ruido_cp',
+                'semilla', 'multi_pv' y 'reloj' (todos opcionales), o un `NivelDificultad`.
+                'reloj' es {'restante_ms', 'incremento_ms', 'jugadas_restantes'} del bando que
+                mueve: el plazo de la jugada lo reparte entonces un `GestorTiempo`.
+            al_informar: Función que recibe el informe de cada iteración completa; se llama
+                desde el hilo de escucha y no debe bloquear.
+
+        Returns:
+            Futuro con el resultado de la búsqueda.
+
+        Raises:
+            RuntimeError: Si el trabajador ya está cerrado.
+            ValueError: Si hay límites desconocidos.
+        """
+        limites = self._normalizarLimites(limites)
+        posicion = posicion.copia() if isinstance(posicion, Posicion) else Posicion.desde_partida(posicion)
+        futuro = Future()
+        with self._cerrojo:
+            if self._cerrado:
+                raise RuntimeError("El trabajador del motor está cerrado")
+            self._id_tarea += 1
+            self._pendientes.append({'id': self._id_tarea, 'futuro': futuro, 'posicion': posicion,
+                                     'limites': limites, 'al_informar': al_informar, 'plazo': None})
+            self._despachar()
+        return futuro
+
+    def pensar_async(self, posicion, limites: Union[None, Dict, NivelDificultad] = None,
+                     al_informar: Optional[Callable[[Dict], None]] = None) -> asyncio.Future:
+        """
+        Igual que `pensar`, pero devuelve un futuro de asyncio del bucle en curso. Los informes
+        se entregan en el bucle de eventos y cancelar el futuro detiene la búsqueda.
+        Debe llamarse desde una corrutina.
+        """
+        bucle = asyncio.get_running_loop()
+        informar = None
+        if al_informar is not None:
+            informar = lambda informe: bucle.call_soon_threadsafe(al_informar, informe)
+        futuro = self.pensar(posicion, limites, informar)
+        futuro_async = asyncio.wrap_future(futuro, loop=bucle)
+        futuro_async.add_done_callback(lambda f: self.cancelar(futuro) if f.cancelled() else None)
+        return futuro_async
+
+    def _despachar(self):
+        """
+        Envía al trabajador el siguiente encargo no cancelado si está libre (con el cerrojo tomado).
+        """
+        while self._activo is None and self._pendientes:
+            encargo = self._pendientes.popleft()
+            if not encargo['futuro'].set_running_or_notify_cancel():
+                continue # Cancelado mientras esperaba en la cola
+            tiempo_ms = encargo['limites'].get('tiempo_ms')
+            reloj = encargo['limites'].get('reloj')
+            if reloj:
+                limite_duro_ms = GestorTiempo.para_posicion(encargo['posicion'], **reloj).limite_duro_ms
+                tiempo_ms = min(tiempo_ms, limite_duro_ms) if tiempo_ms is not None else limite_duro_ms
+            if tiempo_ms is not None:
+                encargo['plazo'] = time.monotonic() + tiempo_ms / 1000.0 + _MARGEN_PLAZO_S
+            self._activo = encargo
+            self._evento_detener.clear() # Aquí y no en el trabajador, para no perder un `detener` temprano
+            self._tareas.put(('buscar', encargo['id'], encargo['posicion'], encargo['limites']))
+
+    def detener(self):
+        """
+        Detiene la búsqueda en curso (su futuro se resuelve con la última iteración completa).
+        """
+        with self._cerrojo:
+            if self._activo is not None:
+                self._evento_detener.set()
+
+    def cancelar(self, futuro: Future) -> bool:
+        """
+        Cancela un encargo: si aún está en cola se descarta; si está en curso, se detiene.
+
+        Returns:
+            True si el encargo estaba pendiente o en curso.
+        """
+        if futuro.cancel():
+            return True
+        with self._cerrojo:
+            if self._activo is not None and self._activo['futuro'] is futuro:
+                self._evento_detener.set()
+                return True
+        return False
+
+    def nueva_partida(self):
+        """
+        Vacía la tabla de transposición del trabajador (tras las búsquedas ya encargadas).
+        """
+        self._tareas.put(('nueva_partida',))
+
+    # ============================================================
+    # 2. Hilo de Escucha
+    # ============================================================
+
+    def _escuchar(self):
+        """
+        Recibe informes y resultados del trabajador, resuelve los futuros y vigila los plazos.
+        """
+        while True:
+            try:
+                tipo, id_tarea, contenido = self._mensajes.get(timeout=_INTERVALO_SONDEO_S)
+            except queue.Empty:
+                with self._cerrojo:
+                    activo = self._activo
+                    if activo is None and self._cerrado:
+                        return
+                    perdido = activo is not None and not self._proceso.is_alive()
+                    if perdido:
+                        self._activo = None
+                    elif activo is not None and activo['plazo'] is not None and time.monotonic() > activo['plazo']:
+                        logger.warning(f"La búsqueda {activo['id']} supera su plazo; se detiene")
+                        self._evento_detener.set()
+                        activo['plazo'] = None
+                if perdido:
+                    activo['futuro'].set_exception(RuntimeError("El proceso del motor terminó inesperadamente"))
+                continue
+            except (EOFError, OSError):
+                return
+            with self._cerrojo:
+                activo = self._activo
+                if activo is None or activo['id'] != id_tarea:
+                    continue
+                if tipo == 'informe':
+                    al_informar = activo['al_informar']
+                else:
+                    self._activo = None
+                    self._despachar()
+            if tipo == 'informe':
+                if al_informar is not None:
+                    try:
+                        al_informar(contenido)
+                    except Exception:
+                        logger.exception("Error en la función de informe de la búsqueda")
+            elif tipo == 'resultado':
+                activo['futuro'].set_result(contenido)
+            else:
+                activo['futuro'].set_exception(RuntimeError(contenido))
+
+    # ============================================================
+    # 3. Cierre
+    # ============================================================
+
+    def cerrar(self):
+        """
+        Cancela los encargos pendientes, detiene la búsqueda en curso y termina el proceso.
+        """
+        with self._cerrojo:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            while self._pendientes:
+                self._pendientes.popleft()['futuro'].cancel()
+            if self._activo is not None:
+                self._evento_detener.set()
+        self._tareas.put(None)
+        self._proceso.join(_ESPERA_CIERRE_S)
+        if self._proceso.is_alive():
+            self._proceso.terminate()
+            self._proceso.join()
+        self._hilo.join(_ESPERA_CIERRE_S)
+        with self._cerrojo:
+            activo, self._activo = self._activo, None
+        if activo is not None and not activo['futuro'].done():
+            activo['futuro'].set_exception(RuntimeError("El trabajador del motor se cerró"))
+        logger.info("Trabajador del motor cerrado")
+
+    def __enter__(self) -> 'TrabajadorMotor':
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
@@ -7,6 +7,7 @@ from typing import List, Tuple, TYPE_CHECKING, Literal
 
 # Importar clase base y verificar tipos para evitar importación circular
 from .pieza import Pieza
+from .tipo_pieza import TipoPieza
 if TYPE_CHECKING:
     from models.tablero import Tablero # Para type hints
 
@@ -17,6 +18,8 @@ class Alfil(Pieza):
     Representa la pieza de ajedrez Alfil.
     Hereda de la clase base Pieza.
     """
+    tipo = TipoPieza.ALFIL
+
     def __init__(self, color: Literal['blanco', 'negro'], posicion: Tuple[int, int], tablero: 'Tablero'):
         """
         Inicializa un Alfil.
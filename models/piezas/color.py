@@ -0,0 +1,42 @@
+"""
+Define los códigos enteros de color usados internamente por la capa de modelos.
+"""
+
+from enum import IntEnum
+from typing import Literal
+
+
+class Color(IntEnum):
+    """
+    Código entero del color de una pieza o jugador.
+    Internamente se compara y se indexa con estos enteros; las cadenas
+    'blanco'/'negro' solo se usan en la API pública (fronteras del modelo).
+    """
+    BLANCO = 0
+    NEGRO = 1
+
+    @classmethod
+    def desde_texto(cls, texto: Literal['blanco', 'negro']) -> 'Color':
+        """
+        Convierte la cadena de color de la API ('blanco' o 'negro') a su código.
+
+        Raises:
+            ValueError: Si la cadena no es un color válido.
+        """
+        if texto == 'blanco':
+            return cls.BLANCO
+        if texto == 'negro':
+            return cls.NEGRO
+        raise ValueError(f"Color no válido: {texto!r}")
+
+    def a_texto(self) -> Literal['blanco', 'negro']:
+        """
+        Devuelve la cadena de color de la API correspondiente a este código.
+        """
+        return 'blanco' if self is Color.BLANCO else 'negro'
+
+    def opuesto(self) -> 'Color':
+        """
+        Devuelve el color contrario.
+        """
+        return Color.NEGRO if self is Color.BLANCO else Color.BLANCO
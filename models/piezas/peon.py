@@ -4,9 +4,10 @@ Define la pieza Peón y su lógica específica.
 
 import os
 import logging # Importar logging
-from typing import Literal, Tuple, List, TYPE_CHECKING
+from typing import Literal, Tuple, List, Iterator, TYPE_CHECKING
 
 from .pieza import Pieza  # Importación relativa desde el mismo directorio
+from .tipo_pieza import TipoPieza
 
 if TYPE_CHECKING:
     from models.tablero import Tablero # Para type hints
@@ -17,6 +18,8 @@ class Peon(Pieza):
     """
     Representa la pieza de ajedrez Peón.
     """
+    tipo = TipoPieza.PEON
+
     def __init__(self, color: Literal['blanco', 'negro'], posicion: Tuple[int, int], tablero: 'Tablero'):
         """
         Inicializa un Peón.
@@ -94,20 +97,18 @@ class Peon(Pieza):
 
         return movimientos_potenciales 
 
-    def obtener_movimientos_legales(self) -> List[Tuple[int, int]]:
+    def iterar_movimientos_legales(self) -> Iterator[Tuple[int, int]]:
         """
-        Calcula todos los movimientos legales para este Peón.
+        Genera perezosamente los movimientos legales para este Peón.
         Considera: avance simple, avance doble, capturas diagonales y captura al paso.
         Filtra los movimientos potenciales según las reglas específicas del Peón.
         NOTA: La validación de seguridad del rey (no dejarlo en jaque) se hace llamando
         a `tablero._simular_y_verificar_seguridad` para cada movimiento candidato.
 
-        Returns:
-            Una lista de tuplas (fila, columna) representando las casillas destino legales.
+        Yields:
+            Tuplas (fila, columna) representando las casillas destino legales.
         """
-        movimientos_legales = []
         fila_actual, col_actual = self.posicion
-        color_oponente = 'negro' if self.color == 'blanco' else 'blanco'
 
         # Determinar la dirección del movimiento y las filas relevantes
         if self.color == 'blanco':
@@ -124,16 +125,17 @@ class Peon(Pieza):
         if self.tablero.esPosicionValida(destino_simple) and self.tablero.getPieza(destino_simple) is None:
             # Comprobar seguridad
             if self.tablero._simular_y_verificar_seguridad(self, destino_simple):
-                movimientos_legales.append(destino_simple)
-
-                # 2. Avance doble (solo si el avance simple es seguro y posible)
-                if fila_actual == fila_inicial:
-                    destino_doble = (fila_actual + 2 * direccion, col_actual)
-                    # Comprobar camino libre y destino válido/vacío
-                    if self.tablero.esPosicionValida(destino_doble) and self.tablero.getPieza(destino_doble) is None:
-                        # Comprobar seguridad para avance doble
-                        if self.tablero._simular_y_verificar_seguridad(self, destino_doble):
-                            movimientos_legales.append(destino_doble)
+                yield destino_simple
+
+            # 2. Avance doble (solo si la casilla intermedia está libre).
+            # Su seguridad se comprueba aparte: puede tapar un jaque que el avance simple no tapa.
+            if fila_actual == fila_inicial:
+                destino_doble = (fila_actual + 2 * direccion, col_actual)
+                # Comprobar camino libre y destino válido/vacío
+                if self.tablero.esPosicionValida(destino_doble) and self.tablero.getPieza(destino_doble) is None:
+                    # Comprobar seguridad para avance doble
+                    if self.tablero._simular_y_verificar_seguridad(self, destino_doble):
+                        yield destino_doble
 
         # 3. Capturas diagonales estándar
         destinos_diagonales = [
@@ -143,10 +145,10 @@ class Peon(Pieza):
         for destino_diag in destinos_diagonales:
             if self.tablero.esPosicionValida(destino_diag):
                 pieza_en_destino = self.tablero.getPieza(destino_diag)
-                if pieza_en_destino is not None and pieza_en_destino.color == color_oponente:
+                if pieza_en_destino is not None and pieza_en_destino.codigo_color != self.codigo_color:
                     # Comprobar seguridad para captura diagonal
                     if self.tablero._simular_y_verificar_seguridad(self, destino_diag):
-                        movimientos_legales.append(destino_diag)
+                        yield destino_diag
 
         # 4. Captura al paso (En Passant)
         if fila_actual == fila_en_passant and self.tablero.objetivoPeonAlPaso is not None:
@@ -156,6 +158,4 @@ class Peon(Pieza):
                  # Comprobar seguridad para captura al paso
                  # La simulación se encarga de quitar el peón capturado correcto
                  if self.tablero._simular_y_verificar_seguridad(self, objetivo_ep):
-                    movimientos_legales.append(objetivo_ep)
-
-        return movimientos_legales 
\ No newline at end of file
+                    yield objetivo_ep 
\ No newline at end of file
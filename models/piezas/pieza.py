@@ -3,9 +3,12 @@ Clase base para todas las piezas de ajedrez.
 """ 
 
 import logging
-from typing import Literal, Tuple, TYPE_CHECKING, List, Optional
+from typing import Literal, Tuple, TYPE_CHECKING, List, Optional, Iterator
 import os # Importar os para manejo de rutas
 
+from .color import Color
+from .tipo_pieza import TipoPieza
+
 # Evitar importación circular para type hints con referencias adelantadas
 if TYPE_CHECKING:
     from models.tablero import Tablero
@@ -18,6 +21,9 @@ class Pieza:
     """
     Clase base para todas las piezas de ajedrez.
     """
+    # Código entero del tipo de pieza (cada subclase define el suyo)
+    tipo: TipoPieza = TipoPieza.NINGUNO
+
     def __init__(self, color: Literal['blanco', 'negro'], posicion: Tuple[int, int], tablero: 'Tablero'):
         """
         Inicializa una pieza.
@@ -28,6 +34,9 @@ class Pieza:
             tablero: La instancia del tablero en la que se encuentra la pieza.
         """
         self.color: Literal['blanco', 'negro'] = color
+        # Códigos enteros para comparaciones y despacho en bucles internos
+        self.codigo_color: Color = Color.desde_texto(color)
+        self.codigo: int = (self.codigo_color << 3) | self.tipo # Codificación compacta de la casilla
         self.posicion: Tuple[int, int] = posicion
         self.tablero: 'Tablero' = tablero
         self.se_ha_movido: bool = False
@@ -54,20 +63,23 @@ class Pieza:
         """
         raise NotImplementedError("Las subclases deben implementar obtener_movimientos_potenciales()")
 
-    def obtener_movimientos_legales(self) -> List[Tuple[int, int]]:
+    def iterar_movimientos_legales(self) -> Iterator[Tuple[int, int]]:
         """
-        Calcula todos los movimientos legales para esta pieza en la posición actual del tablero.
+        Genera perezosamente los movimientos legales de esta pieza en la posición actual.
         Este método considera:
         1. Movimientos base/potenciales de la pieza.
         2. Obstrucciones por piezas del mismo color.
         3. Capturas de piezas del color opuesto.
         4. Que el movimiento no deje al propio rey en jaque.
-        5. Reglas especiales (enroque, al paso) - gestionadas aquí o en métodos específicos llamados desde aquí.
+        5. Reglas especiales (enroque, al paso) - las subclases Rey y Peón sobreescriben este método.
 
-        Returns:
-            Una lista de tuplas (fila, columna) representando las casillas destino legales.
+        Cada destino se valida justo antes de entregarlo, de modo que quien solo necesita
+        saber si existe algún movimiento (o contarlos) no paga por construir una lista.
+        NOTA: No se debe modificar el tablero mientras se consume el generador.
+
+        Yields:
+            Tuplas (fila, columna) representando las casillas destino legales.
         """
-        movimientos_legales = []
         # 1. Obtener movimientos potenciales (definidos en subclase)
         # ¡Importante! Obtener potenciales primero para no recalcular en cada simulación
         movimientos_potenciales = self.obtener_movimientos_potenciales()
@@ -80,19 +92,23 @@ class Pieza:
 
             # 2b. Verificar si la casilla destino está ocupada por pieza propia
             pieza_en_destino = self.tablero.getPieza(destino)
-            if pieza_en_destino is not None and pieza_en_destino.color == self.color:
+            if pieza_en_destino is not None and pieza_en_destino.codigo_color == self.codigo_color:
                 continue # No se puede mover a casilla ocupada por pieza propia
 
-            # 2c. Simular el movimiento y verificar si deja al rey en jaque (¡NUEVO!)
+            # 2c. Simular el movimiento y verificar si deja al rey en jaque
             if self.tablero._simular_y_verificar_seguridad(self, destino):
-                # Solo añadir el movimiento si el rey está seguro después de él
-                movimientos_legales.append(destino)
+                # Solo entregar el movimiento si el rey está seguro después de él
+                yield destino
 
-        # 3. Considerar movimientos especiales (Enroque, Al Paso)
-        # Estos deben manejarse en las clases Rey y Peón, quienes sobreescribirán este método
-        # o añadirán su lógica específica aquí si no lo sobreescriben completamente.
+    def obtener_movimientos_legales(self) -> List[Tuple[int, int]]:
+        """
+        Calcula todos los movimientos legales para esta pieza en la posición actual del tablero.
+        Materializa en una lista el resultado de `iterar_movimientos_legales`.
 
-        return movimientos_legales
+        Returns:
+            Una lista de tuplas (fila, columna) representando las casillas destino legales.
+        """
+        return list(self.iterar_movimientos_legales())
 
     def obtenerNotacionFEN(self) -> str:
         """
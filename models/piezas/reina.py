@@ -7,6 +7,7 @@ from typing import List, Tuple, TYPE_CHECKING, Literal
 
 # Importar clase base y verificar tipos para evitar importación circular
 from .pieza import Pieza
+from .tipo_pieza import TipoPieza
 if TYPE_CHECKING:
     from models.tablero import Tablero # Para type hints
 
@@ -18,6 +19,8 @@ class Reina(Pieza):
     Hereda de la clase base Pieza.
     Combina el movimiento de la Torre y el Alfil.
     """
+    tipo = TipoPieza.REINA
+
     def __init__(self, color: Literal['blanco', 'negro'], posicion: Tuple[int, int], tablero: 'Tablero'):
         """
         Inicializa una Reina.
@@ -4,10 +4,10 @@ Define la pieza Rey y su lógica específica.
 
 import os
 import logging
-from typing import Literal, Tuple, List, TYPE_CHECKING
+from typing import Literal, Tuple, List, Iterator, TYPE_CHECKING
 
 from .pieza import Pieza  # Importación relativa desde el mismo directorio
-from .torre import Torre # Necesario para verificar la torre en el enroque
+from .tipo_pieza import TipoPieza
 
 if TYPE_CHECKING:
     from models.tablero import Tablero
@@ -18,6 +18,8 @@ class Rey(Pieza):
     """
     Representa la pieza de ajedrez Rey.
     """
+    tipo = TipoPieza.REY
+
     def __init__(self, color: Literal['blanco', 'negro'], posicion: Tuple[int, int], tablero: 'Tablero'):
         """
         Inicializa un Rey.
@@ -75,17 +77,16 @@ class Rey(Pieza):
         # El enroque se añade como movimiento legal, no potencial, porque depende de muchas condiciones
         return movimientos_potenciales
 
-    def obtener_movimientos_legales(self) -> List[Tuple[int, int]]:
+    def iterar_movimientos_legales(self) -> Iterator[Tuple[int, int]]:
         """
-        Calcula todos los movimientos legales para este Rey.
+        Genera perezosamente los movimientos legales para este Rey.
         Incluye movimientos de un paso y el enroque (si es válido).
         Filtra movimientos que van fuera del tablero, a casillas ocupadas por piezas amigas,
         o a casillas amenazadas por el oponente.
 
-        Returns:
-            Una lista de tuplas (fila, columna) representando las casillas destino legales.
+        Yields:
+            Tuplas (fila, columna) representando las casillas destino legales.
         """
-        movimientos_legales = []
         color_oponente = 'negro' if self.color == 'blanco' else 'blanco'
 
         # 1. Filtrar movimientos potenciales de un paso
@@ -95,7 +96,7 @@ class Rey(Pieza):
                 continue # Fuera del tablero
 
             pieza_en_destino = self.tablero.getPieza(destino)
-            if pieza_en_destino is not None and pieza_en_destino.color == self.color:
+            if pieza_en_destino is not None and pieza_en_destino.codigo_color == self.codigo_color:
                 continue # Casilla ocupada por pieza amiga
 
             # Verificar si la casilla destino está amenazada (Rey no puede moverse a una casilla atacada)
@@ -105,13 +106,11 @@ class Rey(Pieza):
             # Verificar si el movimiento deja al rey en jaque (King Safety Check - ¡NUEVO!)
             # Aunque el destino no esté atacado, mover el rey podría REVELAR un ataque.
             if self.tablero._simular_y_verificar_seguridad(self, destino):
-                movimientos_legales.append(destino)
+                yield destino
 
         # 2. Verificar y añadir movimientos de Enroque
         # La seguridad del enroque (no pasar/aterrizar en casilla atacada) ya está en _obtener_movimientos_enroque
-        movimientos_legales.extend(self._obtener_movimientos_enroque())
-
-        return movimientos_legales
+        yield from self._obtener_movimientos_enroque()
 
     def _obtener_movimientos_enroque(self) -> List[Tuple[int, int]]:
         """
@@ -142,7 +141,8 @@ class Rey(Pieza):
         if self.tablero.derechosEnroque[self.color]['corto']:
             torre_pos_corta = (fila, col_torre_corta)
             torre_corta = self.tablero.getPieza(torre_pos_corta)
-            if isinstance(torre_corta, Torre) and not torre_corta.se_ha_movido:
+            if torre_corta is not None and torre_corta.tipo == TipoPieza.TORRE and \
+               torre_corta.codigo_color == self.codigo_color and not torre_corta.se_ha_movido:
                 # Verificar casillas intermedias vacías
                 if all(self.tablero.getPieza(pos) is None for pos in casillas_intermedias_corto):
                     # Verificar que las casillas por las que pasa/a las que llega el rey no están atacadas
@@ -154,7 +154,8 @@ class Rey(Pieza):
         if self.tablero.derechosEnroque[self.color]['largo']:
             torre_pos_larga = (fila, col_torre_larga)
             torre_larga = self.tablero.getPieza(torre_pos_larga)
-            if isinstance(torre_larga, Torre) and not torre_larga.se_ha_movido:
+            if torre_larga is not None and torre_larga.tipo == TipoPieza.TORRE and \
+               torre_larga.codigo_color == self.codigo_color and not torre_larga.se_ha_movido:
                 # Verificar casillas intermedias vacías
                 if all(self.tablero.getPieza(pos) is None for pos in casillas_intermedias_largo):
                     # Verificar que las casillas por las que pasa/a las que llega el rey no están atacadas
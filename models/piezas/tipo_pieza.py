@@ -0,0 +1,40 @@
+"""
+Define los códigos enteros de tipo de pieza usados internamente por la capa de modelos.
+"""
+
+from enum import IntEnum
+
+
+class TipoPieza(IntEnum):
+    """
+    Código entero del tipo de pieza. Permite despachar con tablas indexadas por tipo
+    en lugar de cadenas de `isinstance`. El 0 se reserva para "sin pieza", de modo que
+    una casilla se puede codificar como `(color << 3) | tipo` en un único entero.
+    """
+    NINGUNO = 0
+    PEON = 1
+    CABALLO = 2
+    ALFIL = 3
+    TORRE = 4
+    REINA = 5
+    REY = 6
+
+    @classmethod
+    def desde_letra(cls, letra: str) -> 'TipoPieza':
+        """
+        Convierte una letra de notación FEN/algebraica ('P', 'N', 'B', 'R', 'Q', 'K',
+        en mayúscula o minúscula) a su código.
+
+        Raises:
+            ValueError: Si la letra no corresponde a ninguna pieza.
+        """
+        try:
+            return cls('PNBRQK'.index(letra.upper()) + 1)
+        except ValueError:
+            raise ValueError(f"Letra de pieza no válida: {letra!r}") from None
+
+    def a_letra(self) -> str:
+        """
+        Devuelve la letra FEN en mayúscula del tipo ('P', 'N', 'B', 'R', 'Q' o 'K').
+        """
+        return ' PNBRQK'[self]
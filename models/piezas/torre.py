@@ -7,6 +7,7 @@ from typing import List, Tuple, TYPE_CHECKING, Literal
 
 # Importar clase base y verificar tipos para evitar importación circular
 from .pieza import Pieza
+from .tipo_pieza import TipoPieza
 if TYPE_CHECKING:
     from models.tablero import Tablero # Para type hints
 
@@ -19,6 +20,8 @@ class Torre(Pieza):
     Se mueve horizontal o verticalmente.
     Participa en el enroque.
     """
+    tipo = TipoPieza.TORRE
+
     def __init__(self, color: Literal['blanco', 'negro'], posicion: Tuple[int, int], tablero: 'Tablero'):
         """
         Inicializa una Torre.
@@ -2,7 +2,7 @@
 Representa el tablero de ajedrez y las posiciones de las piezas.
 """ 
 import logging
-from typing import Dict, List, Tuple, Optional, Literal
+from typing import Dict, List, Tuple, Optional, Literal, Iterator
 from collections import defaultdict # Importar defaultdict
 
 # Importar piezas
@@ -13,16 +13,31 @@ from models.piezas.alfil import Alfil
 from models.piezas.reina import Reina
 from models.piezas.rey import Rey
 from models.piezas.peon import Peon
+from models.piezas.color import Color
+from models.piezas.tipo_pieza import TipoPieza
 
 # Configuración básica de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Alias de los códigos de tipo para los bucles internos
+_PEON, _CABALLO, _ALFIL, _TORRE, _REINA, _REY = (TipoPieza.PEON, TipoPieza.CABALLO, TipoPieza.ALFIL,
+                                                 TipoPieza.TORRE, TipoPieza.REINA, TipoPieza.REY)
+# Tablas indexadas por código de tipo: ¿ataca la pieza en líneas ortogonales / diagonales?
+_ATACA_ORTOGONAL = (False, False, False, False, True, True, False)
+_ATACA_DIAGONAL = (False, False, False, True, False, True, False)
+# Casilla inicial de cada torre -> (color, lado de enroque que habilita)
+_ENROQUE_POR_CASILLA_TORRE = {(0, 7): ('blanco', 'corto'), (0, 0): ('blanco', 'largo'),
+                              (7, 7): ('negro', 'corto'), (7, 0): ('negro', 'largo')}
+
 class Tablero:
     """
     Representa el tablero de ajedrez, incluyendo posiciones de piezas, piezas capturadas,
     derechos de enroque y objetivos de captura al paso.
     """
+    # Clases de pieza admitidas en una promoción, por letra FEN
+    _CLASES_PROMOCION = {'Q': Reina, 'R': Torre, 'B': Alfil, 'N': Caballo}
+
     # ============================================================
     # 1. Inicialización y Configuración del Tablero
     # ============================================================
@@ -73,6 +88,14 @@ class Tablero:
         # Clave: string de representación de posición (tipo FEN), Valor: contador de ocurrencias
         self.historial_posiciones: Dict[str, int] = defaultdict(int)
 
+        # Caché de movimientos legales por casilla origen: {origen: (pieza, [destinos])}.
+        # Solo se invalidan las piezas afectadas por cada movimiento (ver `_invalidarMovimientosAfectados`).
+        self._cache_movimientos: Dict[Tuple[int, int], Tuple[Pieza, List[Tuple[int, int]]]] = {}
+        # Estado con el que se llenó la caché (matriz de casillas y objetivo al paso)
+        self._clave_cache: Optional[Tuple[List[List[Optional[Pieza]]], Optional[Tuple[int, int]]]] = None
+        # True si la caché se llenó con un rey en jaque: el próximo movimiento obliga a recalcular todo
+        self._cache_requiere_recalculo_total: bool = False
+
         # Inicializar el tablero con piezas
         self.inicializarTablero()
 
@@ -154,8 +177,19 @@ class Tablero:
             True si la pieza es blanca, False en caso contrario o si la casilla está vacía.
         """
         pieza = self.getPieza(posicion)
-        return pieza is not None and pieza.color == 'blanco'
-    
+        return pieza is not None and pieza.codigo_color == Color.BLANCO
+
+    def obtenerCodigos(self) -> List[int]:
+        """
+        Devuelve el tablero como una lista plana de 64 enteros (índice = fila * 8 + columna),
+        con el código `(color << 3) | tipo` de cada pieza y 0 en las casillas vacías.
+        Representación compacta pensada para el motor de búsqueda y la evaluación.
+
+        Returns:
+            Lista de 64 códigos enteros.
+        """
+        return [0 if pieza is None else pieza.codigo for fila in self.casillas for pieza in fila]
+
     # ============================================================
     # 3. Ejecución Central del Movimiento
     # ============================================================
@@ -204,7 +238,7 @@ class Tablero:
         casilla_captura_ep = None # Casilla donde estaba el peón capturado al paso
 
         # Comprobar si es un movimiento de peón al destino objetivo de 'al paso'
-        if isinstance(pieza_movida, Peon) and posDestino == self.objetivoPeonAlPaso:
+        if pieza_movida.tipo == _PEON and posDestino == self.objetivoPeonAlPaso:
             es_captura = True
             es_en_passant = True
             # El peón capturado está en la misma columna que el destino,
@@ -213,24 +247,24 @@ class Tablero:
             col_capturada = posDestino[1]
             casilla_captura_ep = (fila_capturada, col_capturada)
             pieza_capturada_ep = self.getPieza(casilla_captura_ep)
-            if pieza_capturada_ep is None or pieza_capturada_ep.color == pieza_movida.color:
+            if pieza_capturada_ep is None or pieza_capturada_ep.codigo_color == pieza_movida.codigo_color:
                 logger.error(f"Intento de captura al paso inválida en {posDestino} (sin peón o peón propio en {casilla_captura_ep})")
                 return 'error'
             self.capturarPieza(pieza_capturada_ep)
-            self.setPieza(casilla_captura_ep, None)
+            self._colocarPieza(casilla_captura_ep, None)
             logger.debug(f"Captura al paso realizada. Peón capturado en {casilla_captura_ep}")
 
         # 2. Gestionar captura normal (si no fue al paso)
         elif pieza_capturada is not None:
-            if pieza_capturada.color == pieza_movida.color:
+            if pieza_capturada.codigo_color == pieza_movida.codigo_color:
                 logger.error(f"Intento de captura de pieza propia en {posDestino}.")
                 return 'error'
             self.capturarPieza(pieza_capturada)
             es_captura = True
 
         # 3. Mover la pieza en el tablero
-        self.setPieza(posDestino, pieza_movida)
-        self.setPieza(posOrigen, None)
+        self._colocarPieza(posDestino, pieza_movida)
+        self._colocarPieza(posOrigen, None)
 
         # 4. Añadir al historial
         # TODO: Considerar añadir información extra al historial para en passant/promoción si es necesario para FEN o PGN.
@@ -249,16 +283,21 @@ class Tablero:
         # Se actualizan derechos de enroque *después* de mover la pieza y registrar captura.
         self.actualizarDerechosEnroque(pieza_movida, posOrigen, pieza_capturada, posDestino)
         # El objetivo al paso se actualiza DESPUÉS de los derechos de enroque
+        objetivo_ep_anterior = self.objetivoPeonAlPaso
         self.actualizarPeonAlPaso(pieza_movida, posOrigen, posDestino)
+        # Invalidar solo los movimientos en caché de las piezas afectadas
+        casillas_cambiadas = [posOrigen, posDestino]
+        if casilla_captura_ep is not None:
+            casillas_cambiadas.append(casilla_captura_ep)
+        self._invalidarMovimientosAfectados(casillas_cambiadas, objetivo_ep_anterior)
         self.actualizarContadores(pieza_movida, es_captura)
         self.actualizarUltimoMovimiento(posOrigen, posDestino)
 
         # 7. Detectar promoción de peón
         es_promocion = False
-        if isinstance(pieza_movida, Peon):
+        if pieza_movida.tipo == _PEON:
             fila_destino = posDestino[0]
-            if (pieza_movida.color == 'blanco' and fila_destino == 7) or \
-               (pieza_movida.color == 'negro' and fila_destino == 0):
+            if fila_destino == (7 if pieza_movida.codigo_color == Color.BLANCO else 0):
                 es_promocion = True
                 logger.debug(f"Promoción necesaria en {posDestino}")
 
@@ -299,7 +338,21 @@ class Tablero:
     def setPieza(self, posicion: Tuple[int, int], pieza: Optional[Pieza]):
         """
         Establece una pieza (o None) en una posición específica del tablero.
-        Es un método auxiliar para `moverPieza` y `inicializarTablero`. No valida la posición.
+        Pensado para colocar piezas desde fuera (configuración de posiciones). No valida la posición.
+        Como el cambio no proviene de un movimiento, vacía por completo la caché de movimientos legales.
+
+        Args:
+            posicion: Una tupla (fila, columna) indicando la casilla.
+            pieza: La pieza a establecer, o None para vaciar la casilla.
+        """
+        self._colocarPieza(posicion, pieza)
+        self._cache_movimientos.clear()
+
+    def _colocarPieza(self, posicion: Tuple[int, int], pieza: Optional[Pieza]):
+        """
+        Escribe una pieza (o None) en una casilla sin tocar la caché de movimientos.
+        Usado internamente por `moverPieza`, `realizarEnroque` (que invalidan de forma selectiva)
+        y por la simulación, que deja el tablero exactamente como estaba.
 
         Args:
             posicion: Una tupla (fila, columna) indicando la casilla.
@@ -339,15 +392,15 @@ class Tablero:
         rey = self.getPieza(rey_pos_origen)
         torre = self.getPieza(torre_pos_origen)
         
-        if not isinstance(rey, Rey) or not isinstance(torre, Torre):
+        if rey is None or torre is None or rey.tipo != _REY or torre.tipo != _TORRE:
             logger.error(f"Piezas incorrectas en {rey_pos_origen} o {torre_pos_origen} para enroque {color} {tipo}.")
             return False
         
         # Mover las piezas en el tablero
-        self.setPieza(rey_pos_destino, rey)
-        self.setPieza(rey_pos_origen, None)
-        self.setPieza(torre_pos_destino, torre)
-        self.setPieza(torre_pos_origen, None)
+        self._colocarPieza(rey_pos_destino, rey)
+        self._colocarPieza(rey_pos_origen, None)
+        self._colocarPieza(torre_pos_destino, torre)
+        self._colocarPieza(torre_pos_origen, None)
         
         # Actualizar posición interna de las piezas
         if hasattr(rey, 'posicion'): rey.posicion = rey_pos_destino
@@ -365,25 +418,63 @@ class Tablero:
         self.derechosEnroque[color]['corto'] = False
         self.derechosEnroque[color]['largo'] = False
         # Actualizar Peón al Paso (se limpia porque no fue mov de peón)
+        objetivo_ep_anterior = self.objetivoPeonAlPaso
         self.objetivoPeonAlPaso = None 
+        # Invalidar los movimientos en caché afectados por el rey y la torre
+        self._invalidarMovimientosAfectados(
+            [rey_pos_origen, rey_pos_destino, torre_pos_origen, torre_pos_destino], objetivo_ep_anterior)
         # Actualizar Contadores (enroque no es captura ni mov de peón)
         self.actualizarContadores(rey, False) # Usamos el rey como pieza movida
         # Actualizar Último Movimiento (registramos el del rey)
         self.actualizarUltimoMovimiento(rey_pos_origen, rey_pos_destino)
-        # Actualizar Estado del Juego
-        self.actualizarEstadoJuego()
         
         # Cambiar turno
         self.turno_blanco = not self.turno_blanco
         
-        # 9. Actualizar historial de posiciones DESPUÉS de cambiar el turno
+        # Actualizar historial de posiciones DESPUÉS de cambiar el turno
         estado_actual = self.obtenerPosicionActual()
         self.historial_posiciones[estado_actual] += 1
         logger.debug(f"Historial posiciones actualizado (enroque). Estado: '{estado_actual}', Count: {self.historial_posiciones[estado_actual]}")
+
+        # Actualizar Estado del Juego para el jugador que mueve ahora (igual que en `moverPieza`)
+        self.actualizarEstadoJuego()
         
         logger.info(f"Enroque {color} {tipo} realizado.")
         return True
-    
+
+    def realizarMovimiento(self, origen: Tuple[int, int], destino: Tuple[int, int], promocion: Optional[str] = None) -> bool:
+        """
+        Realiza un movimiento completo ya validado (p. ej. con `esMovimientoLegal`): despacha
+        el enroque a `realizarEnroque` y completa la promoción que `moverPieza` deja pendiente,
+        recalculando el historial de repeticiones y el estado del juego con la pieza nueva.
+
+        Args:
+            origen: Casilla origen (fila, columna).
+            destino: Casilla destino (fila, columna); para enrocar, la casilla destino del rey.
+            promocion: Letra FEN de la pieza de promoción ('Q', 'R', 'B', 'N'); por defecto, dama.
+
+        Returns:
+            True si el movimiento se realizó, False si hubo un error.
+        """
+        # La letra se valida antes de mover: después, el peón ya estaría en la última fila
+        clase = self._CLASES_PROMOCION.get((promocion or 'Q').upper())
+        if clase is None:
+            logger.error(f"Pieza de promoción no válida: {promocion}")
+            return False
+        pieza = self.getPieza(origen)
+        if pieza is not None and pieza.tipo == _REY and abs(destino[1] - origen[1]) == 2:
+            return self.realizarEnroque(pieza.color, 'corto' if destino[1] > origen[1] else 'largo')
+        resultado = self.moverPieza(origen, destino)
+        if resultado == 'error':
+            return False
+        if resultado == 'promocion_necesaria':
+            # La posición se registró con el peón en la última fila: se corrige con la pieza nueva
+            self.historial_posiciones[self.obtenerPosicionActual()] -= 1
+            self.setPieza(destino, clase(pieza.color, destino, self))
+            self.historial_posiciones[self.obtenerPosicionActual()] += 1
+            self.actualizarEstadoJuego()
+        return True
+
     # ============================================================
     # 4. Evaluación de Amenazas
     # ============================================================
@@ -405,92 +496,65 @@ class Tablero:
         target_f, target_c = posicion
         if not self.esPosicionValida(posicion):
             return False
-
-        for r in range(8):
-            for c in range(8):
-                pieza = self.casillas[r][c]
-                if pieza is None or pieza.color != color_atacante:
+        codigo_atacante = Color.desde_texto(color_atacante)
+        direccion_peon = 1 if codigo_atacante == Color.BLANCO else -1
+
+        for attacker_f in range(8):
+            fila = self.casillas[attacker_f]
+            for attacker_c in range(8):
+                pieza = fila[attacker_c]
+                if pieza is None or pieza.codigo_color != codigo_atacante:
                     continue
-
-                attacker_f, attacker_c = pieza.posicion
+                tipo = pieza.tipo
 
                 # --- 1. Comprobación de Peón ---
-                if isinstance(pieza, Peon):
-                    direccion = 1 if pieza.color == 'blanco' else -1
+                if tipo == _PEON:
                     # El peón amenaza las casillas diagonales en frente
-                    if target_f == attacker_f + direccion:
+                    if target_f == attacker_f + direccion_peon:
                         if target_c == attacker_c + 1 or target_c == attacker_c - 1:
                             return True
                     continue # Si es peón, no hace falta más chequeo
 
+                df = target_f - attacker_f
+                dc = target_c - attacker_c
+
                 # --- 2. Comprobación de Caballo ---
-                if isinstance(pieza, Caballo):
+                if tipo == _CABALLO:
                     # El caballo amenaza si la diferencia absoluta de filas/cols es (1,2) o (2,1)
-                    df = abs(target_f - attacker_f)
-                    dc = abs(target_c - attacker_c)
-                    if (df == 1 and dc == 2) or (df == 2 and dc == 1):
+                    if (abs(df), abs(dc)) in ((1, 2), (2, 1)):
                         return True
                     continue # Si es caballo, no hace falta más chequeo
 
                 # --- 3. Comprobación de Rey ---
-                if isinstance(pieza, Rey):
-                    # El rey amenaza las casillas adyacentes
-                    if abs(target_f - attacker_f) <= 1 and abs(target_c - attacker_c) <= 1:
-                        # No puede ser la misma casilla (abs(df) + abs(dc) > 0)
-                        if (target_f, target_c) != (attacker_f, attacker_c): 
-                           return True
+                if tipo == _REY:
+                    # El rey amenaza las casillas adyacentes (no puede ser la misma casilla)
+                    if abs(df) <= 1 and abs(dc) <= 1 and (df != 0 or dc != 0):
+                        return True
                     continue # Si es rey, no hace falta más chequeo
 
                 # --- 4. Comprobación de Piezas Deslizantes (Torre, Alfil, Reina) ---
-                is_sliding = isinstance(pieza, (Torre, Alfil, Reina))
-                if not is_sliding:
-                    continue # Si no es ninguna de las anteriores, algo raro pasa, pasar a la siguiente
-
-                # Verificar si la pieza puede atacar en línea recta o diagonal
-                can_attack_rank_file = isinstance(pieza, (Torre, Reina))
-                can_attack_diagonal = isinstance(pieza, (Alfil, Reina))
+                # ¿Está en la misma fila o columna (Torre/Reina) o en la misma diagonal (Alfil/Reina)?
+                if (df == 0) != (dc == 0):
+                    if not _ATACA_ORTOGONAL[tipo]:
+                        continue
+                elif df != 0 and abs(df) == abs(dc):
+                    if not _ATACA_DIAGONAL[tipo]:
+                        continue
+                else:
+                    continue # No está en una línea de ataque válida
 
-                df = target_f - attacker_f
-                dc = target_c - attacker_c
-                on_line = False
-                step_f, step_c = 0, 0
-
-                # ¿Está en la misma fila o columna? (Ataque de Torre/Reina)
-                if can_attack_rank_file and (df == 0 or dc == 0) and (df != 0 or dc != 0):
-                    on_line = True
-                    step_f = 0 if df == 0 else (1 if df > 0 else -1)
-                    step_c = 0 if dc == 0 else (1 if dc > 0 else -1)
-                # ¿Está en la misma diagonal? (Ataque de Alfil/Reina)
-                elif can_attack_diagonal and abs(df) == abs(dc) and df != 0:
-                    on_line = True
-                    step_f = 1 if df > 0 else -1
-                    step_c = 1 if dc > 0 else -1
-                
-                # Si no está en una línea de ataque válida para esta pieza, continuar
-                if not on_line:
-                    continue
-                
-                # Ahora, verificar si el camino está libre HASTA la casilla objetivo
-                path_clear = True
+                # Verificar si el camino está libre HASTA la casilla objetivo
+                step_f = (df > 0) - (df < 0)
+                step_c = (dc > 0) - (dc < 0)
                 check_f, check_c = attacker_f + step_f, attacker_c + step_c
-                while (check_f, check_c) != posicion:
-                    # Si salimos del tablero en el camino, algo es raro, pero el camino está 'libre' en ese sentido
-                    if not self.esPosicionValida((check_f, check_c)):
-                        # Esto no debería ocurrir si target_pos es válido y on_line es True
-                        logger.warning(f"[Threat Check Path] Path check went out of bounds from {(attacker_f, attacker_c)} to {posicion}")
-                        path_clear = False # Considerarlo bloqueado por seguridad
-                        break
+                while check_f != target_f or check_c != target_c:
                     # Si encontramos CUALQUIER pieza en el camino, está bloqueado
-                    blocking_piece = self.getPieza((check_f, check_c))
-                    if blocking_piece is not None:
-                        path_clear = False
+                    if self.casillas[check_f][check_c] is not None:
                         break
-                    # Avanzar al siguiente paso
                     check_f += step_f
                     check_c += step_c
-                
-                # Si el camino estaba libre, la pieza amenaza la posición
-                if path_clear:
+                else:
+                    # Si el camino estaba libre, la pieza amenaza la posición
                     return True
 
         # Si ninguna pieza amenaza la posición tras revisar todas
@@ -520,56 +584,33 @@ class Tablero:
         """
         color_movido = pieza_movida.color
 
-        # Casillas iniciales de las torres
-        torre_blanca_larga, torre_blanca_corta = (0, 0), (0, 7)
-        torre_negra_larga, torre_negra_corta = (7, 0), (7, 7)
-
         # 1. Si el REY se mueve, pierde AMBOS derechos de enroque
-        if isinstance(pieza_movida, Rey):
-            if self.derechosEnroque[color_movido]['corto']:
-                self.derechosEnroque[color_movido]['corto'] = False
-                logger.debug(f"Enroque corto perdido para {color_movido} (movimiento de rey)")
-            if self.derechosEnroque[color_movido]['largo']:
-                self.derechosEnroque[color_movido]['largo'] = False
-                logger.debug(f"Enroque largo perdido para {color_movido} (movimiento de rey)")
+        if pieza_movida.tipo == _REY:
+            for lado in ('corto', 'largo'):
+                if self.derechosEnroque[color_movido][lado]:
+                    self.derechosEnroque[color_movido][lado] = False
+                    logger.debug(f"Enroque {lado} perdido para {color_movido} (movimiento de rey)")
             # No necesitamos hacer más si el rey se movió
             return
 
         # 2. Si una TORRE se mueve DESDE su casilla inicial, pierde el derecho de ESE LADO
-        if isinstance(pieza_movida, Torre):
-            if color_movido == 'blanco':
-                if posOrigen == torre_blanca_corta and self.derechosEnroque['blanco']['corto']:
-                    self.derechosEnroque['blanco']['corto'] = False
-                    logger.debug("Enroque corto perdido para blanco (movimiento torre corta)")
-                elif posOrigen == torre_blanca_larga and self.derechosEnroque['blanco']['largo']:
-                    self.derechosEnroque['blanco']['largo'] = False
-                    logger.debug("Enroque largo perdido para blanco (movimiento torre larga)")
-            elif color_movido == 'negro':
-                if posOrigen == torre_negra_corta and self.derechosEnroque['negro']['corto']:
-                    self.derechosEnroque['negro']['corto'] = False
-                    logger.debug("Enroque corto perdido para negro (movimiento torre corta)")
-                elif posOrigen == torre_negra_larga and self.derechosEnroque['negro']['largo']:
-                    self.derechosEnroque['negro']['largo'] = False
-                    logger.debug("Enroque largo perdido para negro (movimiento torre larga)")
+        if pieza_movida.tipo == _TORRE:
+            self._retirarDerechoEnroqueTorre(color_movido, posOrigen, "movimiento de torre")
 
         # 3. Si una TORRE es CAPTURADA EN su casilla inicial, el OPONENTE pierde el derecho de ESE LADO
         # Nota: Se usa posDestino porque es la casilla donde estaba la torre *antes* de ser capturada.
-        if pieza_capturada is not None and isinstance(pieza_capturada, Torre) and posDestino is not None:
-            color_capturada = pieza_capturada.color
-            if color_capturada == 'blanco':
-                if posDestino == torre_blanca_corta and self.derechosEnroque['blanco']['corto']: # Torre blanca corta fue capturada
-                    self.derechosEnroque['blanco']['corto'] = False
-                    logger.debug("Enroque corto perdido para blanco (torre corta capturada)")
-                elif posDestino == torre_blanca_larga and self.derechosEnroque['blanco']['largo']: # Torre blanca larga fue capturada
-                    self.derechosEnroque['blanco']['largo'] = False
-                    logger.debug("Enroque largo perdido para blanco (torre larga capturada)")
-            elif color_capturada == 'negro':
-                if posDestino == torre_negra_corta and self.derechosEnroque['negro']['corto']: # Torre negra corta fue capturada
-                    self.derechosEnroque['negro']['corto'] = False
-                    logger.debug("Enroque corto perdido para negro (torre corta capturada)")
-                elif posDestino == torre_negra_larga and self.derechosEnroque['negro']['largo']: # Torre negra larga fue capturada
-                    self.derechosEnroque['negro']['largo'] = False
-                    logger.debug("Enroque largo perdido para negro (torre larga capturada)")
+        if pieza_capturada is not None and pieza_capturada.tipo == _TORRE and posDestino is not None:
+            self._retirarDerechoEnroqueTorre(pieza_capturada.color, posDestino, "torre capturada")
+
+    def _retirarDerechoEnroqueTorre(self, color: Literal['blanco', 'negro'], casilla: Tuple[int, int], motivo: str):
+        """
+        Retira el derecho de enroque asociado a la casilla inicial de una torre de `color`,
+        si `casilla` es una de ellas. Auxiliar de `actualizarDerechosEnroque`.
+        """
+        entrada = _ENROQUE_POR_CASILLA_TORRE.get(casilla)
+        if entrada is not None and entrada[0] == color and self.derechosEnroque[color][entrada[1]]:
+            self.derechosEnroque[color][entrada[1]] = False
+            logger.debug(f"Enroque {entrada[1]} perdido para {color} ({motivo})")
 
     def actualizarPeonAlPaso(self, pieza_movida: Pieza, posOrigen: Tuple[int, int], posDestino: Tuple[int, int]):
         """
@@ -583,7 +624,7 @@ class Tablero:
         """
         self.objetivoPeonAlPaso = None 
 
-        if isinstance(pieza_movida, Peon) and abs(posOrigen[0] - posDestino[0]) == 2:
+        if pieza_movida.tipo == _PEON and abs(posOrigen[0] - posDestino[0]) == 2:
             fila_objetivo = (posOrigen[0] + posDestino[0]) // 2
             columna_objetivo = posOrigen[1]
             self.objetivoPeonAlPaso = (fila_objetivo, columna_objetivo)
@@ -604,7 +645,7 @@ class Tablero:
             self.numero_movimiento += 1
 
         # Resetear contador de 50 movimientos si fue un movimiento de peón o una captura
-        if isinstance(pieza_movida, Peon) or es_captura:
+        if pieza_movida.tipo == _PEON or es_captura:
             self.contadorRegla50Movimientos = 0
         else:
             self.contadorRegla50Movimientos += 1
@@ -623,26 +664,26 @@ class Tablero:
         
         NOTA:
          - Verifica jaque y tablas por 50 mov/repetición/material insuficiente.
-         - NO implementa chequeo completo de mate/ahogado, ya que requiere la 
-           generación de TODOS los movimientos legales para el jugador actual, 
-           lo cual es responsabilidad de una capa superior (Controlador/Validador).
+         - Para mate/ahogado solo comprueba si existe algún movimiento legal
+           (`tiene_movimientos_legales`), sin generar la lista completa.
         """
         color_jugador_actual = self.getTurnoColor() # Color del jugador QUE VA A MOVER AHORA
         color_oponente = 'negro' if color_jugador_actual == 'blanco' else 'blanco'
         
         # Encontrar el rey del jugador actual
-        rey_pos = None
-        for r, fila in enumerate(self.casillas):
-            for c, pieza in enumerate(fila):
-                if isinstance(pieza, Rey) and pieza.color == color_jugador_actual:
-                    rey_pos = (r, c)
-                    break
-            if rey_pos: break
+        rey_pos = self._buscarRey(color_jugador_actual)
 
         if rey_pos is None:
              logger.critical(f"No se encontró el rey {color_jugador_actual}. Estado del juego no actualizado.") # Usar critical para errores graves
              return
 
+        # Comprobar Jaque (evaluando si el rey actual está amenazado).
+        # Con el rey en jaque casi todos los movimientos cambian: se recalcula la caché entera.
+        esta_en_jaque = self.esCasillaAmenazada(rey_pos, color_oponente)
+        if esta_en_jaque:
+            self._cache_movimientos.clear()
+        self._cache_requiere_recalculo_total = esta_en_jaque
+
         # 1. Comprobar condiciones de Tablas (que no dependen de movimientos legales)
         if self.contadorRegla50Movimientos >= 100: # Son 50 movimientos completos, 100 plies
             self.estado_juego = 'tablas'
@@ -658,13 +699,8 @@ class Tablero:
             logger.info("Tablas por material insuficiente.")
             return
 
-        # 2. Comprobar Jaque (evaluando si el rey actual está amenazado)
-        esta_en_jaque = self.esCasillaAmenazada(rey_pos, color_oponente)
-
-        # 3. Determinar estado final (Mate/Ahogado - REQUIERE MOVIMIENTOS LEGALES)
-        movimientos_legales = self.obtener_todos_movimientos_legales(color_jugador_actual)
-
-        if not movimientos_legales: # No hay movimientos legales
+        # 2. Determinar estado final (Mate/Ahogado - basta con saber si existe algún movimiento legal)
+        if not self.tiene_movimientos_legales(color_jugador_actual): # No hay movimientos legales
            if esta_en_jaque:
                self.estado_juego = 'jaque_mate'
                logger.info(f"Jaque Mate a {color_jugador_actual}.")
@@ -673,7 +709,7 @@ class Tablero:
                logger.info(f"Tablas por ahogado a {color_jugador_actual}.")
            return
 
-        # 4. Si hay movimientos legales (o no hemos comprobado aún), actualizar estado básico
+        # 3. Si hay movimientos legales, actualizar estado básico
         if esta_en_jaque:
             self.estado_juego = 'jaque'
         else:
@@ -687,68 +723,48 @@ class Tablero:
         Returns:
             True si el material es insuficiente para mate, False en caso contrario.
         """
-        piezas_blancas = []
-        piezas_negras = []
-        alfiles_blancos_casilla_clara = 0
-        alfiles_blancos_casilla_oscura = 0
-        alfiles_negros_casilla_clara = 0
-        alfiles_negros_casilla_oscura = 0
+        # Conteo por color y código de tipo (excluyendo reyes) y color de casilla de los alfiles
+        conteo = ([0] * 7, [0] * 7)
+        alfiles_casilla_oscura = [0, 0]
+        alfiles_casilla_clara = [0, 0]
 
-        # Contar piezas (excluyendo reyes) y características de alfiles
         for r in range(8):
             for c in range(8):
                 pieza = self.casillas[r][c]
-                if pieza is not None and not isinstance(pieza, Rey):
-                    tipo_pieza = type(pieza)
-                    # Si encontramos una Reina o una Torre o un Peón, el material SIEMPRE es suficiente
-                    if tipo_pieza == Reina or tipo_pieza == Torre or tipo_pieza == Peon:
-                        return False # Mate es posible
-
-                    if pieza.color == 'blanco':
-                        piezas_blancas.append(tipo_pieza)
-                        if isinstance(pieza, Alfil):
-                            # (0,0) es oscura en la config estándar. (r+c)%2==0 es oscura.
-                            if (r + c) % 2 == 0:
-                                alfiles_blancos_casilla_oscura += 1
-                            else:
-                                alfiles_blancos_casilla_clara += 1
-                        # Guardar si hay caballos (podríamos solo contar)
-                        # elif isinstance(pieza, Caballo): pass
-                    else: # Negro
-                        piezas_negras.append(tipo_pieza)
-                        if isinstance(pieza, Alfil):
-                            if (r + c) % 2 == 0:
-                                alfiles_negros_casilla_oscura += 1
-                            else:
-                                alfiles_negros_casilla_clara += 1
-                        # elif isinstance(pieza, Caballo): pass
-
-        num_piezas_blancas = len(piezas_blancas)
-        num_piezas_negras = len(piezas_negras)
-
-        # Caso 1: Rey vs Rey (ambas listas vacías)
+                if pieza is None or pieza.tipo == _REY:
+                    continue
+                tipo = pieza.tipo
+                # Si encontramos una Reina o una Torre o un Peón, el material SIEMPRE es suficiente
+                if tipo == _REINA or tipo == _TORRE or tipo == _PEON:
+                    return False # Mate es posible
+                color = pieza.codigo_color
+                conteo[color][tipo] += 1
+                if tipo == _ALFIL:
+                    # (0,0) es oscura en la config estándar. (r+c)%2==0 es oscura.
+                    if (r + c) % 2 == 0:
+                        alfiles_casilla_oscura[color] += 1
+                    else:
+                        alfiles_casilla_clara[color] += 1
+
+        blancas, negras = conteo
+        num_piezas_blancas = blancas[_CABALLO] + blancas[_ALFIL]
+        num_piezas_negras = negras[_CABALLO] + negras[_ALFIL]
+
+        # Caso 1: Rey vs Rey
         if num_piezas_blancas == 0 and num_piezas_negras == 0:
             logger.debug("Material insuficiente: K vs K")
             return True
 
-        # Caso 2: Rey + Caballo vs Rey
-        if (num_piezas_blancas == 1 and piezas_blancas[0] == Caballo and num_piezas_negras == 0) or \
-           (num_piezas_negras == 1 and piezas_negras[0] == Caballo and num_piezas_blancas == 0):
-            logger.debug("Material insuficiente: K+N vs K")
-            return True
-
-        # Caso 3: Rey + Alfil vs Rey
-        if (num_piezas_blancas == 1 and piezas_blancas[0] == Alfil and num_piezas_negras == 0) or \
-           (num_piezas_negras == 1 and piezas_negras[0] == Alfil and num_piezas_blancas == 0):
-            logger.debug("Material insuficiente: K+B vs K")
+        # Caso 2 y 3: Rey + Caballo vs Rey, o Rey + Alfil vs Rey
+        if num_piezas_blancas + num_piezas_negras == 1:
+            logger.debug("Material insuficiente: K+N vs K o K+B vs K")
             return True
 
         # Caso 4: Rey + Alfil vs Rey + Alfil (ambos alfiles en casillas del mismo color)
-        if num_piezas_blancas == 1 and piezas_blancas[0] == Alfil and \
-           num_piezas_negras == 1 and piezas_negras[0] == Alfil:
+        if blancas[_ALFIL] == 1 and negras[_ALFIL] == 1 and num_piezas_blancas == 1 and num_piezas_negras == 1:
             # Comprobar si ambos están en claras o ambos en oscuras
-            ambos_en_claras = alfiles_blancos_casilla_clara == 1 and alfiles_negros_casilla_clara == 1
-            ambos_en_oscuras = alfiles_blancos_casilla_oscura == 1 and alfiles_negros_casilla_oscura == 1
+            ambos_en_claras = alfiles_casilla_clara[Color.BLANCO] == 1 and alfiles_casilla_clara[Color.NEGRO] == 1
+            ambos_en_oscuras = alfiles_casilla_oscura[Color.BLANCO] == 1 and alfiles_casilla_oscura[Color.NEGRO] == 1
             if ambos_en_claras or ambos_en_oscuras:
                  logger.debug("Material insuficiente: K+B vs K+B (mismo color)")
                  return True
@@ -776,73 +792,124 @@ class Tablero:
         Returns:
             True si el rey NO queda en jaque después del movimiento simulado, False en caso contrario.
         """
-        origen = pieza.posicion
         color_jugador = pieza.color
         color_oponente = 'negro' if color_jugador == 'blanco' else 'blanco'
 
-        # --- Almacenar estado original ---        
-        pieza_capturada_temporal = self.getPieza(destino)
-        objetivo_ep_original = self.objetivoPeonAlPaso
-        derechos_enroque_original = { 
-            'blanco': self.derechosEnroque['blanco'].copy(),
-            'negro': self.derechosEnroque['negro'].copy()
-        }
-        pieza_se_ha_movido_original = pieza.se_ha_movido
-        torre_capturada_se_ha_movido_original = None
-        if pieza_capturada_temporal is not None and isinstance(pieza_capturada_temporal, Torre):
-             torre_capturada_se_ha_movido_original = pieza_capturada_temporal.se_ha_movido
-
-        # --- Simular el movimiento --- 
-        pieza_capturada_ep_real = None 
-        casilla_peon_capturado_ep = None
-        if isinstance(pieza, Peon) and destino == self.objetivoPeonAlPaso:
-            fila_captura_ep = origen[0]
-            col_captura_ep = destino[1]
-            casilla_peon_capturado_ep = (fila_captura_ep, col_captura_ep)
-            pieza_capturada_ep_real = self.getPieza(casilla_peon_capturado_ep)
-            if pieza_capturada_ep_real: # Solo si realmente hay algo que capturar al paso
-                self.setPieza(casilla_peon_capturado_ep, None) 
-        
-        self.setPieza(destino, pieza)
-        self.setPieza(origen, None)
-        pieza.posicion = destino 
-        if hasattr(pieza, 'se_ha_movido'): # Asegurar que la pieza tiene el atributo
-            pieza.se_ha_movido = True 
-        
-        # Actualizar derechos y EP temporalmente (simplificado)
-        self.actualizarDerechosEnroque(pieza, origen, pieza_capturada_temporal, destino)
-        self.actualizarPeonAlPaso(pieza, origen, destino)
+        registro = self._aplicarMovimientoTemporal(pieza.posicion, destino)
 
         # --- Verificar seguridad del rey --- 
-        rey_pos = None
-        for r, fila in enumerate(self.casillas):
-            for c, p_actual in enumerate(fila):
-                if isinstance(p_actual, Rey) and p_actual.color == color_jugador:
-                    rey_pos = (r, c)
-                    break
-            if rey_pos: break
-
+        rey_pos = self._buscarRey(color_jugador)
         es_seguro = False
         if rey_pos is None:
              logger.critical(f"SIMULACIÓN: Rey {color_jugador} no encontrado.")
         else:
              es_seguro = not self.esCasillaAmenazada(rey_pos, color_oponente)
 
-        # --- Deshacer la simulación ---
-        if hasattr(pieza, 'se_ha_movido'):
-            pieza.se_ha_movido = pieza_se_ha_movido_original 
-        pieza.posicion = origen 
-        self.setPieza(origen, pieza)
-        self.setPieza(destino, pieza_capturada_temporal)
-        if casilla_peon_capturado_ep and pieza_capturada_ep_real:
-            self.setPieza(casilla_peon_capturado_ep, pieza_capturada_ep_real) 
+        self._revertirMovimientoTemporal(registro)
+        return es_seguro
 
-        self.objetivoPeonAlPaso = objetivo_ep_original
-        self.derechosEnroque = derechos_enroque_original 
-        if pieza_capturada_temporal is not None and isinstance(pieza_capturada_temporal, Torre) and torre_capturada_se_ha_movido_original is not None:
-            pieza_capturada_temporal.se_ha_movido = torre_capturada_se_ha_movido_original
+    def _aplicarMovimientoTemporal(self, origen: Tuple[int, int], destino: Tuple[int, int], promocion: Optional[str] = None) -> tuple:
+        """
+        Aplica un movimiento de forma reversible, sin historial, contadores, turno ni caché.
+        Gestiona captura al paso, el movimiento de la torre en el enroque (rey que avanza dos columnas)
+        y, si se indica `promocion` ('Q', 'R', 'B' o 'N'), coloca la pieza promovida.
+        ¡Precaución! Debe deshacerse siempre con `_revertirMovimientoTemporal`.
 
-        return es_seguro
+        Args:
+            origen: Casilla de la pieza que se mueve.
+            destino: Casilla destino.
+            promocion: Letra de la pieza de promoción, o None para dejar el peón.
+
+        Returns:
+            Registro opaco con todo lo necesario para deshacer el movimiento.
+        """
+        pieza = self.casillas[origen[0]][origen[1]]
+        pieza_capturada = self.casillas[destino[0]][destino[1]]
+
+        # --- Almacenar estado original ---
+        registro_estado = (
+            self.objetivoPeonAlPaso,
+            {'blanco': self.derechosEnroque['blanco'].copy(), 'negro': self.derechosEnroque['negro'].copy()},
+            pieza.se_ha_movido,
+            pieza_capturada.se_ha_movido if pieza_capturada is not None else None,
+        )
+
+        # --- Captura al paso: retirar el peón capturado ---
+        casilla_ep = None
+        pieza_ep = None
+        if pieza.tipo == _PEON and destino == self.objetivoPeonAlPaso:
+            casilla_ep = (origen[0], destino[1])
+            pieza_ep = self.casillas[casilla_ep[0]][casilla_ep[1]]
+            if pieza_ep is not None: # Solo si realmente hay algo que capturar al paso
+                self._colocarPieza(casilla_ep, None)
+
+        # --- Enroque: mover también la torre ---
+        torre_enroque = None
+        if pieza.tipo == _REY and abs(destino[1] - origen[1]) == 2:
+            col_torre_origen, col_torre_destino = (7, 5) if destino[1] > origen[1] else (0, 3)
+            torre = self.casillas[origen[0]][col_torre_origen]
+            if torre is not None:
+                torre_enroque = (torre, (origen[0], col_torre_origen), (origen[0], col_torre_destino), torre.se_ha_movido)
+                self._colocarPieza(torre_enroque[1], None)
+                self._colocarPieza(torre_enroque[2], torre)
+                torre.posicion = torre_enroque[2]
+                torre.se_ha_movido = True
+
+        # --- Mover la pieza (o la pieza promovida) ---
+        self._colocarPieza(origen, None)
+        pieza.posicion = destino
+        pieza.se_ha_movido = True
+        pieza_colocada = pieza
+        if promocion is not None and pieza.tipo == _PEON:
+            pieza_colocada = self._CLASES_PROMOCION[promocion.upper()](pieza.color, destino, self)
+            pieza_colocada.se_ha_movido = True
+        self._colocarPieza(destino, pieza_colocada)
+
+        # Actualizar derechos y EP temporalmente
+        self.actualizarDerechosEnroque(pieza, origen, pieza_capturada, destino)
+        self.actualizarPeonAlPaso(pieza, origen, destino)
+
+        return (pieza, origen, destino, pieza_capturada, casilla_ep, pieza_ep, torre_enroque, registro_estado)
+
+    def _revertirMovimientoTemporal(self, registro: tuple):
+        """
+        Deshace un movimiento aplicado con `_aplicarMovimientoTemporal`, dejando el tablero
+        (casillas, posiciones, `se_ha_movido`, derechos de enroque y objetivo al paso) como estaba.
+
+        Args:
+            registro: El registro devuelto por `_aplicarMovimientoTemporal`.
+        """
+        pieza, origen, destino, pieza_capturada, casilla_ep, pieza_ep, torre_enroque, registro_estado = registro
+        objetivo_ep, derechos_enroque, pieza_se_ha_movido, capturada_se_ha_movido = registro_estado
+
+        pieza.se_ha_movido = pieza_se_ha_movido
+        pieza.posicion = origen
+        self._colocarPieza(origen, pieza)
+        self._colocarPieza(destino, pieza_capturada)
+        if pieza_capturada is not None:
+            pieza_capturada.se_ha_movido = capturada_se_ha_movido
+        if casilla_ep is not None and pieza_ep is not None:
+            self._colocarPieza(casilla_ep, pieza_ep)
+        if torre_enroque is not None:
+            torre, torre_origen, torre_destino, torre_se_ha_movido = torre_enroque
+            self._colocarPieza(torre_destino, None)
+            self._colocarPieza(torre_origen, torre)
+            torre.posicion = torre_origen
+            torre.se_ha_movido = torre_se_ha_movido
+
+        self.objetivoPeonAlPaso = objetivo_ep
+        self.derechosEnroque = derechos_enroque
+
+    def _buscarRey(self, color: Literal['blanco', 'negro']) -> Optional[Tuple[int, int]]:
+        """
+        Devuelve la casilla del rey del color indicado, o None si no está en el tablero.
+        """
+        codigo_rey = (Color.desde_texto(color) << 3) | _REY
+        for r, fila in enumerate(self.casillas):
+            for c, pieza in enumerate(fila):
+                if pieza is not None and pieza.codigo == codigo_rey:
+                    return (r, c)
+        return None
 
     # ============================================================ 
     # 6. Representación de Posición y Chequeo de Repetición (Auxiliares)
@@ -937,11 +1004,106 @@ class Tablero:
     # 6. Generación de Todos los Movimientos Legales (NUEVO)
     # ============================================================
 
+    def iterar_movimientos_legales(self, color: Literal['blanco', 'negro']) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Genera perezosamente todos los movimientos legales para un color dado,
+        en el mismo orden de recorrido de casillas que `obtener_todos_movimientos_legales`.
+        Cada movimiento se valida solo cuando el consumidor lo pide, por lo que
+        quien se detiene pronto (p. ej., "¿hay algún movimiento?") no paga por el resto.
+        NOTA: No se debe modificar el tablero mientras se consume el generador.
+
+        Args:
+            color: El color ('blanco' o 'negro') para el que generar movimientos.
+
+        Yields:
+            Tuplas ((fila_origen, col_origen), (fila_destino, col_destino)).
+        """
+        self._validarClaveCache()
+        codigo_color = Color.desde_texto(color)
+        for r in range(8):
+            fila = self.casillas[r]
+            for c in range(8):
+                pieza = fila[c]
+                if pieza is not None and pieza.codigo_color == codigo_color:
+                    origen = (r, c)
+                    entrada = self._cache_movimientos.get(origen)
+                    if entrada is not None and entrada[0] is pieza:
+                        for destino in entrada[1]:
+                            yield (origen, destino)
+                        continue
+                    # Sin caché: validar perezosamente y guardar la lista solo si se consumió entera
+                    destinos = []
+                    for destino in pieza.iterar_movimientos_legales(): # Ya filtra por seguridad del rey
+                        destinos.append(destino)
+                        yield (origen, destino)
+                    self._guardarEnCache(origen, pieza, destinos)
+
+    def contar_movimientos_legales(self, color: Literal['blanco', 'negro']) -> int:
+        """
+        Cuenta los movimientos legales de un color sin construir la lista de
+        tuplas (origen, destino). Útil para evaluación de movilidad y estadísticas.
+
+        Args:
+            color: El color ('blanco' o 'negro') cuyos movimientos se cuentan.
+
+        Returns:
+            El número de movimientos legales disponibles para ese color.
+        """
+        total = 0
+        codigo_color = Color.desde_texto(color)
+        for r in range(8):
+            fila = self.casillas[r]
+            for c in range(8):
+                pieza = fila[c]
+                if pieza is not None and pieza.codigo_color == codigo_color:
+                    total += len(self.obtener_movimientos_legales_casilla((r, c)))
+        return total
+
+    def obtener_movimientos_legales_casilla(self, posicion: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Devuelve los destinos legales de la pieza situada en `posicion`, usando la caché
+        incremental cuando sigue siendo válida. Pensado para la interfaz (resaltar destinos
+        al seleccionar una pieza) y para quien consulta pieza a pieza.
+
+        Args:
+            posicion: Tupla (fila, columna) de la pieza.
+
+        Returns:
+            Lista de casillas destino legales, o lista vacía si la casilla está vacía o es inválida.
+            La lista devuelta no debe modificarse (puede ser la almacenada en caché).
+        """
+        pieza = self.getPieza(posicion)
+        if pieza is None:
+            return []
+        self._validarClaveCache()
+        entrada = self._cache_movimientos.get(posicion)
+        if entrada is not None and entrada[0] is pieza:
+            return entrada[1]
+        destinos = pieza.obtener_movimientos_legales()
+        self._guardarEnCache(posicion, pieza, destinos)
+        return destinos
+
+    def tiene_movimientos_legales(self, color: Literal['blanco', 'negro']) -> bool:
+        """
+        Indica si el color dado dispone de al menos un movimiento legal.
+        Se detiene en el primer movimiento encontrado. Usado por `actualizarEstadoJuego`
+        para distinguir mate/ahogado sin generar todos los movimientos.
+
+        Args:
+            color: El color ('blanco' o 'negro') a comprobar.
+
+        Returns:
+            True si existe algún movimiento legal, False en caso contrario.
+        """
+        for _ in self.iterar_movimientos_legales(color):
+            return True
+        return False
+
     def obtener_todos_movimientos_legales(self, color: Literal['blanco', 'negro']) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
         """
         Genera una lista de todos los movimientos legales para un color dado.
         Un movimiento legal es uno que sigue las reglas de la pieza y no deja
-        al propio rey en jaque.
+        al propio rey en jaque. Materializa el resultado de `iterar_movimientos_legales`.
 
         Args:
             color: El color ('blanco' o 'negro') para el que generar movimientos.
@@ -951,18 +1113,400 @@ class Tablero:
             en el formato ((fila_origen, col_origen), (fila_destino, col_destino)).
             Devuelve una lista vacía si no hay movimientos legales (posible mate o ahogado).
         """
-        todos_movimientos_legales = []
+        return list(self.iterar_movimientos_legales(color))
+
+    def esMovimientoLegal(self, origen: Tuple[int, int], destino: Tuple[int, int], promocion: Optional[str] = None) -> bool:
+        """
+        Valida un único movimiento (p. ej., recibido del usuario o por red) sin generar
+        todos los movimientos de la pieza. Comprueba, solo para ese movimiento:
+        1. Que haya una pieza del jugador con el turno en `origen` y el destino no sea propio.
+        2. La geometría de la pieza y que el camino esté libre (piezas deslizantes, avance de peón).
+        3. Reglas especiales: enroque (rey dos columnas) y captura al paso.
+        4. La promoción: solo en avances a la última fila y con 'Q', 'R', 'B' o 'N' (o None
+           si la pieza se elegirá después, como en `moverPieza`).
+        5. Que el propio rey no quede en jaque: solo se simula el movimiento si el rey está
+           en jaque, si mueve el rey, si es al paso o si la pieza puede estar clavada.
+
+        Args:
+            origen: Tupla (fila, columna) de la pieza a mover.
+            destino: Tupla (fila, columna) de destino.
+            promocion: Letra de la pieza de promoción, o None.
+
+        Returns:
+            True si el movimiento es legal en la posición actual, False en caso contrario.
+        """
+        # 1. Validaciones básicas
+        if not self.esPosicionValida(origen) or not self.esPosicionValida(destino) or origen == destino:
+            return False
+        pieza = self.casillas[origen[0]][origen[1]]
+        if pieza is None or pieza.color != self.getTurnoColor():
+            return False
+        ocupante = self.casillas[destino[0]][destino[1]]
+        if ocupante is not None and ocupante.color == pieza.color:
+            return False
+
+        # 4. Promoción (se valida antes para descartar pronto parámetros incoherentes)
+        es_promocion = pieza.tipo == _PEON and destino[0] == (7 if pieza.codigo_color == Color.BLANCO else 0)
+        if promocion is not None and (not es_promocion or str(promocion).upper() not in self._CLASES_PROMOCION):
+            return False
+
+        df = destino[0] - origen[0]
+        dc = destino[1] - origen[1]
+
+        # 2 y 3. Geometría por tipo de pieza
+        es_al_paso = False
+        if pieza.tipo == _CABALLO:
+            if (abs(df), abs(dc)) not in ((1, 2), (2, 1)):
+                return False
+        elif pieza.tipo in (_ALFIL, _TORRE, _REINA):
+            if not self._esLineaLibre(origen, destino, ortogonal=_ATACA_ORTOGONAL[pieza.tipo], diagonal=_ATACA_DIAGONAL[pieza.tipo]):
+                return False
+        elif pieza.tipo == _PEON:
+            direccion = 1 if pieza.codigo_color == Color.BLANCO else -1
+            if dc == 0:
+                if ocupante is not None:
+                    return False
+                if df == 2 * direccion:
+                    if origen[0] != (1 if pieza.color == 'blanco' else 6) or \
+                       self.casillas[origen[0] + direccion][origen[1]] is not None:
+                        return False
+                elif df != direccion:
+                    return False
+            elif abs(dc) == 1 and df == direccion:
+                if ocupante is None:
+                    if destino != self.objetivoPeonAlPaso:
+                        return False
+                    capturado = self.casillas[origen[0]][destino[1]]
+                    if capturado is None or capturado.codigo_color == pieza.codigo_color or capturado.tipo != _PEON:
+                        return False
+                    es_al_paso = True
+            else:
+                return False
+        elif pieza.tipo == _REY:
+            if abs(df) <= 1 and abs(dc) <= 1:
+                return self._simular_y_verificar_seguridad(pieza, destino)
+            # Enroque: la validación completa (derechos, torre, casillas libres y no atacadas) está en el Rey
+            if df == 0 and abs(dc) == 2:
+                return destino in pieza._obtener_movimientos_enroque()
+            return False
+        else:
+            return False
+
+        # 5. Seguridad del rey: simular solo cuando el movimiento podría exponerlo
+        color_rival = 'negro' if pieza.color == 'blanco' else 'blanco'
+        rey_pos = self._buscarRey(pieza.color)
+        if rey_pos is None:
+            return False
+        posible_clavada = self._esLineaLibre(rey_pos, origen, ortogonal=True, diagonal=True)
+        if es_al_paso or posible_clavada or self.esCasillaAmenazada(rey_pos, color_rival):
+            return self._simular_y_verificar_seguridad(pieza, destino)
+        return True
+
+    # ============================================================
+    # 7. Caché Incremental de Movimientos Legales
+    # ============================================================
+
+    def _validarClaveCache(self):
+        """
+        Vacía la caché si el tablero se modificó por fuera de los métodos de movimiento
+        (p. ej., se reemplazó `casillas` o se cambió a mano el objetivo al paso).
+        """
+        clave = self._clave_cache
+        if clave is None or clave[0] is not self.casillas or clave[1] != self.objetivoPeonAlPaso:
+            self._cache_movimientos.clear()
+            self._clave_cache = (self.casillas, self.objetivoPeonAlPaso)
+
+    def _guardarEnCache(self, origen: Tuple[int, int], pieza: Pieza, destinos: List[Tuple[int, int]]):
+        """
+        Guarda la lista de destinos legales de una pieza. El Rey nunca se guarda:
+        sus movimientos dependen de los ataques de todo el bando contrario y del enroque.
+        """
+        if pieza.tipo != _REY:
+            self._cache_movimientos[origen] = (pieza, destinos)
+
+    def _invalidarMovimientosAfectados(self, casillas_cambiadas: List[Tuple[int, int]], objetivo_ep_anterior: Optional[Tuple[int, int]]):
+        """
+        Elimina de la caché solo las piezas cuyos movimientos legales pueden haber cambiado
+        tras un movimiento. Una entrada se descarta si:
+        1. La pieza estaba en una casilla cambiada (se movió o fue capturada).
+        2. Alguna casilla cambiada está a su alcance (salto de caballo, casillas del peón,
+           o línea de una pieza deslizante con el camino libre hasta ella).
+        3. Su propio rey se movió, o la pieza está en el mismo rayo desde su rey que alguna
+           casilla cambiada (puede haberse creado o deshecho una clavada).
+        4. Es un peón en fila de captura al paso y el objetivo al paso cambió.
+        Si la caché se llenó con un rey en jaque, se vacía entera (recalculo total).
+        Llamado por `moverPieza` y `realizarEnroque` después de actualizar el tablero.
+
+        Args:
+            casillas_cambiadas: Casillas cuyo contenido cambió (origen, destino, captura al paso, torre).
+            objetivo_ep_anterior: Objetivo de captura al paso antes del movimiento.
+        """
+        if self._cache_requiere_recalculo_total or self._clave_cache is None or self._clave_cache[0] is not self.casillas:
+            self._cache_movimientos.clear()
+        elif self._cache_movimientos:
+            # Posición de cada rey tras el movimiento (y si se movió)
+            reyes = {}
+            for r in range(8):
+                for c in range(8):
+                    pieza = self.casillas[r][c]
+                    if pieza is not None and pieza.tipo == _REY:
+                        reyes[pieza.color] = ((r, c), (r, c) in casillas_cambiadas)
+            cambio_ep = objetivo_ep_anterior != self.objetivoPeonAlPaso
+
+            for origen in list(self._cache_movimientos):
+                pieza = self._cache_movimientos[origen][0]
+                if origen in casillas_cambiadas or self._esAfectadaPorCambio(pieza, origen, casillas_cambiadas, reyes.get(pieza.color), cambio_ep):
+                    del self._cache_movimientos[origen]
+        self._clave_cache = (self.casillas, self.objetivoPeonAlPaso)
+
+    def _esAfectadaPorCambio(self, pieza: Pieza, origen: Tuple[int, int], casillas_cambiadas: List[Tuple[int, int]],
+                             info_rey: Optional[Tuple[Tuple[int, int], bool]], cambio_ep: bool) -> bool:
+        """
+        Decide (de forma conservadora) si los movimientos legales de una pieza que no se movió
+        pueden haber cambiado por las casillas modificadas. Auxiliar de `_invalidarMovimientosAfectados`.
+        """
+        if info_rey is None or info_rey[1]:
+            return True # Sin rey localizable o el rey propio se movió: cambian todas las clavadas
+        rey_pos = info_rey[0]
+        fila, col = origen
+
+        tipo = pieza.tipo
+        if tipo == _PEON:
+            direccion = 1 if pieza.codigo_color == Color.BLANCO else -1
+            if cambio_ep and fila == (4 if pieza.codigo_color == Color.BLANCO else 3):
+                return True
+        for casilla in casillas_cambiadas:
+            df = casilla[0] - fila
+            dc = casilla[1] - col
+            # 2. Alcance geométrico de la pieza
+            if tipo == _CABALLO:
+                if (abs(df), abs(dc)) in ((1, 2), (2, 1)):
+                    return True
+            elif tipo == _PEON:
+                if abs(dc) <= 1 and (df == direccion or (dc == 0 and df == 2 * direccion)):
+                    return True
+            elif self._esLineaLibre(origen, casilla, ortogonal=_ATACA_ORTOGONAL[tipo], diagonal=_ATACA_DIAGONAL[tipo]):
+                return True
+            # 3. Clavadas: misma dirección desde el rey propio
+            paso_casilla = self._direccionDesde(rey_pos, casilla)
+            if paso_casilla is not None and paso_casilla == self._direccionDesde(rey_pos, origen):
+                return True
+        return False
+
+    def _direccionDesde(self, desde: Tuple[int, int], hasta: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Devuelve el paso unitario (df, dc) de la línea recta o diagonal que une dos casillas,
+        o None si no están alineadas (o son la misma casilla).
+        """
+        df = hasta[0] - desde[0]
+        dc = hasta[1] - desde[1]
+        if (df == 0 and dc == 0) or (df != 0 and dc != 0 and abs(df) != abs(dc)):
+            return None
+        return ((df > 0) - (df < 0), (dc > 0) - (dc < 0))
+
+    def _esLineaLibre(self, desde: Tuple[int, int], hasta: Tuple[int, int], ortogonal: bool, diagonal: bool) -> bool:
+        """
+        Indica si `hasta` está en una línea permitida desde `desde` (ortogonal y/o diagonal)
+        y todas las casillas intermedias están vacías.
+        """
+        paso = self._direccionDesde(desde, hasta)
+        if paso is None:
+            return False
+        es_diagonal = paso[0] != 0 and paso[1] != 0
+        if (es_diagonal and not diagonal) or (not es_diagonal and not ortogonal):
+            return False
+        f, c = desde[0] + paso[0], desde[1] + paso[1]
+        while (f, c) != hasta:
+            if self.casillas[f][c] is not None:
+                return False
+            f += paso[0]
+            c += paso[1]
+        return True
+
+    # ============================================================
+    # 8. Anotación de Movimientos (Captura / Jaque / Mate)
+    # ============================================================
+
+    def anotar_movimientos_casilla(self, posicion: Tuple[int, int]) -> List[Dict]:
+        """
+        Devuelve los movimientos legales de la pieza en `posicion` anotados con captura,
+        jaque y mate, para que la interfaz resalte los destinos de forma diferenciada.
+        Las máscaras de jaque se calculan una sola vez para todos los destinos.
+
+        Args:
+            posicion: Tupla (fila, columna) de la pieza seleccionada.
+
+        Returns:
+            Lista de diccionarios {'origen', 'destino', 'captura', 'jaque', 'mate'}.
+            Lista vacía si la casilla está vacía o es inválida.
+        """
+        pieza = self.getPieza(posicion)
+        if pieza is None:
+            return []
+        mascaras = self._calcularMascarasJaque(pieza.color)
+        return [self._anotarMovimiento(pieza, posicion, destino, mascaras)
+                for destino in self.obtener_movimientos_legales_casilla(posicion)]
+
+    def anotar_movimientos(self, color: Literal['blanco', 'negro']) -> List[Dict]:
+        """
+        Devuelve todos los movimientos legales de un color anotados con captura, jaque y mate,
+        calculados en una sola pasada a partir de las máscaras de jaque directo y descubierto.
+
+        Args:
+            color: El color ('blanco' o 'negro') cuyos movimientos se anotan.
+
+        Returns:
+            Lista de diccionarios {'origen', 'destino', 'captura', 'jaque', 'mate'}.
+        """
+        mascaras = self._calcularMascarasJaque(color)
+        return [self._anotarMovimiento(self.casillas[origen[0]][origen[1]], origen, destino, mascaras)
+                for origen, destino in self.iterar_movimientos_legales(color)]
+
+    def iterar_jaques(self, color: Literal['blanco', 'negro']) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Genera solo los movimientos legales de `color` que dan jaque (útil para búsqueda de mate).
+        Las piezas que no pueden alcanzar ninguna casilla de jaque directo ni descubrir un jaque
+        se descartan sin generar sus movimientos legales.
+
+        Args:
+            color: El color atacante.
+
+        Yields:
+            Tuplas ((fila_origen, col_origen), (fila_destino, col_destino)) que dan jaque.
+        """
+        mascaras = self._calcularMascarasJaque(color)
+        if mascaras is None:
+            return
+        _, directos, descubridores = mascaras
+        codigo_color = Color.desde_texto(color)
         for r in range(8):
             for c in range(8):
                 pieza = self.casillas[r][c]
-                if pieza is not None and pieza.color == color:
-                    movimientos_pieza = pieza.obtener_movimientos_legales() # Ya filtra por seguridad del rey
-                    origen = (r, c)
-                    for destino in movimientos_pieza:
-                        todos_movimientos_legales.append((origen, destino))
-        
-        # logger.debug(f"Movimientos legales generados para {color}: {len(todos_movimientos_legales)}") # Puede ser muy verboso
-        return todos_movimientos_legales
+                if pieza is None or pieza.codigo_color != codigo_color:
+                    continue
+                origen = (r, c)
+                casillas_jaque = directos[pieza.tipo]
+                # Descartar la pieza si no es descubridora, no tiene movimientos especiales
+                # y ninguno de sus destinos potenciales es casilla de jaque directo
+                if origen not in descubridores and pieza.tipo not in (_PEON, _REY) and \
+                   not any(destino in casillas_jaque for destino in pieza.obtener_movimientos_potenciales()):
+                    continue
+                for destino in self.obtener_movimientos_legales_casilla(origen):
+                    if self._daJaque(pieza, origen, destino, mascaras):
+                        yield (origen, destino)
+
+    def _calcularMascarasJaque(self, color: Literal['blanco', 'negro']) -> Optional[tuple]:
+        """
+        Precalcula, para el bando `color`, las casillas desde las que cada tipo de pieza daría
+        jaque directo al rey rival y las piezas propias que descubrirían un jaque al moverse.
+
+        Returns:
+            Tupla (rey_rival_pos, directos, descubridores) o None si no hay rey rival, donde:
+            - directos: tupla indexada por `TipoPieza` con el set de casillas desde las que
+              ese tipo de pieza atacaría al rey rival (vacío para el rey).
+            - descubridores: {casilla de pieza propia: set de casillas de la línea pieza deslizante-rey}
+              (moverse fuera de esa línea descubre el jaque).
+        """
+        codigo_color = Color.desde_texto(color)
+        rey_rival = self._buscarRey(codigo_color.opuesto().a_texto())
+        if rey_rival is None:
+            return None
+        fila_rey, col_rey = rey_rival
+
+        # Jaques de peón y caballo: casillas fijas alrededor del rey
+        direccion = 1 if color == 'blanco' else -1
+        casillas_peon = {(fila_rey - direccion, col_rey + dc) for dc in (-1, 1)}
+        casillas_caballo = {(fila_rey + df, col_rey + dc)
+                            for df, dc in ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))}
+
+        # Jaques de piezas deslizantes: rayos desde el rey hasta la primera pieza (incluida)
+        casillas_diagonal, casillas_ortogonal = set(), set()
+        descubridores: Dict[Tuple[int, int], set] = {}
+        for df, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)):
+            diagonal = df != 0 and dc != 0
+            destino_set = casillas_diagonal if diagonal else casillas_ortogonal
+            linea = []
+            bloqueador = None
+            f, c = fila_rey + df, col_rey + dc
+            while 0 <= f <= 7 and 0 <= c <= 7:
+                linea.append((f, c))
+                pieza = self.casillas[f][c]
+                if pieza is not None:
+                    if bloqueador is None:
+                        destino_set.update(linea)
+                        if pieza.codigo_color != codigo_color:
+                            break # Una pieza rival tapa la línea: no hay jaque descubierto posible
+                        bloqueador = (f, c)
+                    else:
+                        # Segunda pieza: si es deslizante propia adecuada, el bloqueador es descubridor
+                        ataca = _ATACA_DIAGONAL if diagonal else _ATACA_ORTOGONAL
+                        if pieza.codigo_color == codigo_color and ataca[pieza.tipo]:
+                            descubridores[bloqueador] = set(linea)
+                        break
+                f += df
+                c += dc
+            if bloqueador is None:
+                destino_set.update(linea)
+
+        # Indexado por TipoPieza: NINGUNO, PEON, CABALLO, ALFIL, TORRE, REINA, REY
+        directos = (
+            frozenset(),
+            casillas_peon,
+            casillas_caballo,
+            casillas_diagonal,
+            casillas_ortogonal,
+            casillas_diagonal | casillas_ortogonal,
+            frozenset(),
+        )
+        return rey_rival, directos, descubridores
+
+    def _daJaque(self, pieza: Pieza, origen: Tuple[int, int], destino: Tuple[int, int], mascaras: tuple) -> bool:
+        """
+        Decide si un movimiento legal da jaque usando las máscaras precalculadas.
+        Los movimientos especiales (al paso, enroque, promoción a dama) se verifican simulándolos.
+        """
+        rey_rival, directos, descubridores = mascaras
+        es_especial = (pieza.tipo == _PEON and (destino == self.objetivoPeonAlPaso or destino[0] in (0, 7))) or \
+                      (pieza.tipo == _REY and abs(destino[1] - origen[1]) == 2)
+        if es_especial:
+            registro = self._aplicarMovimientoTemporal(origen, destino, 'Q' if pieza.tipo == _PEON and destino[0] in (0, 7) else None)
+            jaque = self.esCasillaAmenazada(rey_rival, pieza.color)
+            self._revertirMovimientoTemporal(registro)
+            return jaque
+        if destino in directos[pieza.tipo]:
+            return True
+        linea = descubridores.get(origen)
+        return linea is not None and destino not in linea
+
+    def _anotarMovimiento(self, pieza: Pieza, origen: Tuple[int, int], destino: Tuple[int, int], mascaras: Optional[tuple]) -> Dict:
+        """
+        Construye la anotación de un movimiento legal. El mate solo se comprueba en los
+        movimientos que dan jaque, simulándolos y buscando alguna respuesta legal del rival.
+        """
+        ocupante = self.casillas[destino[0]][destino[1]]
+        captura = (ocupante is not None and ocupante.codigo_color != pieza.codigo_color) or \
+                  (pieza.tipo == _PEON and destino == self.objetivoPeonAlPaso)
+        jaque = mascaras is not None and self._daJaque(pieza, origen, destino, mascaras)
+        mate = False
+        if jaque:
+            promocion = 'Q' if pieza.tipo == _PEON and destino[0] in (0, 7) else None
+            registro = self._aplicarMovimientoTemporal(origen, destino, promocion)
+            mate = not self._tieneRespuestaSinCache(pieza.codigo_color.opuesto().a_texto())
+            self._revertirMovimientoTemporal(registro)
+        return {'origen': origen, 'destino': destino, 'captura': captura, 'jaque': jaque, 'mate': mate}
+
+    def _tieneRespuestaSinCache(self, color: Literal['blanco', 'negro']) -> bool:
+        """
+        Indica si `color` tiene algún movimiento legal, calculándolo directamente desde las piezas.
+        Se usa dentro de una simulación, donde la caché (que describe la posición real) no es válida.
+        """
+        codigo_color = Color.desde_texto(color)
+        for fila in self.casillas:
+            for pieza in fila:
+                if pieza is not None and pieza.codigo_color == codigo_color:
+                    for _ in pieza.iterar_movimientos_legales():
+                        return True
+        return False
 
     # --- Fin Métodos ---
    
@@ -1,3 +1,116 @@
 """
 Define la clase para gestionar el tiempo de juego de cada jugador.
 """
+
+import logging
+import time
+from typing import Callable, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Temporizador:
+    """
+    Reloj de ajedrez de dos jugadores con incremento (Fischer): solo corre el reloj del jugador
+    al que le toca mover y, al terminar su jugada, recibe el incremento. Los tiempos se
+    expresan en milisegundos.
+    """
+
+    def __init__(self, tiempoInicialMs: int, incrementoMs: int = 0, reloj: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            tiempoInicialMs: Tiempo de cada jugador al empezar la partida.
+            incrementoMs: Tiempo que se suma al jugador tras cada una de sus jugadas.
+            reloj: Función que devuelve el instante actual en segundos (se sustituye en las pruebas).
+
+        Raises:
+            ValueError: Si el tiempo inicial no es positivo o el incremento es negativo.
+        """
+        if tiempoInicialMs <= 0 or incrementoMs < 0:
+            raise ValueError(f"Tiempo no válido: {tiempoInicialMs} ms + {incrementoMs} ms")
+        self.incrementoMs = incrementoMs
+        self._reloj = reloj
+        self._restante = {'blanco': float(tiempoInicialMs), 'negro': float(tiempoInicialMs)}
+        self._jugadas = {'blanco': 0, 'negro': 0}
+        self._turno: Literal['blanco', 'negro'] = 'blanco'
+        self._inicioTurno: Optional[float] = None # None con el reloj parado
+
+    def iniciar(self, color: Literal['blanco', 'negro'] = 'blanco'):
+        """
+        Pone en marcha el reloj del jugador indicado.
+        """
+        self.pausar()
+        self._turno = color
+        self._inicioTurno = self._reloj()
+
+    def pausar(self):
+        """
+        Para el reloj en marcha descontando el tiempo consumido (no suma incremento).
+        """
+        if self._inicioTurno is not None:
+            self._restante[self._turno] -= (self._reloj() - self._inicioTurno) * 1000.0
+            self._inicioTurno = None
+
+    def reanudar(self):
+        """
+        Vuelve a poner en marcha el reloj del jugador al que le toca mover.
+        """
+        if self._inicioTurno is None:
+            self._inicioTurno = self._reloj()
+
+    def cambiarTurno(self):
+        """
+        Registra la jugada del jugador en turno: descuenta su tiempo, le suma el incremento
+        (si no ha agotado el tiempo) y pone en marcha el reloj del rival.
+        """
+        enMarcha = self._inicioTurno is not None
+        self.pausar()
+        color = self._turno
+        self._jugadas[color] += 1
+        if self._restante[color] > 0:
+            self._restante[color] += self.incrementoMs
+        else:
+            logger.info(f"El jugador {color} ha agotado su tiempo")
+        self._turno = 'negro' if color == 'blanco' else 'blanco'
+        if enMarcha:
+            self._inicioTurno = self._reloj()
+
+    def getTurno(self) -> Literal['blanco', 'negro']:
+        """
+        Devuelve el color cuyo reloj corre (o correrá al reanudar).
+        """
+        return self._turno
+
+    def estaEnMarcha(self) -> bool:
+        """
+        Indica si el reloj está corriendo.
+        """
+        return self._inicioTurno is not None
+
+    def getTiempoRestante(self, color: Literal['blanco', 'negro']) -> int:
+        """
+        Devuelve el tiempo restante del jugador en milisegundos (0 si lo ha agotado),
+        incluido el consumo de la jugada en curso.
+        """
+        restante = self._restante[color]
+        if color == self._turno and self._inicioTurno is not None:
+            restante -= (self._reloj() - self._inicioTurno) * 1000.0
+        return max(0, int(restante))
+
+    def getIncremento(self) -> int:
+        """
+        Devuelve el incremento por jugada en milisegundos.
+        """
+        return self.incrementoMs
+
+    def getJugadasRealizadas(self, color: Literal['blanco', 'negro']) -> int:
+        """
+        Devuelve cuántas jugadas ha completado el jugador.
+        """
+        return self._jugadas[color]
+
+    def estaAgotado(self, color: Literal['blanco', 'negro']) -> bool:
+        """
+        Indica si el jugador ha agotado su tiempo.
+        """
+        return self.getTiempoRestante(color) <= 0
@@ -0,0 +1,3 @@
+"""
+Inicializador del paquete de tests para los controladores.
+"""
\ No newline at end of file
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el controlador del protocolo UCI (ControladorUCI).
+"""
+import io
+import threading
+import time
+import pytest
+from controllers.controlador_uci import ControladorUCI, puntuacion_uci
+from models.motor.buscador import MATE
+
+@pytest.fixture
+def uci():
+    """
+    Un controlador que escribe en memoria; se cierra al terminar cada test.
+    """
+    controlador = ControladorUCI(salida=io.StringIO(), tamano_tabla_mb=4)
+    yield controlador
+    controlador.cerrar()
+
+def _lineas(controlador):
+    """
+    Líneas escritas hasta ahora por el controlador.
+    """
+    return controlador.salida.getvalue().splitlines()
+
+def test_presentacion_y_opciones(uci):
+    """
+    Verifica la respuesta a 'uci' e 'isready' y que 'setoption Hash' recrea el motor con el nuevo tamaño.
+    """
+    uci.procesar("uci")
+    uci.procesar("isready")
+    lineas = _lineas(uci)
+    assert lineas[0].startswith("id name") and "uciok" in lineas and lineas[-1] == "readyok"
+    assert any(linea.startswith("option name Hash type spin") for linea in lineas)
+    uci.procesar("setoption name Hash value 8")
+    assert uci.tamano_tabla_mb == 8 and uci._trabajador is None
+    assert uci.procesar("quit") is False
+
+def test_position_y_go_depth(uci):
+    """
+    Verifica 'position ... moves' y que 'go depth' informa de cada iteración y termina con bestmove.
+    """
+    uci.procesar("position startpos moves e2e4 e7e5 g1f3")
+    assert uci.posicion.a_fen() == "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+    uci.procesar("go depth 3")
+    uci.esperar_busqueda(30)
+    lineas = _lineas(uci)
+    assert [linea.split()[2] for linea in lineas if linea.startswith("info depth")] == ['1', '2', '3']
+    assert all(" seldepth " in linea for linea in lineas if linea.startswith("info depth"))
+    assert lineas[-1].startswith("bestmove ")
+
+def test_mate_y_movimiento_ilegal(uci):
+    """
+    Verifica la puntuación de mate en UCI y que una orden 'position' con un movimiento ilegal se descarta.
+    """
+    uci.procesar("position fen 6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1 moves d1d9")
+    assert uci.posicion.a_fen().startswith("rnbqkbnr")
+    uci.procesar("position fen 6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+    uci.procesar("go wtime 1000 btime 1000 winc 10 binc 10")
+    uci.esperar_busqueda(30)
+    lineas = _lineas(uci)
+    assert "score mate 1" in lineas[-2] and lineas[-1] == "bestmove d1d8"
+
+def test_go_infinite_espera_a_stop(uci):
+    """
+    Verifica que con 'go infinite' el bestmove solo sale tras 'stop', aunque el motor haya terminado antes.
+    """
+    uci.procesar("position fen 6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+    uci.procesar("go infinite")
+    uci.esperar_busqueda(30) # Encuentra el mate y termina, pero retiene el bestmove
+    assert not any(linea.startswith("bestmove") for linea in _lineas(uci))
+    uci.procesar("stop")
+    assert _lineas(uci)[-1] == "bestmove d1d8"
+    uci.procesar("position startpos")
+    uci.procesar("go infinite")
+    time.sleep(0.2)
+    uci.procesar("stop")
+    uci.esperar_busqueda(30)
+    assert _lineas(uci)[-1].startswith("bestmove ")
+
+def test_formato_de_puntuaciones():
+    """
+    Verifica el formato de las puntuaciones en centipeones y en jugadas hasta el mate.
+    """
+    assert puntuacion_uci(35) == "cp 35"
+    assert puntuacion_uci(MATE - 1) == "mate 1" and puntuacion_uci(MATE - 3) == "mate 2"
+    assert puntuacion_uci(-MATE + 2) == "mate -1"
+
+def test_multi_pv(uci):
+    """
+    Verifica que con la opción MultiPV cada iteración informa una línea por variante con 'multipv N'.
+    """
+    uci.procesar("setoption name MultiPV value 2")
+    uci.procesar("position startpos")
+    uci.procesar("go depth 2")
+    uci.esperar_busqueda(30)
+    lineas = _lineas(uci)
+    assert any(" multipv 1 " in linea for linea in lineas) and any(" multipv 2 " in linea for linea in lineas)
+    assert lineas[-1].startswith("bestmove ")
+
+def test_stop_con_busqueda_en_cola(uci):
+    """
+    Verifica que 'stop' con la búsqueda aún en cola tras otra no bloquea el controlador:
+    la encolada sale con 'bestmove 0000' y el motor sigue respondiendo.
+    """
+    uci.procesar("position startpos")
+    uci.procesar("go depth 7")
+    uci.procesar("go depth 3")
+    hilo = threading.Thread(target=uci.procesar, args=("stop",), daemon=True)
+    hilo.start()
+    hilo.join(5)
+    assert not hilo.is_alive()
+    assert _lineas(uci)[-1] == "bestmove 0000"
+    uci.procesar("isready")
+    assert _lineas(uci)[-1] == "readyok"
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el ajuste Texel de los pesos de la evaluación (AjusteTexel) y el archivo de pesos.
+"""
+import json
+import pytest
+np = pytest.importorskip('numpy')
+from models.motor.ajuste_texel import AjusteTexel, leer_posicion_etiquetada, posiciones_desde_pgn
+from models.motor.evaluador import Evaluador
+from models.motor.posicion import Posicion
+from models.motor.tablas_pst import cargar_pesos, pesos_actuales
+
+FENS = [
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "4k3/8/8/8/7p/2P5/2P5/4K3 b - - 0 1",
+    "4k3/8/3p4/3P4/8/8/8/4K3 b - - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+]
+
+def test_leer_posicion_etiquetada():
+    """
+    Verifica que se reconocen los formatos habituales de resultado y se descartan las líneas sin él.
+    """
+    fen = "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+    assert leer_posicion_etiquetada(f"{fen} 1-0") == (fen, 1.0)
+    assert leer_posicion_etiquetada(f"{fen} [0.5]") == (fen, 0.5)
+    assert leer_posicion_etiquetada('4k3/8/8/8/8/8/8/4K3 w - - c9 "0-1";') == ("4k3/8/8/8/8/8/8/4K3 w - -", 0.0)
+    assert leer_posicion_etiquetada(f"{fen} | 1/2-1/2") == (fen, 0.5)
+    assert leer_posicion_etiquetada(fen) is None
+
+def test_evaluaciones_coinciden_con_evaluador():
+    """
+    Verifica que la evaluación vectorizada coincide con la de `Evaluador` (salvo redondeos).
+    """
+    ajuste = AjusteTexel()
+    assert ajuste.cargar([f"{fen} 1-0" for fen in FENS], procesos=1) == len(FENS)
+    for fen, evaluacion in zip(FENS, ajuste.evaluaciones()):
+        posicion = Posicion.desde_fen(fen)
+        esperada = Evaluador().evaluar(posicion) * (-1 if posicion.turno else 1)
+        assert abs(evaluacion - esperada) <= 1
+
+def test_gradiente_numerico():
+    """
+    Verifica que el gradiente analítico coincide con el de diferencias finitas.
+    """
+    ajuste = AjusteTexel()
+    ajuste.cargar([f"{fen} {resultado}" for fen, resultado in zip(FENS, ('1-0', '0-1', '1/2-1/2', '0-1', '1-0'))],
+                  procesos=1)
+    ajuste.escala = 0.006
+    perdida, gradiente = ajuste.gradiente()
+    for indice in np.nonzero(gradiente)[0][::5]:
+        arriba, abajo = ajuste.parametros.copy(), ajuste.parametros.copy()
+        arriba[indice] += 1e-4
+        abajo[indice] -= 1e-4
+        numerico = (ajuste.perdida(arriba) - ajuste.perdida(abajo)) / 2e-4
+        assert numerico == pytest.approx(gradiente[indice], rel=1e-4, abs=1e-9)
+
+def test_ajuste_reduce_perdida_y_guarda_pesos(tmp_path):
+    """
+    Verifica que el ajuste reduce la pérdida sobre las posiciones de unas partidas y que el
+    archivo de pesos escrito se puede volver a cargar.
+    """
+    pgn = ('[Result "1-0"]\n\n1. e4 e5 2. Nf3 Nc6 3. Bc4 Nf6 4. Ng5 d5 5. exd5 Nxd5 6. Nxf7 Kxf7 '
+           '7. Qf3+ Ke6 8. Nc3 Nb4 9. O-O c6 10. d4 1-0\n\n'
+           '[Result "0-1"]\n\n1. f3 e5 2. g4 Qh4# 0-1\n')
+    lineas = list(posiciones_desde_pgn(pgn, saltar_plies=2))
+    assert lineas and all(linea.endswith(('1-0', '0-1')) for linea in lineas)
+    ajuste = AjusteTexel()
+    ajuste.cargar(lineas, procesos=1)
+    historial = ajuste.ajustar(iteraciones=50, informe_cada=0)
+    assert historial[-1] < historial[0]
+    ruta = tmp_path / 'pesos.json'
+    ajuste.guardar(str(ruta))
+    pesos = cargar_pesos(str(ruta))
+    assert set(pesos) == set(pesos_actuales())
+    assert pesos['MATERIAL_MG'][6] == 0 # Los pesos fijos no cambian
+
+def test_cargar_pesos_rechaza_formato_incorrecto(tmp_path):
+    """
+    Verifica que un archivo de pesos con un peso desconocido o de otra forma se rechaza.
+    """
+    ruta = tmp_path / 'pesos.json'
+    ruta.write_text(json.dumps({'MATERIAL_MG': [0, 100]}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        cargar_pesos(str(ruta))
+    ruta.write_text(json.dumps({'DESCONOCIDO': [1]}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        cargar_pesos(str(ruta))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el buscador del motor (Buscador) y el jugador ordenador que lo usa.
+"""
+import pytest
+from models.tablero import Tablero
+from models.motor.buscador import Buscador, MATE
+from models.motor.posicion import Posicion, movimiento_a_uci, movimiento_a_tupla
+from models.jugadores.jugador_ordenador import JugadorOrdenador
+
+@pytest.mark.parametrize("fen, mate", [
+    ("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", "d1d8"),                                  # Mate del pasillo
+    ("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1", "f3f7"),     # Mate del pastor
+])
+def test_encuentra_mate_en_uno(fen: str, mate: str):
+    """
+    Verifica que el buscador encuentra el mate en una y lo puntúa como mate.
+    """
+    resultado = Buscador().buscar(Posicion.desde_fen(fen), profundidad_max=3)
+    assert movimiento_a_uci(resultado['movimiento']) == mate
+    assert resultado['puntuacion'] == MATE - 1
+
+def test_gana_material_colgado():
+    """
+    Verifica que el buscador captura una dama indefensa.
+    """
+    posicion = Posicion.desde_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+    resultado = Buscador().buscar(posicion, profundidad_max=2)
+    assert movimiento_a_uci(resultado['movimiento']) == "d1d5"
+
+def test_plazo_devuelve_ultima_iteracion_completa():
+    """
+    Verifica que, al agotarse el plazo, se devuelve la última iteración completa
+    sin modificar la posición de entrada.
+    """
+    posicion = Posicion.desde_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    fen = posicion.a_fen()
+    resultado = Buscador().buscar(posicion, tiempo_ms=200)
+    assert resultado['profundidad'] >= 1
+    assert resultado['movimiento'] == resultado['pv'][0]
+    assert [i['profundidad'] for i in resultado['iteraciones']] == list(range(1, resultado['profundidad'] + 1))
+    assert resultado['tiempo_ms'] < 1000
+    assert posicion.a_fen() == fen
+
+def test_sin_movimientos_legales():
+    """
+    Verifica que en una posición de mate no se devuelve movimiento.
+    """
+    posicion = Posicion.desde_fen("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1")
+    assert Buscador().buscar(posicion, profundidad_max=3)['movimiento'] is None
+
+def test_jugador_ordenador_devuelve_movimiento_legal():
+    """
+    Verifica que el jugador ordenador juega un movimiento legal del Tablero dentro del plazo.
+    """
+    tablero = Tablero()
+    jugador = JugadorOrdenador("Ordenador", 'blanco', tiempo_max_ms=200)
+    origen, destino, promocion = jugador.elegir_movimiento(tablero)
+    assert tablero.esMovimientoLegal(origen, destino, promocion)
+    assert jugador.ultimo_resultado['tiempo_ms'] < 1000
+
+def test_jugador_ordenador_ponder_acierta_la_respuesta_prevista():
+    """
+    Verifica que, si el rival juega la respuesta prevista, la jugada siguiente sale de la
+    búsqueda hecha en su tiempo.
+    """
+    tablero = Tablero()
+    jugador = JugadorOrdenador("Ordenador", 'blanco', tiempo_max_ms=200, ponder=True)
+    try:
+        origen, destino, _ = jugador.elegir_movimiento(tablero)
+        assert tablero.moverPieza(origen, destino) == 'movimiento_ok'
+        assert jugador.ponderador.activo
+        respuesta_origen, respuesta_destino, _ = movimiento_a_tupla(jugador.ultimo_resultado['pv'][1])
+        assert tablero.moverPieza(respuesta_origen, respuesta_destino) == 'movimiento_ok'
+        origen, destino, promocion = jugador.elegir_movimiento(tablero)
+        assert tablero.esMovimientoLegal(origen, destino, promocion)
+        assert jugador.ultimo_resultado.get('ponder') is True
+    finally:
+        jugador.cerrar()
+    assert not jugador.ponderador.activo
+
+def test_presupuesto_de_nodos_reproducible():
+    """
+    Verifica que una búsqueda limitada por nodos no supera el presupuesto y siempre devuelve
+    el mismo resultado.
+    """
+    posicion = Posicion.desde_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    resultados = [Buscador().buscar(posicion, nodos_max=3000) for _ in range(2)]
+    assert resultados[0]['nodos'] <= 3000
+    assert resultados[0]['profundidad'] >= 1
+    assert (resultados[0]['movimiento'], resultados[0]['pv'], resultados[0]['nodos']) == \
+        (resultados[1]['movimiento'], resultados[1]['pv'], resultados[1]['nodos'])
+
+def test_estadisticas_de_ordenacion():
+    """
+    Verifica que la búsqueda expone las estadísticas de cortes y que la mayoría
+    de los cortes los produce el primer movimiento buscado.
+    """
+    posicion = Posicion.desde_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    resultado = Buscador().buscar(posicion, profundidad_max=4)
+    ordenacion = resultado['ordenacion']
+    assert ordenacion['cortes'] > 0
+    assert ordenacion['tasa_corte_primer_movimiento'] > 0.8
+
+def test_quiescencia_evita_efecto_horizonte():
+    """
+    Verifica que a profundidad 1 no se captura un peón defendido con la dama
+    (sin quiescencia, QxP parecería ganar un peón) y que se cuentan los nodos de quiescencia.
+    """
+    posicion = Posicion.desde_fen("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+    resultado = Buscador().buscar(posicion, profundidad_max=1)
+    assert movimiento_a_uci(resultado['movimiento']) != "d1d5"
+    assert resultado['nodos_quiescencia'] > 0
+
+def test_busqueda_selectiva_reduce_nodos():
+    """
+    Verifica que el movimiento nulo y las reducciones de movimientos tardíos reducen los
+    nodos a profundidad fija sin cambiar la jugada elegida.
+    """
+    fen = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+    completa = Buscador(movimiento_nulo=False, reducciones=False).buscar(Posicion.desde_fen(fen), profundidad_max=4)
+    selectiva = Buscador().buscar(Posicion.desde_fen(fen), profundidad_max=4)
+    assert selectiva['nodos'] < completa['nodos']
+    assert selectiva['movimiento'] == completa['movimiento']
+    assert selectiva['selectiva']['reducciones_lmr'] > 0
+    assert completa['selectiva'] == {'cortes_nulos': 0, 'reducciones_lmr': 0, 'reintentos_lmr': 0}
+
+def test_sin_movimiento_nulo_con_solo_peones():
+    """
+    Verifica que no se poda con movimiento nulo cuando el bando solo tiene rey y peones
+    (posibles zugzwang).
+    """
+    posicion = Posicion.desde_fen("8/8/4k3/8/4PK2/8/8/8 w - - 0 1")
+    resultado = Buscador().buscar(posicion, profundidad_max=6)
+    assert resultado['selectiva']['cortes_nulos'] == 0
+
+def test_multi_pv_devuelve_lineas_ordenadas():
+    """
+    Verifica que con multi_pv=3 se devuelven tres líneas distintas ordenadas por puntuación,
+    que la primera coincide con la búsqueda de una sola línea y que cada iteración las informa.
+    """
+    fen = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+    simple = Buscador().buscar(Posicion.desde_fen(fen), profundidad_max=3)
+    multiple = Buscador().buscar(Posicion.desde_fen(fen), profundidad_max=3, multi_pv=3)
+    lineas = multiple['lineas']
+    assert len(lineas) == 3
+    assert len({linea['movimiento'] for linea in lineas}) == 3
+    assert [linea['puntuacion'] for linea in lineas] == sorted((linea['puntuacion'] for linea in lineas), reverse=True)
+    assert (lineas[0]['movimiento'], lineas[0]['puntuacion']) == (multiple['movimiento'], multiple['puntuacion'])
+    assert multiple['puntuacion'] == simple['puntuacion']
+    assert multiple['iteraciones'][-1]['lineas'] == lineas
+    assert len(simple['lineas']) == 1
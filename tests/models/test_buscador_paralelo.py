@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la búsqueda paralela del motor (BuscadorParalelo, Lazy SMP).
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+import pytest
+from models.motor.buscador_paralelo import BuscadorParalelo, medir_aceleracion
+from models.motor.posicion import Posicion, movimiento_a_uci
+
+@pytest.fixture(scope="module")
+def buscador_paralelo():
+    """
+    Búsqueda paralela con dos procesos y una tabla pequeña, compartida por los tests del módulo.
+    """
+    with BuscadorParalelo(num_procesos=2, tamano_tabla_mb=1) as buscador:
+        yield buscador
+
+def test_paralelo_encuentra_mate_en_uno(buscador_paralelo):
+    """
+    Verifica que la búsqueda paralela encuentra el mate en una y participan todos los procesos.
+    """
+    posicion = Posicion.desde_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    resultado = buscador_paralelo.buscar(posicion, profundidad_max=3)
+    assert movimiento_a_uci(resultado['movimiento']) == "a1a8"
+    assert resultado['procesos'] == 2
+
+def test_paralelo_busquedas_consecutivas_respetan_plazo(buscador_paralelo):
+    """
+    Verifica que los procesos persistentes atienden búsquedas consecutivas con plazo.
+    """
+    posicion = Posicion.desde_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    for _ in range(2):
+        resultado = buscador_paralelo.buscar(posicion, tiempo_ms=200)
+        assert resultado['movimiento'] in posicion.generar_movimientos_legales()
+        assert resultado['nodos'] > 0
+
+def test_medir_aceleracion_devuelve_medidas():
+    """
+    Verifica que la medición de aceleración devuelve tiempos y cociente positivos.
+    """
+    posiciones = [Posicion.desde_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")]
+    medidas = medir_aceleracion(posiciones, profundidad=2, num_procesos=2, tamano_tabla_mb=1)
+    assert medidas['procesos'] == 2
+    assert medidas['tiempo_un_proceso_ms'] > 0 and medidas['tiempo_paralelo_ms'] > 0
+    assert medidas['aceleracion'] > 0
+
+def test_fallo_al_iniciar_libera_la_memoria(monkeypatch):
+    """
+    Verifica que, si un proceso trabajador no llega a iniciarse, se terminan los ya iniciados
+    y se libera la memoria compartida.
+    """
+    memorias, procesos = [], []
+    class Memoria(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            memorias.append(self.name)
+    iniciar = multiprocessing.process.BaseProcess.start
+    def iniciar_solo_uno(proceso):
+        if procesos:
+            raise OSError("Sin recursos")
+        iniciar(proceso)
+        procesos.append(proceso)
+    monkeypatch.setattr(shared_memory, 'SharedMemory', Memoria)
+    monkeypatch.setattr(multiprocessing.process.BaseProcess, 'start', iniciar_solo_uno)
+    with pytest.raises(OSError):
+        BuscadorParalelo(num_procesos=2, tamano_tabla_mb=1)
+    monkeypatch.undo()
+    assert not procesos[0].is_alive()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=memorias[0])
+
+def test_proceso_caido_no_bloquea_la_busqueda():
+    """
+    Verifica que una búsqueda sin plazo falla en lugar de esperar para siempre si un
+    proceso trabajador ha muerto.
+    """
+    with BuscadorParalelo(num_procesos=2, tamano_tabla_mb=1) as buscador:
+        buscador._procesos[1].terminate()
+        buscador._procesos[1].join()
+        with pytest.raises(RuntimeError):
+            buscador.buscar(Posicion.desde_fen("4k3/8/8/8/8/8/8/4K2R w K - 0 1"), profundidad_max=64)
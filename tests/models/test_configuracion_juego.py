@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la configuración de partida (ConfiguracionJuego) y los niveles de dificultad.
+"""
+import pytest
+from models.tablero import Tablero
+from models.configuracion_juego import ConfiguracionJuego
+from models.motor.nivel_dificultad import NIVELES_DIFICULTAD, NivelDificultad, obtener_nivel
+
+def _jugar_plies(configuracion: ConfiguracionJuego, plies: int):
+    """
+    Juega `plies` jugadas del ordenador contra sí mismo y devuelve las jugadas y los nodos usados.
+    """
+    tablero = Tablero()
+    jugadores = {color: configuracion.crearJugadorOrdenador(f"Ordenador {color}", color) for color in ('blanco', 'negro')}
+    jugadas, nodos = [], []
+    for _ in range(plies):
+        jugador = jugadores[tablero.getTurnoColor()]
+        origen, destino, _ = jugador.elegir_movimiento(tablero)
+        assert tablero.moverPieza(origen, destino) == 'movimiento_ok'
+        jugadas.append((origen, destino))
+        nodos.append(jugador.ultimo_resultado['nodos'])
+    return jugadas, nodos
+
+def test_niveles_definen_presupuestos_crecientes():
+    """
+    Verifica que cada nivel limita la búsqueda y que los niveles por nodos crecen y son reproducibles.
+    """
+    por_nodos = [nivel for nivel in NIVELES_DIFICULTAD.values() if nivel.nodos_max is not None]
+    assert [nivel.nodos_max for nivel in por_nodos] == sorted(nivel.nodos_max for nivel in por_nodos)
+    assert all(nivel.reproducible for nivel in por_nodos)
+    with pytest.raises(ValueError):
+        obtener_nivel(0)
+    with pytest.raises(ValueError):
+        NivelDificultad('sin límite')
+
+def test_nivel_por_nodos_es_reproducible_y_respeta_el_presupuesto():
+    """
+    Verifica que un nivel limitado por nodos, con ruido y la misma semilla, juega siempre
+    las mismas jugadas sin superar su presupuesto de nodos.
+    """
+    configuracion = ConfiguracionJuego(nivelDificultad=2, semilla=11)
+    jugadas_1, nodos_1 = _jugar_plies(configuracion, 6)
+    jugadas_2, nodos_2 = _jugar_plies(ConfiguracionJuego(nivelDificultad=2, semilla=11), 6)
+    assert jugadas_1 == jugadas_2
+    assert nodos_1 == nodos_2
+    assert max(nodos_1) <= configuracion.getPresupuesto().nodos_max
+
+def test_cambiar_nivel_actualiza_presupuesto():
+    """
+    Verifica que cambiar el nivel cambia el presupuesto y que un nivel inexistente se rechaza.
+    """
+    configuracion = ConfiguracionJuego()
+    configuracion.setNivelDificultad(1)
+    assert configuracion.getNivelDificultad() == 1
+    assert configuracion.getPresupuesto() is NIVELES_DIFICULTAD[1]
+    with pytest.raises(ValueError):
+        configuracion.setNivelDificultad(99)
+    assert configuracion.getNivelDificultad() == 1
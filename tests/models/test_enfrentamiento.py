@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el enfrentamiento entre configuraciones del jugador ordenador (Enfrentamiento).
+"""
+import pytest
+from models.motor.enfrentamiento import Enfrentamiento, jugar_partida, leer_aperturas
+from models.motor.sprt import SPRT
+
+RAPIDA = {'tiempo_max_ms': None, 'profundidad_max': 1, 'tamano_tabla_mb': 1}
+
+def test_leer_aperturas():
+    """
+    Verifica que se leen aperturas en UCI y SAN, con números de jugada y comentarios.
+    """
+    aperturas = leer_aperturas(["e2e4 e7e5", "# comentario", "", "1. d4 d5 2. c4"])
+    assert aperturas == [['e2e4', 'e7e5'], ['d2d4', 'd7d5', 'c2c4']]
+    with pytest.raises(ValueError):
+        leer_aperturas(["e2e5"])
+
+def test_partida_termina_con_resultado():
+    """
+    Verifica que una partida respeta la apertura y termina con un resultado arbitrado por el tablero
+    o por el límite de plies.
+    """
+    partida = jugar_partida(RAPIDA, RAPIDA, ['e2e4', 'e7e5'], max_plies=40)
+    assert partida['jugadas'][:2] == ['e2e4', 'e7e5']
+    assert partida['resultado'] in ('1-0', '0-1', '1/2-1/2')
+    assert partida['motivo'] in ('jaque_mate', 'tablas', 'adjudicacion', 'limite')
+    assert len(partida['jugadas']) == partida['plies'] <= 40
+
+def test_enfrentamiento_alterna_colores_y_para_por_sprt():
+    """
+    Verifica que las aperturas se juegan con ambos colores, que el enfrentamiento se detiene
+    cuando el SPRT decide y que el informe incluye partidas por segundo.
+    """
+    partidas = []
+    enfrentamiento = Enfrentamiento(RAPIDA, RAPIDA, [['e2e4'], ['d2d4']], SPRT(0, 10), procesos=1, max_plies=12)
+    informe = enfrentamiento.jugar(4, lambda indice, puntos, partida: partidas.append(partida))
+    assert informe['partidas'] == len(partidas) == 4
+    assert [partida['a_con_blancas'] for partida in partidas] == [True, False, True, False]
+    assert [partida['jugadas'][0] for partida in partidas] == ['e2e4', 'e2e4', 'd2d4', 'd2d4']
+    assert informe['partidas_por_segundo'] > 0 and informe['decision'] is None
+    # Configuraciones idénticas a 12 plies: todo tablas, y con H1 a +400 Elo el SPRT acepta H0 enseguida
+    informe = Enfrentamiento(RAPIDA, RAPIDA, [['e2e4']], SPRT(0, 400), procesos=1, max_plies=12).jugar(100)
+    assert informe['decision'] == 'H0' and informe['partidas'] < 10
+    assert informe['tablas'] == informe['partidas']
+
+def test_busqueda_paralela_solo_en_serie():
+    """
+    Verifica que una configuración con búsqueda paralela no se admite en un pool de procesos
+    y que, sin indicar procesos, el enfrentamiento se juega en serie.
+    """
+    paralela = {**RAPIDA, 'num_procesos': 2}
+    with pytest.raises(ValueError):
+        Enfrentamiento(paralela, RAPIDA, procesos=2)
+    assert Enfrentamiento(paralela, RAPIDA).procesos == 1
+    assert Enfrentamiento(RAPIDA, paralela, procesos=1).procesos == 1
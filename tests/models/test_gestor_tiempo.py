@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el gestor de tiempo con reloj (GestorTiempo).
+"""
+from models.tablero import Tablero
+from models.jugadores.jugador_ordenador import JugadorOrdenador
+from models.motor.buscador import Buscador
+from models.motor.gestor_tiempo import GestorTiempo
+from models.motor.posicion import Posicion, movimiento_a_uci
+from models.motor.tablas_pst import FASE_MAXIMA
+from models.temporizador import Temporizador
+
+def _iteracion(movimiento: int, puntuacion: int, tiempo_ms: float, tiempo_iteracion_ms: float) -> dict:
+    """
+    Entrada de iteración mínima como las de `Buscador.buscar`.
+    """
+    return {'profundidad': 5, 'puntuacion': puntuacion, 'tiempo_ms': tiempo_ms, 'tiempo_iteracion_ms': tiempo_iteracion_ms,
+            'factor_ramificacion': 2.0, 'lineas': [{'movimiento': movimiento, 'puntuacion': puntuacion, 'pv': [movimiento]}]}
+
+def test_limites_segun_reloj_y_fase():
+    """
+    Verifica que el límite duro supera al blando sin pasar del tiempo disponible, que en el final
+    se gasta más por jugada que en la apertura y que con poco reloj nunca se pasa del margen.
+    """
+    apertura = GestorTiempo(60000, 1000, fase=FASE_MAXIMA)
+    final = GestorTiempo(60000, 1000, fase=0)
+    assert apertura.limite_blando_ms == 60000 // 35 + 750
+    assert apertura.limite_blando_ms < apertura.limite_duro_ms <= 60000 * 0.4
+    assert final.limite_blando_ms > apertura.limite_blando_ms
+    assert GestorTiempo(10000, 0, jugadas_restantes=1).limite_duro_ms == 10000 - 50
+    assert (GestorTiempo(40, 5000).limite_blando_ms, GestorTiempo(40, 5000).limite_duro_ms) == (1, 1)
+
+def test_extiende_y_detiene_las_iteraciones():
+    """
+    Verifica que no se empieza una iteración que no terminaría a tiempo, y que un cambio de mejor
+    jugada o una caída de la puntuación extienden el límite blando sin pasar del duro.
+    """
+    gestor = GestorTiempo(35000, fase=FASE_MAXIMA) # Límite blando de 1000 ms, duro de 4000 ms
+    assert (gestor.limite_blando_ms, gestor.limite_duro_ms) == (1000, 4000)
+    assert gestor.continuar(_iteracion(1, 20, 300, 150))
+    assert not gestor.continuar(_iteracion(1, 20, 700, 350)) # Prevista hasta 1400 ms
+    inestable = GestorTiempo(35000, fase=FASE_MAXIMA)
+    inestable.continuar(_iteracion(1, 20, 300, 150))
+    assert inestable.continuar(_iteracion(2, 20, 700, 350))
+    assert inestable.limite_actual_ms == 1500
+    fallo_bajo = GestorTiempo(35000, fase=FASE_MAXIMA)
+    fallo_bajo.continuar(_iteracion(1, 20, 300, 150))
+    assert fallo_bajo.continuar(_iteracion(1, -130, 700, 350))
+    assert fallo_bajo.limite_actual_ms == 2000
+    assert not fallo_bajo.continuar(_iteracion(2, -400, 1900, 1000))
+    assert fallo_bajo.limite_actual_ms == 2500 # Extensión máxima
+
+def test_busqueda_con_gestor_respeta_el_reloj():
+    """
+    Verifica que la búsqueda con gestor no supera el límite duro y que con un único movimiento
+    legal se juega tras la primera iteración.
+    """
+    gestor = GestorTiempo(3000)
+    resultado = Buscador().buscar(Posicion.desde_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"),
+                                  gestor_tiempo=gestor)
+    assert resultado['profundidad'] >= 1
+    assert resultado['tiempo_ms'] < gestor.limite_duro_ms + 100
+    unico = Buscador().buscar(Posicion.desde_fen("k7/8/8/8/8/8/6r1/K7 w - - 0 1"), gestor_tiempo=GestorTiempo(60000))
+    assert movimiento_a_uci(unico['movimiento']) == "a1b1" and len(unico['iteraciones']) == 1
+
+def test_jugador_ordenador_con_temporizador():
+    """
+    Verifica que el jugador ordenador reparte su reloj con el gestor de tiempo y juega una jugada legal.
+    """
+    tablero = Tablero()
+    temporizador = Temporizador(2000)
+    jugador = JugadorOrdenador("Ordenador", 'blanco', temporizador=temporizador)
+    origen, destino, promocion = jugador.elegir_movimiento(tablero)
+    assert tablero.esMovimientoLegal(origen, destino, promocion)
+    assert jugador.ultimo_resultado['tiempo_ms'] < GestorTiempo(2000).limite_duro_ms + 100
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el libro de aperturas Polyglot (LibroAperturas) y su constructor desde PGN.
+"""
+import struct
+import pytest
+from models.motor.constructor_libro import ConstructorLibro, leer_partidas_pgn
+from models.motor.libro_aperturas import LibroAperturas, movimiento_a_polyglot, movimiento_desde_polyglot
+from models.motor.posicion import Posicion, FEN_INICIAL, movimiento_a_uci
+
+PGN = """[Event "Prueba"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 {desarrollo} Nc6 (2... d6 3. d4) 3. Bb5 a6 4. O-O $1 Nf6 1-0
+
+[Event "Prueba"]
+[Result "0-1"]
+
+1. d4 d5 2. c4 e6 0-1
+
+[Event "Prueba"]
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 1/2-1/2
+"""
+
+@pytest.fixture
+def ruta_libro(tmp_path):
+    """
+    Libro construido con las tres partidas de `PGN`.
+    """
+    constructor = ConstructorLibro(max_plies=10)
+    assert constructor.agregar_pgn(PGN) == 3
+    ruta = tmp_path / "libro.bin"
+    constructor.guardar(str(ruta))
+    return str(ruta)
+
+def test_leer_partidas_pgn_ignora_comentarios_variantes_y_nags():
+    """
+    Verifica que el lector PGN extrae etiquetas y la línea principal sin comentarios, variantes ni NAGs.
+    """
+    partidas = list(leer_partidas_pgn(PGN))
+    assert len(partidas) == 3
+    etiquetas, jugadas = partidas[0]
+    assert etiquetas['Result'] == '1-0'
+    assert jugadas == ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6', 'O-O', 'Nf6']
+
+def test_libro_pesos_segun_resultado(ruta_libro):
+    """
+    Verifica los pesos: 2 por victoria y 1 por tablas del bando que jugó el movimiento.
+    """
+    with LibroAperturas(ruta_libro) as libro:
+        posicion = Posicion.desde_fen(FEN_INICIAL)
+        pesos = {movimiento_a_uci(m): peso for m, peso in libro.movimientos(posicion)}
+        # e4: victoria (2) + tablas (1); d4 lo jugó el bando que perdió
+        assert pesos == {'e2e4': 3}
+        assert libro.entradas(posicion.clave)[0][0] == movimiento_a_polyglot(posicion.movimiento_desde_uci('e2e4'))
+
+def test_libro_archivo_ordenado_y_clave_polyglot(ruta_libro):
+    """
+    Verifica que el archivo está ordenado por clave y usa las claves Polyglot estándar.
+    """
+    with open(ruta_libro, 'rb') as archivo:
+        datos = archivo.read()
+    claves = [struct.unpack_from('>Q', datos, i)[0] for i in range(0, len(datos), 16)]
+    assert claves == sorted(claves)
+    assert 0x463B96181691FC9C in claves # Clave Polyglot de la posición inicial
+
+def test_libro_enroque_en_formato_polyglot(ruta_libro):
+    """
+    Verifica que el enroque se escribe como rey que captura su torre y se traduce de vuelta.
+    """
+    posicion = Posicion.desde_fen("r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4")
+    enroque = posicion.movimiento_desde_san('O-O')
+    codigo = movimiento_a_polyglot(enroque)
+    assert codigo & 63 == 7 and (codigo >> 6) & 63 == 4 # e1h1
+    assert movimiento_desde_polyglot(posicion, codigo) == enroque
+    with LibroAperturas(ruta_libro, semilla=1) as libro:
+        assert libro.elegir_movimiento(posicion) == enroque
+
+def test_libro_posicion_desconocida_devuelve_none(ruta_libro):
+    """
+    Verifica que una posición fuera del libro no devuelve movimiento.
+    """
+    with LibroAperturas(ruta_libro, semilla=3) as libro:
+        posicion = Posicion.desde_fen("8/8/8/4k3/8/8/8/4K3 w - - 0 1")
+        assert libro.elegir_movimiento(posicion) is None
+
+def test_libro_archivo_invalido(tmp_path):
+    """
+    Verifica que un archivo cuyo tamaño no es múltiplo de 16 bytes se rechaza.
+    """
+    ruta = tmp_path / "roto.bin"
+    ruta.write_bytes(b"\x00" * 10)
+    with pytest.raises(ValueError):
+        LibroAperturas(str(ruta))
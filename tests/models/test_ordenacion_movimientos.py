@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la ordenación de movimientos del buscador (OrdenacionMovimientos).
+"""
+import pytest
+from models.motor.ordenacion_movimientos import OrdenacionMovimientos
+from models.motor.posicion import Posicion, movimiento_a_uci
+
+@pytest.fixture
+def posicion_capturas():
+    """
+    Posición con varias capturas posibles para las blancas.
+    Dama blanca en d1 puede capturar la dama de d5; peón e4 puede capturar d5 y f5 (torre).
+    """
+    return Posicion.desde_fen("4k3/8/8/3q1r2/4P3/8/8/3QK3 w - - 0 1")
+
+def test_orden_tabla_mvv_lva_y_tranquilos(posicion_capturas: Posicion):
+    """
+    Verifica: movimiento de tabla primero, luego capturas por MVV-LVA y después los tranquilos.
+    """
+    ordenacion = OrdenacionMovimientos()
+    movimientos = posicion_capturas.generar_movimientos()
+    movimiento_tabla = posicion_capturas.movimiento_desde_uci("e1e2")
+    ordenados = [movimiento_a_uci(m) for m in ordenacion.ordenar(posicion_capturas, movimientos, movimiento_tabla, 0)]
+    assert ordenados[:4] == ["e1e2", "e4d5", "d1d5", "e4f5"] # PxD antes que DxD, y ambas antes que PxT
+
+def test_killer_e_historia_tras_corte(posicion_capturas: Posicion):
+    """
+    Verifica que un movimiento tranquilo que produce un corte pasa a ordenarse
+    justo después de las capturas, y que se actualizan las estadísticas de cortes.
+    """
+    ordenacion = OrdenacionMovimientos()
+    tranquilo = posicion_capturas.movimiento_desde_uci("d1a4")
+    ordenacion.registrar_corte(posicion_capturas, tranquilo, 3, 2, 0)
+    ordenados = ordenacion.ordenar(posicion_capturas, posicion_capturas.generar_movimientos(), 0, 2)
+    assert ordenados[3] == tranquilo
+    assert ordenacion.killers[2][0] == tranquilo
+    assert ordenacion.estadisticas()['tasa_corte_primer_movimiento'] == 1.0
+    ordenacion.nueva_busqueda()
+    assert ordenacion.killers[2] == [0, 0]
+    assert ordenacion.estadisticas()['cortes'] == 0
@@ -23,4 +23,21 @@ def test_inicializacion_peon():
     assert peon_negro.posicion == (6, 7)
     assert peon_negro.se_ha_movido is False
 
+def test_avance_doble_tapa_jaque():
+    """
+    Verifica que el avance doble se permite cuando tapa un jaque aunque el avance simple no lo haga.
+    Posición: Rey negro en d6 en jaque por el alfil blanco de a3; c7-c5 tapa la diagonal.
+    """
+    from models.piezas.rey import Rey
+    from models.piezas.alfil import Alfil
+    tablero = Tablero()
+    tablero.casillas = [[None for _ in range(8)] for _ in range(8)]
+    tablero.setPieza((5, 3), Rey('negro', (5, 3), tablero))     # Kd6
+    tablero.setPieza((0, 4), Rey('blanco', (0, 4), tablero))    # Ke1
+    tablero.setPieza((2, 0), Alfil('blanco', (2, 0), tablero))  # Ba3
+    peon = Peon('negro', (6, 2), tablero)                       # Pc7
+    tablero.setPieza((6, 2), peon)
+
+    assert peon.obtener_movimientos_legales() == [(4, 2)], "Solo c7-c5 es legal: tapa el jaque."
+
 # Aquí se añadirán más tests para cubrir movimientos, capturas, promoción, etc. 
\ No newline at end of file
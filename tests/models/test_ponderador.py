@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la búsqueda en el tiempo del rival (Ponderador).
+"""
+import time
+from models.motor.buscador import Buscador
+from models.motor.ponderador import Ponderador
+from models.motor.posicion import Posicion
+
+FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 5 4"
+
+def test_ponderador_acierto_reutiliza_la_busqueda():
+    """
+    Verifica que, si el rival juega la jugada prevista, se devuelve la búsqueda en segundo
+    plano sin volver a esperar el presupuesto ya consumido.
+    """
+    posicion = Posicion.desde_fen(FEN)
+    esperada = posicion.movimiento_desde_uci("f8c5")
+    ponderador = Ponderador(Buscador())
+    assert ponderador.iniciar(posicion, esperada)
+    assert ponderador.activo
+    time.sleep(0.3)
+    posicion.hacer_movimiento(esperada)
+    inicio = time.perf_counter()
+    resultado = ponderador.resolver(posicion, tiempo_ms=200)
+    assert time.perf_counter() - inicio < 0.15
+    assert resultado['ponder'] is True
+    assert resultado['movimiento'] in posicion.generar_movimientos_legales()
+    assert resultado['profundidad'] >= 1
+    assert not ponderador.activo
+    assert ponderador.estadisticas()['aciertos'] == 1
+
+def test_ponderador_fallo_cancela_la_busqueda():
+    """
+    Verifica que, si el rival juega otra jugada, la búsqueda en segundo plano se cancela enseguida.
+    """
+    posicion = Posicion.desde_fen(FEN)
+    ponderador = Ponderador(Buscador())
+    assert ponderador.iniciar(posicion, posicion.movimiento_desde_uci("f8c5"))
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("d7d6"))
+    inicio = time.perf_counter()
+    assert ponderador.resolver(posicion, tiempo_ms=5000) is None
+    assert time.perf_counter() - inicio < 0.5
+    assert not ponderador.activo
+    assert ponderador.estadisticas() == {'aciertos': 0, 'fallos': 1, 'tasa_aciertos': 0.0}
+
+def test_ponderador_jugada_ilegal_no_inicia():
+    """
+    Verifica que no se inicia la búsqueda si la jugada prevista no es legal.
+    """
+    posicion = Posicion.desde_fen(FEN)
+    ilegal = Posicion.desde_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1").movimiento_desde_uci("e2e4")
+    ponderador = Ponderador(Buscador())
+    assert not ponderador.iniciar(posicion, ilegal)
+    assert not ponderador.activo
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la posición compacta del motor (Posicion): generación de movimientos y make/unmake.
+"""
+import pytest
+from models.tablero import Tablero
+from models.motor.posicion import Posicion, FEN_INICIAL, movimiento_a_uci
+
+def _perft(posicion: Posicion, profundidad: int) -> int:
+    """
+    Cuenta los nodos hoja legales a la profundidad dada.
+    """
+    if profundidad == 0:
+        return 1
+    total = 0
+    for movimiento in posicion.generar_movimientos():
+        if posicion.hacer_movimiento(movimiento):
+            total += _perft(posicion, profundidad - 1)
+        posicion.deshacer_movimiento()
+    return total
+
+@pytest.mark.parametrize("fen, profundidad, esperado", [
+    (FEN_INICIAL, 3, 8902),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 2, 2039), # Enroques, al paso, promociones
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 3, 2812),                            # Clavadas y al paso
+])
+def test_perft_posiciones_de_referencia(fen: str, profundidad: int, esperado: int):
+    """
+    Verifica el número de nodos (perft) frente a valores de referencia conocidos
+    y que make/unmake deja la posición intacta.
+    """
+    posicion = Posicion.desde_fen(fen)
+    assert _perft(posicion, profundidad) == esperado
+    assert posicion.a_fen() == fen
+
+def test_desde_tablero_coincide_con_tablero():
+    """
+    Verifica que la posición construida desde un Tablero genera los mismos movimientos legales.
+    """
+    tablero = Tablero()
+    tablero.moverPieza((1, 4), (3, 4)) # e4
+    tablero.moverPieza((6, 3), (4, 3)) # d5
+    posicion = Posicion.desde_tablero(tablero)
+    assert posicion.a_fen().startswith("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq d6")
+    esperados = {(o[0] * 8 + o[1], d[0] * 8 + d[1]) for o, d in tablero.obtener_todos_movimientos_legales('blanco')}
+    obtenidos = {(m & 63, (m >> 6) & 63) for m in posicion.generar_movimientos_legales()}
+    assert obtenidos == esperados
+
+def test_conversion_movimientos_uci():
+    """
+    Verifica la conversión de movimientos a y desde notación UCI, incluida la promoción.
+    """
+    posicion = Posicion.desde_fen("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+    movimiento = posicion.movimiento_desde_uci("b7b8n")
+    assert movimiento is not None
+    assert movimiento_a_uci(movimiento) == "b7b8n"
+    assert posicion.movimiento_desde_uci("b7b6") is None
+
+def test_clave_zobrist_polyglot_incremental():
+    """
+    Verifica que la clave incremental coincide con la clave Polyglot de referencia
+    y se restaura al deshacer.
+    """
+    posicion = Posicion.desde_fen(FEN_INICIAL)
+    assert posicion.clave == 0x463B96181691FC9C
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("e2e4"))
+    assert posicion.clave == 0x823C9B50FD114196
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("d7d5"))
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("e4e5"))
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("f7f5")) # Al paso capturable: entra en la clave
+    assert posicion.clave == 0x22A48B5A8E47FF78
+    assert posicion.clave == posicion.calcular_clave()
+    for _ in range(4):
+        posicion.deshacer_movimiento()
+    assert posicion.clave == 0x463B96181691FC9C
+
+def test_repeticion_detectada():
+    """
+    Verifica la detección de repetición dentro de la línea de movimientos aplicados.
+    """
+    posicion = Posicion.desde_fen(FEN_INICIAL)
+    for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+        assert not posicion.es_repeticion()
+        posicion.hacer_movimiento(posicion.movimiento_desde_uci(uci))
+    assert posicion.es_repeticion()
+
+def test_copia_conserva_el_historial():
+    """
+    Verifica que la copia conserva las posiciones anteriores (la búsqueda, que trabaja sobre
+    una copia, ve las repeticiones de la partida) y que deshacer en ella no afecta al original.
+    """
+    posicion = Posicion.desde_fen(FEN_INICIAL)
+    for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+        posicion.hacer_movimiento(posicion.movimiento_desde_uci(uci))
+    copia = posicion.copia()
+    assert copia.es_repeticion()
+    copia.deshacer_movimiento()
+    assert posicion.es_repeticion() and posicion.clave != copia.clave
+
+def test_desde_partida_incluye_el_historial():
+    """
+    Verifica que la posición construida desde la partida de un `Tablero` ve las repeticiones
+    (también al rehacer solo las jugadas nuevas) y que sin historial válido no se usa.
+    """
+    tablero = Tablero()
+    jugadas = [((0, 6), (2, 5)), ((7, 6), (5, 5)), ((2, 5), (0, 6)), ((5, 5), (7, 6)), ((0, 6), (2, 5))]
+    for origen, destino in jugadas[:3]:
+        assert tablero.realizarMovimiento(origen, destino)
+    previa = Posicion.desde_partida(tablero)
+    assert len(previa._pila) == 3 and not previa.es_repeticion()
+    for origen, destino in jugadas[3:]:
+        assert tablero.realizarMovimiento(origen, destino)
+    posicion = Posicion.desde_partida(tablero, previa)
+    assert posicion.es_repeticion() and not Posicion.desde_tablero(tablero).es_repeticion()
+    assert posicion._pila == Posicion.desde_partida(tablero)._pila and len(previa._pila) == 3
+    tablero.historial_movimientos = [] # Posición preparada a mano: sin historial
+    assert Posicion.desde_partida(tablero, posicion).clave == Posicion.desde_tablero(tablero).clave
+
+def test_sumas_evaluacion_incrementales():
+    """
+    Verifica que las sumas de material/PST y la fase mantenidas en make/unmake
+    coinciden con las calculadas recorriendo el tablero (incluye captura, al paso, enroque y promoción).
+    """
+    posicion = Posicion.desde_fen("r3k2r/1P4pp/8/3pP3/8/8/6PP/R3K2R w KQkq d6 0 1")
+    assert posicion.fase == 8 # Cuatro torres
+    iniciales = (posicion.mg, posicion.eg, posicion.fase)
+    for uci in ("e5d6", "e8g8", "b7a8q", "f8a8", "e1c1"):
+        posicion.hacer_movimiento(posicion.movimiento_desde_uci(uci))
+        assert (posicion.mg, posicion.eg, posicion.fase) == posicion.calcular_sumas_evaluacion()
+    for _ in range(5):
+        posicion.deshacer_movimiento()
+    assert (posicion.mg, posicion.eg, posicion.fase) == iniciales
+
+def test_evaluacion_simetrica():
+    """
+    Verifica que la evaluación de la posición inicial es 0 para ambos bandos.
+    """
+    from models.motor.evaluador import Evaluador
+    evaluador = Evaluador()
+    posicion = Posicion.desde_fen(FEN_INICIAL)
+    assert evaluador.evaluar(posicion) == 0
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("e2e4"))
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("e7e5"))
+    assert evaluador.evaluar(posicion) == 0
+
+def test_movimiento_desde_san():
+    """
+    Verifica la conversión desde notación SAN: enroques, promociones, desambiguación
+    y rechazo de jugadas ambiguas o ilegales.
+    """
+    posicion = Posicion.desde_fen("r3k2r/1P6/8/8/8/2N3N1/8/R3K2R w KQkq - 0 1")
+    casos = {'O-O': 'e1g1', 'O-O-O': 'e1c1', 'b8=Q': 'b7b8q', 'bxa8=N+': 'b7a8n',
+             'Nce4': 'c3e4', 'Nge4': 'g3e4', 'R1a2': 'a1a2', 'Rhg1': 'h1g1'}
+    for san, uci in casos.items():
+        assert movimiento_a_uci(posicion.movimiento_desde_san(san)) == uci
+    assert posicion.movimiento_desde_san('Ne4') is None # Ambiguo
+    assert posicion.movimiento_desde_san('Qd4') is None
+    # Un avance de peón sin 'x' no puede ser una captura
+    posicion = Posicion.desde_fen("r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 1 4")
+    assert posicion.movimiento_desde_san('b5') is None
+    assert movimiento_a_uci(posicion.movimiento_desde_san('axb5')) == 'a6b5'
+
+def test_movimiento_nulo():
+    """
+    Verifica que el movimiento nulo pasa el turno, borra la casilla al paso con su clave
+    Zobrist y que deshacerlo restaura la posición exacta.
+    """
+    posicion = Posicion.desde_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2")
+    fen, clave = posicion.a_fen(), posicion.clave
+    posicion.hacer_movimiento_nulo()
+    assert posicion.clave == Posicion.desde_fen("4k3/8/8/3pP3/8/8/8/4K3 b - - 0 2").clave
+    assert posicion.al_paso == -1
+    posicion.deshacer_movimiento_nulo()
+    assert (posicion.a_fen(), posicion.clave) == (fen, clave)
+    assert not posicion.tiene_piezas(0)
+    assert Posicion.desde_fen(FEN_INICIAL).tiene_piezas(1)
+
+def test_clave_peones_incremental():
+    """
+    Verifica que la clave de peones incremental coincide con la calculada desde cero tras
+    capturas, capturas al paso y promociones, y que solo cambia con movimientos de peones.
+    """
+    posicion = Posicion.desde_fen("r3k2r/1P4p1/8/3pP3/8/2n5/P7/R3K2R w KQkq d6 0 2")
+    for movimiento in posicion.generar_movimientos():
+        clave_peones = posicion.clave_peones
+        if posicion.hacer_movimiento(movimiento):
+            assert posicion.clave_peones == posicion.calcular_clave_peones()
+            for respuesta in posicion.generar_movimientos():
+                posicion.hacer_movimiento(respuesta)
+                assert posicion.clave_peones == posicion.calcular_clave_peones()
+                posicion.deshacer_movimiento()
+        posicion.deshacer_movimiento()
+        assert posicion.clave_peones == clave_peones
+    posicion.hacer_movimiento(posicion.movimiento_desde_uci("e1g1"))
+    assert posicion.clave_peones == clave_peones
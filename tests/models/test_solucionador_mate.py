@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el solucionador de mates en N (SolucionadorMate) y su modo por lotes EPD.
+"""
+import pytest
+from models.tablero import Tablero
+from models.motor.posicion import Posicion, movimiento_a_uci
+from models.motor.solucionador_mate import SolucionadorMate, leer_epd, resolver_lote
+
+@pytest.mark.parametrize("fen, mate_en, primera", [
+    ("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", 1, "d1d8"),
+    ("r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1", 3, "f8c5"),
+])
+def test_encuentra_el_mate_mas_corto(fen: str, mate_en: int, primera: str):
+    """
+    Verifica que se encuentra el mate más corto y que la variante termina en mate.
+    """
+    posicion = Posicion.desde_fen(fen)
+    resultado = SolucionadorMate().resolver(posicion, max_jugadas=4)
+    assert resultado['mate_en'] == mate_en and resultado['completo']
+    assert movimiento_a_uci(resultado['movimiento']) == primera
+    assert len(resultado['variante']) == 2 * mate_en - 1
+    for movimiento in resultado['variante']:
+        assert posicion.hacer_movimiento(movimiento)
+    assert posicion.en_jaque() and not posicion.generar_movimientos_legales()
+
+def test_sin_mate_y_limites():
+    """
+    Verifica que sin mate forzado con jaques se devuelve None, y que un presupuesto de nodos
+    agotado se indica como búsqueda incompleta.
+    """
+    solucionador = SolucionadorMate()
+    resultado = solucionador.resolver(Posicion.desde_fen("kbK5/pp6/1P6/8/8/8/8/R7 w - - 0 1"), 3)
+    assert resultado['mate_en'] is None and resultado['completo']
+    resultado = solucionador.resolver(Posicion.desde_fen("r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1"),
+                                      3, nodos_max=10)
+    assert resultado['mate_en'] is None and not resultado['completo']
+
+def test_resuelve_desde_tablero():
+    """
+    Verifica que se acepta un `Tablero` y que no se modifica.
+    """
+    tablero = Tablero()
+    resultado = SolucionadorMate().resolver(tablero, 2)
+    assert resultado['mate_en'] is None
+    assert tablero.turno_blanco
+
+def test_lote_epd():
+    """
+    Verifica la lectura EPD y que el lote informa de resueltos, correctos y soluciones alternativas.
+    """
+    assert leer_epd('6k1/8/8/8/8/8/8/3R2K1 w - - bm Rd8#; id "uno";') == \
+        ("6k1/8/8/8/8/8/8/3R2K1 w - - 0 1", {'bm': 'Rd8#', 'id': 'uno'})
+    assert leer_epd("# comentario") is None
+    lineas = [
+        '6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - bm Rd8#; dm 1; id "pasillo";',
+        '6k1/5ppp/8/8/8/8/5PPP/3RR1K1 w - - dm 1; id "dos torres";',
+        'kbK5/pp6/1P6/8/8/8/8/R7 w - - bm Ra6; dm 2; id "tranquila";',
+    ]
+    informe = resolver_lote(lineas, max_jugadas=2, procesos=1)
+    assert (informe['problemas'], informe['resueltos'], informe['correctos']) == (3, 2, 2)
+    assert informe['con_alternativas'] == 1
+    assert len(informe['resultados'][1]['alternativas']) == 1 # Rd8# y Re8#
+
+def test_mate_encontrado_siempre_trae_variante():
+    """
+    Verifica que, sea cual sea el presupuesto de nodos, un mate encontrado siempre trae su
+    jugada y su variante, y que una jugada 'bm' ilegible no da el problema por correcto.
+    """
+    fen = "r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1"
+    for nodos_max in range(10, 400, 7):
+        resultado = SolucionadorMate().resolver(Posicion.desde_fen(fen), 3, nodos_max=nodos_max)
+        if resultado['mate_en'] is not None:
+            assert resultado['movimiento'] == resultado['variante'][0] and len(resultado['variante']) == 5
+    informe = resolver_lote(['6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - bm Rd8# Zz9; id "ilegible";'], procesos=1)
+    assert informe['correctos'] == 1
+    informe = resolver_lote(['6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - bm Re1 Zz9; id "otra";'], procesos=1)
+    assert informe['correctos'] == 0
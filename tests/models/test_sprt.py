@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el test secuencial de razón de verosimilitudes (SPRT).
+"""
+import random
+import pytest
+from models.motor.sprt import SPRT, elo_a_puntuacion, puntuacion_a_elo
+
+def test_conversion_elo():
+    """
+    Verifica la conversión entre Elo y puntuación esperada.
+    """
+    assert elo_a_puntuacion(0) == 0.5
+    assert puntuacion_a_elo(elo_a_puntuacion(35.0)) == pytest.approx(35.0)
+    with pytest.raises(ValueError):
+        SPRT(elo0=5, elo1=0)
+
+def test_decide_con_rachas():
+    """
+    Verifica que una racha de victorias acepta H1, una de tablas acepta H0, y que el test
+    no decide con las primeras partidas.
+    """
+    sprt = SPRT(0, 10)
+    sprt.registrar(1)
+    sprt.registrar(1)
+    assert sprt.decision() is None
+    while sprt.decision() is None:
+        sprt.registrar(1)
+    assert sprt.decision() == 'H1' and sprt.partidas < 30
+    sprt = SPRT(0, 10)
+    while sprt.decision() is None:
+        sprt.registrar(0.5)
+    assert sprt.decision() == 'H0'
+    with pytest.raises(ValueError):
+        sprt.registrar(0.25)
+
+@pytest.mark.parametrize("elo, esperada", [(-20, 'H0'), (40, 'H1')])
+def test_decide_con_resultados_simulados(elo: float, esperada: str):
+    """
+    Verifica que con resultados simulados de una diferencia de Elo clara se acepta la hipótesis
+    correcta y que la estimación de Elo la contiene.
+    """
+    aleatorio = random.Random(7)
+    victoria = elo_a_puntuacion(elo) - 0.2 # 40 % de tablas
+    sprt = SPRT(0, 10)
+    while sprt.decision() is None:
+        tirada = aleatorio.random()
+        sprt.registrar(1 if tirada < victoria else 0.5 if tirada < victoria + 0.4 else 0)
+    assert sprt.decision() == esperada
+    estimacion = sprt.estimacion_elo()
+    assert estimacion['minimo'] <= elo <= estimacion['maximo']
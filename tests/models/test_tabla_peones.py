@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la tabla de estructura de peones (TablaPeones) y los términos de peones del evaluador.
+"""
+import pytest
+from models.motor.tabla_peones import TablaPeones
+from models.motor.evaluador import Evaluador, evaluar_estructura_peones
+from models.motor.buscador import Buscador
+from models.motor.posicion import Posicion
+from models.motor.tablas_pst import PEON_DOBLADO, PEON_AISLADO, PEON_PASADO_MG, PEON_PASADO_EG
+
+def test_guardar_y_sondear():
+    """
+    Verifica que una estructura guardada se recupera, que una clave ausente no
+    y que se cuentan los aciertos.
+    """
+    tabla = TablaPeones(entradas=1000)
+    assert tabla.num_entradas == 512
+    tabla.guardar(0x1234, 10, -20, 1 << 12, 0)
+    assert tabla.sondear(0x1234) == (0x1234, 10, -20, 1 << 12, 0)
+    assert tabla.sondear(0x1234 + 512) is None # Misma entrada, otra clave
+    estadisticas = tabla.estadisticas()
+    assert estadisticas['sondeos'] == 2 and estadisticas['aciertos'] == 1
+    assert estadisticas['tasa_aciertos'] == 0.5
+    with pytest.raises(ValueError):
+        TablaPeones(entradas=0)
+
+def test_terminos_de_estructura():
+    """
+    Verifica los peones doblados, aislados y pasados y sus máscaras.
+    """
+    # Blancas: peones doblados y aislados en c2/c3; negras: peón pasado en h4
+    posicion = Posicion.desde_fen("4k3/8/8/8/7p/2P5/2P5/4K3 w - - 0 1")
+    mg, eg, pasados_blancos, pasados_negros = evaluar_estructura_peones(posicion.casillas)
+    assert pasados_blancos == (1 << 10) | (1 << 18)
+    assert pasados_negros == 1 << 31
+    assert mg == PEON_DOBLADO[0] + 2 * PEON_AISLADO[0] + PEON_PASADO_MG[1] + PEON_PASADO_MG[2] \
+        - PEON_AISLADO[0] - PEON_PASADO_MG[4]
+    assert eg == PEON_DOBLADO[1] + 2 * PEON_AISLADO[1] + PEON_PASADO_EG[1] + PEON_PASADO_EG[2] \
+        - PEON_AISLADO[1] - PEON_PASADO_EG[4]
+    # Un peón rival en una columna vecina por delante impide que sea pasado
+    _, _, pasados_blancos, _ = evaluar_estructura_peones(Posicion.desde_fen("4k3/3p4/8/8/4P3/8/8/4K3 w - - 0 1").casillas)
+    assert pasados_blancos == 0
+
+def test_busqueda_reutiliza_estructura():
+    """
+    Verifica que durante una búsqueda la mayoría de evaluaciones reutilizan la estructura
+    de peones y que la caché no cambia la evaluación.
+    """
+    fen = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+    resultado = Buscador().buscar(Posicion.desde_fen(fen), profundidad_max=4)
+    assert resultado['peones']['sondeos'] > 0
+    assert resultado['peones']['tasa_aciertos'] > 0.8
+    posicion = Posicion.desde_fen(fen)
+    evaluador = Evaluador()
+    assert evaluador.evaluar(posicion) == evaluador.evaluar(posicion) == Evaluador(TablaPeones(1)).evaluar(posicion)
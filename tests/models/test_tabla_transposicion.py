@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la tabla de transposición del motor (TablaTransposicion).
+"""
+import pytest
+from models.motor.tabla_transposicion import (TablaTransposicion, COTA_EXACTA, COTA_INFERIOR,
+                                              COTA_SUPERIOR, BYTES_POR_ENTRADA)
+
+def test_guardar_y_sondear():
+    """
+    Verifica que una entrada guardada se recupera y que una clave ausente no.
+    """
+    tabla = TablaTransposicion(tamano_mb=1)
+    tabla.guardar(0x1234, 5, COTA_EXACTA, -42, 777)
+    assert tabla.sondear(0x1234) == (777, -42, 5, COTA_EXACTA)
+    assert tabla.sondear(0x9999) is None
+    estadisticas = tabla.estadisticas()
+    assert estadisticas['sondeos'] == 2 and estadisticas['aciertos'] == 1
+    assert estadisticas['tasa_aciertos'] == 0.5
+
+def test_memoria_acotada():
+    """
+    Verifica que la tabla no supera el tamaño configurado.
+    """
+    tabla = TablaTransposicion(tamano_mb=0.5)
+    assert tabla.num_entradas * BYTES_POR_ENTRADA <= 0.5 * 1024 * 1024
+    assert TablaTransposicion.bytes_necesarios(0.5) == tabla.num_entradas * BYTES_POR_ENTRADA
+    with pytest.raises(ValueError):
+        TablaTransposicion(tamano_mb=0)
+
+def test_reemplazo_por_profundidad_y_siempre():
+    """
+    Verifica el esquema de cubetas: la entrada profunda se conserva frente a una menos
+    profunda de la misma cubeta, que va a la entrada de reemplazo siempre.
+    """
+    tabla = TablaTransposicion(tamano_mb=0.001)
+    n = tabla.num_cubetas
+    profunda, superficial, otra = 1, 1 + n, 1 + 2 * n # Tres claves de la misma cubeta
+    tabla.guardar(profunda, 8, COTA_INFERIOR, 10, 1)
+    tabla.guardar(superficial, 2, COTA_SUPERIOR, 20, 2)
+    assert tabla.sondear(profunda) is not None
+    assert tabla.sondear(superficial) is not None
+    tabla.guardar(otra, 3, COTA_EXACTA, 30, 3) # Reemplaza a la superficial, no a la profunda
+    assert tabla.sondear(profunda) is not None
+    assert tabla.sondear(superficial) is None
+    assert tabla.sondear(otra) is not None
+
+def test_edad_permite_desalojar_entradas_antiguas():
+    """
+    Verifica que tras `nueva_busqueda` una entrada profunda antigua es reemplazable
+    y deja de contar en la ocupación.
+    """
+    tabla = TablaTransposicion(tamano_mb=0.001)
+    n = tabla.num_cubetas
+    tabla.guardar(1, 10, COTA_EXACTA, 0, 1)
+    assert tabla.ocupacion() > 0
+    tabla.nueva_busqueda()
+    assert tabla.ocupacion() == 0
+    tabla.guardar(1 + n, 1, COTA_EXACTA, 0, 2)
+    tabla.guardar(1 + 2 * n, 1, COTA_EXACTA, 0, 3)
+    assert tabla.sondear(1) is None
+    tabla.limpiar()
+    assert tabla.sondear(1 + n) is None
+
+def test_escritura_a_medias_no_se_acepta():
+    """
+    Verifica que si otro proceso reescribe parte de una entrada (sin cerrojos, en memoria
+    compartida), el sondeo falla en vez de mezclar datos de dos posiciones.
+    """
+    buffer = bytearray(TablaTransposicion.bytes_necesarios(0.001))
+    tabla = TablaTransposicion(tamano_mb=0.001, buffer=buffer)
+    otro_proceso = TablaTransposicion(tamano_mb=0.001, buffer=buffer)
+    clave = 0x9E3779B97F4A7C15
+    tabla.guardar(clave, 6, COTA_INFERIOR, 250, 77)
+    assert otro_proceso.sondear(clave) == (77, 250, 6, COTA_INFERIOR)
+    tabla.guardar(clave + 1, -2, COTA_SUPERIOR, -99990, 0) # Puntuación y profundidad negativas
+    assert tabla.sondear(clave + 1) == (0, -99990, -2, COTA_SUPERIOR)
+    indice = (clave % tabla.num_cubetas) * 2
+    otro_proceso._datos[indice] = 12345 # Escritura de otra posición interrumpida antes de su clave
+    assert tabla.sondear(clave) is None
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para las tablas de finales (generación retrógrada y consulta con TablasFinales).
+"""
+import random
+import pytest
+from models.motor.buscador import Buscador, MATE
+from models.motor.generador_tablas_finales import generar_tablas
+from models.motor.posicion import Posicion, movimiento_a_uci
+from models.motor.tablas_finales import TablasFinales
+
+def _valor(sondeo):
+    """
+    Valor escalar de un sondeo: ganar antes (o perder más tarde) es mejor, como en las puntuaciones de mate.
+    """
+    resultado, distancia = sondeo
+    return resultado * (1000 - distancia) if resultado else 0
+
+@pytest.fixture(scope="module")
+def tablas(tmp_path_factory):
+    """
+    Tabla KRK generada con dos procesos en un directorio temporal.
+    """
+    directorio = tmp_path_factory.mktemp("tablas")
+    generar_tablas(str(directorio), ('KRK',), procesos=2)
+    with TablasFinales(str(directorio)) as tablas:
+        yield tablas
+
+def test_tablas_finales_firmas(tablas):
+    """
+    Verifica que solo se cubren las firmas disponibles.
+    """
+    assert tablas.firmas() == ['KRK']
+    # Otro material no está cubierto
+    assert tablas.sondear(Posicion.desde_fen("k7/8/1K6/8/8/8/8/7Q w - - 0 1")) is None
+
+@pytest.mark.parametrize("fen, esperado", [
+    ("k7/8/1K6/8/8/8/8/7R w - - 0 1", (1, 1)),   # Th8 mate
+    ("R6k/8/6K1/8/8/8/8/8 b - - 0 1", (-1, 0)),  # Mate ya dado
+    ("K7/8/1k6/8/8/8/8/7r b - - 0 1", (1, 1)),   # Bando fuerte negro (tabla reflejada)
+    ("8/8/8/3k4/3R4/8/8/7K b - - 0 1", (0, 0)),  # El rey captura la torre indefensa
+])
+def test_tablas_finales_posiciones_conocidas(tablas, fen, esperado):
+    """
+    Verifica resultado y distancia al mate en posiciones conocidas.
+    """
+    assert tablas.sondear(Posicion.desde_fen(fen)) == esperado
+
+def test_tablas_finales_consistentes_con_sus_sucesores(tablas):
+    """
+    Verifica en posiciones aleatorias que cada valor es el mejor de los de sus sucesores a un ply más.
+    """
+    aleatorio = random.Random(7)
+    comprobadas = 0
+    while comprobadas < 200:
+        casillas = aleatorio.sample(range(64), 3)
+        fen_filas = [['1'] * 8 for _ in range(8)]
+        for casilla, letra in zip(casillas, 'KkR'):
+            fen_filas[7 - casilla // 8][casilla % 8] = letra
+        turno = aleatorio.choice('wb')
+        fen = '/'.join(''.join(fila) for fila in fen_filas) + f" {turno} - - 0 1"
+        posicion = Posicion.desde_fen(fen)
+        sondeo = tablas.sondear(posicion)
+        if sondeo is None:
+            continue
+        legales = posicion.generar_movimientos_legales()
+        if not legales:
+            assert sondeo == ((-1, 0) if posicion.en_jaque() else (0, 0))
+        else:
+            valores = []
+            for movimiento in legales:
+                posicion.hacer_movimiento(movimiento)
+                hijo = tablas.sondear(posicion)
+                posicion.deshacer_movimiento()
+                # Sin torre (capturada) son tablas; si no, el resultado del hijo cambia de signo a un ply más
+                valores.append(_valor((-hijo[0], hijo[1] + 1)) if hijo else 0)
+            assert _valor(sondeo) == max(valores)
+        comprobadas += 1
+
+def test_buscador_con_tablas_juega_el_mate_mas_corto(tablas):
+    """
+    Verifica que el buscador con tablas puntúa el mate exacto y juega una jugada que lo acorta.
+    """
+    posicion = Posicion.desde_fen("8/8/8/4k3/8/8/8/R3K3 w - - 0 1")
+    resultado_tabla, distancia = tablas.sondear(posicion)
+    assert resultado_tabla == 1
+    buscador = Buscador(tablas_finales=tablas)
+    resultado = buscador.buscar(posicion, profundidad_max=2)
+    assert resultado['puntuacion'] == MATE - distancia
+    assert resultado['aciertos_tablas_finales'] > 0
+    posicion.hacer_movimiento(resultado['movimiento'])
+    assert tablas.sondear(posicion) == (-1, distancia - 1), movimiento_a_uci(resultado['movimiento'])
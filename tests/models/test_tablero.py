@@ -15,6 +15,8 @@ from models.piezas.torre import Torre
 from models.piezas.alfil import Alfil
 from models.piezas.caballo import Caballo
 from models.piezas.peon import Peon
+from models.piezas.color import Color
+from models.piezas.tipo_pieza import TipoPieza
 from typing import Tuple, Optional, Type
 
 # ============================================================
@@ -1075,3 +1077,286 @@ def test_obtener_todos_movimientos_legales_filtra_jaque(tablero_vacio: Tablero):
 # ==================================================================
 # Pruebas de Simulación y Verificación de Seguridad del Rey
 # ==================================================================
+
+# ============================================================
+# Pruebas de Iteración y Conteo de Movimientos Legales
+# ============================================================
+
+def test_iterar_movimientos_legales_coincide_con_lista(tablero_inicial: Tablero):
+    """
+    Verifica que el generador produce los mismos movimientos, en el mismo orden,
+    que `obtener_todos_movimientos_legales`.
+    """
+    tablero_inicial.moverPieza((1, 4), (3, 4)) # e4
+    tablero_inicial.moverPieza((6, 3), (4, 3)) # d5
+    generados = list(tablero_inicial.iterar_movimientos_legales('blanco'))
+    assert generados == tablero_inicial.obtener_todos_movimientos_legales('blanco')
+
+def test_iterar_movimientos_legales_es_perezoso(tablero_inicial: Tablero):
+    """
+    Verifica que el generador entrega el primer movimiento sin agotar el resto.
+    """
+    generador = tablero_inicial.iterar_movimientos_legales('blanco')
+    primero = next(generador)
+    assert primero == ((0, 1), (2, 0)), "El primer movimiento en orden de recorrido debería ser Nb1-a3."
+
+def test_contar_movimientos_legales(tablero_inicial: Tablero):
+    """
+    Verifica el conteo de movimientos legales sin construir la lista.
+    """
+    assert tablero_inicial.contar_movimientos_legales('blanco') == 20
+    assert tablero_inicial.contar_movimientos_legales('negro') == 20
+
+def test_tiene_movimientos_legales(tablero_vacio: Tablero):
+    """
+    Verifica la detección de ausencia de movimientos (posición de ahogado).
+    """
+    tablero_vacio.setPieza((1, 2), Reina('blanco', (1, 2), tablero_vacio)) # Qc2
+    tablero_vacio.setPieza((7, 7), Rey('blanco', (7, 7), tablero_vacio))   # Kh8
+    tablero_vacio.setPieza((0, 0), Rey('negro', (0, 0), tablero_vacio))    # Ka1
+    assert tablero_vacio.tiene_movimientos_legales('negro') is False
+    assert tablero_vacio.contar_movimientos_legales('negro') == 0
+    assert tablero_vacio.tiene_movimientos_legales('blanco') is True
+
+# ============================================================
+# Pruebas de la Caché Incremental de Movimientos Legales
+# ============================================================
+
+def _movimientos_sin_cache(tablero: Tablero, color: str) -> list:
+    """
+    Calcula los movimientos legales de un color directamente desde las piezas, sin caché.
+    """
+    movimientos = []
+    for r in range(8):
+        for c in range(8):
+            pieza = tablero.casillas[r][c]
+            if pieza is not None and pieza.color == color:
+                movimientos.extend(((r, c), destino) for destino in pieza.obtener_movimientos_legales())
+    return sorted(movimientos)
+
+def _jugar_movimiento(tablero: Tablero, origen: tuple, destino: tuple):
+    """
+    Ejecuta un movimiento legal, delegando el enroque en `realizarEnroque`.
+    """
+    pieza = tablero.getPieza(origen)
+    if isinstance(pieza, Rey) and abs(destino[1] - origen[1]) == 2:
+        tablero.realizarEnroque(pieza.color, 'corto' if destino[1] == 6 else 'largo')
+    else:
+        tablero.moverPieza(origen, destino)
+
+@pytest.mark.parametrize("semilla", [1, 7, 42])
+def test_cache_movimientos_coincide_con_calculo_completo(semilla: int):
+    """
+    Juega una partida aleatoria y verifica en cada ply que los movimientos servidos
+    (con invalidación selectiva) coinciden con un cálculo completo desde cero.
+    """
+    import random
+    generador = random.Random(semilla)
+    tablero = Tablero()
+    for _ in range(60):
+        for color in ('blanco', 'negro'):
+            assert sorted(tablero.obtener_todos_movimientos_legales(color)) == _movimientos_sin_cache(tablero, color)
+        if tablero.estado_juego in ('jaque_mate', 'tablas'):
+            break
+        movimientos = tablero.obtener_todos_movimientos_legales(tablero.getTurnoColor())
+        _jugar_movimiento(tablero, *generador.choice(movimientos))
+
+def test_cache_movimientos_reutiliza_piezas_no_afectadas(tablero_inicial: Tablero):
+    """
+    Verifica que tras un movimiento se conservan en caché las piezas lejanas
+    y se descartan las afectadas.
+    """
+    tablero_inicial.obtener_todos_movimientos_legales('blanco')
+    lista_caballo_b1 = tablero_inicial.obtener_movimientos_legales_casilla((0, 1))
+    tablero_inicial.moverPieza((1, 4), (3, 4)) # e4: libera e2 para Ng1 y la diagonal f1-a6 para el alfil
+    assert tablero_inicial.obtener_movimientos_legales_casilla((0, 1)) is lista_caballo_b1, "Nb1 no debería recalcularse."
+    assert (1, 4) in tablero_inicial.obtener_movimientos_legales_casilla((0, 6)), "Ng1 debería poder ir a e2."
+    assert (3, 4) not in tablero_inicial._cache_movimientos, "El peón movido no debería seguir en caché."
+    assert sorted(tablero_inicial.obtener_movimientos_legales_casilla((0, 5))) == [(1, 4), (2, 3), (3, 2), (4, 1), (5, 0)]
+
+def test_cache_movimientos_setPieza_invalida(tablero_inicial: Tablero):
+    """
+    Verifica que colocar piezas a mano vacía la caché.
+    """
+    tablero_inicial.obtener_todos_movimientos_legales('blanco')
+    tablero_inicial.setPieza((2, 4), Peon('negro', (2, 4), tablero_inicial)) # Peón negro en e3
+    assert ((1, 4), (2, 4)) not in tablero_inicial.obtener_todos_movimientos_legales('blanco')
+
+# ============================================================
+# Pruebas de Anotación de Movimientos (captura / jaque / mate)
+# ============================================================
+
+def _anotacion(anotaciones: list, origen: tuple, destino: tuple) -> dict:
+    """
+    Devuelve la anotación del movimiento origen->destino dentro de una lista de anotaciones.
+    """
+    return next(a for a in anotaciones if a['origen'] == origen and a['destino'] == destino)
+
+def test_anotar_movimientos_captura_y_jaque_directo(tablero_vacio: Tablero):
+    """
+    Verifica las marcas de captura y jaque directo de una torre.
+    """
+    tablero_vacio.setPieza((0, 0), Torre('blanco', (0, 0), tablero_vacio)) # Ta1
+    tablero_vacio.setPieza((1, 4), Rey('blanco', (1, 4), tablero_vacio))   # Ke2
+    tablero_vacio.setPieza((7, 7), Rey('negro', (7, 7), tablero_vacio))    # Kh8
+    tablero_vacio.setPieza((5, 0), Caballo('negro', (5, 0), tablero_vacio)) # Na6
+
+    anotaciones = tablero_vacio.anotar_movimientos_casilla((0, 0))
+    assert _anotacion(anotaciones, (0, 0), (5, 0)) == {'origen': (0, 0), 'destino': (5, 0), 'captura': True, 'jaque': False, 'mate': False}
+    assert _anotacion(anotaciones, (0, 0), (0, 3))['jaque'] is False
+    assert tablero_vacio.anotar_movimientos_casilla((0, 0)) == [a for a in tablero_vacio.anotar_movimientos('blanco') if a['origen'] == (0, 0)]
+
+    tablero_vacio.setPieza((5, 0), None)
+    assert _anotacion(tablero_vacio.anotar_movimientos_casilla((0, 0)), (0, 0), (0, 7))['jaque'] is True # Th1+
+
+def test_anotar_movimientos_jaque_descubierto(tablero_vacio: Tablero):
+    """
+    Verifica que mover una pieza fuera de la línea alfil-rey marca jaque descubierto.
+    """
+    tablero_vacio.setPieza((0, 0), Alfil('blanco', (0, 0), tablero_vacio))   # Ba1
+    tablero_vacio.setPieza((3, 3), Caballo('blanco', (3, 3), tablero_vacio)) # Nd4 (tapa la diagonal)
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))     # Ke1
+    tablero_vacio.setPieza((7, 7), Rey('negro', (7, 7), tablero_vacio))      # Kh8
+
+    anotaciones = tablero_vacio.anotar_movimientos_casilla((3, 3))
+    assert all(a['jaque'] for a in anotaciones), "Cualquier salto del caballo descubre jaque del alfil."
+
+def test_anotar_movimientos_mate(tablero_vacio: Tablero):
+    """
+    Verifica la marca de mate en un mate del pasillo (Ta7-a8#).
+    """
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))  # Ke1
+    tablero_vacio.setPieza((6, 0), Torre('blanco', (6, 0), tablero_vacio)) # Ta7
+    tablero_vacio.setPieza((7, 4), Rey('negro', (7, 4), tablero_vacio))   # Ke8
+    for col in (3, 4, 5):
+        tablero_vacio.setPieza((6, col), Peon('negro', (6, col), tablero_vacio))
+
+    anotaciones = tablero_vacio.anotar_movimientos('blanco')
+    assert _anotacion(anotaciones, (6, 0), (7, 0)) == {'origen': (6, 0), 'destino': (7, 0), 'captura': False, 'jaque': True, 'mate': True}
+    assert list(tablero_vacio.iterar_jaques('blanco')) == [((6, 0), (7, 0))]
+    assert tablero_vacio.obtenerPosicionActual().startswith("4k3/R2ppp2/"), "La simulación debe restaurar el tablero."
+
+# ============================================================
+# Pruebas de Validación de un Único Movimiento (esMovimientoLegal)
+# ============================================================
+
+def test_esMovimientoLegal_posicion_inicial(tablero_inicial: Tablero):
+    """
+    Verifica geometría, camino libre y turno en la posición inicial.
+    """
+    assert tablero_inicial.esMovimientoLegal((1, 4), (3, 4)) is True   # e2-e4
+    assert tablero_inicial.esMovimientoLegal((0, 6), (2, 5)) is True   # Ng1-f3
+    assert tablero_inicial.esMovimientoLegal((0, 5), (2, 3)) is False  # Bf1-d3 bloqueado por e2
+    assert tablero_inicial.esMovimientoLegal((1, 4), (4, 4)) is False  # e2-e5 (tres casillas)
+    assert tablero_inicial.esMovimientoLegal((6, 4), (4, 4)) is False  # e7-e5: no es turno de negras
+    assert tablero_inicial.esMovimientoLegal((1, 4), (2, 4), 'Q') is False # Promoción fuera de la última fila
+
+def test_esMovimientoLegal_clavada_y_jaque(tablero_vacio: Tablero):
+    """
+    Verifica que se rechazan movimientos de piezas clavadas y los que no resuelven un jaque.
+    """
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))      # Ke1
+    tablero_vacio.setPieza((0, 5), Alfil('blanco', (0, 5), tablero_vacio))    # Bf1 (clavado)
+    tablero_vacio.setPieza((0, 7), Torre('negro', (0, 7), tablero_vacio))     # Th1
+    tablero_vacio.setPieza((2, 0), Caballo('blanco', (2, 0), tablero_vacio))  # Na3
+    tablero_vacio.setPieza((7, 7), Rey('negro', (7, 7), tablero_vacio))       # Kh8
+    assert tablero_vacio.esMovimientoLegal((0, 5), (1, 6)) is False, "El alfil clavado no puede moverse."
+    assert tablero_vacio.esMovimientoLegal((2, 0), (1, 2)) is True
+
+    tablero_vacio.setPieza((0, 5), None) # Sin alfil: la torre da jaque al rey
+    assert tablero_vacio.esMovimientoLegal((2, 0), (4, 1)) is False, "Nb5 no resuelve el jaque."
+    assert tablero_vacio.esMovimientoLegal((0, 4), (0, 5)) is False, "El rey no puede seguir en la línea de la torre."
+    assert tablero_vacio.esMovimientoLegal((0, 4), (1, 4)) is True
+
+def test_esMovimientoLegal_enroque_y_al_paso(tablero_vacio: Tablero):
+    """
+    Verifica la validación del enroque y de la captura al paso.
+    """
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))   # Ke1
+    tablero_vacio.setPieza((0, 7), Torre('blanco', (0, 7), tablero_vacio)) # Th1
+    tablero_vacio.setPieza((7, 4), Rey('negro', (7, 4), tablero_vacio))    # Ke8
+    tablero_vacio.setPieza((4, 4), Peon('blanco', (4, 4), tablero_vacio))  # Pe5
+    tablero_vacio.setPieza((6, 3), Peon('negro', (6, 3), tablero_vacio))   # Pd7
+    tablero_vacio.derechosEnroque['blanco']['corto'] = True
+    assert tablero_vacio.esMovimientoLegal((0, 4), (0, 6)) is True   # O-O
+    assert tablero_vacio.esMovimientoLegal((0, 4), (0, 2)) is False  # O-O-O sin torre ni derechos
+
+    tablero_vacio.turno_blanco = False
+    tablero_vacio.moverPieza((6, 3), (4, 3)) # d7-d5
+    assert tablero_vacio.esMovimientoLegal((4, 4), (5, 3)) is True   # exd6 al paso
+    assert tablero_vacio.esMovimientoLegal((4, 4), (5, 5)) is False  # exf6 sin pieza que capturar
+
+def test_esMovimientoLegal_promocion(tablero_vacio: Tablero):
+    """
+    Verifica las piezas de promoción admitidas.
+    """
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))
+    tablero_vacio.setPieza((7, 0), Rey('negro', (7, 0), tablero_vacio))
+    tablero_vacio.setPieza((6, 6), Peon('blanco', (6, 6), tablero_vacio)) # Pg7
+    assert tablero_vacio.esMovimientoLegal((6, 6), (7, 6)) is True
+    assert tablero_vacio.esMovimientoLegal((6, 6), (7, 6), 'N') is True
+    assert tablero_vacio.esMovimientoLegal((6, 6), (7, 6), 'K') is False
+
+def test_realizarMovimiento_promocion_y_enroque(tablero_vacio: Tablero):
+    """
+    Verifica que realizarMovimiento completa la promoción (con el estado de juego recalculado)
+    y despacha el enroque cuando el rey se mueve dos columnas.
+    """
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))
+    tablero_vacio.setPieza((0, 7), Torre('blanco', (0, 7), tablero_vacio))
+    tablero_vacio.setPieza((7, 0), Rey('negro', (7, 0), tablero_vacio))
+    tablero_vacio.setPieza((6, 6), Peon('blanco', (6, 6), tablero_vacio)) # Pg7
+    tablero_vacio.derechosEnroque['blanco']['corto'] = True
+    assert tablero_vacio.realizarMovimiento((0, 4), (0, 6)) is True
+    assert isinstance(tablero_vacio.getPieza((0, 5)), Torre) and isinstance(tablero_vacio.getPieza((0, 6)), Rey)
+    assert tablero_vacio.realizarMovimiento((7, 0), (7, 1)) is True
+    assert tablero_vacio.realizarMovimiento((6, 6), (7, 6), 'Q') is True
+    assert isinstance(tablero_vacio.getPieza((7, 6)), Reina)
+    assert tablero_vacio.estado_juego == 'jaque'
+    assert tablero_vacio.historial_posiciones[tablero_vacio.obtenerPosicionActual()] == 1
+
+def test_realizarMovimiento_promocion_no_valida_no_mueve(tablero_vacio: Tablero):
+    """
+    Verifica que una letra de promoción no válida se rechaza sin tocar el tablero.
+    """
+    tablero_vacio.setPieza((0, 4), Rey('blanco', (0, 4), tablero_vacio))
+    tablero_vacio.setPieza((7, 7), Rey('negro', (7, 7), tablero_vacio))
+    tablero_vacio.setPieza((6, 0), Peon('blanco', (6, 0), tablero_vacio)) # Pa7
+    assert tablero_vacio.realizarMovimiento((6, 0), (7, 0), 'X') is False
+    assert isinstance(tablero_vacio.getPieza((6, 0)), Peon) and tablero_vacio.getPieza((7, 0)) is None
+    assert tablero_vacio.getTurnoColor() == 'blanco' and tablero_vacio.contadorPly == 0
+
+# ============================================================
+# Pruebas de Códigos Enteros de Color y Tipo
+# ============================================================
+
+def test_codigos_piezas_y_enums():
+    """
+    Verifica los códigos enteros de color y tipo y sus conversiones desde/hacia la API de cadenas.
+    """
+    assert Color.desde_texto('blanco') == Color.BLANCO
+    assert Color.NEGRO.a_texto() == 'negro'
+    assert Color.BLANCO.opuesto() == Color.NEGRO
+    with pytest.raises(ValueError):
+        Color.desde_texto('rojo')
+    assert TipoPieza.desde_letra('n') == TipoPieza.CABALLO
+    assert TipoPieza.REINA.a_letra() == 'Q'
+    with pytest.raises(ValueError):
+        TipoPieza.desde_letra('X')
+
+    tablero = Tablero()
+    caballo_negro = tablero.getPieza((7, 1))
+    assert caballo_negro.tipo == TipoPieza.CABALLO
+    assert caballo_negro.codigo_color == Color.NEGRO
+    assert caballo_negro.codigo == (Color.NEGRO << 3) | TipoPieza.CABALLO
+
+def test_obtenerCodigos_tablero_inicial(tablero_inicial: Tablero):
+    """
+    Verifica la representación compacta de 64 enteros del tablero.
+    """
+    codigos = tablero_inicial.obtenerCodigos()
+    assert len(codigos) == 64
+    assert codigos[4] == TipoPieza.REY                       # Ke1 (blanco = 0)
+    assert codigos[8 * 6 + 0] == (Color.NEGRO << 3) | TipoPieza.PEON # a7
+    assert codigos[8 * 3 + 3] == 0                            # d4 vacía
+    assert sum(1 for codigo in codigos if codigo) == 32
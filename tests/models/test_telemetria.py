@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para la telemetría de la búsqueda (registro_busqueda y RegistroTelemetria).
+"""
+import io
+import json
+from models.tablero import Tablero
+from models.jugadores.jugador_ordenador import JugadorOrdenador
+from models.motor.buscador import Buscador
+from models.motor.posicion import Posicion
+from models.motor.telemetria import RegistroTelemetria, factor_ramificacion_efectivo
+
+FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+def test_telemetria_de_la_busqueda():
+    """
+    Verifica que el resultado incluye el registro de telemetría con contadores coherentes
+    y los datos de cada iteración.
+    """
+    informes = []
+    resultado = Buscador().buscar(Posicion.desde_fen(FEN), profundidad_max=4, al_completar_iteracion=informes.append)
+    telemetria = resultado['telemetria']
+    assert telemetria['fen'] == FEN and telemetria['profundidad'] == 4
+    assert telemetria['profundidad_selectiva'] >= 4
+    assert telemetria['nodos'] == resultado['nodos'] and telemetria['nps'] > 0
+    assert 0 < telemetria['aciertos_tt'] <= telemetria['sondeos_tt'] and telemetria['cortes'] > 0
+    iteraciones = telemetria['iteraciones']
+    assert [iteracion['profundidad'] for iteracion in iteraciones] == [1, 2, 3, 4]
+    assert sum(iteracion['nodos_iteracion'] for iteracion in iteraciones) == resultado['nodos']
+    assert iteraciones[0]['factor_ramificacion'] is None and iteraciones[-1]['factor_ramificacion'] > 1
+    assert telemetria['factor_ramificacion'] == factor_ramificacion_efectivo(resultado['iteraciones']) > 1
+    assert [informe['profundidad_selectiva'] for informe in informes] == [i['profundidad_selectiva'] for i in iteraciones]
+    json.dumps(telemetria)
+
+def test_registro_jsonl_y_jugador(tmp_path):
+    """
+    Verifica que el registro escribe una línea JSON por búsqueda con sus etiquetas, usado
+    como función de telemetría del jugador ordenador.
+    """
+    ruta = tmp_path / "telemetria.jsonl"
+    with RegistroTelemetria(str(ruta), etiquetas={'version': 'prueba'}) as registro:
+        jugador = JugadorOrdenador("Motor", 'blanco', tiempo_max_ms=None, profundidad_max=2, telemetria=registro)
+        jugador.elegir_movimiento(Tablero())
+        jugador.elegir_movimiento(Tablero())
+    lineas = [json.loads(linea) for linea in ruta.read_text(encoding='utf-8').splitlines()]
+    assert len(lineas) == 2
+    assert lineas[0]['version'] == 'prueba' and lineas[0]['profundidad'] == 2 and 'marca_tiempo' in lineas[0]
+    flujo = io.StringIO()
+    RegistroTelemetria(flujo)({'nodos': 1})
+    assert json.loads(flujo.getvalue())['nodos'] == 1
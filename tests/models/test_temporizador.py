@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el reloj de partida (Temporizador).
+"""
+import pytest
+from models.configuracion_juego import ConfiguracionJuego
+from models.temporizador import Temporizador
+
+class _RelojFalso:
+    """
+    Reloj controlado por el test (segundos).
+    """
+    def __init__(self):
+        self.ahora = 100.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+def test_descuenta_el_turno_y_suma_incremento():
+    """
+    Verifica que solo corre el reloj del jugador en turno, que al cambiar de turno recibe el
+    incremento y que pausado no se descuenta tiempo.
+    """
+    reloj = _RelojFalso()
+    temporizador = Temporizador(60000, 2000, reloj=reloj)
+    temporizador.iniciar('blanco')
+    reloj.ahora += 3.0
+    assert temporizador.getTiempoRestante('blanco') == 57000
+    assert temporizador.getTiempoRestante('negro') == 60000
+    temporizador.cambiarTurno()
+    assert temporizador.getTurno() == 'negro' and temporizador.getTiempoRestante('blanco') == 59000
+    reloj.ahora += 1.0
+    temporizador.pausar()
+    reloj.ahora += 10.0
+    assert temporizador.getTiempoRestante('negro') == 59000 and not temporizador.estaEnMarcha()
+    temporizador.reanudar()
+    reloj.ahora += 0.5
+    temporizador.cambiarTurno()
+    assert temporizador.getTiempoRestante('negro') == 58500 + 2000
+    assert temporizador.getJugadasRealizadas('blanco') == 1 and temporizador.getJugadasRealizadas('negro') == 1
+
+def test_tiempo_agotado_sin_incremento():
+    """
+    Verifica que el tiempo no baja de cero y que quien lo agota no recibe el incremento.
+    """
+    reloj = _RelojFalso()
+    temporizador = Temporizador(1000, 5000, reloj=reloj)
+    temporizador.iniciar()
+    reloj.ahora += 2.0
+    assert temporizador.estaAgotado('blanco') and temporizador.getTiempoRestante('blanco') == 0
+    temporizador.cambiarTurno()
+    assert temporizador.estaAgotado('blanco')
+    with pytest.raises(ValueError):
+        Temporizador(0)
+
+def test_configuracion_crea_el_temporizador():
+    """
+    Verifica que la configuración crea el reloj solo si se juega con temporizador.
+    """
+    assert ConfiguracionJuego().crearTemporizador() is None
+    temporizador = ConfiguracionJuego(usarTemporizador=True, limiteTiempo=300, incrementoTiempo=2).crearTemporizador()
+    assert temporizador.getTiempoRestante('negro') == 300000 and temporizador.getIncremento() == 2000
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests para el trabajador asíncrono del motor (TrabajadorMotor).
+"""
+import asyncio
+import pytest
+from models.tablero import Tablero
+from models.motor.nivel_dificultad import obtener_nivel
+from models.motor.posicion import Posicion
+from models.motor.trabajador_motor import TrabajadorMotor
+
+FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+@pytest.fixture(scope="module")
+def trabajador():
+    """
+    Un único trabajador para todo el módulo (arrancar el proceso es lo más caro).
+    """
+    with TrabajadorMotor(tamano_tabla_mb=4) as trabajador:
+        yield trabajador
+
+def test_pensar_devuelve_futuro_con_informes(trabajador):
+    """
+    Verifica que pensar no bloquea, que se informa de cada iteración y que una segunda
+    búsqueda de la misma posición aprovecha la tabla ya caliente del trabajador.
+    """
+    informes = []
+    futuro = trabajador.pensar(Posicion.desde_fen(FEN), {'profundidad_max': 4}, informes.append)
+    resultado = futuro.result(timeout=30)
+    assert resultado['profundidad'] == 4 and not resultado['detenido']
+    assert [informe['profundidad'] for informe in informes] == [1, 2, 3, 4]
+    assert informes[-1]['movimiento'] == resultado['movimiento']
+    repetido = trabajador.pensar(Posicion.desde_fen(FEN), {'profundidad_max': 4}).result(timeout=30)
+    assert repetido['nodos'] < resultado['nodos']
+
+def test_cancelar_busqueda_en_curso_y_pendiente(trabajador):
+    """
+    Verifica que cancelar una búsqueda sin límites la resuelve con la última iteración completa
+    y que un encargo en cola cancelado se descarta.
+    """
+    en_curso = trabajador.pensar(Tablero())
+    pendiente = trabajador.pensar(Posicion.desde_fen(FEN))
+    assert pendiente.cancel()
+    assert trabajador.cancelar(en_curso)
+    resultado = en_curso.result(timeout=30)
+    assert resultado['detenido'] and resultado['movimiento'] is not None
+    assert pendiente.cancelled()
+
+def test_plazo_y_nivel(trabajador):
+    """
+    Verifica que se aceptan límites de un nivel de dificultad y que se rechazan límites desconocidos.
+    """
+    resultado = trabajador.pensar(Posicion.desde_fen(FEN), obtener_nivel(2)).result(timeout=30)
+    assert resultado['nodos'] <= obtener_nivel(2).nodos_max
+    with pytest.raises(ValueError):
+        trabajador.pensar(Posicion.desde_fen(FEN), {'segundos': 1})
+
+def test_pensar_async(trabajador):
+    """
+    Verifica la interfaz asyncio: los informes llegan al bucle de eventos y el resultado se espera con await.
+    """
+    async def pensar():
+        informes = []
+        resultado = await trabajador.pensar_async(Posicion.desde_fen(FEN), {'tiempo_ms': 200}, informes.append)
+        return resultado, informes
+    resultado, informes = asyncio.run(pensar())
+    assert resultado['movimiento'] is not None
+    assert informes and informes[-1]['profundidad'] == resultado['profundidad']